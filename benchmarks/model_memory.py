@@ -0,0 +1,82 @@
+"""Compare the memory footprint of decoded stackwalk dicts and StackwalkResult.
+
+Usage::
+
+    python -m benchmarks.model_memory [--threads N] [--frames N] [path/to/result.json]
+
+Without a path, a synthetic result is generated from the test fixture by
+repeating its threads and frames.
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from minidumpmcp.analysis.model import StackwalkResult
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "testdata" / "stackwalk" / "test_app.json"
+
+
+def synthetic_result(threads: int, frames: int) -> str:
+    """Build a large stackwalk JSON document from the test fixture."""
+    data: Dict[str, Any] = json.loads(FIXTURE.read_text())
+    template = data["threads"][0]["frames"]
+    thread_list = []
+    for thread_index in range(threads):
+        frame_list = []
+        for position in range(frames):
+            frame = dict(template[position % len(template)])
+            frame["frame"] = position
+            frame.pop("registers", None)
+            frame_list.append(frame)
+        thread_list.append(
+            {"thread_id": 1000 + thread_index, "thread_name": None, "frame_count": frames, "frames": frame_list}
+        )
+    data["threads"] = thread_list
+    data["thread_count"] = threads
+    data["crashing_thread"] = {"threads_index": 0, **thread_list[0]}
+    return json.dumps(data)
+
+
+def measure(build: Callable[[], Any]) -> Tuple[int, int, float]:
+    """Return (retained bytes, peak bytes, seconds) for building an object.
+
+    Time is measured in a separate run because tracemalloc slows allocation down.
+    """
+    gc.collect()
+    started = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return current, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", type=Path, help="stackwalk JSON result to load")
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    text = args.path.read_text() if args.path else synthetic_result(args.threads, args.frames)
+    print(f"JSON text: {len(text) / 1e6:.1f} MB")
+    for name, build in (
+        ("json.loads", lambda: json.loads(text)),
+        ("StackwalkResult.from_json", lambda: StackwalkResult.from_json(text)),
+    ):
+        current, peak, elapsed = measure(build)
+        print(f"{name:28} retained {current / 1e6:7.1f} MB  peak {peak / 1e6:7.1f} MB  {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Measure background job throughput against the number of worker processes.
+
+Usage::
+
+    python -m benchmarks.worker_pool [--workers 1 2 4] [--jobs N] [--dumps N]
+
+For every worker count a fresh queue is filled with triage jobs, each over a
+directory of copies of the test minidump read by a single metadata process, and
+a :class:`~minidumpmcp.worker.WorkerPool` is started to drain it.  Jobs per
+second should grow with the worker count up to the number of cores.
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from minidumpmcp.storage import JobQueue
+from minidumpmcp.tools.jobs import JobProvider, JobScheduler
+from minidumpmcp.worker import WorkerPool
+
+FIXTURE = Path(__file__).parent.parent / "tests" / "testdata" / "test.dmp"
+
+
+async def drain(queue: JobQueue) -> None:
+    """Wait until no job is queued or running."""
+    while queue.jobs(("queued", "running")):
+        await asyncio.sleep(0.01)
+
+
+async def run(workers: int, jobs: int, dumps: Path, scratch: Path) -> float:
+    """Return the seconds *workers* worker processes take to run *jobs* triage jobs."""
+    database = scratch / f"jobs-{workers}.sqlite3"
+    env = {
+        "MINIDUMP_MCP_LOG_LEVEL": "WARNING",
+        "MINIDUMP_MCP_JOBS__DATABASE_PATH": str(database),
+        "MINIDUMP_MCP_JOBS__CONCURRENCY": "1",
+        "MINIDUMP_MCP_JOBS__MAX_FINISHED": str(jobs + 2 * workers),
+        "MINIDUMP_MCP_JOBS__POLL_INTERVAL": "0.05",
+        "MINIDUMP_MCP_CACHE__DIRECTORY": str(scratch / "analyses"),
+        "MINIDUMP_MCP_SIGNATURES__ENABLED": "false",
+        "MINIDUMP_MCP_SIMILARITY__ENABLED": "false",
+        "MINIDUMP_MCP_STORE__PATH": str(scratch / "store"),
+    }
+    queue = JobQueue(database)
+    provider = JobProvider(scheduler=JobScheduler(queue, concurrency=0))
+    empty = scratch / "empty"
+    empty.mkdir(exist_ok=True)
+
+    pool = WorkerPool(workers, env=env)
+    await pool.start()
+    try:
+        # Give the workers time to start up and import the package before the clock starts
+        for _ in range(2 * workers):
+            await provider.submit_triage(str(empty))
+        await drain(queue)
+
+        started = time.perf_counter()
+        for _ in range(jobs):
+            await provider.submit_triage(str(dumps), max_workers=1)
+        await drain(queue)
+        elapsed = time.perf_counter() - started
+    finally:
+        await pool.close()
+    failed = len(queue.jobs(("failed",)))
+    if failed:
+        print(f"  {failed} jobs failed")
+    queue.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--jobs", type=int, default=64)
+    parser.add_argument("--dumps", type=int, default=100, help="minidumps triaged by every job")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.jobs} jobs of {args.dumps} dumps each")
+    with tempfile.TemporaryDirectory(prefix="minidumpmcp-bench-") as name:
+        scratch = Path(name)
+        dumps = scratch / "dumps"
+        dumps.mkdir()
+        for position in range(args.dumps):
+            shutil.copy(FIXTURE, dumps / f"{position}.dmp")
+
+        baseline: List[float] = []
+        for workers in args.workers:
+            elapsed = asyncio.run(run(workers, args.jobs, dumps, scratch))
+            rate = args.jobs / elapsed
+            baseline = baseline or [rate]
+            print(f"{workers:3} workers  {elapsed:7.2f} s  {rate:7.1f} jobs/s  x{rate / baseline[0]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Helpers for post-processing minidump analysis results."""
+
+from .model import Frame, StackwalkResult
+from .projection import FieldSelector, build_selector, project_json
+from .text_report import parse_text_report
+
+__all__ = ["FieldSelector", "Frame", "StackwalkResult", "build_selector", "parse_text_report", "project_json"]
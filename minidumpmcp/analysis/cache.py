@@ -0,0 +1,357 @@
+"""In-memory cache of stackwalk analyses.
+
+Each cached analysis keeps the raw JSON text produced by minidump-stackwalk,
+the human-readable report of the same run when available, and a compact index of byte spans for its top-level members,
+threads and modules.  Callers decode only the slices they need, so a cached
+analysis costs roughly the size of the JSON text instead of the ~10x a fully
+decoded ``dict`` tree would take.
+
+An :class:`AnalysisStore` over a shared
+:class:`~minidumpmcp.storage.cache_backend.CacheBackend` lets processes and
+server replicas share their analyses: a local directory for the server and its
+job worker processes, or networked key-value stores for replicas on several
+hosts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from .model import StackwalkResult
+from .projection import FieldSelector, iter_elements, iter_members, project_value
+
+if TYPE_CHECKING:
+    from minidumpmcp.storage.cache_backend import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of the file at *path*, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def hash_minidump(path: Path) -> str:
+    """Return the SHA-256 hex digest of the file at *path*.
+
+    The file is read in chunks on a worker thread so large dumps neither
+    block the event loop nor get loaded into memory at once.
+    """
+    return await asyncio.to_thread(hash_file, path)
+
+
+def symbols_fingerprint(symbols_path: Path) -> str:
+    """Return a digest of the names, sizes and modification times of the ``.sym`` files under *symbols_path*.
+
+    Symbols added or replaced after an analysis, e.g. by extract_symbols, change
+    the digest, so the analysis is not served for the new contents of the directory.
+    """
+    entries = []
+    for root, _, files in os.walk(symbols_path):
+        for name in files:
+            if not name.lower().endswith(".sym"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append(f"{os.path.relpath(path, symbols_path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n")
+    digest = hashlib.sha256()
+    for entry in sorted(entries):
+        digest.update(entry.encode())
+    return digest.hexdigest()
+
+
+def analysis_key(dump_hash: str, symbols_path: Optional[Path] = None, symbols_version: str = "") -> str:
+    """Derive the analysis hash for a dump analyzed with a given symbols directory.
+
+    Args:
+        dump_hash: SHA-256 of the dump
+        symbols_path: Symbols directory of the analysis
+        symbols_version: :func:`symbols_fingerprint` of *symbols_path* when the analysis ran
+    """
+    material = f"{dump_hash}\0{symbols_path.absolute() if symbols_path else ''}\0{symbols_version}"
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def _spans(text: str, start: int) -> array[int]:
+    spans: array[int] = array("Q")
+    for element_start, element_end in iter_elements(text, start):
+        spans.append(element_start)
+        spans.append(element_end)
+    return spans
+
+
+class CachedAnalysis:
+    """A stackwalk JSON result with a span index for lazy decoding."""
+
+    __slots__ = (
+        "analysis_hash",
+        "minidump_path",
+        "command",
+        "json_text",
+        "text_report",
+        "created_at",
+        "_members",
+        "_lists",
+    )
+
+    def __init__(
+        self,
+        analysis_hash: str,
+        minidump_path: Path,
+        command: str,
+        json_text: str,
+        text_report: Optional[str] = None,
+    ) -> None:
+        """Index *json_text* and keep it for later slicing.
+
+        Raises:
+            json.JSONDecodeError: If *json_text* is not a JSON object
+        """
+        self.analysis_hash = analysis_hash
+        self.minidump_path = minidump_path
+        self.command = command
+        self.json_text = json_text
+        self.text_report = text_report
+        self.created_at = time.time()
+        self._members: Dict[str, Tuple[int, int]] = {key: (s, e) for key, s, e in iter_members(json_text)}
+        self._lists: Dict[str, array[int]] = {}
+        for key in ("threads", "modules"):
+            span = self._members.get(key)
+            if span is not None and json_text[span[0]] == "[":
+                self._lists[key] = _spans(json_text, span[0])
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes, used for cache accounting."""
+        text_size = len(self.text_report) if self.text_report is not None else 0
+        return len(self.json_text) + text_size + sum(8 * len(spans) for spans in self._lists.values())
+
+    def member(self, key: str) -> Any:
+        """Decode a single top-level member, or return ``None`` when absent."""
+        span = self._members.get(key)
+        if span is None:
+            return None
+        return project_value(self.json_text, span[0], None)
+
+    def count(self, key: str) -> int:
+        """Number of elements in the indexed list *key* (``threads`` or ``modules``)."""
+        spans = self._lists.get(key)
+        return len(spans) // 2 if spans is not None else 0
+
+    def elements(self, key: str, offset: int, limit: int, selector: Optional[FieldSelector] = None) -> Iterator[Any]:
+        """Decode elements ``[offset, offset + limit)`` of the indexed list *key*.
+
+        Args:
+            key: Indexed list name (``threads`` or ``modules``)
+            offset: Index of the first element
+            limit: Maximum number of elements
+            selector: Optional projection applied to every element
+        """
+        spans = self._lists.get(key)
+        if spans is None:
+            return
+        for position in range(max(offset, 0), min(offset + limit, len(spans) // 2)):
+            yield project_value(self.json_text, spans[2 * position], selector)
+
+    def element(self, key: str, position: int, selector: Optional[FieldSelector] = None) -> Any:
+        """Decode a single element of the indexed list *key*, or ``None`` when out of range."""
+        return next(self.elements(key, position, 1, selector), None) if position >= 0 else None
+
+    def model(self) -> StackwalkResult:
+        """Build the typed columnar model of this analysis.
+
+        The model is not kept by the cache; callers that need it repeatedly should hold on to it.
+        """
+        return StackwalkResult.from_json(self.json_text)
+
+    def frames(self, thread_position: int, offset: int, limit: int) -> Optional[Tuple[int, List[Any]]]:
+        """Decode a page of frames of one thread.
+
+        Returns:
+            ``(total_frames, frames)`` or ``None`` when the thread does not exist
+        """
+        spans = self._lists.get("threads")
+        if spans is None or not 0 <= thread_position < len(spans) // 2:
+            return None
+        frames_start = next(
+            (start for key, start, _ in iter_members(self.json_text, spans[2 * thread_position]) if key == "frames"),
+            None,
+        )
+        if frames_start is None:
+            return 0, []
+        total = 0
+        page: List[Any] = []
+        for start, _ in iter_elements(self.json_text, frames_start):
+            if offset <= total < offset + limit:
+                page.append(project_value(self.json_text, start, None))
+            total += 1
+        return total, page
+
+
+class AnalysisStore:
+    """Analyses kept in a :class:`~minidumpmcp.storage.cache_backend.CacheBackend`.
+
+    An analysis is stored under ``<analysis_hash>.analysis`` as a JSON header line
+    followed by the stackwalk JSON and the text report.
+    """
+
+    SUFFIX = ".analysis"
+
+    def __init__(self, backend: CacheBackend) -> None:
+        """Initialize the store.
+
+        Args:
+            backend: Backend shared with the other processes or replicas
+        """
+        self.backend = backend
+
+    def load(self, analysis_hash: str) -> Optional[CachedAnalysis]:
+        """Read the analysis stored under *analysis_hash*, or ``None`` when there is none.
+
+        Raises:
+            OSError: If the backend cannot be reached
+        """
+        value = self.backend.get(analysis_hash + self.SUFFIX)
+        if value is None:
+            return None
+        try:
+            header_line, _, body_bytes = value.partition(b"\n")
+            header = json.loads(header_line)
+            body = body_bytes.decode("utf-8")
+            json_length = header["json_length"]
+            text_report = body[json_length:] if header.get("has_text_report") else None
+            entry = CachedAnalysis(
+                analysis_hash, Path(header["minidump_path"]), header["command"], body[:json_length], text_report
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable stored analysis %s: %s", analysis_hash, e)
+            return None
+        entry.created_at = header.get("created_at", entry.created_at)
+        return entry
+
+    def save(self, entry: CachedAnalysis) -> None:
+        """Store *entry*, replacing a previous copy.
+
+        Raises:
+            OSError: If the backend cannot be reached
+        """
+        header = {
+            "minidump_path": str(entry.minidump_path),
+            "command": entry.command,
+            "created_at": entry.created_at,
+            "json_length": len(entry.json_text),
+            "has_text_report": entry.text_report is not None,
+        }
+        body = entry.json_text + (entry.text_report or "")
+        self.backend.put(entry.analysis_hash + self.SUFFIX, (json.dumps(header) + "\n" + body).encode("utf-8"))
+
+
+class AnalysisCache:
+    """Bounded LRU cache of :class:`CachedAnalysis` entries keyed by analysis hash."""
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        max_bytes: int = 512 * 1024 * 1024,
+        store: Optional[AnalysisStore] = None,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of analyses kept
+            max_bytes: Maximum combined size of the cached JSON documents
+            store: Optional store shared with other processes or replicas; :meth:`publish`
+                   writes analyses to it and :meth:`fetch` reads those missing from memory
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._store = store
+        self._entries: OrderedDict[str, CachedAnalysis] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Combined size of the analyses held in memory."""
+        return self._bytes
+
+    def __contains__(self, analysis_hash: object) -> bool:
+        return analysis_hash in self._entries
+
+    def get(self, analysis_hash: str) -> Optional[CachedAnalysis]:
+        """Return the analysis held in memory and mark it as recently used."""
+        entry = self._entries.get(analysis_hash)
+        if entry is not None:
+            self._entries.move_to_end(analysis_hash)
+        return entry
+
+    def put(self, entry: CachedAnalysis) -> None:
+        """Insert *entry* in memory, evicting least recently used analyses as needed."""
+        self._insert(entry)
+
+    async def fetch(self, analysis_hash: str) -> Optional[CachedAnalysis]:
+        """Return the analysis from memory, or else from the shared store.
+
+        Analyses found in the store, e.g. produced by another replica, are kept in
+        memory afterwards.  An unreachable store counts as a miss.
+        """
+        entry = self.get(analysis_hash)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        if self._store is not None:
+            try:
+                entry = await asyncio.to_thread(self._store.load, analysis_hash)
+            except OSError as e:
+                logger.warning("Could not read analysis %s from the shared store: %s", analysis_hash, e)
+            if entry is not None:
+                self.shared_hits += 1
+                self._insert(entry)
+                return entry
+        self.misses += 1
+        return None
+
+    async def publish(self, entry: CachedAnalysis) -> None:
+        """Insert *entry* in memory and write it to the shared store."""
+        self._insert(entry)
+        if self._store is not None:
+            try:
+                await asyncio.to_thread(self._store.save, entry)
+            except OSError as e:
+                logger.warning("Could not write analysis %s to the shared store: %s", entry.analysis_hash, e)
+
+    def _insert(self, entry: CachedAnalysis) -> None:
+        previous = self._entries.pop(entry.analysis_hash, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        self._entries[entry.analysis_hash] = entry
+        self._bytes += entry.size
+        while len(self._entries) > 1 and (len(self._entries) > self._max_entries or self._bytes > self._max_bytes):
+            evicted_hash, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+            logger.debug("Evicted analysis %s from cache", evicted_hash)
@@ -0,0 +1,319 @@
+"""Deterministic classification of common crash patterns.
+
+The classifier looks at a handful of facts a debugger checks first and that
+need no symbols or language model to establish:
+
+- a fault address in the first 64 KiB, i.e. a NULL pointer plus a small offset;
+- a stack overflow, from the exception type or a fault just below the stack
+  pointer, together with recursion in the crashing thread;
+- abort, panic, assertion and stack protector frames on top of the stack;
+- allocator fill patterns (``0xfeeefeee``, ``0xdddddddd``, ...) in the fault
+  address or the crashing frame's registers, pointing at freed or
+  uninitialized memory.
+
+Findings are cheap to compute from the crashing thread alone, so they are
+used both to pre-digest results for the analysis prompts and in bulk triage.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .model import Frame, StackwalkResult, Thread
+from .signature import SignatureGenerator, normalize_function
+
+# Addresses below this are NULL plus an offset (Windows never maps the first 64 KiB).
+NULL_PAGE_LIMIT = 0x10000
+
+# A fault this far below (or a page above) the stack pointer is a guard page hit.
+_GUARD_DISTANCE = 64 * 1024
+_PAGE_SIZE = 4096
+
+# Frames scanned for recursion and for abort/panic machinery.
+_SCAN_DEPTH = 64
+_RECURSION_REPEATS = 8
+_DEEP_STACK = 1024
+
+# Distance from a fill pattern still attributed to it, e.g. a field of a freed object.
+_POISON_SLACK = 0x1000
+
+_ACCESS_FAULTS = re.compile(r"ACCESS_VIOLATION|IN_PAGE_ERROR|SIGSEGV|SIGBUS|EXC_BAD_ACCESS")
+_STACK_POINTERS = ("rsp", "esp", "sp")
+
+_SIGNATURES = SignatureGenerator()
+
+# 32-bit fill patterns of debug heaps and allocators: (value, kind, meaning)
+_POISON_VALUES: Tuple[Tuple[int, str, str], ...] = (
+    (0xFEEEFEEE, "use_after_free", "HeapFree fill of freed heap memory"),
+    (0xDDDDDDDD, "use_after_free", "MSVC debug CRT fill of freed memory"),
+    (0xE5E5E5E5, "use_after_free", "jemalloc fill of freed memory"),
+    (0xCDCDCDCD, "uninitialized_memory", "MSVC debug CRT fill of uninitialized heap memory"),
+    (0xBAADF00D, "uninitialized_memory", "HeapAlloc fill of uninitialized heap memory"),
+    (0xCCCCCCCC, "uninitialized_memory", "MSVC fill of uninitialized stack memory"),
+)
+
+# Functions that tell how the process was brought down: (pattern, kind, meaning)
+_TERMINATION_FRAMES: Tuple[Tuple[re.Pattern[str], str, str], ...] = tuple(
+    (re.compile(pattern), kind, meaning)
+    for pattern, kind, meaning in (
+        (
+            r"(?:std|core)::panicking::|rust_panic$|rust_begin_unwind$|__rust_start_panic$",
+            "panic",
+            "Rust panic",
+        ),
+        (r"(?:__assert_fail|__assert_rtn|_wassert|_assert)$", "assertion_failure", "failed assertion"),
+        (
+            r"(?:__stack_chk_fail|__report_gsfailure|__fortify_fail)$",
+            "stack_buffer_overrun",
+            "stack protector detected a buffer overrun",
+        ),
+        (r"std::terminate$|__terminate$|__cxa_call_terminate$", "uncaught_exception", "std::terminate"),
+        (
+            r"(?:__GI_)?abort$|std::(?:rt|process)::abort|abort_internal$|(?:__GI_)?raise$|gsignal$|"
+            r"(?:__)?pthread_kill\w*$",
+            "abort",
+            "process abort",
+        ),
+    )
+)
+
+_TERMINATION_TYPES: Tuple[Tuple[re.Pattern[str], str, str], ...] = (
+    (re.compile(r"STACK_BUFFER_OVERRUN|FAIL_FAST"), "stack_buffer_overrun", "fail-fast or /GS check"),
+    (re.compile(r"SIGABRT|EXC_CRASH"), "abort", "abort signal"),
+)
+
+
+class Finding(NamedTuple):
+    """One recognized crash pattern."""
+
+    kind: str
+    confidence: str
+    summary: str
+    evidence: Tuple[str, ...]
+
+
+def _parse_address(value: object) -> Optional[int]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return int(value, 16)
+    except ValueError:
+        return None
+
+
+def _crashing_thread(result: StackwalkResult) -> Optional[Thread]:
+    if result.crashing_thread is not None:
+        return result.crashing_thread
+    index = (result.header.get("crash_info") or {}).get("crashing_thread")
+    if isinstance(index, int) and 0 <= index < len(result.threads):
+        return result.threads[index]
+    return None
+
+
+def _frame_label(frame: Frame) -> str:
+    if frame.function:
+        return normalize_function(frame.function)
+    return f"{frame.module or ''}@0x{frame.module_offset or frame.offset or 0:x}"
+
+
+class _Facts:
+    """What the individual checks need, extracted once from the result."""
+
+    def __init__(self, result: StackwalkResult) -> None:
+        crash_info = result.header.get("crash_info") or {}
+        self.crash_type: str = crash_info.get("type") or ""
+        self.assertion: Optional[str] = crash_info.get("assertion")
+        self.address = _parse_address(crash_info.get("address"))
+        self.width = result.address_width or 16
+        thread = _crashing_thread(result)
+        self.frames: List[Frame] = list(result.frames(thread, _SCAN_DEPTH)) if thread is not None else []
+        self.frame_count = thread.frame_count if thread is not None else 0
+        raw_registers = (result.registers(thread) if thread is not None else None) or {}
+        self.registers: Dict[str, int] = {}
+        for name, value in raw_registers.items():
+            number = _parse_address(value)
+            if number is not None:
+                self.registers[name] = number
+
+    def hex(self, value: int) -> str:
+        return f"0x{value:0{self.width}x}"
+
+    @property
+    def access_fault(self) -> bool:
+        return bool(_ACCESS_FAULTS.search(self.crash_type))
+
+
+def _access_kind(crash_type: str) -> str:
+    if crash_type.endswith("_READ"):
+        return "Read of"
+    if crash_type.endswith("_WRITE"):
+        return "Write to"
+    if crash_type.endswith("_EXEC"):
+        return "Execution at"
+    return "Access to"
+
+
+def _null_dereference(facts: _Facts) -> Optional[Finding]:
+    if not facts.access_fault or facts.address is None or facts.address >= NULL_PAGE_LIMIT:
+        return None
+    summary = f"{_access_kind(facts.crash_type)} {facts.hex(facts.address)}"
+    if facts.address == 0:
+        summary += ", a NULL pointer"
+    else:
+        summary += f", {facts.address:#x} bytes past NULL (field or element of a NULL pointer)"
+    if facts.crash_type.endswith("_EXEC"):
+        summary += "; likely a call through a NULL function pointer or vtable"
+    evidence = [f"crash type {facts.crash_type}", f"fault address {facts.hex(facts.address)} < {NULL_PAGE_LIMIT:#x}"]
+    holders = [name for name, value in facts.registers.items() if value == facts.address]
+    if holders:
+        evidence.append(f"held in {', '.join(holders)}")
+    return Finding("null_dereference", "high", summary, tuple(evidence))
+
+
+def _recursion(facts: _Facts) -> Optional[Tuple[str, int]]:
+    """Most repeated frame among the scanned frames, if it repeats enough to be recursion."""
+    if not facts.frames:
+        return None
+    label, repeats = Counter(map(_frame_label, facts.frames)).most_common(1)[0]
+    return (label, repeats) if repeats >= _RECURSION_REPEATS else None
+
+
+def _stack_overflow(facts: _Facts) -> Optional[Finding]:
+    evidence: List[str] = []
+    explicit = "STACK_OVERFLOW" in facts.crash_type
+    if explicit:
+        evidence.append(f"crash type {facts.crash_type}")
+
+    guard_hit = False
+    stack_pointer = next((facts.registers[name] for name in _STACK_POINTERS if name in facts.registers), None)
+    if facts.access_fault and facts.address is not None and stack_pointer is not None:
+        if stack_pointer - _GUARD_DISTANCE <= facts.address <= stack_pointer + _PAGE_SIZE:
+            guard_hit = True
+            evidence.append(
+                f"fault address {facts.hex(facts.address)} is next to the stack pointer {facts.hex(stack_pointer)}"
+            )
+
+    recursion = _recursion(facts)
+    if recursion is not None:
+        label, repeats = recursion
+        evidence.append(f"{label} appears {repeats} times in the top {len(facts.frames)} frames")
+    deep = facts.frame_count >= _DEEP_STACK
+    if deep:
+        evidence.append(f"crashing thread has {facts.frame_count} frames")
+
+    if explicit or (guard_hit and (recursion is not None or deep)):
+        confidence = "high"
+    elif guard_hit or (recursion is not None and deep):
+        confidence = "medium"
+    else:
+        return None
+    summary = "Stack overflow"
+    if recursion is not None:
+        summary += f", likely unbounded recursion through {recursion[0]}"
+    return Finding("stack_overflow", confidence, summary, tuple(evidence))
+
+
+def _termination(facts: _Facts) -> Optional[Finding]:
+    if facts.assertion:
+        return Finding(
+            "assertion_failure", "high", f"Assertion failed: {facts.assertion}", ("crash_info.assertion is set",)
+        )
+    names = [normalize_function(frame.function) if frame.function else None for frame in facts.frames]
+    # Patterns are tried in order so that e.g. a panic wins over the abort it ends in
+    for pattern, kind, meaning in _TERMINATION_FRAMES:
+        for position, name in enumerate(names):
+            if name is None or not pattern.match(name):
+                continue
+            # The first frame a signature would keep is the code that gave up
+            cause = next(
+                (label for label in map(_SIGNATURES.frame_label, facts.frames[position + 1 :]) if label is not None),
+                None,
+            )
+            summary = f"Deliberate termination: {meaning}"
+            if cause is not None:
+                summary += f", raised from {cause}"
+            return Finding(kind, "high", summary, (f"frame {position} is {name}",))
+    for type_pattern, kind, meaning in _TERMINATION_TYPES:
+        if type_pattern.search(facts.crash_type):
+            return Finding(kind, "medium", f"Deliberate termination: {meaning}", (f"crash type {facts.crash_type}",))
+    return None
+
+
+def _poison(value: int) -> Optional[Tuple[int, str, str]]:
+    """Fill pattern *value* points into, as ``(pattern, kind, meaning)``."""
+    for pattern, kind, meaning in _POISON_VALUES:
+        for filled in (pattern, pattern | pattern << 32):
+            if abs(value - filled) < _POISON_SLACK:
+                return filled, kind, meaning
+    return None
+
+
+def _describe_poison(facts: _Facts, value: int, filled: int) -> str:
+    delta = value - filled
+    if delta == 0:
+        return facts.hex(value)
+    return f"{facts.hex(value)} = {facts.hex(filled)} {'+' if delta > 0 else '-'} {abs(delta):#x}"
+
+
+def _poisoned_memory(facts: _Facts) -> List[Finding]:
+    meanings: Dict[str, str] = {}
+    evidence: Dict[str, List[str]] = {}
+    in_address: Set[str] = set()
+    sources: List[Tuple[str, int]] = [("fault address", facts.address)] if facts.address is not None else []
+    sources.extend(facts.registers.items())
+    for name, value in sources:
+        match = _poison(value)
+        if match is None:
+            continue
+        filled, kind, meaning = match
+        meanings.setdefault(kind, meaning)
+        evidence.setdefault(kind, []).append(f"{name} = {_describe_poison(facts, value, filled)}")
+        if name == "fault address":
+            in_address.add(kind)
+
+    findings = []
+    for kind, meaning in meanings.items():
+        what = "freed memory" if kind == "use_after_free" else "uninitialized memory"
+        confidence = "high" if kind in in_address else "medium"
+        summary = f"Pointer taken from {what} ({meaning})"
+        findings.append(Finding(kind, confidence, summary, tuple(evidence[kind])))
+    return findings
+
+
+def classify(result: StackwalkResult) -> List[Finding]:
+    """Recognize common crash patterns in a stackwalk result.
+
+    Only ``crash_info`` and the top frames and registers of the crashing thread are
+    read, so a model built with :func:`~minidumpmcp.analysis.signature.crash_model`
+    suffices.
+
+    Returns:
+        Findings, most specific first; empty when no pattern matches
+    """
+    facts = _Facts(result)
+    findings: List[Finding] = []
+    for check in (_stack_overflow, _termination, _null_dereference):
+        finding = check(facts)
+        if finding is not None:
+            findings.append(finding)
+    findings.extend(_poisoned_memory(facts))
+    return findings
+
+
+def format_findings(findings: Sequence[Finding]) -> str:
+    """Render findings as a compact Markdown block for the analysis prompts."""
+    lines = [
+        "## Findings",
+        "",
+        "Deterministic pre-analysis of the crashing thread. Verify each finding against the data before relying on it.",
+        "",
+    ]
+    if not findings:
+        lines.append("- No known crash pattern matched; analyze the data from scratch.")
+    for finding in findings:
+        lines.append(f"- **{finding.kind}** ({finding.confidence}): {finding.summary}")
+        if finding.evidence:
+            lines.append(f"  - Evidence: {'; '.join(finding.evidence)}")
+    return "\n".join(lines)
@@ -0,0 +1,118 @@
+"""Detection and streaming decompression of compressed minidumps.
+
+Crash reporters commonly ship dumps as ``.dmp.gz``, ``.zip`` or ``.xz``.  The
+format is recognized from the first bytes of the file, not its name, and the
+dump is decompressed chunk by chunk into a file next to where it is needed
+(so it can be renamed into place) while being hashed, keeping memory use
+bounded by the chunk size whatever the size of the dump.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import lzma
+import zipfile
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Dict, Optional, Tuple, Union
+
+from minidumpmcp.exceptions import FileValidationError
+
+MINIDUMP_MAGIC = b"MDMP"
+
+COMPRESSION_MAGIC: Dict[str, bytes] = {
+    "gzip": b"\x1f\x8b",
+    "zip": b"PK\x03\x04",
+    "xz": b"\xfd7zXZ\x00",
+}
+
+# Bytes needed to tell every supported format apart
+MAGIC_SIZE = max(len(magic) for magic in (MINIDUMP_MAGIC, *COMPRESSION_MAGIC.values()))
+
+_CHUNK_SIZE = 1024 * 1024
+
+_ZIP_MEMBER_SUFFIXES = (".dmp", ".mdmp")
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """Return the compression format whose magic bytes *head* starts with, if any."""
+    for name, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def file_compression(path: Path) -> Optional[str]:
+    """Return the compression format of the file at *path*, or ``None`` for plain files."""
+    with open(path, "rb") as f:
+        return detect_compression(f.read(MAGIC_SIZE))
+
+
+def _zip_member(archive: zipfile.ZipFile, path: Path) -> zipfile.ZipInfo:
+    """Pick the minidump of an archive: its only file, or its only ``.dmp``/``.mdmp`` file."""
+    files = [info for info in archive.infolist() if not info.is_dir()]
+    if len(files) != 1:
+        files = [info for info in files if info.filename.lower().endswith(_ZIP_MEMBER_SUFFIXES)]
+    if len(files) != 1:
+        raise FileValidationError(path, "Zip archive must contain exactly one minidump")
+    return files[0]
+
+
+def _open(stack: ExitStack, path: Path, compression: str) -> Union[io.BufferedIOBase, IO[bytes]]:
+    if compression == "gzip":
+        return stack.enter_context(gzip.open(path, "rb"))
+    if compression == "xz":
+        return stack.enter_context(lzma.open(path, "rb"))
+    if compression == "zip":
+        archive = stack.enter_context(zipfile.ZipFile(path))
+        return stack.enter_context(archive.open(_zip_member(archive, path)))
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def decompress_file(
+    path: Path, compression: str, target: Path, chunk_size: int = _CHUNK_SIZE, max_bytes: Optional[int] = None
+) -> Tuple[str, int]:
+    """Decompress *path* into *target*, hashing the decompressed data on the way.
+
+    Blocking; run on a worker thread from async code.
+
+    Args:
+        path: Compressed dump
+        compression: Format returned by :func:`file_compression`
+        target: File receiving the decompressed dump
+        chunk_size: Number of decompressed bytes held in memory at once
+        max_bytes: Size the decompressed dump may not exceed, so that a decompression
+                   bomb cannot fill the disk; unlimited when omitted
+
+    Returns:
+        SHA-256 hex digest and size of the decompressed dump
+
+    Raises:
+        FileValidationError: If the archive is corrupt, encrypted, too large once decompressed
+                             or does not hold a minidump
+        OSError: If a file cannot be read or written
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with ExitStack() as stack:
+            source = _open(stack, path, compression)
+            with open(target, "wb") as out:
+                while chunk := source.read(chunk_size):
+                    if size == 0 and not chunk.startswith(MINIDUMP_MAGIC):
+                        raise FileValidationError(path, f"Decompressed {compression} data is not a minidump")
+                    if max_bytes is not None and size + len(chunk) > max_bytes:
+                        raise FileValidationError(path, f"Decompressed {compression} data exceeds {max_bytes} bytes")
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+    except (zipfile.BadZipFile, gzip.BadGzipFile, lzma.LZMAError, EOFError) as e:
+        raise FileValidationError(path, f"Corrupt {compression} data: {e}") from e
+    except (RuntimeError, NotImplementedError) as e:
+        # zipfile's errors for encrypted members and compression methods it cannot decompress (e.g. deflate64)
+        raise FileValidationError(path, f"Unsupported {compression} data: {e}") from e
+    if size == 0:
+        raise FileValidationError(path, f"Decompressed {compression} data is empty")
+    return digest.hexdigest(), size
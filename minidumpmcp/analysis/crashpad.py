@@ -0,0 +1,246 @@
+"""Incremental reader for Crashpad crash report databases.
+
+A Crashpad database keeps one ``<uuid>.dmp`` per report, moving it from
+``new/`` (still being written) to ``pending/`` (awaiting upload) and
+``completed/``; the generic (Linux, Android, Fuchsia) implementation stores
+upload state next to it in ``<uuid>.meta``.
+
+:class:`CrashpadIndex` remembers every report it has seen in SQLite together
+with the modification time of each report directory.  A rescan skips
+directories whose mtime is unchanged and otherwise only lists file names,
+so only reports that appeared since the previous scan are ever opened.
+Reports are handed out until they are marked processed, which keeps ingestion
+resumable when a run is interrupted.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+# Directories holding complete reports; ``new/`` only holds reports being written.
+REPORT_STATES = ("pending", "completed")
+
+# ReportMetadata of crash_report_database_generic.cc, followed by the remote report id
+_METADATA = struct.Struct("<iiqqB7x")
+_METADATA_VERSION = 1
+_ATTRIBUTE_UPLOADED = 1
+_ATTRIBUTE_UPLOAD_EXPLICITLY_REQUESTED = 2
+
+# Directory mtimes this close to the scan time are not trusted, because a report
+# written in the same timestamp tick would not change them again.
+_MTIME_SLACK_NS = 2_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crashpad_directories (
+    database TEXT NOT NULL,
+    state TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (database, state)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS crashpad_reports (
+    database TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    state TEXT NOT NULL,
+    discovered_at REAL NOT NULL,
+    processed_at REAL,
+    dump_hash TEXT,
+    error TEXT,
+    PRIMARY KEY (database, uuid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS crashpad_reports_unprocessed ON crashpad_reports (database, discovered_at)
+    WHERE processed_at IS NULL;
+"""
+
+
+class CrashpadReport(NamedTuple):
+    """A report of a Crashpad database."""
+
+    uuid: str
+    state: str
+    path: Path
+
+
+def _isoformat(timestamp: int) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp > 0 else None
+
+
+def read_report_metadata(dump_path: Path) -> Optional[Dict[str, Any]]:
+    """Read the ``.meta`` file next to a report, if there is a readable one."""
+    try:
+        data = dump_path.with_suffix(".meta").read_bytes()
+    except OSError:
+        return None
+    if len(data) < _METADATA.size:
+        return None
+    version, upload_attempts, last_attempt, created, attributes = _METADATA.unpack_from(data)
+    if version != _METADATA_VERSION:
+        return None
+    return {
+        "created": _isoformat(created),
+        "upload_attempts": upload_attempts,
+        "last_upload_attempt": _isoformat(last_attempt),
+        "uploaded": bool(attributes & _ATTRIBUTE_UPLOADED),
+        "upload_explicitly_requested": bool(attributes & _ATTRIBUTE_UPLOAD_EXPLICITLY_REQUESTED),
+        "remote_id": data[_METADATA.size :].decode("utf-8", errors="replace") or None,
+    }
+
+
+class CrashpadIndex:
+    """SQLite-backed record of the reports seen in Crashpad databases."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Open (and create if needed) the state database.
+
+        Args:
+            path: Database file, or ``":memory:"`` for a private in-memory index
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def scan(self, database: Path) -> int:
+        """Record the reports added to *database* since the previous scan.
+
+        Reports that moved between directories (e.g. after upload) keep their
+        processing state.
+
+        Returns:
+            Number of newly discovered reports
+        """
+        key = str(database.absolute())
+        now_ns = time.time_ns()
+        listings: Dict[str, List[str]] = {}
+        mtimes: Dict[str, int] = {}
+        with self._lock:
+            known_mtimes = {
+                row["state"]: row["mtime_ns"]
+                for row in self._db.execute(
+                    "SELECT state, mtime_ns FROM crashpad_directories WHERE database = ?", (key,)
+                )
+            }
+        for state in REPORT_STATES:
+            directory = database / state
+            try:
+                mtime_ns = directory.stat().st_mtime_ns
+            except OSError:
+                continue
+            if known_mtimes.get(state) == mtime_ns:
+                continue
+            with os.scandir(directory) as entries:
+                listings[state] = [entry.name[:-4] for entry in entries if entry.name.endswith(".dmp")]
+            mtimes[state] = mtime_ns if now_ns - mtime_ns > _MTIME_SLACK_NS else 0
+
+        if not listings:
+            return 0
+
+        discovered = 0
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for state, uuids in listings.items():
+                    for start in range(0, len(uuids), 500):
+                        chunk = uuids[start : start + 500]
+                        known = {
+                            row["uuid"]: row["state"]
+                            for row in self._db.execute(
+                                "SELECT uuid, state FROM crashpad_reports WHERE database = ? "
+                                f"AND uuid IN ({', '.join('?' for _ in chunk)})",
+                                [key, *chunk],
+                            )
+                        }
+                        new = [uuid for uuid in chunk if uuid not in known]
+                        moved = [uuid for uuid in chunk if uuid in known and known[uuid] != state]
+                        self._db.executemany(
+                            "INSERT INTO crashpad_reports (database, uuid, state, discovered_at) VALUES (?, ?, ?, ?)",
+                            [(key, uuid, state, now_ns / 1e9) for uuid in new],
+                        )
+                        self._db.executemany(
+                            "UPDATE crashpad_reports SET state = ? WHERE database = ? AND uuid = ?",
+                            [(state, key, uuid) for uuid in moved],
+                        )
+                        discovered += len(new)
+                    self._db.execute(
+                        "INSERT INTO crashpad_directories (database, state, mtime_ns) VALUES (?, ?, ?) "
+                        "ON CONFLICT (database, state) DO UPDATE SET mtime_ns = excluded.mtime_ns",
+                        (key, state, mtimes[state]),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return discovered
+
+    def unprocessed(self, database: Path, limit: Optional[int] = None) -> List[CrashpadReport]:
+        """Return the reports of *database* not marked processed yet, oldest first."""
+        key = str(database.absolute())
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT uuid, state FROM crashpad_reports WHERE database = ? AND processed_at IS NULL "
+                "ORDER BY discovered_at, uuid LIMIT ?",
+                (key, -1 if limit is None else limit),
+            ).fetchall()
+        return [
+            CrashpadReport(row["uuid"], row["state"], database / row["state"] / f"{row['uuid']}.dmp") for row in rows
+        ]
+
+    def pending_count(self, database: Path) -> int:
+        """Number of reports of *database* not marked processed yet."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT count(*) FROM crashpad_reports WHERE database = ? AND processed_at IS NULL",
+                (str(database.absolute()),),
+            ).fetchone()
+        return int(row[0])
+
+    def mark_processed(
+        self, database: Path, uuid: str, dump_hash: Optional[str] = None, error: Optional[str] = None
+    ) -> None:
+        """Mark a report processed so it is not handed out again.
+
+        Args:
+            database: Crashpad database of the report
+            uuid: Report id
+            dump_hash: SHA-256 of the report's minidump
+            error: Why the report could not be processed, if it failed
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE crashpad_reports SET processed_at = ?, dump_hash = ?, error = ? "
+                "WHERE database = ? AND uuid = ?",
+                (time.time(), dump_hash, error, str(database.absolute()), uuid),
+            )
+
+    def reset(self, database: Path) -> None:
+        """Forget everything recorded about *database*, so the next scan starts over."""
+        key = str(database.absolute())
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("DELETE FROM crashpad_reports WHERE database = ?", (key,))
+                self._db.execute("DELETE FROM crashpad_directories WHERE database = ?", (key,))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
@@ -0,0 +1,593 @@
+"""Fast pure-Python reader for minidump metadata.
+
+``minidump-stackwalk`` walks every thread's stack and loads symbols, which is
+what a full analysis needs but far more than triage does.  This reader maps
+the file and decodes only the fixed-size records of the header, the stream
+directory and the system info, exception, misc info, thread list and module
+list streams, so the crash reason, platform and main module of a dump are
+available in well under a millisecond.
+
+Captured process memory (the MemoryList and Memory64List streams) is indexed
+by start address on first use, so reading the bytes at a virtual address is a
+binary search followed by a zero-copy slice of the mapping.
+
+Field names follow the stackwalk JSON output where an equivalent exists.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import uuid
+from bisect import bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from minidumpmcp.exceptions import FileValidationError
+
+MINIDUMP_SIGNATURE = b"MDMP"
+
+# Stream types (MINIDUMP_STREAM_TYPE and the Breakpad/Crashpad extensions)
+THREAD_LIST_STREAM = 3
+MODULE_LIST_STREAM = 4
+MEMORY_LIST_STREAM = 5
+EXCEPTION_STREAM = 6
+SYSTEM_INFO_STREAM = 7
+MEMORY64_LIST_STREAM = 9
+MISC_INFO_STREAM = 15
+BREAKPAD_INFO_STREAM = 0x47670001
+CRASHPAD_INFO_STREAM = 0x43500001
+
+STREAM_NAMES = {
+    3: "ThreadList",
+    4: "ModuleList",
+    5: "MemoryList",
+    6: "Exception",
+    7: "SystemInfo",
+    8: "ThreadExList",
+    9: "Memory64List",
+    10: "CommentA",
+    11: "CommentW",
+    12: "HandleData",
+    13: "FunctionTable",
+    14: "UnloadedModuleList",
+    15: "MiscInfo",
+    16: "MemoryInfoList",
+    17: "ThreadInfoList",
+    18: "HandleOperationList",
+    21: "SystemMemoryInfo",
+    22: "ProcessVmCounters",
+    0x47670001: "BreakpadInfo",
+    0x47670002: "AssertionInfo",
+    0x47670003: "LinuxCpuInfo",
+    0x47670004: "LinuxProcStatus",
+    0x47670005: "LinuxLsbRelease",
+    0x47670006: "LinuxCmdLine",
+    0x47670007: "LinuxEnviron",
+    0x47670008: "LinuxAuxv",
+    0x47670009: "LinuxMaps",
+    0x4767000A: "LinuxDsoDebug",
+    0x43500001: "CrashpadInfo",
+}
+
+_CPU_ARCHS = {0: "x86", 5: "arm", 6: "ia64", 9: "amd64", 12: "arm64", 0x8001: "sparc", 0x8002: "ppc64", 0x8003: "arm64"}
+
+# Architectures whose addresses are printed with 8 hex digits
+_NARROW_ARCHS = {"x86", "arm", "sparc"}
+
+_WINDOWS_PLATFORMS = {"Windows 3.1", "Windows 95", "Windows NT"}
+
+_PLATFORMS = {
+    0: "Windows 3.1",
+    1: "Windows 95",
+    2: "Windows NT",
+    0x8000: "Unix",
+    0x8101: "Mac OS X",
+    0x8102: "iOS",
+    0x8201: "Linux",
+    0x8202: "Solaris",
+    0x8203: "Android",
+    0x8204: "PS3",
+    0x8205: "NaCl",
+    0x8206: "Fuchsia",
+}
+
+_WINDOWS_EXCEPTIONS = {
+    0x80000003: "EXCEPTION_BREAKPOINT",
+    0x80000004: "EXCEPTION_SINGLE_STEP",
+    0xC0000005: "EXCEPTION_ACCESS_VIOLATION",
+    0xC0000006: "EXCEPTION_IN_PAGE_ERROR",
+    0xC000001D: "EXCEPTION_ILLEGAL_INSTRUCTION",
+    0xC0000025: "EXCEPTION_NONCONTINUABLE_EXCEPTION",
+    0xC000008C: "EXCEPTION_ARRAY_BOUNDS_EXCEEDED",
+    0xC000008E: "EXCEPTION_FLT_DIVIDE_BY_ZERO",
+    0xC0000094: "EXCEPTION_INT_DIVIDE_BY_ZERO",
+    0xC0000095: "EXCEPTION_INT_OVERFLOW",
+    0xC0000096: "EXCEPTION_PRIV_INSTRUCTION",
+    0xC00000FD: "EXCEPTION_STACK_OVERFLOW",
+    0xC0000374: "STATUS_HEAP_CORRUPTION",
+    0xC0000409: "STATUS_STACK_BUFFER_OVERRUN",
+    0xC0000420: "STATUS_ASSERTION_FAILURE",
+    0xE06D7363: "Unhandled C++ Exception",
+}
+
+_ACCESS_VIOLATION_KINDS = {0: "_READ", 1: "_WRITE", 8: "_EXEC"}
+
+# Windows exceptions whose second parameter is the faulting data address
+_FAULT_ADDRESS_EXCEPTIONS = {0xC0000005, 0xC0000006}
+
+_POSIX_SIGNALS = {
+    4: "SIGILL",
+    5: "SIGTRAP",
+    6: "SIGABRT",
+    7: "SIGBUS",
+    8: "SIGFPE",
+    9: "SIGKILL",
+    11: "SIGSEGV",
+    13: "SIGPIPE",
+    15: "SIGTERM",
+    31: "SIGSYS",
+}
+
+_MAC_EXCEPTIONS = {
+    1: "EXC_BAD_ACCESS",
+    2: "EXC_BAD_INSTRUCTION",
+    3: "EXC_ARITHMETIC",
+    4: "EXC_EMULATION",
+    5: "EXC_SOFTWARE",
+    6: "EXC_BREAKPOINT",
+    10: "EXC_CRASH",
+    11: "EXC_RESOURCE",
+    12: "EXC_GUARD",
+}
+
+_HEADER = struct.Struct("<4sIIIIIQ")
+_DIRECTORY_ENTRY = struct.Struct("<III")
+_SYSTEM_INFO = struct.Struct("<HHHBBIIIIIHH")
+_EXCEPTION = struct.Struct("<IIIIQQII")
+_MODULE = struct.Struct("<QIIII52sIIIIQQ")
+_THREAD = struct.Struct("<IIIIQQIIII")
+_LOCATION = struct.Struct("<II")
+_MEMORY_DESCRIPTOR = struct.Struct("<QII")
+_MEMORY64_LIST = struct.Struct("<QQ")
+_MEMORY64_DESCRIPTOR = struct.Struct("<QQ")
+_CRASHPAD_INFO = struct.Struct("<I16s16sIIII")
+_CRASHPAD_MODULE_LINK = struct.Struct("<III")
+_ANNOTATION = struct.Struct("<IHHI")
+
+# MinidumpAnnotation type of plain string annotations
+_ANNOTATION_STRING = 1
+
+
+def exception_name(os_name: Optional[str], code: int, information: Tuple[int, ...] = ()) -> str:
+    """Human-readable name of an exception code, in the style of minidump-stackwalk."""
+    if os_name in ("Linux", "Android", "Solaris", "Unix", "Fuchsia"):
+        return _POSIX_SIGNALS.get(code, f"0x{code:08x}")
+    if os_name in ("Mac OS X", "iOS"):
+        return _MAC_EXCEPTIONS.get(code, f"0x{code:08x}")
+    name = _WINDOWS_EXCEPTIONS.get(code)
+    if name is None:
+        return f"0x{code:08x}"
+    if code == 0xC0000005 and information:
+        name += _ACCESS_VIOLATION_KINDS.get(information[0], "")
+    return name
+
+
+class MemoryRegion(NamedTuple):
+    """A range of process memory captured in the dump."""
+
+    start: int
+    size: int
+    rva: int
+
+    @property
+    def end(self) -> int:
+        """First address past the region."""
+        return self.start + self.size
+
+    def __contains__(self, address: object) -> bool:
+        return isinstance(address, int) and self.start <= address < self.end
+
+
+class MinidumpReader:
+    """Memory-mapped reader over the streams of a minidump file.
+
+    Use as a context manager; the file stays mapped until the reader is closed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Map *path* and read its header and stream directory.
+
+        Raises:
+            FileValidationError: If the file cannot be read or is not a minidump
+        """
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            # mmap raises ValueError for empty files
+            raise FileValidationError(path, f"Invalid format: cannot map file ({e})") from e
+
+        if len(self._data) < _HEADER.size or self._data[:4] != MINIDUMP_SIGNATURE:
+            self.close()
+            raise FileValidationError(path, "Invalid format: missing MDMP signature")
+
+        _, version, stream_count, directory_rva, _, timestamp, flags = _HEADER.unpack_from(self._data, 0)
+        self.version = version & 0xFFFF
+        self.timestamp = timestamp
+        self.flags = flags
+        self.streams: Dict[int, Tuple[int, int]] = {}
+        for index in range(stream_count):
+            offset = directory_rva + index * _DIRECTORY_ENTRY.size
+            if offset + _DIRECTORY_ENTRY.size > len(self._data):
+                break
+            stream_type, size, rva = _DIRECTORY_ENTRY.unpack_from(self._data, offset)
+            # The first stream of a type wins, like in minidump-stackwalk
+            if stream_type and stream_type not in self.streams:
+                self.streams[stream_type] = (rva, size)
+        self._regions: Optional[List[MemoryRegion]] = None
+        self._region_starts: List[int] = []
+
+    def __enter__(self) -> MinidumpReader:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file.
+
+        Raises:
+            BufferError: If a view returned by :meth:`memory` has not been released
+        """
+        self._data.close()
+
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes."""
+        return len(self._data)
+
+    def stream(self, stream_type: int) -> Optional[bytes]:
+        """Raw bytes of a stream, or ``None`` if absent or out of bounds."""
+        location = self.streams.get(stream_type)
+        if location is None:
+            return None
+        rva, size = location
+        if rva + size > len(self._data):
+            return None
+        return self._data[rva : rva + size]
+
+    def read(self, rva: int, size: int) -> bytes:
+        """Read *size* bytes at *rva*, truncated at the end of the file."""
+        return self._data[rva : rva + size]
+
+    def string(self, rva: int) -> Optional[str]:
+        """Decode the ``MINIDUMP_STRING`` at *rva*."""
+        if not rva or rva + 4 > len(self._data):
+            return None
+        (length,) = struct.unpack_from("<I", self._data, rva)
+        return self._data[rva + 4 : rva + 4 + length].decode("utf-16-le", errors="replace")
+
+    def utf8_string(self, rva: int) -> Optional[str]:
+        """Decode the ``MinidumpUTF8String`` (or ``MinidumpByteArray``) at *rva*."""
+        if not rva or rva + 4 > len(self._data):
+            return None
+        (length,) = struct.unpack_from("<I", self._data, rva)
+        return self._data[rva + 4 : rva + 4 + length].decode("utf-8", errors="replace")
+
+    def _location(self, size: int, rva: int) -> Optional[bytes]:
+        if not rva or not size or rva + size > len(self._data):
+            return None
+        return self._data[rva : rva + size]
+
+    def _dictionary(self, size: int, rva: int) -> Dict[str, str]:
+        """Decode a ``MinidumpSimpleStringDictionary``."""
+        data = self._location(size, rva)
+        if data is None or len(data) < 4:
+            return {}
+        (count,) = struct.unpack_from("<I", data)
+        result = {}
+        for index in range(min(count, (len(data) - 4) // _LOCATION.size)):
+            key_rva, value_rva = _LOCATION.unpack_from(data, 4 + index * _LOCATION.size)
+            key = self.utf8_string(key_rva)
+            if key is not None:
+                result[key] = self.utf8_string(value_rva) or ""
+        return result
+
+    def _string_list(self, size: int, rva: int) -> List[str]:
+        """Decode a ``MinidumpRVAList`` of UTF-8 strings."""
+        data = self._location(size, rva)
+        if data is None or len(data) < 4:
+            return []
+        (count,) = struct.unpack_from("<I", data)
+        count = min(count, (len(data) - 4) // 4)
+        return [self.utf8_string(item) or "" for item in struct.unpack_from(f"<{count}I", data, 4)]
+
+    def _annotation_objects(self, size: int, rva: int) -> Dict[str, str]:
+        """Decode a ``MinidumpAnnotationList``; non-string values are hex encoded."""
+        data = self._location(size, rva)
+        if data is None or len(data) < 4:
+            return {}
+        (count,) = struct.unpack_from("<I", data)
+        result = {}
+        for index in range(min(count, (len(data) - 4) // _ANNOTATION.size)):
+            name_rva, kind, _, value_rva = _ANNOTATION.unpack_from(data, 4 + index * _ANNOTATION.size)
+            name = self.utf8_string(name_rva)
+            if name is None:
+                continue
+            if kind == _ANNOTATION_STRING:
+                result[name] = self.utf8_string(value_rva) or ""
+            elif value_rva and value_rva + 4 <= len(self._data):
+                (length,) = struct.unpack_from("<I", self._data, value_rva)
+                result[name] = self._data[value_rva + 4 : value_rva + 4 + length].hex()
+        return result
+
+    # ---------------------------------------------------------------- streams
+
+    def memory_regions(self) -> List[MemoryRegion]:
+        """Captured memory ranges sorted by start address.
+
+        Descriptors whose data lies past the end of the file are truncated to what is present.
+        """
+        if self._regions is not None:
+            return self._regions
+        regions = []
+        data = self.stream(MEMORY_LIST_STREAM)
+        if data is not None and len(data) >= 4:
+            (count,) = struct.unpack_from("<I", data)
+            count = min(count, (len(data) - 4) // _MEMORY_DESCRIPTOR.size)
+            for index in range(count):
+                start, size, rva = _MEMORY_DESCRIPTOR.unpack_from(data, 4 + index * _MEMORY_DESCRIPTOR.size)
+                regions.append(MemoryRegion(start, size, rva))
+        data = self.stream(MEMORY64_LIST_STREAM)
+        if data is not None and len(data) >= _MEMORY64_LIST.size:
+            # Full-memory dumps store the ranges back to back from a single base RVA
+            count, rva = _MEMORY64_LIST.unpack_from(data)
+            count = min(count, (len(data) - _MEMORY64_LIST.size) // _MEMORY64_DESCRIPTOR.size)
+            for index in range(count):
+                start, size = _MEMORY64_DESCRIPTOR.unpack_from(data, _MEMORY64_LIST.size + index * 16)
+                regions.append(MemoryRegion(start, size, rva))
+                rva += size
+        file_size = len(self._data)
+        self._regions = sorted(
+            MemoryRegion(region.start, min(region.size, file_size - region.rva), region.rva)
+            for region in regions
+            if region.size and region.rva < file_size
+        )
+        self._region_starts = [region.start for region in self._regions]
+        return self._regions
+
+    def find_region(self, address: int) -> Optional[MemoryRegion]:
+        """The captured region containing *address*, if any."""
+        regions = self.memory_regions()
+        index = bisect_right(self._region_starts, address) - 1
+        if index >= 0 and address in regions[index]:
+            return regions[index]
+        return None
+
+    def memory(self, address: int, size: int) -> Optional[memoryview]:
+        """Zero-copy view of up to *size* captured bytes starting at *address*.
+
+        The view ends early at the end of the containing region. Release it (or use it
+        as a context manager) before closing the reader.
+
+        Returns:
+            The bytes, or ``None`` if *address* was not captured
+        """
+        region = self.find_region(address)
+        if region is None:
+            return None
+        offset = region.rva + address - region.start
+        end = region.rva + min(address + size, region.end) - region.start
+        with memoryview(self._data) as view:
+            return view[offset:end]
+
+    def system_info(self) -> Optional[Dict[str, Any]]:
+        """Decode the system info stream."""
+        data = self.stream(SYSTEM_INFO_STREAM)
+        if data is None or len(data) < _SYSTEM_INFO.size:
+            return None
+        arch, _, _, cpu_count, _, major, minor, build, platform, csd_rva, _, _ = _SYSTEM_INFO.unpack_from(data)
+        os_ver = f"{major}.{minor}.{build}"
+        csd = self.string(csd_rva)
+        if csd:
+            os_ver = f"{os_ver} {csd}"
+        return {
+            "os": _PLATFORMS.get(platform, f"0x{platform:x}"),
+            "os_ver": os_ver,
+            "cpu_arch": _CPU_ARCHS.get(arch, f"0x{arch:x}"),
+            "cpu_count": cpu_count,
+        }
+
+    def crash_info(self, system_info: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Decode the exception stream.
+
+        Args:
+            system_info: Result of :meth:`system_info`, used to name the exception and format addresses
+        """
+        data = self.stream(EXCEPTION_STREAM)
+        if data is None or len(data) < _EXCEPTION.size:
+            return None
+        thread_id, _, code, _, _, address, parameter_count, _ = _EXCEPTION.unpack_from(data)
+        parameter_count = min(parameter_count, 15, (len(data) - _EXCEPTION.size) // 8)
+        information = struct.unpack_from(f"<{parameter_count}Q", data, _EXCEPTION.size)
+        os_name = system_info["os"] if system_info else None
+        if os_name in _WINDOWS_PLATFORMS and code in _FAULT_ADDRESS_EXCEPTIONS and len(information) >= 2:
+            address = information[1]
+        return {
+            "type": exception_name(os_name, code, information),
+            "code": f"0x{code:08x}",
+            "address": self._address(address, system_info),
+            "crashing_thread_id": thread_id,
+        }
+
+    @staticmethod
+    def pointer_size(system_info: Optional[Dict[str, Any]]) -> int:
+        """Size in bytes of a pointer of the dumped process, from :meth:`system_info`."""
+        return 4 if system_info is not None and system_info["cpu_arch"] in _NARROW_ARCHS else 8
+
+    @staticmethod
+    def _address(value: int, system_info: Optional[Dict[str, Any]]) -> str:
+        if system_info is not None and system_info["cpu_arch"] in _NARROW_ARCHS:
+            return f"0x{value & 0xFFFFFFFF:08x}"
+        return f"0x{value:016x}"
+
+    def process_id(self) -> Optional[int]:
+        """Process id from the misc info stream."""
+        data = self.stream(MISC_INFO_STREAM)
+        if data is None or len(data) < 12:
+            return None
+        _, flags, pid = struct.unpack_from("<III", data)
+        return pid if flags & 1 else None
+
+    def thread_ids(self) -> List[int]:
+        """Ids of the threads in the thread list."""
+        data = self.stream(THREAD_LIST_STREAM)
+        if data is None or len(data) < 4:
+            return []
+        (count,) = struct.unpack_from("<I", data)
+        count = min(count, (len(data) - 4) // _THREAD.size)
+        return [_THREAD.unpack_from(data, 4 + index * _THREAD.size)[0] for index in range(count)]
+
+    def modules(self, system_info: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Decode the module list, in the order of the dump (main module first).
+
+        Args:
+            system_info: Result of :meth:`system_info`, used to format addresses
+        """
+        data = self.stream(MODULE_LIST_STREAM)
+        if data is None or len(data) < 4:
+            return []
+        (count,) = struct.unpack_from("<I", data)
+        count = min(count, (len(data) - 4) // _MODULE.size)
+        modules = []
+        for index in range(count):
+            base, size, _, timestamp, name_rva, version_info, cv_size, cv_rva, _, _, _, _ = _MODULE.unpack_from(
+                data, 4 + index * _MODULE.size
+            )
+            name = self.string(name_rva) or ""
+            debug_file, debug_id = self._codeview(cv_rva, cv_size)
+            modules.append(
+                {
+                    "base_addr": self._address(base, system_info),
+                    "size": size,
+                    "filename": name.replace("\\", "/").rsplit("/", 1)[-1],
+                    "path": name,
+                    "version": self._version(version_info),
+                    "code_id": f"{timestamp:08X}{size:x}",
+                    "debug_file": debug_file,
+                    "debug_id": debug_id,
+                }
+            )
+        return modules
+
+    def crashpad_info(self, modules: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """Decode the Crashpad info stream: report ids and annotations.
+
+        Args:
+            modules: Result of :meth:`modules`, used to name annotated modules
+        """
+        data = self.stream(CRASHPAD_INFO_STREAM)
+        if data is None or len(data) < _CRASHPAD_INFO.size:
+            return None
+        _, report_id, client_id, simple_size, simple_rva, modules_size, modules_rva = _CRASHPAD_INFO.unpack_from(data)
+        module_annotations = []
+        module_list = self._location(modules_size, modules_rva)
+        if module_list is not None and len(module_list) >= 4:
+            (count,) = struct.unpack_from("<I", module_list)
+            for index in range(min(count, (len(module_list) - 4) // _CRASHPAD_MODULE_LINK.size)):
+                module_index, size, rva = _CRASHPAD_MODULE_LINK.unpack_from(
+                    module_list, 4 + index * _CRASHPAD_MODULE_LINK.size
+                )
+                info = self._location(size, rva)
+                if info is None or len(info) < 20:
+                    continue
+                # version, list annotations, simple annotations, then annotation objects since version 1
+                locations = struct.unpack_from(f"<{min(len(info) - 4, 24) // 4}I", info, 4)
+                entry = {
+                    "module": modules[module_index]["filename"] if modules and module_index < len(modules) else None,
+                    "list_annotations": self._string_list(*locations[0:2]),
+                    "simple_annotations": self._dictionary(*locations[2:4]),
+                    "annotation_objects": self._annotation_objects(*locations[4:6]) if len(locations) >= 6 else {},
+                }
+                if entry["list_annotations"] or entry["simple_annotations"] or entry["annotation_objects"]:
+                    module_annotations.append(entry)
+        return {
+            "report_id": str(uuid.UUID(bytes_le=report_id)),
+            "client_id": str(uuid.UUID(bytes_le=client_id)),
+            "simple_annotations": self._dictionary(simple_size, simple_rva),
+            "module_annotations": module_annotations,
+        }
+
+    @staticmethod
+    def _version(version_info: bytes) -> Optional[str]:
+        signature, _, file_ms, file_ls = struct.unpack_from("<IIII", version_info)
+        if signature != 0xFEEF04BD:
+            return None
+        return f"{file_ms >> 16}.{file_ms & 0xFFFF}.{file_ls >> 16}.{file_ls & 0xFFFF}"
+
+    def _codeview(self, rva: int, size: int) -> Tuple[Optional[str], Optional[str]]:
+        """Debug file and Breakpad debug id from a CodeView record."""
+        record = self.read(rva, size) if rva and size else b""
+        if record[:4] == b"RSDS" and len(record) >= 24:
+            guid = uuid.UUID(bytes_le=record[4:20])
+            (age,) = struct.unpack_from("<I", record, 20)
+            name = record[24:].split(b"\0", 1)[0].decode("utf-8", errors="replace")
+            return name.replace("\\", "/").rsplit("/", 1)[-1] or None, f"{guid.hex.upper()}{age:X}"
+        if record[:4] == b"NB10" and len(record) >= 16:
+            timestamp, age = struct.unpack_from("<II", record, 8)
+            name = record[16:].split(b"\0", 1)[0].decode("utf-8", errors="replace")
+            return name or None, f"{timestamp:08X}{age:X}"
+        if record[:4] == b"BpEL" and len(record) >= 4:
+            # ELF build id
+            return None, record[4:].hex().upper() or None
+        return None, None
+
+    def summary(self, include_modules: bool = False) -> Dict[str, Any]:
+        """Collect the triage metadata of the dump.
+
+        Args:
+            include_modules: Whether to list every module instead of only the main one
+        """
+        system_info = self.system_info()
+        crash_info = self.crash_info(system_info)
+        thread_ids = self.thread_ids()
+        modules = self.modules(system_info)
+        if crash_info is not None:
+            crashing = crash_info["crashing_thread_id"]
+            crash_info["crashing_thread"] = thread_ids.index(crashing) if crashing in thread_ids else None
+
+        result: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat() if self.timestamp else None,
+            "size": self.size,
+            "streams": sorted(STREAM_NAMES.get(stream, f"0x{stream:x}") for stream in self.streams),
+            "system_info": system_info,
+            "crash_info": crash_info,
+            "pid": self.process_id(),
+            "thread_count": len(thread_ids),
+            "module_count": len(modules),
+            "main_module": modules[0] if modules else None,
+        }
+        if CRASHPAD_INFO_STREAM in self.streams:
+            result["crashpad_info"] = self.crashpad_info(modules)
+        if include_modules:
+            result["modules"] = modules
+        return result
+
+
+def read_minidump_info(path: Path, include_modules: bool = False) -> Dict[str, Any]:
+    """Read the triage metadata of the minidump at *path*.
+
+    Raises:
+        FileValidationError: If the file cannot be read or is not a minidump
+    """
+    with MinidumpReader(path) as reader:
+        return reader.summary(include_modules)
@@ -0,0 +1,487 @@
+"""Compact typed model of a stackwalk result.
+
+``json.loads`` on a large stackwalk result builds a dict per frame, which
+costs roughly ten times the size of the JSON text.  :class:`StackwalkResult`
+keeps the same information in a few flat structures instead:
+
+- frames of every thread are stored column-wise in :mod:`array` buffers
+  (module index, addresses, function/file ids, line, trust);
+- module, function and file names are interned in a :class:`StringTable`;
+- threads and modules are small ``__slots__`` records.
+
+Values that do not fit the columns (registers, inline frames, unusual
+fields) are kept in sparse per-frame dictionaries, so :meth:`StackwalkResult.to_dict`
+reproduces the original document.  Dicts are only materialized on request,
+typically right before a result leaves the server.
+"""
+
+from __future__ import annotations
+
+import json
+from array import array
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from .projection import iter_elements, iter_members, project_value
+
+# Trust values of the stackwalk JSON, in increasing order of confidence.
+TRUST_LEVELS = ("none", "scan", "cfi_scan", "frame_pointer", "cfi", "context", "prewalked", "inline")
+_TRUST_CODES = {name: code for code, name in enumerate(TRUST_LEVELS)}
+
+# Sentinel for missing addresses and lines in the columns.
+_NO_ADDRESS = 2**64 - 1
+_NO_LINE = -1
+_NO_STRING = -1
+
+_FRAME_KEYS = (
+    "frame",
+    "module",
+    "function",
+    "function_offset",
+    "file",
+    "line",
+    "offset",
+    "module_offset",
+    "missing_symbols",
+    "trust",
+)
+_MODULE_KEYS = ("base_addr", "end_addr", "filename", "version", "code_id", "debug_file", "debug_id")
+_MODULE_FLAGS = ("missing_symbols", "loaded_symbols", "corrupt_symbols")
+_THREAD_KEYS = ("thread_id", "thread_name", "frame_count", "frames")
+
+
+class StringTable:
+    """Interning table mapping strings to dense integer ids."""
+
+    __slots__ = ("_ids", "_strings")
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: Optional[str]) -> int:
+        """Return the id of *value*, adding it if needed (``-1`` for ``None``)."""
+        if value is None:
+            return _NO_STRING
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def lookup(self, value: str) -> Optional[int]:
+        """Return the id of *value* without adding it."""
+        return self._ids.get(value)
+
+    def get(self, string_id: int) -> Optional[str]:
+        """Return the string for *string_id* (``None`` for ``-1``)."""
+        return self._strings[string_id] if string_id >= 0 else None
+
+
+class Module:
+    """A loaded module of the crashed process."""
+
+    __slots__ = (
+        "base_addr",
+        "end_addr",
+        "filename",
+        "version",
+        "code_id",
+        "debug_file",
+        "debug_id",
+        "missing_symbols",
+        "loaded_symbols",
+        "corrupt_symbols",
+        "extra",
+    )
+
+    def __init__(self, data: Dict[str, Any], strings: StringTable) -> None:
+        """Build a module from its JSON object, interning its strings."""
+        self.base_addr: int = int(data["base_addr"], 16)
+        self.end_addr: int = int(data["end_addr"], 16)
+        self.filename: Optional[str] = strings.get(strings.intern(data.get("filename")))
+        self.version: Optional[str] = strings.get(strings.intern(data.get("version")))
+        self.code_id: Optional[str] = data.get("code_id")
+        self.debug_file: Optional[str] = strings.get(strings.intern(data.get("debug_file")))
+        self.debug_id: Optional[str] = data.get("debug_id")
+        self.missing_symbols: bool = bool(data.get("missing_symbols", False))
+        self.loaded_symbols: bool = bool(data.get("loaded_symbols", False))
+        self.corrupt_symbols: bool = bool(data.get("corrupt_symbols", False))
+        extra = {key: value for key, value in data.items() if key not in _MODULE_KEYS and key not in _MODULE_FLAGS}
+        self.extra: Optional[Dict[str, Any]] = extra or None
+
+    def contains(self, address: int) -> bool:
+        """Whether *address* falls inside the module's address range."""
+        return self.base_addr <= address < self.end_addr
+
+    def to_dict(self, width: int) -> Dict[str, Any]:
+        """Materialize the module in the JSON output format."""
+        result: Dict[str, Any] = {
+            "base_addr": _hex(self.base_addr, width),
+            "end_addr": _hex(self.end_addr, width),
+            "code_id": self.code_id,
+            "debug_file": self.debug_file,
+            "debug_id": self.debug_id,
+            "filename": self.filename,
+            "version": self.version,
+            "missing_symbols": self.missing_symbols,
+            "loaded_symbols": self.loaded_symbols,
+            "corrupt_symbols": self.corrupt_symbols,
+        }
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+
+class Thread:
+    """A thread record pointing at its slice of the frame columns."""
+
+    __slots__ = ("thread_id", "thread_name", "frame_count", "first_frame", "stored_frames", "extra")
+
+    def __init__(
+        self, data: Dict[str, Any], first_frame: int, stored_frames: int, extra: Optional[Dict[str, Any]]
+    ) -> None:
+        """Build a thread from its JSON object; frames are stored separately."""
+        self.thread_id: Optional[int] = data.get("thread_id")
+        self.thread_name: Optional[str] = data.get("thread_name")
+        self.frame_count: int = data.get("frame_count", stored_frames)
+        self.first_frame = first_frame
+        self.stored_frames = stored_frames
+        self.extra = extra
+
+
+class Frame(NamedTuple):
+    """Typed view of one stack frame."""
+
+    module: Optional[str]
+    function: Optional[str]
+    file: Optional[str]
+    line: Optional[int]
+    offset: Optional[int]
+    module_offset: Optional[int]
+    function_offset: Optional[int]
+    trust: str
+    missing_symbols: bool
+
+
+def _hex(value: int, width: int) -> str:
+    return f"0x{value:0{width}x}"
+
+
+class StackwalkResult:
+    """Columnar, interned representation of a minidump-stackwalk JSON result."""
+
+    __slots__ = (
+        "header",
+        "modules",
+        "unloaded_modules",
+        "threads",
+        "crashing_thread",
+        "strings",
+        "address_width",
+        "_module_by_name",
+        "_module",
+        "_offset",
+        "_module_offset",
+        "_function",
+        "_function_offset",
+        "_file",
+        "_line",
+        "_trust",
+        "_missing",
+        "_registers",
+        "_extra",
+    )
+
+    def __init__(self) -> None:
+        """Create an empty result; use :meth:`from_json` or :meth:`from_dict`."""
+        self.header: Dict[str, Any] = {}
+        self.modules: List[Module] = []
+        self.unloaded_modules: List[Module] = []
+        self.threads: List[Thread] = []
+        self.crashing_thread: Optional[Thread] = None
+        self.strings = StringTable()
+        self.address_width = 0
+        self._module_by_name: Dict[str, int] = {}
+        self._module = array("i")
+        self._offset = array("Q")
+        self._module_offset = array("Q")
+        self._function = array("i")
+        self._function_offset = array("Q")
+        self._file = array("i")
+        self._line = array("i")
+        self._trust = array("B")
+        self._missing = array("B")
+        self._registers: Dict[int, Dict[str, str]] = {}
+        self._extra: Dict[int, Dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------ building
+
+    @classmethod
+    def from_json(cls, text: str) -> StackwalkResult:
+        """Build a result from stackwalk JSON text.
+
+        Threads are decoded and folded into the columns one at a time, so the
+        fully decoded document never exists in memory.
+
+        Raises:
+            json.JSONDecodeError: If *text* is not a JSON object
+        """
+        result = cls()
+        crashing: Optional[Dict[str, Any]] = None
+        for key, start, _ in iter_members(text):
+            if key == "threads" and text[start] == "[":
+                result.header[key] = None
+                for element_start, _ in iter_elements(text, start):
+                    result._add_thread(project_value(text, element_start, None))
+            elif key == "crashing_thread":
+                result.header[key] = None
+                crashing = project_value(text, start, None)
+            else:
+                result._add_member(key, project_value(text, start, None))
+        result._set_crashing_thread(crashing)
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> StackwalkResult:
+        """Build a result from an already decoded stackwalk document."""
+        result = cls()
+        for key, value in data.items():
+            if key == "threads" and isinstance(value, list):
+                result.header[key] = None
+                for thread in value:
+                    result._add_thread(thread)
+            elif key == "crashing_thread":
+                result.header[key] = None
+            else:
+                result._add_member(key, value)
+        result._set_crashing_thread(data.get("crashing_thread"))
+        return result
+
+    def _add_member(self, key: str, value: Any) -> None:
+        # Lists stored outside the header keep a ``None`` placeholder to preserve member order
+        if key in ("modules", "unloaded_modules") and isinstance(value, list):
+            target = self.modules if key == "modules" else self.unloaded_modules
+            for data in value:
+                if not self.address_width:
+                    self.address_width = len(data["base_addr"]) - 2
+                module = Module(data, self.strings)
+                if key == "modules" and module.filename is not None:
+                    self._module_by_name.setdefault(module.filename, len(target))
+                target.append(module)
+            self.header[key] = None
+        else:
+            self.header[key] = value
+
+    def _add_thread(self, data: Dict[str, Any]) -> None:
+        self.threads.append(self._store_thread(data))
+
+    def _set_crashing_thread(self, data: Optional[Dict[str, Any]]) -> None:
+        """Share the crashing thread's frames with ``threads`` when it is a plain copy."""
+        if data is None:
+            return
+        index = data.get("threads_index")
+        if isinstance(index, int) and 0 <= index < len(self.threads):
+            candidate = self.threads[index]
+            if {"threads_index": index, **self._thread_dict(candidate, None)} == data:
+                self.crashing_thread = candidate
+                return
+        self.crashing_thread = self._store_thread(data)
+
+    def _store_thread(self, data: Dict[str, Any]) -> Thread:
+        frames = data.get("frames") or []
+        first = len(self._trust)
+        for position, frame in enumerate(frames):
+            self._add_frame(frame, position)
+        extra = {key: value for key, value in data.items() if key not in _THREAD_KEYS}
+        if "frames" not in data:
+            extra["_no_frames"] = True
+        return Thread(data, first, len(frames), extra or None)
+
+    def _address(self, value: Optional[str], key: str, extra: Dict[str, Any]) -> int:
+        """Convert a hex string to a column value, keeping non-canonical strings aside."""
+        if value is None:
+            return _NO_ADDRESS
+        if not self.address_width:
+            self.address_width = len(value) - 2
+        try:
+            number = int(value, 16)
+        except (TypeError, ValueError):
+            extra[key] = value
+            return _NO_ADDRESS
+        if _hex(number, self.address_width) != value:
+            extra[key] = value
+        return number
+
+    def _add_frame(self, frame: Dict[str, Any], position: int) -> None:
+        index = len(self._trust)
+        extra: Dict[str, Any] = {}
+
+        module_name = frame.get("module")
+        module_index = self._module_by_name.get(module_name, -1) if module_name is not None else -1
+        if module_name is not None and module_index < 0:
+            extra["module"] = module_name
+        self._module.append(module_index)
+
+        self._offset.append(self._address(frame.get("offset"), "offset", extra))
+        self._module_offset.append(self._address(frame.get("module_offset"), "module_offset", extra))
+        self._function_offset.append(self._address(frame.get("function_offset"), "function_offset", extra))
+        self._function.append(self.strings.intern(frame.get("function")))
+        self._file.append(self.strings.intern(frame.get("file")))
+
+        line = frame.get("line")
+        if isinstance(line, int) and line >= 0:
+            self._line.append(line)
+        else:
+            self._line.append(_NO_LINE)
+            if line is not None:
+                extra["line"] = line
+
+        trust = frame.get("trust", "none")
+        self._trust.append(_TRUST_CODES.get(trust, 0))
+        if trust not in _TRUST_CODES:
+            extra["trust"] = trust
+
+        missing = frame.get("missing_symbols")
+        self._missing.append(2 if missing is None else int(bool(missing)))
+
+        if frame.get("frame", position) != position:
+            extra["frame"] = frame.get("frame")
+        registers = frame.get("registers")
+        if registers is not None:
+            self._registers[index] = registers
+        for key, value in frame.items():
+            if key not in _FRAME_KEYS and key != "registers":
+                extra[key] = value
+        if extra:
+            self._extra[index] = extra
+
+    # ----------------------------------------------------------------- accessors
+
+    @property
+    def frame_total(self) -> int:
+        """Number of frames stored across all threads."""
+        return len(self._trust)
+
+    def module_for(self, name: str) -> Optional[Module]:
+        """Return the loaded module called *name*."""
+        index = self._module_by_name.get(name)
+        return self.modules[index] if index is not None else None
+
+    def frame(self, index: int) -> Frame:
+        """Typed view of the frame at column *index*."""
+        extra = self._extra.get(index)
+        module_index = self._module[index]
+        if module_index >= 0:
+            module: Optional[str] = self.modules[module_index].filename
+        else:
+            module = extra.get("module") if extra else None
+        line = self._line[index]
+        return Frame(
+            module=module,
+            function=self.strings.get(self._function[index]),
+            file=self.strings.get(self._file[index]),
+            line=line if line != _NO_LINE else None,
+            offset=self._optional(self._offset[index]),
+            module_offset=self._optional(self._module_offset[index]),
+            function_offset=self._optional(self._function_offset[index]),
+            trust=extra["trust"] if extra and "trust" in extra else TRUST_LEVELS[self._trust[index]],
+            missing_symbols=self._missing[index] == 1,
+        )
+
+    def frames(self, thread: Thread, limit: Optional[int] = None) -> Iterator[Frame]:
+        """Iterate over the typed frames of *thread*, optionally only the first *limit*."""
+        count = thread.stored_frames if limit is None else min(limit, thread.stored_frames)
+        for index in range(thread.first_frame, thread.first_frame + count):
+            yield self.frame(index)
+
+    def registers(self, thread: Thread, position: int = 0) -> Optional[Dict[str, str]]:
+        """Registers recorded for a frame of *thread*, usually only the top frame."""
+        if not 0 <= position < thread.stored_frames:
+            return None
+        return self._registers.get(thread.first_frame + position)
+
+    @staticmethod
+    def _optional(value: int) -> Optional[int]:
+        return None if value == _NO_ADDRESS else value
+
+    # ----------------------------------------------------------- materialization
+
+    def frame_dict(self, index: int, position: int) -> Dict[str, Any]:
+        """Materialize the frame at column *index* in the JSON output format."""
+        width = self.address_width
+        frame = self.frame(index)
+        missing = self._missing[index]
+        result: Dict[str, Any] = {
+            "frame": position,
+            "module": frame.module,
+            "function": frame.function,
+            "function_offset": _hex(frame.function_offset, width) if frame.function_offset is not None else None,
+            "file": frame.file,
+            "line": frame.line,
+            "offset": _hex(frame.offset, width) if frame.offset is not None else None,
+            "module_offset": _hex(frame.module_offset, width) if frame.module_offset is not None else None,
+            "missing_symbols": None if missing == 2 else bool(missing),
+            "trust": frame.trust,
+        }
+        registers = self._registers.get(index)
+        if registers is not None:
+            result["registers"] = registers
+        extra = self._extra.get(index)
+        if extra:
+            result.update(extra)
+        return result
+
+    def _thread_dict(self, thread: Thread, max_frames: Optional[int]) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "thread_id": thread.thread_id,
+            "thread_name": thread.thread_name,
+            "frame_count": thread.frame_count,
+        }
+        extra = dict(thread.extra) if thread.extra else {}
+        no_frames = extra.pop("_no_frames", False)
+        result.update(extra)
+        if not no_frames:
+            count = thread.stored_frames if max_frames is None else min(max_frames, thread.stored_frames)
+            result["frames"] = [self.frame_dict(thread.first_frame + position, position) for position in range(count)]
+        return result
+
+    def thread_dict(self, position: int, max_frames: Optional[int] = None) -> Dict[str, Any]:
+        """Materialize one thread of ``threads`` in the JSON output format."""
+        return self._thread_dict(self.threads[position], max_frames)
+
+    def to_dict(self, max_frames: Optional[int] = None) -> Dict[str, Any]:
+        """Materialize the whole result in the JSON output format.
+
+        Args:
+            max_frames: Optional maximum number of frames per thread
+        """
+        width = self.address_width
+        result: Dict[str, Any] = {}
+        for key, value in self.header.items():
+            if key == "modules":
+                result[key] = [module.to_dict(width) for module in self.modules]
+            elif key == "unloaded_modules":
+                result[key] = [module.to_dict(width) for module in self.unloaded_modules]
+            elif key == "threads":
+                result[key] = [self._thread_dict(thread, max_frames) for thread in self.threads]
+            elif key == "crashing_thread":
+                result[key] = self._crashing_thread_dict(max_frames)
+            else:
+                result[key] = value
+        return result
+
+    def _crashing_thread_dict(self, max_frames: Optional[int]) -> Optional[Dict[str, Any]]:
+        if self.crashing_thread is None:
+            return None
+        crashing = self._thread_dict(self.crashing_thread, max_frames)
+        for position, thread in enumerate(self.threads):
+            if thread is self.crashing_thread:
+                return {"threads_index": position, **crashing}
+        return crashing
+
+    def to_json(self) -> str:
+        """Serialize the result back to JSON text."""
+        return json.dumps(self.to_dict())
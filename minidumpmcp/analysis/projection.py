@@ -0,0 +1,345 @@
+"""Field projection for minidump-stackwalk JSON output.
+
+Projections let callers ask for a slice of the stackwalk result, e.g.
+``crash_info`` or ``threads[*].frames[:10]``.  The selection is applied while
+the raw JSON text is being scanned: unselected members are skipped without
+ever building the full document, and list limits stop decoding once enough
+elements have been collected.
+
+Grammar of a single field path::
+
+    path     := segment ("." segment)*
+    segment  := name ["[*]" | "[:" N "]"]
+
+``[*]`` selects every element of a list (the default when omitted) and
+``[:N]`` keeps only the first *N* elements.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from json.decoder import scanstring
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Keys of the stackwalk JSON whose values carry a ``frames`` list.
+THREAD_KEYS = ("threads", "crashing_thread")
+
+_SEGMENT = re.compile(r"^(?P<name>[A-Za-z_][A-Za-z0-9_]*)(?:\[(?:(?P<all>\*)|:(?P<limit>\d+))\])?$")
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null")
+# Run of a container's text without brackets outside of strings
+_NO_BRACKETS = re.compile(r'[^"\[\]{}]*(?:"(?:[^"\\]|\\.)*"[^"\[\]{}]*)*', re.DOTALL)
+
+_decode = json.JSONDecoder().raw_decode
+
+
+@dataclass
+class FieldSelector:
+    """Node of a projection tree.
+
+    Attributes:
+        limit: Maximum number of list elements to keep (``None`` keeps all)
+        children: Selectors for specific object members
+        keep_rest: Whether members without an explicit child selector are kept whole
+    """
+
+    limit: Optional[int] = None
+    children: Dict[str, "FieldSelector"] = field(default_factory=dict)
+    keep_rest: bool = True
+
+    @property
+    def is_whole(self) -> bool:
+        """Whether the selected value is kept unchanged."""
+        return self.keep_rest and not self.children and self.limit is None
+
+    def _merge_limit(self, limit: Optional[int]) -> None:
+        self.limit = None if self.limit is None or limit is None else max(self.limit, limit)
+
+
+def _combine(selector: Optional[FieldSelector], limit: Optional[int]) -> FieldSelector:
+    if selector is None:
+        return FieldSelector(limit=limit, keep_rest=False)
+    selector._merge_limit(limit)
+    return selector
+
+
+def parse_projection(fields: Iterable[str]) -> FieldSelector:
+    """Build a projection tree from a list of field paths.
+
+    Args:
+        fields: Field paths such as ``crash_info`` or ``threads[*].frames[:10]``
+
+    Returns:
+        Root selector describing which parts of the document to keep
+
+    Raises:
+        ValueError: If a path does not follow the projection grammar
+    """
+    root = FieldSelector(keep_rest=False)
+    for path in fields:
+        node = root
+        segments = path.strip().split(".")
+        for position, segment in enumerate(segments):
+            match = _SEGMENT.match(segment.strip())
+            if match is None:
+                raise ValueError(f"Invalid projection segment '{segment}' in '{path}'")
+            limit = int(match["limit"]) if match["limit"] is not None else None
+            child = _combine(node.children.get(match["name"]), limit)
+            node.children[match["name"]] = child
+            node = child
+            if position == len(segments) - 1:
+                node.keep_rest = True
+    if not root.children:
+        raise ValueError("Projection must contain at least one field path")
+    return root
+
+
+def cap_frames(selector: FieldSelector, max_frames: int) -> FieldSelector:
+    """Limit every selected thread to at most *max_frames* frames.
+
+    Args:
+        selector: Root selector, modified in place
+        max_frames: Maximum number of frames kept per thread
+
+    Returns:
+        The same *selector* for chaining
+    """
+    for key in THREAD_KEYS:
+        thread = selector.children.get(key)
+        if thread is None:
+            if not selector.keep_rest:
+                continue
+            thread = selector.children[key] = FieldSelector()
+        frames = thread.children.get("frames")
+        if frames is not None:
+            frames.limit = max_frames if frames.limit is None else min(frames.limit, max_frames)
+        elif thread.keep_rest:
+            thread.children["frames"] = FieldSelector(limit=max_frames)
+    return selector
+
+
+def build_selector(fields: Optional[Iterable[str]], max_frames: Optional[int]) -> Optional[FieldSelector]:
+    """Combine field paths and a per-thread frame cap into one selector.
+
+    Returns ``None`` when neither is given, meaning the full document is wanted.
+    """
+    if fields is None and max_frames is None:
+        return None
+    selector = parse_projection(fields) if fields is not None else FieldSelector()
+    if max_frames is not None:
+        cap_frames(selector, max_frames)
+    return selector
+
+
+def _skip_ws(text: str, idx: int) -> int:
+    match = _WHITESPACE.match(text, idx)
+    return match.end() if match else idx
+
+
+def _skip_value(text: str, idx: int) -> int:
+    """Return the index just past the JSON value starting at *idx*.
+
+    Nothing is decoded: strings and scalars are matched, and containers are
+    scanned from bracket to bracket with whole strings and bracket-free runs
+    consumed by one regex match each.  Brackets must balance, but commas and
+    scalars inside a skipped container are not checked.
+    """
+    char = text[idx]
+    if char == '"':
+        string = _STRING.match(text, idx)
+        if string is None:
+            raise json.JSONDecodeError("Unterminated string", text, idx)
+        return string.end()
+    if char == "{" or char == "[":
+        closing: List[str] = []
+        while True:
+            char = text[idx]
+            if char == "{":
+                closing.append("}")
+            elif char == "[":
+                closing.append("]")
+            elif char == '"':
+                raise json.JSONDecodeError("Unterminated string", text, idx)
+            else:
+                expected = closing.pop()
+                if char != expected:
+                    raise json.JSONDecodeError(f"Expecting '{expected}'", text, idx)
+                if not closing:
+                    return idx + 1
+            idx = _NO_BRACKETS.match(text, idx + 1).end()  # type: ignore[union-attr]
+    scalar = _SCALAR.match(text, idx)
+    if scalar is None or scalar.end() == idx:
+        raise json.JSONDecodeError("Expecting value", text, idx)
+    return scalar.end()
+
+
+def _select(text: str, idx: int, selector: FieldSelector) -> Tuple[Any, int]:
+    if selector.is_whole:
+        return _decode(text, idx)
+    char = text[idx]
+    if char == "{":
+        return _select_object(text, idx, selector)
+    if char == "[":
+        return _select_array(text, idx, selector)
+    return _decode(text, idx)
+
+
+def _select_object(text: str, idx: int, selector: FieldSelector) -> Tuple[Dict[str, Any], int]:
+    result: Dict[str, Any] = {}
+    idx = _skip_ws(text, idx + 1)
+    if text[idx] == "}":
+        return result, idx + 1
+    while True:
+        if text[idx] != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, idx)
+        key, idx = scanstring(text, idx + 1)
+        idx = _skip_ws(text, idx)
+        if text[idx] != ":":
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, idx)
+        idx = _skip_ws(text, idx + 1)
+
+        child = selector.children.get(key)
+        if child is not None:
+            result[key], idx = _select(text, idx, child)
+        elif selector.keep_rest:
+            result[key], idx = _decode(text, idx)
+        else:
+            idx = _skip_value(text, idx)
+
+        idx = _skip_ws(text, idx)
+        if text[idx] == "}":
+            return result, idx + 1
+        if text[idx] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+        idx = _skip_ws(text, idx + 1)
+
+
+def _select_array(text: str, idx: int, selector: FieldSelector) -> Tuple[list[Any], int]:
+    items: list[Any] = []
+    element_whole = selector.keep_rest and not selector.children
+    idx = _skip_ws(text, idx + 1)
+    if text[idx] == "]":
+        return items, idx + 1
+    while True:
+        if selector.limit is not None and len(items) >= selector.limit:
+            idx = _skip_value(text, idx)
+        elif element_whole or text[idx] != "{":
+            item, idx = _decode(text, idx)
+            items.append(item)
+        else:
+            item, idx = _select_object(text, idx, selector)
+            items.append(item)
+
+        idx = _skip_ws(text, idx)
+        if text[idx] == "]":
+            return items, idx + 1
+        if text[idx] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+        idx = _skip_ws(text, idx + 1)
+
+
+def iter_members(text: str, idx: int = 0) -> Iterator[Tuple[str, int, int]]:
+    """Yield ``(key, start, end)`` spans for the members of the JSON object at *idx*.
+
+    Values are skipped rather than decoded, so this is a cheap way to index
+    a large document and decode individual members later with
+    ``json.loads(text[start:end])``.
+
+    Raises:
+        json.JSONDecodeError: If the value at *idx* is not a valid JSON object
+    """
+    try:
+        idx = _skip_ws(text, idx)
+        if text[idx] != "{":
+            raise json.JSONDecodeError("Expecting object", text, idx)
+        idx = _skip_ws(text, idx + 1)
+        if text[idx] == "}":
+            return
+        while True:
+            if text[idx] != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, idx)
+            key, idx = scanstring(text, idx + 1)
+            idx = _skip_ws(text, idx)
+            if text[idx] != ":":
+                raise json.JSONDecodeError("Expecting ':' delimiter", text, idx)
+            start = _skip_ws(text, idx + 1)
+            idx = _skip_value(text, start)
+            yield key, start, idx
+            idx = _skip_ws(text, idx)
+            if text[idx] == "}":
+                return
+            if text[idx] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+            idx = _skip_ws(text, idx + 1)
+    except IndexError:
+        raise json.JSONDecodeError("Unexpected end of data", text, len(text)) from None
+
+
+def iter_elements(text: str, idx: int = 0) -> Iterator[Tuple[int, int]]:
+    """Yield ``(start, end)`` spans for the elements of the JSON array at *idx*.
+
+    Raises:
+        json.JSONDecodeError: If the value at *idx* is not a valid JSON array
+    """
+    try:
+        idx = _skip_ws(text, idx)
+        if text[idx] != "[":
+            raise json.JSONDecodeError("Expecting array", text, idx)
+        idx = _skip_ws(text, idx + 1)
+        if text[idx] == "]":
+            return
+        while True:
+            start = idx
+            idx = _skip_value(text, start)
+            yield start, idx
+            idx = _skip_ws(text, idx)
+            if text[idx] == "]":
+                return
+            if text[idx] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+            idx = _skip_ws(text, idx + 1)
+    except IndexError:
+        raise json.JSONDecodeError("Unexpected end of data", text, len(text)) from None
+
+
+def project_value(text: str, idx: int, selector: Optional[FieldSelector]) -> Any:
+    """Decode the JSON value starting at *idx* keeping only the parts described by *selector*.
+
+    Unlike :func:`project_json` this does not require the value to span the
+    whole of *text*, so indexed sub-documents can be projected in place.
+
+    Raises:
+        json.JSONDecodeError: If the value at *idx* is not valid JSON
+    """
+    try:
+        return _select(text, _skip_ws(text, idx), selector or FieldSelector())[0]
+    except IndexError:
+        raise json.JSONDecodeError("Unexpected end of data", text, len(text)) from None
+
+
+def project_json(text: str, selector: Optional[FieldSelector]) -> Any:
+    """Decode *text* keeping only the parts described by *selector*.
+
+    Args:
+        text: Raw JSON document
+        selector: Projection tree, or ``None`` to decode everything
+
+    Returns:
+        The projected document
+
+    Raises:
+        json.JSONDecodeError: If *text* is not valid JSON
+    """
+    if selector is None:
+        return json.loads(text)
+    try:
+        idx = _skip_ws(text, 0)
+        value, idx = _select(text, idx, selector)
+    except IndexError:
+        raise json.JSONDecodeError("Unexpected end of data", text, len(text)) from None
+    if _skip_ws(text, idx) != len(text):
+        raise json.JSONDecodeError("Extra data", text, idx)
+    return value
@@ -0,0 +1,174 @@
+"""Crash signatures for grouping dumps of the same bug.
+
+A signature is built from the top frames of the crashing thread after
+normalization: argument lists, template arguments and Rust symbol hashes are
+dropped, frames without symbols become ``module@0xoffset``, and frames that
+only describe *how* the process died (allocators, panic and abort machinery,
+exception dispatch) are skipped.  Dumps of the same bug then share the same
+signature string even when they differ in inlining or crash plumbing.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .model import Frame, StackwalkResult, Thread
+from .projection import build_selector, project_json
+
+# Functions skipped when building signatures. Each entry is a regular expression
+# matched against the start of the normalized function name.
+DEFAULT_SKIP_FUNCTIONS: Tuple[str, ...] = (
+    # Allocators
+    r"(?:__libc_|je_|moz_x|tc_|__rdl_|__rust_)?(?:malloc|calloc|realloc|free|memalign|posix_memalign)$",
+    r"operator (?:new|delete)",
+    r"alloc::(?:alloc|raw_vec)::",
+    r"__rust_(?:alloc|dealloc|realloc|alloc_error_handler)",
+    r"(?:Rtl(?:Allocate|Free|ReAllocate)Heap|HeapAlloc|HeapFree|HeapReAlloc)$",
+    # Panic and abort machinery
+    r"(?:std|core)::panicking::",
+    r"std::(?:rt|process)::(?:abort|begin_panic)",
+    r"std::sys::.*::abort_internal",
+    r"(?:rust_panic|__rust_start_panic|rust_begin_unwind|__rust_panic_cleanup)",
+    r"(?:__GI_)?(?:raise|abort)$",
+    r"(?:gsignal|pthread_kill|__pthread_kill\w*|__restore_rt|_sigtramp)$",
+    r"(?:__assert_fail|__assert_rtn|_assert|_wassert|__stack_chk_fail)$",
+    r"(?:_CxxThrowException|RaiseException|KiUserExceptionDispatcher|RtlDispatchException)$",
+    r"(?:__cxa_throw|__cxa_rethrow|std::terminate|__terminate_handler|abort_message)",
+)
+
+# Number of frames scanned for signature candidates, including skipped ones.
+_SCAN_DEPTH = 64
+
+_RUST_HASH = re.compile(r"::h[0-9a-f]{16}$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class CrashSignature(NamedTuple):
+    """Signature of one crash."""
+
+    signature: str
+    frames: Tuple[str, ...]
+    crash_type: Optional[str]
+
+
+def _strip_enclosed(text: str, opening: str, closing: str, replacement: str) -> str:
+    """Replace every outermost ``opening ... closing`` group with *replacement*."""
+    result: List[str] = []
+    depth = 0
+    for char in text:
+        if char == opening:
+            if depth == 0:
+                result.append(replacement)
+            depth += 1
+        elif char == closing and depth > 0:
+            depth -= 1
+        elif depth == 0:
+            result.append(char)
+    return "".join(result)
+
+
+def normalize_function(function: str) -> str:
+    """Normalize a symbolized function name for use in a signature.
+
+    ``ns::Widget<int>::draw(int, char const*) const`` becomes ``ns::Widget<T>::draw``
+    and Rust legacy mangling hashes (``::h0123456789abcdef``) are removed.
+    """
+    name = _WHITESPACE.sub(" ", function.strip())
+    name = _RUST_HASH.sub("", name)
+    if name.startswith("operator"):
+        return name.split("(", 1)[0].strip()
+    if name.endswith(" const"):
+        name = name[: -len(" const")]
+    name = _strip_enclosed(name, "(", ")", "")
+    name = _strip_enclosed(name, "<", ">", "<T>")
+    return name.strip()
+
+
+def crash_model(text: str) -> StackwalkResult:
+    """Build a model holding only what signatures need from stackwalk JSON text.
+
+    Only ``crash_info``, the modules and the top frames of the crashing thread are
+    decoded; the other threads are only read when no crashing thread is recorded.
+
+    Raises:
+        json.JSONDecodeError: If *text* is not valid JSON
+    """
+    data = project_json(text, build_selector(["crash_info", "modules", "crashing_thread"], _SCAN_DEPTH))
+    if data.get("crashing_thread") is None:
+        data.update(project_json(text, build_selector(["threads"], _SCAN_DEPTH)))
+    return StackwalkResult.from_dict(data)
+
+
+class SignatureGenerator:
+    """Computes crash signatures from stackwalk results."""
+
+    def __init__(self, frame_count: int = 5, skip_functions: Optional[Iterable[str]] = None) -> None:
+        """Initialize the generator.
+
+        Args:
+            frame_count: Number of frames that make up a signature
+            skip_functions: Regular expressions of functions to skip; defaults to
+                            :data:`DEFAULT_SKIP_FUNCTIONS`
+        """
+        self.frame_count = frame_count
+        patterns = DEFAULT_SKIP_FUNCTIONS if skip_functions is None else tuple(skip_functions)
+        self._skip = re.compile("|".join(f"(?:{pattern})" for pattern in patterns)) if patterns else None
+
+    def frame_label(self, frame: Frame) -> Optional[str]:
+        """Normalized label of a frame, or ``None`` when the frame is skipped."""
+        if frame.function:
+            name = normalize_function(frame.function)
+            if self._skip is not None and self._skip.match(name):
+                return None
+            return name
+        if frame.module:
+            return f"{frame.module}@0x{frame.module_offset or 0:x}"
+        return f"@0x{frame.offset or 0:x}"
+
+    def from_frames(self, frames: Iterable[Frame], crash_type: Optional[str] = None) -> CrashSignature:
+        """Build a signature from frames ordered from the top of the stack."""
+        labels: List[str] = []
+        for frame in frames:
+            label = self.frame_label(frame)
+            if label is not None:
+                labels.append(label)
+                if len(labels) == self.frame_count:
+                    break
+        if not labels:
+            return CrashSignature(f"EMPTY: {crash_type or 'no frames'}", (), crash_type)
+        return CrashSignature(" | ".join(labels), tuple(labels), crash_type)
+
+    def from_result(self, result: StackwalkResult) -> CrashSignature:
+        """Build the signature of a stackwalk result from its crashing thread."""
+        crash_info = result.header.get("crash_info") or {}
+        crash_type = crash_info.get("type")
+        thread = self._crashing_thread(result, crash_info.get("crashing_thread"))
+        if thread is None:
+            return CrashSignature(f"EMPTY: {crash_type or 'no crashing thread'}", (), crash_type)
+        return self.from_frames(result.frames(thread, _SCAN_DEPTH), crash_type)
+
+    def from_json(self, text: str) -> CrashSignature:
+        """Build the signature of stackwalk JSON text, decoding only the crashing thread.
+
+        Raises:
+            json.JSONDecodeError: If *text* is not valid JSON
+        """
+        return self.from_result(crash_model(text))
+
+    def labels(self, result: StackwalkResult, depth: int = _SCAN_DEPTH) -> List[str]:
+        """Normalized labels of the crashing thread's top *depth* frames, skipped frames left out."""
+        crash_info = result.header.get("crash_info") or {}
+        thread = self._crashing_thread(result, crash_info.get("crashing_thread"))
+        if thread is None:
+            return []
+        return [label for label in map(self.frame_label, result.frames(thread, depth)) if label is not None]
+
+    @staticmethod
+    def _crashing_thread(result: StackwalkResult, index: Optional[int]) -> Optional[Thread]:
+        if result.crashing_thread is not None:
+            return result.crashing_thread
+        threads: Sequence[Thread] = result.threads
+        if isinstance(index, int) and 0 <= index < len(threads):
+            return threads[index]
+        return None
@@ -0,0 +1,169 @@
+"""Persistent SQLite index of crash signatures.
+
+The index maps every signature to the dumps that produced it and keeps a
+running per-signature summary (dump count, first and last seen), so "top
+crashers" queries are answered from a single indexed table instead of
+re-reading analyses.  Each dump counts once: re-analyzing it, e.g. with
+better symbols, moves it to its new signature.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .signature import CrashSignature
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    signature TEXT PRIMARY KEY,
+    crash_type TEXT,
+    dump_count INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS signatures_by_count ON signatures (dump_count DESC);
+CREATE TABLE IF NOT EXISTS signature_dumps (
+    dump_hash TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    seen_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS signature_dumps_by_signature ON signature_dumps (signature, seen_at);
+CREATE INDEX IF NOT EXISTS signature_dumps_by_time ON signature_dumps (seen_at);
+"""
+
+
+class SignatureIndex:
+    """SQLite-backed mapping of crash signatures to dump hashes."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Open (and create if needed) the index database.
+
+        Args:
+            path: Database file, or ``":memory:"`` for a private in-memory index
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def record(self, signature: CrashSignature, dump_hash: str, seen_at: Optional[float] = None) -> bool:
+        """Record that *dump_hash* crashed with *signature*.
+
+        Args:
+            signature: Signature computed for the dump
+            dump_hash: SHA-256 of the minidump
+            seen_at: Unix time of the analysis, defaults to now
+
+        Returns:
+            ``True`` if the dump was new to the signature, ``False`` if it was already counted
+        """
+        now = time.time() if seen_at is None else seen_at
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT signature FROM signature_dumps WHERE dump_hash = ?", (dump_hash,)
+                ).fetchone()
+                previous = row["signature"] if row is not None else None
+                if previous == signature.signature:
+                    self._db.execute(
+                        "UPDATE signatures SET last_seen = max(last_seen, ?) WHERE signature = ?",
+                        (now, signature.signature),
+                    )
+                    self._db.execute("COMMIT")
+                    return False
+
+                if previous is not None:
+                    self._db.execute(
+                        "UPDATE signatures SET dump_count = dump_count - 1 WHERE signature = ?", (previous,)
+                    )
+                    self._db.execute("DELETE FROM signatures WHERE signature = ? AND dump_count <= 0", (previous,))
+                self._db.execute(
+                    "INSERT INTO signature_dumps (dump_hash, signature, seen_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (dump_hash) DO UPDATE SET signature = excluded.signature, seen_at = excluded.seen_at",
+                    (dump_hash, signature.signature, now),
+                )
+                self._db.execute(
+                    "INSERT INTO signatures (signature, crash_type, dump_count, first_seen, last_seen) "
+                    "VALUES (?, ?, 1, ?, ?) "
+                    "ON CONFLICT (signature) DO UPDATE SET dump_count = dump_count + 1, "
+                    "first_seen = min(first_seen, excluded.first_seen), "
+                    "last_seen = max(last_seen, excluded.last_seen), "
+                    "crash_type = coalesce(excluded.crash_type, crash_type)",
+                    (signature.signature, signature.crash_type, now, now),
+                )
+                self._db.execute("COMMIT")
+                return True
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def top(self, limit: int = 10, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return the signatures with the most dumps.
+
+        Args:
+            limit: Maximum number of signatures
+            since: Only count dumps seen at or after this Unix time
+
+        Returns:
+            Rows with ``signature``, ``crash_type``, ``dump_count``, ``first_seen`` and ``last_seen``
+        """
+        with self._lock:
+            if since is None:
+                rows = self._db.execute(
+                    "SELECT signature, crash_type, dump_count, first_seen, last_seen "
+                    "FROM signatures ORDER BY dump_count DESC, last_seen DESC LIMIT ?",
+                    (limit,),
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT d.signature, s.crash_type, count(*) AS dump_count, "
+                    "min(d.seen_at) AS first_seen, max(d.seen_at) AS last_seen "
+                    "FROM signature_dumps d JOIN signatures s ON s.signature = d.signature "
+                    "WHERE d.seen_at >= ? GROUP BY d.signature "
+                    "ORDER BY dump_count DESC, last_seen DESC LIMIT ?",
+                    (since, limit),
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def total_dumps(self, since: Optional[float] = None) -> int:
+        """Number of indexed dumps, optionally only those seen since *since*."""
+        with self._lock:
+            if since is None:
+                row = self._db.execute("SELECT count(*) FROM signature_dumps").fetchone()
+            else:
+                row = self._db.execute("SELECT count(*) FROM signature_dumps WHERE seen_at >= ?", (since,)).fetchone()
+        return int(row[0])
+
+    def dumps(self, signature: str, limit: int = 10) -> List[str]:
+        """Return the most recently seen dump hashes of *signature*."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT dump_hash FROM signature_dumps WHERE signature = ? ORDER BY seen_at DESC LIMIT ?",
+                (signature, limit),
+            ).fetchall()
+        return [row["dump_hash"] for row in rows]
+
+    def signature_of(self, dump_hash: str) -> Optional[str]:
+        """Return the signature recorded for *dump_hash*."""
+        with self._lock:
+            row = self._db.execute("SELECT signature FROM signature_dumps WHERE dump_hash = ?", (dump_hash,)).fetchone()
+        return row["signature"] if row is not None else None
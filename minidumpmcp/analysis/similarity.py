@@ -0,0 +1,264 @@
+"""Near-duplicate crash search with MinHash sketches and LSH banding.
+
+Exact signatures split crashes that differ by a single inlined or skipped
+frame.  Here every analysis is reduced to the set of *shingles* (runs of
+consecutive normalized frame labels) of its crashing thread, summarized by a
+MinHash sketch whose agreement rate estimates the Jaccard similarity of two
+shingle sets.  Sketches are split into bands; crashes sharing any band land
+in the same bucket, so a query only compares against the few candidates
+found in its buckets instead of every stored crash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Union
+
+# Mersenne prime used for the universal hash family of the sketches.
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+
+# Upper bound on candidates re-ranked per query, highest band agreement first.
+_MAX_CANDIDATES = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sketches (
+    dump_hash TEXT PRIMARY KEY,
+    analysis_hash TEXT,
+    signature TEXT,
+    crash_type TEXT,
+    minidump_path TEXT,
+    seen_at REAL NOT NULL,
+    minhash BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    dump_hash TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, dump_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lsh_buckets_by_dump ON lsh_buckets (dump_hash);
+"""
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def shingles(labels: Sequence[str], size: int = 2) -> Set[int]:
+    """Hash the runs of *size* consecutive labels, plus each single label.
+
+    Single labels keep short stacks comparable; the runs capture frame order.
+    """
+    encoded = [label.encode() for label in labels]
+    result = {_hash64(label) for label in encoded}
+    for start in range(len(encoded) - size + 1):
+        result.add(_hash64(b"\0".join(encoded[start : start + size])))
+    return result
+
+
+class MinHasher:
+    """Computes fixed-size MinHash sketches of hashed shingle sets."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        """Initialize the hash family.
+
+        Args:
+            num_perm: Number of hash functions, i.e. sketch length
+            seed: Seed of the hash family; sketches are only comparable with the same seed
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def sketch(self, shingle_hashes: Iterable[int]) -> array[int]:
+        """Return the MinHash sketch of a set of shingle hashes."""
+        values = list(shingle_hashes)
+        sketch: array[int] = array("Q", [_MAX_HASH] * self.num_perm)
+        if not values:
+            return sketch
+        for position, (a, b) in enumerate(self._params):
+            sketch[position] = min((a * value + b) % _PRIME for value in values)
+        return sketch
+
+
+def estimate_similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two sketches."""
+    if not first or len(first) != len(second) or first[0] == _MAX_HASH or second[0] == _MAX_HASH:
+        return 0.0
+    return sum(1 for a, b in zip(first, second, strict=True) if a == b) / len(first)
+
+
+class SimilarityIndex:
+    """SQLite-backed LSH index of crash sketches keyed by dump hash."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        bands: int = 16,
+        rows: int = 4,
+        shingle_size: int = 2,
+    ) -> None:
+        """Open (and create if needed) the index database.
+
+        With ``bands`` bands of ``rows`` rows, two crashes with Jaccard similarity
+        ``s`` share at least one bucket with probability ``1 - (1 - s**rows)**bands``.
+
+        Args:
+            path: Database file, or ``":memory:"`` for a private in-memory index
+            bands: Number of LSH bands
+            rows: Sketch values per band
+            shingle_size: Number of consecutive frames per shingle
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.path = str(path)
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        self._hasher = MinHasher(bands * rows)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def sketch(self, labels: Sequence[str]) -> array[int]:
+        """Sketch the normalized frame labels of a crash."""
+        return self._hasher.sketch(shingles(labels, self.shingle_size))
+
+    def _buckets(self, sketch: Sequence[int]) -> List[int]:
+        """Bucket of every band, as signed 64-bit integers for SQLite."""
+        buckets = []
+        for band in range(self.bands):
+            rows = array("Q", sketch[band * self.rows : (band + 1) * self.rows]).tobytes()
+            bucket = _hash64(band.to_bytes(2, "little") + rows)
+            buckets.append(bucket - (1 << 64) if bucket >= 1 << 63 else bucket)
+        return buckets
+
+    def add(
+        self,
+        dump_hash: str,
+        labels: Sequence[str],
+        *,
+        analysis_hash: Optional[str] = None,
+        signature: Optional[str] = None,
+        crash_type: Optional[str] = None,
+        minidump_path: Optional[str] = None,
+        seen_at: Optional[float] = None,
+    ) -> None:
+        """Insert or replace the sketch of a dump.
+
+        Args:
+            dump_hash: SHA-256 of the minidump
+            labels: Normalized frame labels of the crashing thread, top first
+            analysis_hash: Analysis the labels come from
+            signature: Crash signature of the dump
+            crash_type: Crash reason of the dump
+            minidump_path: Where the dump was analyzed from
+            seen_at: Unix time of the analysis, defaults to now
+        """
+        sketch = self.sketch(labels)
+        now = time.time() if seen_at is None else seen_at
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("DELETE FROM lsh_buckets WHERE dump_hash = ?", (dump_hash,))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sketches "
+                    "(dump_hash, analysis_hash, signature, crash_type, minidump_path, seen_at, minhash) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (dump_hash, analysis_hash, signature, crash_type, minidump_path, now, sketch.tobytes()),
+                )
+                if labels:
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO lsh_buckets (band, bucket, dump_hash) VALUES (?, ?, ?)",
+                        [(band, bucket, dump_hash) for band, bucket in enumerate(self._buckets(sketch))],
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def stored_sketch(self, dump_hash: str) -> Optional[array[int]]:
+        """Return the stored sketch of *dump_hash*."""
+        with self._lock:
+            row = self._db.execute("SELECT minhash FROM sketches WHERE dump_hash = ?", (dump_hash,)).fetchone()
+        if row is None:
+            return None
+        sketch: array[int] = array("Q")
+        sketch.frombytes(row["minhash"])
+        return sketch
+
+    def query(
+        self,
+        sketch: Sequence[int],
+        k: int = 5,
+        min_similarity: float = 0.0,
+        exclude: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Find the stored crashes most similar to *sketch*.
+
+        Only crashes sharing at least one LSH bucket are compared.
+
+        Args:
+            sketch: Sketch of the crash to look up
+            k: Maximum number of results
+            min_similarity: Minimum estimated Jaccard similarity
+            exclude: Dump hash left out of the results, typically the query dump itself
+
+        Returns:
+            Rows of stored crash metadata with a ``similarity`` score, most similar first
+        """
+        buckets = self._buckets(sketch)
+        placeholders = ", ".join("(?, ?)" for _ in buckets)
+        parameters: List[Any] = [value for band, bucket in enumerate(buckets) for value in (band, bucket)]
+        with self._lock:
+            candidates = self._db.execute(
+                f"SELECT dump_hash, count(*) AS hits FROM lsh_buckets WHERE (band, bucket) IN (VALUES {placeholders}) "
+                "GROUP BY dump_hash ORDER BY hits DESC LIMIT ?",
+                [*parameters, _MAX_CANDIDATES],
+            ).fetchall()
+            hashes = [row["dump_hash"] for row in candidates if row["dump_hash"] != exclude]
+            rows = []
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start : start + 500]
+                rows.extend(
+                    self._db.execute(
+                        "SELECT dump_hash, analysis_hash, signature, crash_type, minidump_path, seen_at, minhash "
+                        f"FROM sketches WHERE dump_hash IN ({', '.join('?' for _ in chunk)})",
+                        chunk,
+                    ).fetchall()
+                )
+
+        results = []
+        for row in rows:
+            stored: array[int] = array("Q")
+            stored.frombytes(row["minhash"])
+            similarity = estimate_similarity(sketch, stored)
+            if similarity >= min_similarity:
+                result = {key: row[key] for key in row.keys() if key != "minhash"}
+                result["similarity"] = similarity
+                results.append(result)
+        results.sort(key=lambda item: (-item["similarity"], -item["seen_at"]))
+        return results[:k]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT count(*) FROM sketches").fetchone()[0])
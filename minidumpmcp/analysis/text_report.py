@@ -0,0 +1,253 @@
+"""Streaming parser for the human-readable minidump-stackwalk report.
+
+``minidump-stackwalk`` without ``--json`` prints a text report.  This module
+turns that report back into the same structure the JSON output uses
+(``system_info``, ``crash_info``, ``threads``, ``crashing_thread``,
+``modules``), so projection, caching and the analysis resources work no
+matter which format a pipeline produced.
+
+The parser consumes the report one line at a time and keeps no state beyond
+the result being built, so it can be fed directly from a file or a pipe.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+_THREAD = re.compile(r"^Thread (?P<index>\d+)\b(?P<rest>.*)$")
+_TID = re.compile(r"\s*-\s*tid:\s*(?P<tid>\d+)")
+_FRAME = re.compile(r"^\s*(?P<frame>\d+)\s{2}(?P<location>\S.*)$")
+_REGISTER = re.compile(r"(\w+) = (0x[0-9a-fA-F]+)")
+_MODULE = re.compile(
+    r"^0x(?P<base>[0-9a-fA-F]+) - 0x(?P<end>[0-9a-fA-F]+)\s+(?P<filename>\S+)\s+(?P<version>\S+)(?P<rest>.*)$"
+)
+_SOURCE = re.compile(r"^(?P<function>.*?) \[(?P<file>.*) : (?P<line>\d+)(?: \+ (?P<offset>0x[0-9a-fA-F]+))?\]$")
+_OFFSET = re.compile(r"^(?P<name>.*?) \+ (?P<offset>0x[0-9a-fA-F]+)$")
+_SYMBOL_WARNING = re.compile(r"\(WARNING: (?P<reason>[^,)]*)(?:, (?P<debug_file>[^,)]*), (?P<debug_id>[^,)]*))?\)")
+
+# Instruction pointer register names, used to recover a frame's absolute address.
+_PC_REGISTERS = ("rip", "eip", "pc")
+
+# CPU architectures printed with 64-bit addresses.
+_WIDE_ARCHS = ("amd64", "x86_64", "arm64", "aarch64", "ppc64", "mips64", "sparc64")
+
+# "Found by:" descriptions mapped to the trust values of the JSON output.
+_TRUST = {
+    "given as instruction pointer in context": "context",
+    "call frame info": "cfi",
+    "call frame info with scanning": "cfi_scan",
+    "previous frame's frame pointer": "frame_pointer",
+    "stack scanning": "scan",
+    "inlining": "inline",
+    "prewalked": "prewalked",
+}
+
+
+def _hex(value: int, width: int) -> str:
+    return f"0x{value:0{width}x}"
+
+
+def _parse_frame(number: int, location: str) -> Dict[str, Any]:
+    """Parse the location part of a frame line into a JSON-style frame."""
+    frame: Dict[str, Any] = {
+        "frame": number,
+        "module": None,
+        "function": None,
+        "function_offset": None,
+        "file": None,
+        "line": None,
+        "offset": None,
+        "module_offset": None,
+        "missing_symbols": True,
+        "trust": "none",
+    }
+
+    source = _SOURCE.match(location)
+    if source is not None:
+        location = source["function"]
+        frame["file"] = source["file"]
+        frame["line"] = int(source["line"])
+        frame["function_offset"] = source["offset"]
+    else:
+        with_offset = _OFFSET.match(location)
+        if with_offset is not None:
+            location = with_offset["name"]
+            offset_key = "function_offset" if "!" in location else "module_offset"
+            frame[offset_key] = with_offset["offset"]
+
+    if location.startswith("0x") and "!" not in location:
+        frame["offset"] = location
+    elif "!" in location:
+        frame["module"], frame["function"] = location.split("!", 1)
+        frame["missing_symbols"] = False
+    else:
+        frame["module"] = location
+    return frame
+
+
+def _parse_module(line: str) -> Optional[Dict[str, Any]]:
+    match = _MODULE.match(line)
+    if match is None:
+        return None
+    width = len(match["base"])
+    rest = match["rest"]
+    warning = _SYMBOL_WARNING.search(rest)
+    reason = warning["reason"].lower() if warning is not None else ""
+    return {
+        "base_addr": _hex(int(match["base"], 16), width),
+        # The text report prints an inclusive end address, the JSON an exclusive one.
+        "end_addr": _hex(int(match["end"], 16) + 1, width),
+        "filename": match["filename"],
+        "version": None if match["version"] == "???" else match["version"],
+        "debug_file": warning["debug_file"] if warning is not None else None,
+        "debug_id": warning["debug_id"] if warning is not None else None,
+        "missing_symbols": "no symbols" in reason,
+        "loaded_symbols": warning is None,
+        "corrupt_symbols": "corrupt" in reason,
+        "main": "(main)" in rest,
+    }
+
+
+def _normalize_addresses(threads: List[Dict[str, Any]], modules: List[Dict[str, Any]], width: int) -> None:
+    """Pad frame addresses like the JSON output and fill in what module bases allow."""
+    bases = {module["filename"]: int(module["base_addr"], 16) for module in modules}
+    for thread in threads:
+        for frame in thread["frames"]:
+            offset = int(frame["offset"], 16) if frame["offset"] is not None else None
+            module_offset = int(frame["module_offset"], 16) if frame["module_offset"] is not None else None
+            base = bases.get(frame["module"])
+            if base is not None:
+                if offset is None and module_offset is not None:
+                    offset = base + module_offset
+                elif module_offset is None and offset is not None:
+                    module_offset = offset - base
+            frame["offset"] = _hex(offset, width) if offset is not None else None
+            frame["module_offset"] = _hex(module_offset, width) if module_offset is not None else None
+            if frame["function_offset"] is not None:
+                frame["function_offset"] = _hex(int(frame["function_offset"], 16), width)
+
+
+def parse_text_report(lines: Iterable[str]) -> Dict[str, Any]:
+    """Parse a minidump-stackwalk text report into the JSON result structure.
+
+    Args:
+        lines: Lines of the report, e.g. an open file object
+
+    Returns:
+        Dictionary shaped like the ``--json`` output. Fields the text report does
+        not carry are ``None``.
+    """
+    system_info: Dict[str, Any] = {"os": None, "os_ver": None, "cpu_arch": None, "cpu_info": None, "cpu_count": None}
+    crash_info: Dict[str, Any] = {"type": None, "address": None, "crashing_thread": None, "assertion": None}
+    threads: List[Dict[str, Any]] = []
+    modules: List[Dict[str, Any]] = []
+    unloaded_modules: List[Dict[str, Any]] = []
+    main_module: Optional[int] = None
+
+    section = "header"
+    header_key: Optional[str] = None
+    thread: Optional[Dict[str, Any]] = None
+    frame: Optional[Dict[str, Any]] = None
+
+    for raw_line in lines:
+        line = raw_line.rstrip("\r\n")
+        if not line.strip():
+            header_key = None
+            continue
+
+        if line.startswith("Thread "):
+            match = _THREAD.match(line)
+            if match is not None:
+                section = "thread"
+                frame = None
+                rest = match["rest"]
+                tid = _TID.search(rest)
+                crashed = "(crashed)" in rest
+                name = _TID.sub("", rest.replace("(crashed)", "")).strip()
+                thread = {
+                    "thread_id": int(tid["tid"]) if tid is not None else None,
+                    "thread_name": name or None,
+                    "frame_count": 0,
+                    "frames": [],
+                }
+                threads.append(thread)
+                if crashed:
+                    crash_info["crashing_thread"] = int(match["index"])
+                continue
+
+        if line == "Loaded modules:":
+            section, thread, frame = "modules", None, None
+            continue
+        if line == "Unloaded modules:":
+            section, thread, frame = "unloaded_modules", None, None
+            continue
+
+        if section == "thread" and thread is not None:
+            frame_match = _FRAME.match(line)
+            if frame_match is not None and not line.startswith("    "):
+                frame = _parse_frame(int(frame_match["frame"]), frame_match["location"])
+                thread["frames"].append(frame)
+                thread["frame_count"] += 1
+            elif frame is not None:
+                stripped = line.strip()
+                if stripped.startswith("Found by: "):
+                    frame["trust"] = _TRUST.get(stripped[len("Found by: ") :], "none")
+                else:
+                    registers = _REGISTER.findall(stripped)
+                    if registers:
+                        frame.setdefault("registers", {}).update(registers)
+                        if frame["offset"] is None:
+                            pc = next((value for name, value in registers if name in _PC_REGISTERS), None)
+                            frame["offset"] = pc
+            continue
+
+        if section in ("modules", "unloaded_modules"):
+            module = _parse_module(line)
+            if module is not None:
+                if module.pop("main") and section == "modules":
+                    main_module = len(modules)
+                (modules if section == "modules" else unloaded_modules).append(module)
+            continue
+
+        # Header: "Key: value" lines, optionally continued by indented lines
+        if line.startswith((" ", "\t")):
+            value = line.strip()
+            if header_key == "Operating system":
+                system_info["os_ver"] = value
+            elif header_key == "CPU":
+                if value.endswith(("CPU", "CPUs")) and value.split()[0].isdigit():
+                    system_info["cpu_count"] = int(value.split()[0])
+                else:
+                    system_info["cpu_info"] = value
+            continue
+
+        key, _, value = line.partition(":")
+        header_key = key
+        value = value.strip()
+        if key == "Operating system":
+            system_info["os"] = value
+        elif key == "CPU":
+            system_info["cpu_arch"] = value
+        elif key == "Crash reason":
+            crash_info["type"] = value
+        elif key == "Crash address":
+            crash_info["address"] = value
+        elif key == "Assertion":
+            crash_info["assertion"] = value
+
+    _normalize_addresses(threads, modules, 16 if system_info["cpu_arch"] in _WIDE_ARCHS else 8)
+
+    result: Dict[str, Any] = {
+        "status": "OK",
+        "system_info": system_info,
+        "crash_info": crash_info,
+        "main_module": main_module,
+        "modules": modules,
+        "unloaded_modules": unloaded_modules,
+        "thread_count": len(threads),
+        "threads": threads,
+        "crashing_thread": None,
+    }
+    crashing_index = crash_info["crashing_thread"]
+    if crashing_index is not None and crashing_index < len(threads):
+        result["crashing_thread"] = {"threads_index": crashing_index, **threads[crashing_index]}
+    return result
@@ -1,7 +1,9 @@
 """CLI interface for rust-minidump-mcp server and client."""
 
 import asyncio
-from typing import Any, Dict
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
 
 import typer
 
@@ -78,6 +80,93 @@ def server(
     asyncio.run(run_mcp_server(settings))
 
 
+@app.command("worker")
+def worker(
+    concurrency: Optional[int] = typer.Option(None, "--concurrency", "-c", min=1, help="Jobs run at once"),
+    log_level: Optional[str] = typer.Option(None, help="Log level (DEBUG, INFO, WARNING, ERROR)"),
+) -> None:
+    """Run background jobs from the shared job queue, without serving MCP.
+
+    The server starts MINIDUMP_MCP_JOBS__WORKERS of these itself. Workers started by
+    hand pick up jobs of any server using the same queue database and analysis directory.
+
+    Examples:
+        rust-minidump-mcp worker
+        MINIDUMP_MCP_CACHE__DIRECTORY=/srv/analyses rust-minidump-mcp worker -c 1
+    """
+    from minidumpmcp.config import ServerSettings
+    from minidumpmcp.worker import run_worker
+
+    settings_kwargs: Dict[str, Any] = {"log_level": log_level} if log_level else {}
+    asyncio.run(run_worker(ServerSettings(**settings_kwargs), concurrency))
+
+
+@app.command("triage")
+def triage(
+    directory: Path = typer.Argument(..., help="Directory of minidumps or Crashpad database"),
+    recursive: bool = typer.Option(True, help="Search subdirectories"),
+    stackwalk: bool = typer.Option(False, "--stackwalk", help="Also run a full stackwalk on every dump"),
+    symbols_path: Optional[Path] = typer.Option(None, "--symbols", "-s", help="Symbols directory for stackwalks"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-j", min=1, help="Metadata worker processes"),
+    concurrency: int = typer.Option(2, "--concurrency", "-c", min=1, help="Maximum concurrent stackwalks"),
+) -> None:
+    """Triage every minidump in a directory, streaming one JSON record per line.
+
+    Runs in-process, so a whole directory is handled by a single Python process
+    instead of one server start per dump.
+
+    Examples:
+        rust-minidump-mcp triage ./crashes > triage.ndjson
+        rust-minidump-mcp triage ~/.config/app/Crashpad --stackwalk --symbols ./symbols
+    """
+    from minidumpmcp.tools.triage import TriageProvider, find_minidumps
+
+    if not directory.is_dir():
+        typer.echo(f"Error: {directory} is not a directory", err=True)
+        raise typer.Exit(1)
+
+    async def run() -> int:
+        provider = TriageProvider()
+        failed = 0
+        paths = list(find_minidumps(directory, recursive))
+        symbols = str(symbols_path) if symbols_path else None
+        async for record in provider.triage(paths, stackwalk, symbols, workers, concurrency):
+            if not (record["success"] and record.get("stackwalk", {}).get("success", True)):
+                failed += 1
+            typer.echo(json.dumps(record))
+        typer.echo(f"Triaged {len(paths)} minidumps, {failed} failed", err=True)
+        return failed
+
+    if asyncio.run(run()):
+        raise typer.Exit(1)
+
+
+@app.command("prompt-sizes")
+def prompt_sizes(
+    stackwalk_json: Path = typer.Argument(..., help="JSON output of stackwalk_minidump or minidump-stackwalk"),
+) -> None:
+    """Measure the technical analysis prompt for every technical focus.
+
+    Prints the size in bytes and estimated tokens of the analyze_technical_details
+    prompt for each focus, and what each focus saves compared to "all".
+
+    Examples:
+        rust-minidump-mcp prompt-sizes crash.json
+    """
+    from minidumpmcp.prompts import CrashAnalysisProvider
+
+    try:
+        stackwalk_output = stackwalk_json.read_text(encoding="utf-8")
+    except OSError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+
+    result = asyncio.run(CrashAnalysisProvider().measure_technical_focus(stackwalk_output))
+    typer.echo(json.dumps(result, indent=2))
+    if not result["success"]:
+        raise typer.Exit(1)
+
+
 @app.callback()
 def main() -> None:
     """MiniDump MCP CLI Tool."""
@@ -1,6 +1,7 @@
 """Server configuration settings using Pydantic Settings."""
 
-from typing import Any, Literal, Tuple, Type, Union
+from pathlib import Path
+from typing import Any, List, Literal, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict
@@ -43,6 +44,216 @@ class SseTransportConfig(HttpTransportConfig):
     sse_path: str = Field(default="/sse", description="SSE endpoint path")
 
 
+class StackwalkConfig(BaseModel):
+    """Configuration for minidump-stackwalk runs."""
+
+    timeout: float = Field(default=30.0, gt=0, description="Seconds stackwalk_minidump waits for minidump-stackwalk")
+    grace_period: float = Field(
+        default=2.0, ge=0, description="Seconds a stopped minidump-stackwalk may take to exit before it is killed"
+    )
+    over_budget: Literal["triage", "reject", "run"] = Field(
+        default="triage",
+        description=(
+            "What stackwalk_minidump does with an analysis estimated to outlast its timeout or the request's "
+            "deadline: answer with the dump's metadata, return an error, or run it anyway"
+        ),
+    )
+
+
+class SubprocessLimitsConfig(BaseModel):
+    """Resource limits of the minidump-stackwalk and dump_syms processes; unset keeps the server's limits."""
+
+    address_space: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Bytes of virtual memory a tool process may map; full-memory dumps need several times their size",
+    )
+    cpu_seconds: Optional[int] = Field(default=None, gt=0, description="CPU seconds a tool process may use")
+    open_files: Optional[int] = Field(default=1024, gt=0, description="File descriptors a tool process may open")
+
+
+class JobConfig(BaseModel):
+    """Configuration for background jobs and their durable queue."""
+
+    database_path: Path = Field(
+        default_factory=lambda: Path.home() / ".cache" / "rust-minidump-mcp" / "jobs.sqlite3",
+        description="SQLite database of the job queue",
+    )
+    concurrency: int = Field(default=2, ge=1, description="Maximum number of jobs running at once")
+    timeout: float = Field(default=3600.0, gt=0, description="Seconds a job waits for minidump-stackwalk")
+    max_finished: int = Field(default=256, ge=1, description="Number of finished jobs whose status is kept")
+    max_attempts: int = Field(default=3, ge=1, description="Times a job is run before it is failed for good")
+    retry_backoff: float = Field(
+        default=5.0, ge=0, description="Seconds before the first retry of a failed job, doubled for every retry"
+    )
+    lease_seconds: float = Field(
+        default=60.0, gt=0, description="Seconds after which a job of a stopped worker is run again"
+    )
+    workers: int = Field(
+        default=0, ge=0, description="Job worker processes started by the server; 0 runs jobs in the server process"
+    )
+    poll_interval: float = Field(default=1.0, gt=0, description="Seconds an idle worker waits between queue checks")
+
+    @field_validator("database_path", mode="after")
+    @classmethod
+    def expand_database_path(cls, v: Path) -> Path:
+        """Expand ``~`` in the database path."""
+        return v.expanduser()
+
+
+class AnalysisCacheConfig(BaseModel):
+    """Configuration for the analysis cache, its optional shared directory and its resources."""
+
+    max_entries: int = Field(default=32, ge=1, description="Maximum number of cached analyses")
+    max_bytes: int = Field(default=512 * 1024 * 1024, ge=1, description="Maximum size of cached analyses in bytes")
+    page_size: int = Field(default=50, ge=1, description="Items per page of paginated analysis resources")
+    directory: Optional[Path] = Field(
+        default=None,
+        description="Directory analyses are shared through; defaults to ~/.cache/rust-minidump-mcp/analyses "
+        "when jobs run in worker processes",
+    )
+    max_disk_bytes: int = Field(
+        default=4 * 1024 * 1024 * 1024, ge=1, description="Maximum size of the analyses in the directory"
+    )
+    remote_urls: List[str] = Field(
+        default_factory=list,
+        description="Base URLs of HTTP key-value stores shared by server replicas; keys are spread over them "
+        "by consistent hashing. Takes precedence over the directory",
+    )
+    remote_timeout: float = Field(default=5.0, gt=0, description="Seconds a request to a key-value store may take")
+
+    @field_validator("directory", mode="after")
+    @classmethod
+    def expand_directory(cls, v: Optional[Path]) -> Optional[Path]:
+        """Expand ``~`` in the directory."""
+        return v.expanduser() if v is not None else None
+
+
+class SignatureConfig(BaseModel):
+    """Configuration for crash signatures and the persistent signature index."""
+
+    enabled: bool = Field(default=True, description="Compute signatures and index analyzed dumps")
+    database_path: Path = Field(
+        default_factory=lambda: Path.home() / ".cache" / "rust-minidump-mcp" / "signatures.sqlite3",
+        description="SQLite database of the signature index",
+    )
+    frame_count: int = Field(default=5, ge=1, description="Number of frames that make up a signature")
+    skip_functions: List[str] = Field(
+        default_factory=list,
+        description="Additional function regexes skipped when building signatures, on top of the defaults",
+    )
+
+    @field_validator("database_path", mode="after")
+    @classmethod
+    def expand_database_path(cls, v: Path) -> Path:
+        """Expand ``~`` in the database path."""
+        return v.expanduser()
+
+
+class SimilarityConfig(BaseModel):
+    """Configuration for the near-duplicate crash index."""
+
+    enabled: bool = Field(default=True, description="Sketch analyzed dumps for near-duplicate search")
+    database_path: Path = Field(
+        default_factory=lambda: Path.home() / ".cache" / "rust-minidump-mcp" / "similarity.sqlite3",
+        description="SQLite database of the similarity index",
+    )
+    bands: int = Field(default=16, ge=1, description="Number of LSH bands")
+    rows: int = Field(default=4, ge=1, description="MinHash values per LSH band")
+    shingle_size: int = Field(default=2, ge=1, description="Consecutive frames per shingle")
+    frame_depth: int = Field(default=32, ge=1, description="Crashing-thread frames included in a sketch")
+
+    @field_validator("database_path", mode="after")
+    @classmethod
+    def expand_database_path(cls, v: Path) -> Path:
+        """Expand ``~`` in the database path."""
+        return v.expanduser()
+
+
+class CrashpadConfig(BaseModel):
+    """Configuration for incremental Crashpad database ingestion."""
+
+    state_path: Path = Field(
+        default_factory=lambda: Path.home() / ".cache" / "rust-minidump-mcp" / "crashpad.sqlite3",
+        description="SQLite database remembering the reports already ingested",
+    )
+
+    @field_validator("state_path", mode="after")
+    @classmethod
+    def expand_state_path(cls, v: Path) -> Path:
+        """Expand ``~`` in the state path."""
+        return v.expanduser()
+
+
+class DumpStoreConfig(BaseModel):
+    """Configuration for the store of uploaded minidumps."""
+
+    path: Path = Field(
+        default_factory=lambda: Path.home() / ".cache" / "rust-minidump-mcp" / "dumps",
+        description="Directory of the content-addressed dump store",
+    )
+    upload_enabled: bool = Field(default=True, description="Accept dump uploads on HTTP transports")
+    upload_path: str = Field(default="/dumps", description="HTTP path of the upload endpoint")
+    max_upload_bytes: int = Field(
+        default=16 * 1024**3,
+        ge=1,
+        description="Maximum size of an uploaded dump, and of a compressed dump once decompressed",
+    )
+    store_local_dumps: bool = Field(
+        default=False, description="Hardlink (or copy) local dumps into the store when they are analyzed"
+    )
+    max_age_days: Optional[float] = Field(default=None, gt=0, description="Remove dumps not seen for this many days")
+    max_bytes: Optional[int] = Field(default=None, ge=1, description="Total size the store is trimmed to")
+    keep_per_signature: Optional[int] = Field(
+        default=None, ge=1, description="Most recently seen dumps kept per crash signature"
+    )
+
+    @field_validator("path", mode="after")
+    @classmethod
+    def expand_path(cls, v: Path) -> Path:
+        """Expand ``~`` in the store path."""
+        return v.expanduser()
+
+
+class PromptConfig(BaseModel):
+    """Configuration for the MCP prompts."""
+
+    hot_reload: bool = Field(
+        default=False, description="Reload prompt templates whose files changed (for template development)"
+    )
+    render_cache_entries: int = Field(default=64, ge=1, description="Rendered prompts kept in memory per provider")
+
+
+class MetricsConfig(BaseModel):
+    """Configuration for the Prometheus metrics endpoint."""
+
+    enabled: bool = Field(default=True, description="Serve metrics on HTTP transports")
+    path: str = Field(default="/metrics", description="HTTP path of the metrics endpoint")
+    loop_lag_interval: float = Field(
+        default=0.5, gt=0, description="Seconds between measurements of the event loop lag"
+    )
+
+
+class TracingConfig(BaseModel):
+    """Configuration for request tracing."""
+
+    enabled: bool = Field(default=True, description="Trace tool calls, prompts, resource reads and jobs")
+    sample_rate: float = Field(default=0.1, ge=0, le=1, description="Share of traces kept")
+    slow_threshold: Optional[float] = Field(
+        default=5.0, gt=0, description="Seconds after which a trace is kept regardless of the sample rate"
+    )
+    buffer_size: int = Field(default=256, ge=1, description="Traces kept in memory for the get_traces tool")
+    file: Optional[Path] = Field(default=None, description="JSON-lines file the spans of kept traces are appended to")
+    file_max_bytes: int = Field(default=10 * 1024 * 1024, ge=1, description="Size at which the trace file is rotated")
+    file_backups: int = Field(default=3, ge=0, description="Number of rotated trace files kept")
+
+    @field_validator("file", mode="after")
+    @classmethod
+    def expand_file(cls, v: Optional[Path]) -> Optional[Path]:
+        """Expand ``~`` in the trace file path."""
+        return v.expanduser() if v is not None else None
+
+
 # Union type for all transport configurations
 TransportConfig = Union[StdioTransportConfig, StreamableHttpConfig, SseTransportConfig]
 
@@ -82,6 +293,31 @@ class ServerSettings(BaseSettings):
     streamable_http: StreamableHttpConfig = Field(default_factory=StreamableHttpConfig)
     sse: SseTransportConfig = Field(default_factory=SseTransportConfig)
 
+    # Analyses and background analysis jobs
+    stackwalk: StackwalkConfig = Field(default_factory=StackwalkConfig)
+    limits: SubprocessLimitsConfig = Field(default_factory=SubprocessLimitsConfig)
+    jobs: JobConfig = Field(default_factory=JobConfig)
+
+    # Analysis cache
+    cache: AnalysisCacheConfig = Field(default_factory=AnalysisCacheConfig)
+
+    # Crash signatures
+    signatures: SignatureConfig = Field(default_factory=SignatureConfig)
+    similarity: SimilarityConfig = Field(default_factory=SimilarityConfig)
+
+    # Crashpad database ingestion
+    crashpad: CrashpadConfig = Field(default_factory=CrashpadConfig)
+
+    # Uploaded dumps
+    store: DumpStoreConfig = Field(default_factory=DumpStoreConfig)
+
+    # Prompt templates and rendered prompts
+    prompts: PromptConfig = Field(default_factory=PromptConfig)
+
+    # Metrics endpoint and request tracing
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+
     @property
     def transport_config(self) -> TransportConfig:
         """Get the configuration for the currently selected transport.
@@ -0,0 +1,151 @@
+"""Deadline budgeting for tool calls.
+
+Every MCP tool call runs under a deadline: the transport's request timeout,
+shortened by the caller through a ``timeout`` (seconds) entry in the request's
+``_meta``.  Work checks :func:`remaining` before it starts, and
+:class:`RuntimeModel` estimates how long a stackwalk of a dump will take from
+its size and module count, learning from the runs it observes.  Requests that
+cannot finish in time are rejected or downgraded up front instead of timing
+out after the work was done in vain.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Iterator, Optional, Tuple
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+# Monotonic time by which the current request has to be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+MIB = 1024 * 1024
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current request's deadline, or ``None`` without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def budget(timeout: float) -> float:
+    """Seconds work may take: *timeout*, cut to the current request's deadline and never negative."""
+    left = remaining()
+    return timeout if left is None else max(min(timeout, left), 0.0)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Run the block under a deadline *seconds* from now, or an earlier enclosing one."""
+    current = _deadline.get()
+    target = time.monotonic() + seconds
+    token = _deadline.set(target if current is None else min(current, target))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class DeadlineMiddleware(Middleware):
+    """Middleware giving every tool call a deadline."""
+
+    def __init__(self, timeout: float) -> None:
+        """Initialize the middleware.
+
+        Args:
+            timeout: Seconds a tool call may take, normally the transport's request timeout
+        """
+        self.timeout = timeout
+
+    async def on_call_tool(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        """Run the tool call under the transport's deadline, or the caller's shorter one."""
+        seconds = self.timeout
+        meta = getattr(context.message, "meta", None)
+        requested = getattr(meta, "timeout", None) if meta is not None else None
+        if isinstance(requested, (int, float)) and requested > 0:
+            seconds = min(seconds, float(requested))
+        with deadline(seconds):
+            return await call_next(context)
+
+
+class RuntimeModel:
+    """Rolling estimate of stackwalk runtimes from dump size and module count.
+
+    Runtimes are fitted as ``base + per_mib * MiB + per_module * modules`` by least
+    squares over the last *window* observed runs.  Until three runs are observed the
+    prior coefficients are used; while the runs do not determine a fit, e.g. when
+    all dumps are alike, the prior is scaled to match their mean runtime.
+    Estimates are scaled by ``1 + margin`` so borderline requests are not started.
+    """
+
+    def __init__(
+        self,
+        base: float = 0.5,
+        per_mib: float = 0.02,
+        per_module: float = 0.01,
+        window: int = 128,
+        margin: float = 0.25,
+    ) -> None:
+        """Initialize the model.
+
+        Args:
+            base: Prior seconds every run takes
+            per_mib: Prior seconds per MiB of dump
+            per_module: Prior seconds per loaded module
+            window: Number of recent runs the fit uses
+            margin: Fraction added to estimates
+        """
+        self._prior = (base, per_mib, per_module)
+        self._coefficients = self._prior
+        self._samples: Deque[Tuple[float, float, float]] = deque(maxlen=window)
+        self._margin = margin
+
+    @property
+    def coefficients(self) -> Tuple[float, float, float]:
+        """Current ``(base, per_mib, per_module)`` seconds."""
+        return self._coefficients
+
+    def estimate(self, size: int, modules: int = 0) -> float:
+        """Estimated seconds a stackwalk of a *size* byte dump with *modules* modules takes."""
+        base, per_mib, per_module = self._coefficients
+        return (base + per_mib * size / MIB + per_module * modules) * (1 + self._margin)
+
+    def observe(self, size: int, modules: int, seconds: float) -> None:
+        """Record the runtime of a finished stackwalk and refit."""
+        self._samples.append((size / MIB, float(modules), seconds))
+        if len(self._samples) >= 3:
+            self._coefficients = self._fit() or self._scaled_prior()
+
+    def _scaled_prior(self) -> Tuple[float, float, float]:
+        base, per_mib, per_module = self._prior
+        predicted = sum(base + per_mib * mib + per_module * modules for mib, modules, _ in self._samples)
+        if predicted <= 0:
+            return self._prior
+        scale = sum(seconds for _, _, seconds in self._samples) / predicted
+        return base * scale, per_mib * scale, per_module * scale
+
+    def _fit(self) -> Optional[Tuple[float, float, float]]:
+        # Normal equations of the least-squares fit, solved by Cramer's rule
+        rows = [(1.0, mib, modules, seconds) for mib, modules, seconds in self._samples]
+        matrix = [[sum(row[i] * row[j] for row in rows) for j in range(3)] for i in range(3)]
+        vector = [sum(row[i] * row[3] for row in rows) for i in range(3)]
+        determinant = _det3(matrix)
+        # Relative to the diagonal, so the check does not depend on the units
+        if abs(determinant) <= 1e-9 * matrix[0][0] * matrix[1][1] * matrix[2][2]:
+            return None
+        solution = []
+        for column in range(3):
+            replaced = [[vector[i] if j == column else matrix[i][j] for j in range(3)] for i in range(3)]
+            solution.append(max(_det3(replaced) / determinant, 0.0))
+        return solution[0], solution[1], solution[2]
+
+
+def _det3(m: list[list[float]]) -> float:
+    return (
+        m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1])
+        - m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0])
+        + m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0])
+    )
@@ -151,6 +151,117 @@ class MinidumpAnalysisError(MinidumpMCPError):
         super().__init__(message, context=context, suggestion=suggestion, error_code="MINIDUMP_ANALYSIS_FAILED")
 
 
+class AnalysisNotFoundError(MinidumpMCPError):
+    """Raised when a cached analysis is requested that does not exist."""
+
+    def __init__(self, analysis_hash: str) -> None:
+        """Initialize analysis not found error."""
+        message = f"No cached analysis found for '{analysis_hash}'"
+        context = {"analysis_hash": analysis_hash}
+        suggestion = "Run stackwalk_minidump on the dump again; old analyses are evicted when the cache is full"
+
+        super().__init__(message, context=context, suggestion=suggestion, error_code="ANALYSIS_NOT_FOUND")
+
+
+class DeadlineExceededError(MinidumpMCPError):
+    """Raised when an analysis cannot finish before the request's deadline."""
+
+    def __init__(self, minidump_path: Path, estimated_seconds: float, budget_seconds: float) -> None:
+        """Initialize deadline exceeded error."""
+        message = (
+            f"Analyzing '{minidump_path.name}' is estimated to take {estimated_seconds:.1f}s, "
+            f"but only {max(budget_seconds, 0.0):.1f}s are left"
+        )
+        context = {
+            "minidump": str(minidump_path),
+            "estimated_seconds": round(estimated_seconds, 1),
+            "budget_seconds": round(budget_seconds, 1),
+        }
+        suggestion = "Analyze the dump with submit_analysis, which runs in the background without the deadline"
+
+        super().__init__(message, context=context, suggestion=suggestion, error_code="DEADLINE_EXCEEDED")
+
+
+class JobNotFoundError(MinidumpMCPError):
+    """Raised when the status of an unknown analysis job is requested."""
+
+    def __init__(self, job_id: str) -> None:
+        """Initialize job not found error."""
+        message = f"No analysis job found for '{job_id}'"
+        context = {"job_id": job_id}
+        suggestion = "Submit the analysis again; finished jobs are forgotten after a while and on server restarts"
+
+        super().__init__(message, context=context, suggestion=suggestion, error_code="JOB_NOT_FOUND")
+
+
+class MemoryNotCapturedError(MinidumpMCPError):
+    """Raised when a minidump holds no memory at a requested address."""
+
+    def __init__(self, minidump_path: Path, address: str) -> None:
+        """Initialize memory not captured error."""
+        message = f"Memory at {address} is not captured in '{minidump_path.name}'"
+        context = {"minidump": str(minidump_path), "address": address}
+        suggestion = (
+            "Minidumps usually capture only thread stacks and memory around registers; "
+            "pick an address inside one of the listed regions"
+        )
+
+        super().__init__(message, context=context, suggestion=suggestion, error_code="MEMORY_NOT_CAPTURED")
+
+
+class SignatureIndexError(MinidumpMCPError):
+    """Raised when the crash signature index cannot be read or updated."""
+
+    def __init__(self, database: str, reason: str) -> None:
+        """Initialize signature index error."""
+        message = f"Signature index '{database}' is unavailable: {reason}"
+        context = {"database": database, "reason": reason}
+        suggestion = "Check that the signature database path is writable and not used by another program"
+        if "locked" in reason.lower():
+            suggestion = "The database is busy. Retry the request"
+
+        super().__init__(message, context=context, suggestion=suggestion, error_code="SIGNATURE_INDEX_FAILED")
+
+
+class CrashpadDatabaseError(MinidumpMCPError):
+    """Raised when a Crashpad database cannot be ingested."""
+
+    def __init__(self, database: Path, reason: str) -> None:
+        """Initialize Crashpad database error."""
+        message = f"Cannot ingest Crashpad database '{database}': {reason}"
+        context = {"database": str(database), "reason": reason}
+        suggestion = "Pass the database root, the directory containing 'pending' and 'completed'"
+        if "state" in reason.lower():
+            suggestion = "Check that the Crashpad state database path is writable and not used by another program"
+
+        super().__init__(message, context=context, suggestion=suggestion, error_code="CRASHPAD_DATABASE_FAILED")
+
+
+class UploadRejectedError(MinidumpMCPError):
+    """Raised when an uploaded dump is not accepted into the dump store."""
+
+    def __init__(self, reason: str, received_bytes: Optional[int] = None, status_code: int = 400) -> None:
+        """Initialize upload rejected error.
+
+        Args:
+            reason: Why the upload was rejected
+            received_bytes: Bytes received before the upload was rejected
+            status_code: HTTP status reported to the uploading client
+        """
+        self.status_code = status_code
+        message = f"Upload rejected: {reason}"
+        context: dict[str, Any] = {"reason": reason}
+        if received_bytes is not None:
+            context["received_bytes"] = received_bytes
+        suggestion = "Upload the raw minidump (.dmp) file as the request body"
+        if "maximum upload size" in reason:
+            suggestion = "Raise MINIDUMP_MCP_STORE__MAX_UPLOAD_BYTES or analyze the dump from a shared path"
+        elif "does not match" in reason:
+            suggestion = "Retry the upload; the data was corrupted in transfer or the announced hash is wrong"
+
+        super().__init__(message, context=context, suggestion=suggestion, error_code="UPLOAD_REJECTED")
+
+
 class SymbolExtractionError(MinidumpMCPError):
     """Raised when symbol extraction fails."""
 
@@ -168,6 +279,21 @@ class SymbolExtractionError(MinidumpMCPError):
         super().__init__(message, context=context, suggestion=suggestion, error_code="SYMBOL_EXTRACTION_FAILED")
 
 
+class InvalidParameterError(MinidumpMCPError):
+    """Raised when a tool or resource argument is malformed."""
+
+    def __init__(self, parameter: str, value: Any, reason: str) -> None:
+        """Initialize invalid parameter error."""
+        message = f"Invalid value for parameter '{parameter}': {reason}"
+        context = {"parameter": parameter, "value": str(value), "reason": reason}
+
+        suggestion = f"Check the tool description for valid values of '{parameter}'"
+        if "projection" in reason.lower():
+            suggestion = "Use field paths such as 'crash_info', 'modules' or 'threads[*].frames[:10]'"
+
+        super().__init__(message, context=context, suggestion=suggestion, error_code="INVALID_PARAMETER")
+
+
 # Configuration errors
 class ConfigurationError(MinidumpMCPError):
     """Raised when configuration is invalid."""
@@ -0,0 +1,390 @@
+"""Server metrics in the Prometheus text exposition format.
+
+A small registry without dependencies: counters, gauges and histograms are
+updated in place on the event loop, and collectors read the state other
+components already keep (cache counters, job queue, tool subprocess usage)
+only when the metrics are scraped.  :class:`ServerMetrics` holds the
+server's own metrics, fed by the middleware and monitors below; the metrics
+route serves :meth:`MetricsRegistry.render` on HTTP transports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import re
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from minidumpmcp.analysis.cache import AnalysisCache
+from minidumpmcp.storage import JobQueue
+from minidumpmcp.storage.job_queue import JOB_STATES
+from minidumpmcp.tools import _common
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Shared with the wall time distribution of tool subprocesses, which the tools count themselves
+DEFAULT_BUCKETS = _common.WALL_TIME_BUCKETS
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+# Parts of resource URIs that would give every analysis or page its own label value
+_URI_PARAMETERS = (re.compile(r"/[0-9a-f]{16,}(?=/|$)"), re.compile(r"/\d+(?=/|$)"))
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metric:
+    """A metric family: one value per combination of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        """Initialize the metric.
+
+        Args:
+            name: Metric name
+            help: One-line description
+            labelnames: Names of the labels distinguishing the values
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f"{self.name} takes the labels {', '.join(self.labelnames) or 'none'}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key, strict=True))
+
+    def samples(self) -> Iterator[Sample]:
+        """Samples of the metric, as ``(name, labels, value)``."""
+        return iter(())
+
+
+class Counter(Metric):
+    """Value that only goes up."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        """Initialize the counter; see :class:`Metric`."""
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add *amount* to the value for *labels*."""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        """Samples of the counter."""
+        for key, value in self._values.items():
+            yield self.name, self._labels(key), value
+
+
+class Gauge(Counter):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the value for *labels*."""
+        self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        """Initialize the histogram; see :class:`Metric`.
+
+        Args:
+            name: Metric name
+            help: One-line description
+            labelnames: Names of the labels distinguishing the distributions
+            buckets: Upper bounds of the buckets, in increasing order
+        """
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: count in every bucket (not cumulative, +Inf last), and the sum
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record *value* in the distribution for *labels*."""
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def add(self, counts: Sequence[int], total: float, **labels: str) -> None:
+        """Add observations already counted per bucket (not cumulative, +Inf last) that sum to *total*."""
+        if len(counts) != len(self.buckets) + 1:
+            raise ValueError(f"{self.name} takes {len(self.buckets) + 1} bucket counts")
+        key = self._key(labels)
+        current = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+        for index, count in enumerate(counts):
+            current[index] += count
+        self._sums[key] = self._sums.get(key, 0.0) + total
+
+    def samples(self) -> Iterator[Sample]:
+        """Bucket, sum and count samples of every distribution."""
+        for key, counts in self._counts.items():
+            labels = self._labels(key)
+            total = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                total += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, total
+            yield f"{self.name}_sum", labels, self._sums[key]
+            yield f"{self.name}_count", labels, total
+
+
+class MetricsRegistry:
+    """Metrics of the server, rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric) -> Any:
+        """Add *metric* and return it."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register a new counter."""
+        return self.register(Counter(name, help, labelnames))  # type: ignore[no-any-return]
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register a new gauge."""
+        return self.register(Gauge(name, help, labelnames))  # type: ignore[no-any-return]
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Register a new histogram."""
+        return self.register(Histogram(name, help, labelnames, buckets))  # type: ignore[no-any-return]
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        """Add a function building metrics from other components' state at every scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the text exposition format."""
+        metrics: List[Metric] = list(self._metrics.values())
+        for collector in self._collectors:
+            metrics.extend(collector())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(f'{label}="{_escape(text)}"' for label, text in labels.items())
+                    name = f"{name}{{{rendered}}}"
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def cache_collector(cache: AnalysisCache) -> Callable[[], Iterable[Metric]]:
+    """Collector of the analysis cache's counters and size."""
+
+    def collect() -> Iterator[Metric]:
+        lookups = Counter("minidump_mcp_analysis_cache_lookups_total", "Analysis cache lookups", ("result",))
+        lookups.inc(cache.hits, result="hit")
+        lookups.inc(cache.shared_hits, result="shared_hit")
+        lookups.inc(cache.misses, result="miss")
+        yield lookups
+        evictions = Counter("minidump_mcp_analysis_cache_evictions_total", "Analyses evicted from memory")
+        evictions.inc(cache.evictions)
+        yield evictions
+        entries = Gauge("minidump_mcp_analysis_cache_entries", "Analyses held in memory")
+        entries.set(len(cache))
+        yield entries
+        size = Gauge("minidump_mcp_analysis_cache_bytes", "Size of the analyses held in memory")
+        size.set(cache.size)
+        yield size
+
+    return collect
+
+
+def job_queue_collector(queue: JobQueue) -> Callable[[], Iterable[Metric]]:
+    """Collector of the number of background jobs in every state."""
+
+    def collect() -> Iterator[Metric]:
+        jobs = Gauge("minidump_mcp_jobs", "Background jobs by state", ("state",))
+        counts = queue.counts()
+        for state in JOB_STATES:
+            jobs.set(counts[state], state=state)
+        yield jobs
+
+    return collect
+
+
+def subprocess_collector() -> Iterator[Metric]:
+    """Metrics of the tool subprocesses run by this process."""
+    stats = _common.subprocess_stats
+    runs = Counter("minidump_mcp_subprocess_runs_total", "Tool subprocesses run", ("tool", "outcome"))
+    duration = Histogram(
+        "minidump_mcp_subprocess_duration_seconds",
+        "Wall time of tool subprocesses",
+        ("tool",),
+        _common.WALL_TIME_BUCKETS,
+    )
+    cpu = Counter("minidump_mcp_subprocess_cpu_seconds_total", "CPU time of tool subprocesses", ("tool", "mode"))
+    rss = Gauge("minidump_mcp_subprocess_max_rss_bytes", "Largest peak memory of a tool subprocess", ("tool",))
+    for tool, usage in stats.tools.items():
+        runs.inc(usage.runs - usage.failed, tool=tool, outcome="ok")
+        runs.inc(usage.failed, tool=tool, outcome="failed")
+        duration.add(usage.wall_time_counts, usage.wall_seconds, tool=tool)
+        cpu.inc(usage.user_seconds, tool=tool, mode="user")
+        cpu.inc(usage.system_seconds, tool=tool, mode="system")
+        rss.set(usage.max_rss_bytes, tool=tool)
+    stopped = Counter("minidump_mcp_subprocess_stopped_total", "Tool subprocesses stopped early", ("reason",))
+    stopped.inc(stats.cancelled, reason="cancelled")
+    stopped.inc(stats.timed_out, reason="timed_out")
+    killed = Counter("minidump_mcp_subprocess_killed_total", "Tool subprocesses killed after ignoring SIGTERM")
+    killed.inc(stats.killed)
+    yield from (runs, duration, cpu, rss, stopped, killed)
+
+
+def _resource_name(uri: str) -> str:
+    """Resource URI without its query and with hashes and indexes replaced by placeholders."""
+    name = uri.split("?", 1)[0]
+    for pattern, placeholder in zip(_URI_PARAMETERS, ("/{hash}", "/{n}"), strict=True):
+        name = pattern.sub(placeholder, name)
+    return name
+
+
+class ServerMetrics:
+    """The metrics recorded by the server itself."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        """Register the metrics in *registry*, or in a new registry."""
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.request_duration = self.registry.histogram(
+            "minidump_mcp_request_duration_seconds",
+            "Duration of MCP tool calls, prompt renders and resource reads",
+            ("kind", "name", "outcome"),
+        )
+        self.http_bytes = self.registry.counter("minidump_mcp_http_bytes_total", "HTTP body bytes", ("direction",))
+        self.loop_lag = self.registry.histogram(
+            "minidump_mcp_event_loop_lag_seconds", "Delay of event loop callbacks past their due time", (), LAG_BUCKETS
+        )
+
+
+class RequestMetricsMiddleware(Middleware):
+    """Times MCP tool calls, prompt renders and resource reads."""
+
+    def __init__(self, metrics: ServerMetrics) -> None:
+        """Initialize the middleware."""
+        self._metrics = metrics
+
+    async def _timed(self, kind: str, name: str, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call_next(context)
+            outcome = "ok"
+            return result
+        finally:
+            self._metrics.request_duration.observe(time.perf_counter() - started, kind=kind, name=name, outcome=outcome)
+
+    async def on_call_tool(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        """Time a tool call."""
+        return await self._timed("tool", context.message.name, context, call_next)
+
+    async def on_get_prompt(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        """Time a prompt render."""
+        return await self._timed("prompt", context.message.name, context, call_next)
+
+    async def on_read_resource(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        """Time a resource read."""
+        return await self._timed("resource", _resource_name(str(context.message.uri)), context, call_next)
+
+
+class HttpBytesMiddleware:
+    """ASGI middleware counting the request and response body bytes of every HTTP request."""
+
+    def __init__(self, app: ASGIApp, metrics: ServerMetrics) -> None:
+        """Wrap *app*."""
+        self.app = app
+        self._bytes = metrics.http_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Count the bodies passing through."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def counting_receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                self._bytes.inc(len(message.get("body", b"")), direction="in")
+            return message
+
+        async def counting_send(message: Message) -> None:
+            if message["type"] == "http.response.body":
+                self._bytes.inc(len(message.get("body", b"")), direction="out")
+            await send(message)
+
+        await self.app(scope, counting_receive, counting_send)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs a callback that sleeps for a fixed interval."""
+
+    def __init__(self, metrics: ServerMetrics, interval: float = 0.5) -> None:
+        """Initialize the monitor.
+
+        Args:
+            metrics: Metrics receiving the lag
+            interval: Seconds between measurements
+        """
+        self._lag = metrics.loop_lag
+        self._interval = interval
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        """Start measuring on the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._measure())
+
+    async def close(self) -> None:
+        """Stop measuring."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _measure(self) -> None:
+        while True:
+            due = time.monotonic() + self._interval
+            await asyncio.sleep(self._interval)
+            self._lag.observe(max(time.monotonic() - due, 0.0))
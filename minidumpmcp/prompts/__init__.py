@@ -1,5 +1,6 @@
 """Crash analysis prompts for minidump MCP server."""
 
 from .crash_analysis_provider import CrashAnalysisProvider
+from .templates import RenderCache, Template, TemplateRegistry
 
-__all__ = ["CrashAnalysisProvider"]
+__all__ = ["CrashAnalysisProvider", "RenderCache", "Template", "TemplateRegistry"]
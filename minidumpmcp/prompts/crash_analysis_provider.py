@@ -2,18 +2,36 @@
 
 import json
 import logging
-from pathlib import Path
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
+
+from minidumpmcp.analysis.classifier import classify, format_findings
+from minidumpmcp.analysis.model import StackwalkResult
+from minidumpmcp.tracing import annotate, span
+
+from .focus import SLICE_NOTES, TECHNICAL_FOCUS, estimate_tokens, focus_slice
+from .templates import RenderCache, TemplateRegistry, output_hash
 
 logger = logging.getLogger(__name__)
 
 
+def _unwrap(stackwalk_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Stackwalk result of either its own JSON or a complete stackwalk_minidump result."""
+    data = stackwalk_data.get("data")
+    return data if isinstance(data, dict) else stackwalk_data
+
+
 class CrashAnalysisProvider:
     """Provider for crash analysis prompts."""
 
-    def __init__(self) -> None:
-        """Initialize the crash analysis provider."""
-        self._prompts_dir = Path(__file__).parent
+    def __init__(self, templates: Optional[TemplateRegistry] = None, render_cache_entries: int = 64) -> None:
+        """Initialize the crash analysis provider.
+
+        Args:
+            templates: Registry of prompt templates, loaded from this package when omitted
+            render_cache_entries: Number of rendered prompts kept in memory
+        """
+        self._templates = templates if templates is not None else TemplateRegistry()
+        self._rendered = RenderCache(render_cache_entries)
 
     async def analyze_crash_with_expertise(
         self,
@@ -37,55 +55,66 @@ class CrashAnalysisProvider:
             return self._create_usage_guide("analyze_crash_with_expertise")
 
         try:
-            # Parse JSON string to dict
-            # Parse JSON string to dict
-            try:
-                stackwalk_data = json.loads(stackwalk_output)
-            except json.JSONDecodeError as e:
-                error_msg = f"Invalid JSON in stackwalk_output: {str(e)}"
-                logger.error(error_msg)
-                return self._create_error_response(
-                    "analyze_crash_with_expertise",
-                    error_msg,
-                    "The stackwalk_output must be a valid JSON string.",
-                )
-
-            # Validate it's a dict
-            if not isinstance(stackwalk_data, dict):
-                error_msg = f"stackwalk_output must be a JSON object, got {type(stackwalk_data).__name__}"
-                logger.error(error_msg)
-                return self._create_error_response(
-                    "analyze_crash_with_expertise",
-                    error_msg,
-                    "The stackwalk_output must be a JSON object (dictionary).",
+            # Templates are preloaded; repeated calls on the same output are served from the render cache
+            with span("prompt.lookup"):
+                template = self._templates.get("analyze_crash_with_expertise")
+                if template is None:
+                    error_msg = f"Template file not found: {self._templates.path_for('analyze_crash_with_expertise')}"
+                    logger.error(error_msg)
+                    return self._create_error_response(
+                        "analyze_crash_with_expertise",
+                        error_msg,
+                        "The prompt template file is missing. Please ensure the installation is complete.",
+                    )
+                cache_key = (
+                    template.name,
+                    template.version,
+                    output_hash(stackwalk_output),
+                    tuple(focus_areas or ()),
+                    None,
                 )
+                cached = self._rendered.get(cache_key)
+                annotate(cached=cached is not None)
+                if cached is not None:
+                    return cached
 
-            # Load the analyze crash with expertise template
-            template_path = self._prompts_dir / "analyze_crash_with_expertise.md"
-            if not template_path.exists():
-                error_msg = f"Template file not found: {template_path}"
-                logger.error(error_msg)
-                return self._create_error_response(
-                    "analyze_crash_with_expertise",
-                    error_msg,
-                    "The prompt template file is missing. Please ensure the installation is complete.",
+            # Parse JSON string to dict
+            with span("prompt.parse", bytes=len(stackwalk_output)):
+                try:
+                    stackwalk_data = json.loads(stackwalk_output)
+                except json.JSONDecodeError as e:
+                    error_msg = f"Invalid JSON in stackwalk_output: {str(e)}"
+                    logger.error(error_msg)
+                    return self._create_error_response(
+                        "analyze_crash_with_expertise",
+                        error_msg,
+                        "The stackwalk_output must be a valid JSON string.",
+                    )
+
+                # Validate it's a dict
+                if not isinstance(stackwalk_data, dict):
+                    error_msg = f"stackwalk_output must be a JSON object, got {type(stackwalk_data).__name__}"
+                    logger.error(error_msg)
+                    return self._create_error_response(
+                        "analyze_crash_with_expertise",
+                        error_msg,
+                        "The stackwalk_output must be a JSON object (dictionary).",
+                    )
+
+            # Build the complete prompt with the classifier findings ahead of the analysis data
+            with span("prompt.render"):
+                prompt = f"{template.text}\n\n{self._findings_block(stackwalk_data)}## Stackwalk Output\n\n"
+                prompt += f"```json\n{json.dumps(stackwalk_data, indent=2)}\n```\n\n"
+
+                if focus_areas and isinstance(focus_areas, list):
+                    prompt += f"**Focus Areas:** {', '.join(focus_areas)}\n\n"
+
+                prompt += (
+                    "Please analyze this crash dump and provide your expert analysis "
+                    "following the response format specified above."
                 )
 
-            with open(template_path, "r", encoding="utf-8") as f:
-                template = f.read()
-
-            # Build the complete prompt with analysis data
-            prompt = f"{template}\n\n## Stackwalk Output\n\n"
-            prompt += f"```json\n{json.dumps(stackwalk_data, indent=2)}\n```\n\n"
-
-            if focus_areas and isinstance(focus_areas, list):
-                prompt += f"**Focus Areas:** {', '.join(focus_areas)}\n\n"
-
-            prompt += (
-                "Please analyze this crash dump and provide your expert analysis "
-                "following the response format specified above."
-            )
-
+            self._rendered.put(cache_key, prompt)
             return prompt
 
         except Exception as e:
@@ -118,7 +147,7 @@ class CrashAnalysisProvider:
             return self._create_usage_guide("analyze_technical_details")
 
         # Validate technical_focus
-        valid_focus = ["registers", "memory", "stack_frames", "all"]
+        valid_focus = list(TECHNICAL_FOCUS)
         if technical_focus not in valid_focus:
             error_msg = f"Invalid technical_focus: '{technical_focus}'. Must be one of: {valid_focus}"
             logger.error(error_msg)
@@ -129,52 +158,62 @@ class CrashAnalysisProvider:
             )
 
         try:
-            # Parse JSON string to dict
-            # Parse JSON string to dict
-            try:
-                stackwalk_data = json.loads(stackwalk_output)
-            except json.JSONDecodeError as e:
-                error_msg = f"Invalid JSON in stackwalk_output: {str(e)}"
-                logger.error(error_msg)
-                return self._create_error_response(
-                    "analyze_technical_details",
-                    error_msg,
-                    "The stackwalk_output must be a valid JSON string.",
-                )
-
-            # Validate it's a dict
-            if not isinstance(stackwalk_data, dict):
-                error_msg = f"stackwalk_output must be a JSON object, got {type(stackwalk_data).__name__}"
-                logger.error(error_msg)
-                return self._create_error_response(
-                    "analyze_technical_details",
-                    error_msg,
-                    "The stackwalk_output must be a JSON object (dictionary).",
-                )
+            # Templates are preloaded; repeated calls on the same output are served from the render cache
+            with span("prompt.lookup"):
+                template = self._templates.get("analyze_technical_details")
+                if template is None:
+                    error_msg = f"Template file not found: {self._templates.path_for('analyze_technical_details')}"
+                    logger.error(error_msg)
+                    return self._create_error_response(
+                        "analyze_technical_details",
+                        error_msg,
+                        "The prompt template file is missing. Please ensure the installation is complete.",
+                    )
+                cache_key = (template.name, template.version, output_hash(stackwalk_output), (), technical_focus)
+                cached = self._rendered.get(cache_key)
+                annotate(cached=cached is not None)
+                if cached is not None:
+                    return cached
 
-            # Load the technical details template
-            template_path = self._prompts_dir / "analyze_technical_details.md"
-            if not template_path.exists():
-                error_msg = f"Template file not found: {template_path}"
-                logger.error(error_msg)
-                return self._create_error_response(
-                    "analyze_technical_details",
-                    error_msg,
-                    "The prompt template file is missing. Please ensure the installation is complete.",
+            # Parse JSON string to dict
+            with span("prompt.parse", bytes=len(stackwalk_output)):
+                try:
+                    stackwalk_data = json.loads(stackwalk_output)
+                except json.JSONDecodeError as e:
+                    error_msg = f"Invalid JSON in stackwalk_output: {str(e)}"
+                    logger.error(error_msg)
+                    return self._create_error_response(
+                        "analyze_technical_details",
+                        error_msg,
+                        "The stackwalk_output must be a valid JSON string.",
+                    )
+
+                # Validate it's a dict
+                if not isinstance(stackwalk_data, dict):
+                    error_msg = f"stackwalk_output must be a JSON object, got {type(stackwalk_data).__name__}"
+                    logger.error(error_msg)
+                    return self._create_error_response(
+                        "analyze_technical_details",
+                        error_msg,
+                        "The stackwalk_output must be a JSON object (dictionary).",
+                    )
+
+            # Build the complete prompt from the template sections and the data slice of the focus
+            with span("prompt.render"):
+                prompt = f"{template.sections(technical_focus)}\n\n{self._findings_block(stackwalk_data)}"
+                prompt += "## Stackwalk Output\n\n"
+                if technical_focus == "all":
+                    prompt += f"```json\n{json.dumps(stackwalk_data, indent=2)}\n```\n\n"
+                else:
+                    data = focus_slice(_unwrap(stackwalk_data), technical_focus)
+                    prompt += f"{SLICE_NOTES[technical_focus]}\n\n```json\n{json.dumps(data, indent=2)}\n```\n\n"
+                prompt += f"**Technical Focus:** {technical_focus}\n\n"
+                prompt += (
+                    "Please perform a deep technical analysis of this crash dump "
+                    "following the response format specified above."
                 )
 
-            with open(template_path, "r", encoding="utf-8") as f:
-                template = f.read()
-
-            # Build the complete prompt
-            prompt = f"{template}\n\n## Stackwalk Output\n\n"
-            prompt += f"```json\n{json.dumps(stackwalk_data, indent=2)}\n```\n\n"
-            prompt += f"**Technical Focus:** {technical_focus}\n\n"
-            prompt += (
-                "Please perform a deep technical analysis of this crash dump "
-                "following the response format specified above."
-            )
-
+            self._rendered.put(cache_key, prompt)
             return prompt
 
         except Exception as e:
@@ -186,6 +225,51 @@ class CrashAnalysisProvider:
                 "An unexpected error occurred. Please check the server logs for details.",
             )
 
+    async def measure_technical_focus(self, stackwalk_output: str) -> Dict[str, Any]:
+        """
+        Measure the analyze_technical_details prompt for every technical focus.
+
+        Token counts are estimated from the prompt length.
+
+        Args:
+            stackwalk_output: Complete JSON output from stackwalk_minidump tool as JSON string
+
+        Returns:
+            Dictionary with the size of each prompt and what each focus saves compared to "all"
+        """
+        sizes: Dict[str, Dict[str, Any]] = {}
+        for focus in TECHNICAL_FOCUS:
+            prompt = await self.analyze_technical_details(stackwalk_output, focus)
+            if prompt.startswith("## Error in "):
+                return {"success": False, "error": prompt}
+            sizes[focus] = {"bytes": len(prompt.encode("utf-8")), "estimated_tokens": estimate_tokens(prompt)}
+        full = sizes["all"]
+        for size in sizes.values():
+            size["saved_bytes"] = full["bytes"] - size["bytes"]
+            size["saved_tokens"] = full["estimated_tokens"] - size["estimated_tokens"]
+            size["reduction"] = round(full["bytes"] / size["bytes"], 2)
+        return {"success": True, "focus": sizes}
+
+    @staticmethod
+    def _findings_block(stackwalk_data: Dict[str, Any]) -> str:
+        """
+        Classify the crash and render the findings placed ahead of the stackwalk output.
+
+        Accepts the ``data`` of a stackwalk_minidump result as well as the complete result.
+
+        Args:
+            stackwalk_data: Parsed stackwalk output
+
+        Returns:
+            Findings block followed by a blank line, or an empty string if the data cannot be classified
+        """
+        try:
+            findings = classify(StackwalkResult.from_dict(_unwrap(stackwalk_data)))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            logger.warning(f"Could not classify stackwalk output: {e}")
+            return ""
+        return f"{format_findings(findings)}\n\n"
+
     def _create_usage_guide(self, prompt_name: str) -> str:
         """
         Create a usage guide for when prompt is called without parameters.
@@ -213,6 +297,7 @@ and concrete improvement suggestions.
 2. Pass the resulting JSON output to this prompt for expert analysis
 
 The analysis will include:
+- Deterministic findings (null dereference, stack overflow, abort/panic, freed memory) checked first
 - Programming language detection from modules/symbols
 - Crash pattern recognition
 - Prevention strategies and code improvements
@@ -0,0 +1,152 @@
+"""Stackwalk data sent with focused technical analyses.
+
+A full stackwalk result lists every thread and module of the process, while a
+focused analysis only looks at part of it.  :func:`focus_slice` keeps what a
+focus needs, next to ``crash_info`` and ``system_info``:
+
+- ``registers``: the crashing thread with its top frames, whose first frame
+  carries the CPU context;
+- ``memory``: the crashing thread's context frame, the modules containing the
+  fault address or a register value, and where the fault address and those
+  register values fall (module and offset, NULL page);
+- ``stack_frames``: every frame of the crashing thread and the modules they
+  belong to;
+- ``all``: the unchanged result.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from minidumpmcp.analysis.classifier import NULL_PAGE_LIMIT
+
+TECHNICAL_FOCUS = ("registers", "memory", "stack_frames", "all")
+
+# Rough size of a token in prompt text, used to estimate token counts
+CHARS_PER_TOKEN = 4
+
+# Frames of the crashing thread kept for the registers focus
+REGISTER_FRAMES = 8
+
+_CONTEXT_KEYS = ("status", "system_info", "crash_info")
+_THREAD_KEYS = ("threads_index", "thread_id", "thread_name", "frame_count", "last_error_value")
+
+# What each slice holds, stated in the prompt so that the analysis does not look for the rest
+SLICE_NOTES = {
+    "registers": f"Stackwalk output reduced to the crashing thread and its top {REGISTER_FRAMES} frames.",
+    "memory": (
+        "Stackwalk output reduced to the crashing thread's context frame and the modules containing "
+        "the fault address or a register value; `address_regions` tells where each address falls. "
+        "Use the read_dump_memory tool to inspect the memory around these addresses."
+    ),
+    "stack_frames": "Stackwalk output reduced to the frames of the crashing thread and their modules.",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of prompt text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _address(value: Any) -> Optional[int]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return int(value, 16)
+    except ValueError:
+        return None
+
+
+def _crashing_thread(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    thread = data.get("crashing_thread")
+    if isinstance(thread, dict):
+        return thread
+    index = (data.get("crash_info") or {}).get("crashing_thread")
+    threads = data.get("threads")
+    if isinstance(index, int) and isinstance(threads, list) and 0 <= index < len(threads):
+        thread = threads[index]
+    return thread if isinstance(thread, dict) else None
+
+
+def _thread(thread: Dict[str, Any], max_frames: Optional[int]) -> Dict[str, Any]:
+    result = {key: thread[key] for key in _THREAD_KEYS if key in thread}
+    frames = thread.get("frames") or []
+    result["frames"] = frames if max_frames is None else frames[:max_frames]
+    return result
+
+
+def _module_at(modules: List[Dict[str, Any]], address: int) -> Optional[Tuple[Dict[str, Any], int]]:
+    for module in modules:
+        base = _address(module.get("base_addr"))
+        end = _address(module.get("end_addr"))
+        if base is not None and end is not None and base <= address < end:
+            return module, base
+    return None
+
+
+def _memory_slice(data: Dict[str, Any], thread: Optional[Dict[str, Any]], result: Dict[str, Any]) -> None:
+    """Add the context frame, the modules around the interesting addresses and their regions."""
+    addresses: List[Tuple[str, int]] = []
+    fault = _address((data.get("crash_info") or {}).get("address"))
+    if fault is not None:
+        addresses.append(("fault address", fault))
+    if thread is not None:
+        result["crashing_thread"] = _thread(thread, 1)
+        frames = thread.get("frames") or []
+        registers = (frames[0].get("registers") or {}) if frames else {}
+        for name, value in registers.items():
+            number = _address(value)
+            if number is not None:
+                addresses.append((name, number))
+
+    kept: Dict[str, List[Dict[str, Any]]] = {"modules": [], "unloaded_modules": []}
+    regions = []
+    for name, value in addresses:
+        region: Dict[str, Any] = {"from": name, "address": f"0x{value:x}"}
+        for key in ("modules", "unloaded_modules"):
+            found = _module_at(data.get(key) or [], value)
+            if found is None:
+                continue
+            module, base = found
+            if not any(module is other for other in kept[key]):
+                kept[key].append(module)
+            region["module" if key == "modules" else "unloaded_module"] = module.get("filename")
+            region["module_offset"] = f"0x{value - base:x}"
+            break
+        else:
+            if name != "fault address":
+                # Plain values and pointers outside modules are already in the context frame
+                continue
+            region["region"] = "null page" if value < NULL_PAGE_LIMIT else "outside any module"
+        regions.append(region)
+    result["address_regions"] = regions
+    result.update(kept)
+
+
+def focus_slice(data: Dict[str, Any], focus: str) -> Dict[str, Any]:
+    """Return the part of a stackwalk result a technical analysis with *focus* needs.
+
+    Args:
+        data: Stackwalk result, as returned in ``data`` by stackwalk_minidump
+        focus: One of :data:`TECHNICAL_FOCUS`
+
+    Raises:
+        ValueError: If *focus* is unknown
+    """
+    if focus not in TECHNICAL_FOCUS:
+        raise ValueError(f"Unknown technical focus: {focus}")
+    if focus == "all":
+        return data
+    result = {key: data[key] for key in _CONTEXT_KEYS if key in data}
+    thread = _crashing_thread(data)
+    if focus == "registers":
+        if thread is not None:
+            result["crashing_thread"] = _thread(thread, REGISTER_FRAMES)
+    elif focus == "memory":
+        _memory_slice(data, thread, result)
+    elif thread is not None:
+        result["crashing_thread"] = _thread(thread, None)
+        names = {frame.get("module") for frame in result["crashing_thread"]["frames"]}
+        result["modules"] = [module for module in data.get("modules") or [] if module.get("filename") in names]
+    return result
@@ -1,18 +1,27 @@
 """Symbol preparation prompts for FastMCP."""
 
 import logging
-from pathlib import Path
 from typing import List, Optional
 
+from minidumpmcp.tracing import annotate, span
+
+from .templates import RenderCache, TemplateRegistry
+
 logger = logging.getLogger(__name__)
 
 
 class SymbolPreparationProvider:
     """Provider for symbol preparation prompts."""
 
-    def __init__(self) -> None:
-        """Initialize the symbol preparation provider."""
-        self._prompts_dir = Path(__file__).parent
+    def __init__(self, templates: Optional[TemplateRegistry] = None, render_cache_entries: int = 64) -> None:
+        """Initialize the symbol preparation provider.
+
+        Args:
+            templates: Registry of prompt templates, loaded from this package when omitted
+            render_cache_entries: Number of rendered prompts kept in memory
+        """
+        self._templates = templates if templates is not None else TemplateRegistry()
+        self._rendered = RenderCache(render_cache_entries)
 
     async def symbol_transformation_guide(
         self,
@@ -67,53 +76,65 @@ class SymbolPreparationProvider:
                     "Please provide at least one path to symbol files or directories.",
                 )
 
-            # Load the symbol transformation guide template
-            template_path = self._prompts_dir / "symbol_transformation_guide.md"
-            if not template_path.exists():
-                error_msg = f"Template file not found: {template_path}"
-                logger.error(error_msg)
-                return self._create_error_response(
-                    "symbol_transformation_guide",
-                    error_msg,
-                    "The prompt template file is missing. Please ensure the installation is complete.",
+            # Look up the preloaded symbol transformation guide template
+            with span("prompt.lookup"):
+                template = self._templates.get("symbol_transformation_guide")
+                if template is None:
+                    error_msg = f"Template file not found: {self._templates.path_for('symbol_transformation_guide')}"
+                    logger.error(error_msg)
+                    return self._create_error_response(
+                        "symbol_transformation_guide",
+                        error_msg,
+                        "The prompt template file is missing. Please ensure the installation is complete.",
+                    )
+                cache_key = (
+                    template.name,
+                    template.version,
+                    tuple(symbol_sources),
+                    tuple(symbol_server_urls or ()),
+                    tuple(executable_paths or ()),
+                    tuple(target_modules or ()),
                 )
-
-            with open(template_path, "r", encoding="utf-8") as f:
-                template = f.read()
+                cached = self._rendered.get(cache_key)
+                annotate(cached=cached is not None)
+                if cached is not None:
+                    return cached
 
             # Build the complete prompt with input data
-            prompt = f"{template}\n\n## Your Symbol Sources\n\n"
-
-            # Add symbol sources
-            prompt += "**Available Symbol Files:**\n"
-            for source in symbol_sources:
-                prompt += f"- {source}\n"
-            prompt += "\n"
-
-            # Add optional parameters if provided
-            if symbol_server_urls:
-                prompt += "**Symbol Server URLs:**\n"
-                for url in symbol_server_urls:
-                    prompt += f"- {url}\n"
-                prompt += "\n"
+            with span("prompt.render"):
+                prompt = f"{template.text}\n\n## Your Symbol Sources\n\n"
 
-            if executable_paths:
-                prompt += "**Executable Files:**\n"
-                for path in executable_paths:
-                    prompt += f"- {path}\n"
+                # Add symbol sources
+                prompt += "**Available Symbol Files:**\n"
+                for source in symbol_sources:
+                    prompt += f"- {source}\n"
                 prompt += "\n"
 
-            if target_modules:
-                prompt += "**Priority Modules:**\n"
-                for module in target_modules:
-                    prompt += f"- {module}\n"
-                prompt += "\n"
-
-            prompt += (
-                "Please provide guidance on transforming these symbols to Breakpad format, "
-                "including specific commands and troubleshooting steps."
-            )
+                # Add optional parameters if provided
+                if symbol_server_urls:
+                    prompt += "**Symbol Server URLs:**\n"
+                    for url in symbol_server_urls:
+                        prompt += f"- {url}\n"
+                    prompt += "\n"
+
+                if executable_paths:
+                    prompt += "**Executable Files:**\n"
+                    for path in executable_paths:
+                        prompt += f"- {path}\n"
+                    prompt += "\n"
+
+                if target_modules:
+                    prompt += "**Priority Modules:**\n"
+                    for module in target_modules:
+                        prompt += f"- {module}\n"
+                    prompt += "\n"
+
+                prompt += (
+                    "Please provide guidance on transforming these symbols to Breakpad format, "
+                    "including specific commands and troubleshooting steps."
+                )
 
+            self._rendered.put(cache_key, prompt)
             return prompt
 
         except Exception as e:
@@ -0,0 +1,168 @@
+"""Prompt template registry and rendered prompt cache.
+
+Templates are the ``.md`` files next to the prompt providers.  They are read
+once, when the registry is created, into an immutable mapping shared by the
+providers.  With hot reload enabled (for template development) every lookup
+compares the file's modification time with the loaded version and rereads it
+when it changed; otherwise the disk is never touched again.
+
+Templates can be split into sections by ``<!-- focus: registers, memory -->``
+marker lines; :meth:`Template.sections` keeps the text before the first marker,
+the sections tagged with the requested focus and those tagged ``*``.
+
+Rendering a prompt decodes and re-encodes the whole stackwalk output, so
+rendered prompts are kept in a small LRU cache.  Keys include the template
+version, so a reloaded template never serves stale prompts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Hashable, Mapping, NamedTuple, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIX = ".md"
+
+# Directory of the templates shipped with the package
+PROMPTS_DIR = Path(__file__).parent
+
+
+# A line starting a template section, e.g. ``<!-- focus: registers, stack_frames -->``
+_SECTION_MARKER = re.compile(r"^<!-- focus: ([^>]*?) -->[ \t]*\n", re.MULTILINE)
+
+
+class Template(NamedTuple):
+    """A loaded prompt template."""
+
+    name: str
+    text: str
+    version: int
+
+    def sections(self, focus: str = "all") -> str:
+        """Text of the sections tagged for *focus*, without the marker lines.
+
+        ``"all"`` keeps every section.
+        """
+        parts = _SECTION_MARKER.split(self.text)
+        kept = [parts[0]]
+        for position in range(1, len(parts), 2):
+            tags = {tag.strip() for tag in parts[position].split(",")}
+            if focus == "all" or focus in tags or "*" in tags:
+                kept.append(parts[position + 1])
+        return "".join(kept)
+
+
+def output_hash(text: str) -> str:
+    """Hash identifying a prompt input, e.g. a stackwalk output, in render cache keys."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TemplateRegistry:
+    """Immutable set of prompt templates, optionally reloaded when their files change."""
+
+    def __init__(self, directory: Union[str, Path] = PROMPTS_DIR, hot_reload: bool = False) -> None:
+        """Load every template of *directory*.
+
+        Args:
+            directory: Directory of ``<name>.md`` templates, the package's own by default
+            hot_reload: Whether to reload templates whose files changed on lookup
+        """
+        self.directory = Path(directory)
+        self.hot_reload = hot_reload
+        self._lock = threading.Lock()
+        templates: Dict[str, Template] = {}
+        for path in sorted(self.directory.glob(f"*{TEMPLATE_SUFFIX}")):
+            template = self._load(path)
+            if template is not None:
+                templates[template.name] = template
+        self._templates: Mapping[str, Template] = MappingProxyType(templates)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Names of the loaded templates."""
+        return tuple(self._templates)
+
+    def path_for(self, name: str) -> Path:
+        """File a template is loaded from."""
+        return self.directory / f"{name}{TEMPLATE_SUFFIX}"
+
+    def get(self, name: str) -> Optional[Template]:
+        """Return the template called *name*, or ``None`` if there is no such template."""
+        if self.hot_reload:
+            return self._refresh(name)
+        return self._templates.get(name)
+
+    def _refresh(self, name: str) -> Optional[Template]:
+        """Reload *name* if its file changed, appeared or disappeared since it was loaded."""
+        current = self._templates.get(name)
+        path = self.path_for(name)
+        try:
+            version = path.stat().st_mtime_ns
+        except OSError:
+            version = None
+        if current is not None and current.version == version:
+            return current
+        template = self._load(path) if version is not None else None
+        if template == current:
+            return current
+        with self._lock:
+            templates = dict(self._templates)
+            if template is None:
+                templates.pop(name, None)
+            else:
+                templates[name] = template
+            self._templates = MappingProxyType(templates)
+        logger.info("Reloaded prompt template %s", path)
+        return template
+
+    @staticmethod
+    def _load(path: Path) -> Optional[Template]:
+        try:
+            version = path.stat().st_mtime_ns
+            text = path.read_text(encoding="utf-8")
+        except OSError as e:
+            logger.error("Could not read prompt template %s: %s", path, e)
+            return None
+        return Template(path.name[: -len(TEMPLATE_SUFFIX)], text, version)
+
+
+class RenderCache:
+    """LRU cache of rendered prompts."""
+
+    def __init__(self, max_entries: int = 64) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Number of rendered prompts kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the prompt rendered for *key*, marking it as recently used."""
+        prompt = self._entries.get(key)
+        if prompt is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return prompt
+
+    def put(self, key: Hashable, prompt: str) -> None:
+        """Store a rendered prompt, evicting the least recently used ones beyond the limit."""
+        self._entries[key] = prompt
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
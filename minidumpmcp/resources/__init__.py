@@ -0,0 +1,5 @@
+"""MCP resources exposing cached minidump analyses."""
+
+from .analysis_resources import AnalysisResourceProvider
+
+__all__ = ["AnalysisResourceProvider"]
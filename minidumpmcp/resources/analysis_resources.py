@@ -0,0 +1,169 @@
+"""Paginated MCP resources over cached stackwalk analyses.
+
+Analyses produced by ``stackwalk_minidump`` are addressed by their
+``analysis_hash`` and exposed as:
+
+- ``minidump://<hash>/summary``
+- ``minidump://<hash>/threads`` and ``minidump://<hash>/threads?cursor=<cursor>``
+- ``minidump://<hash>/threads/<n>/frames`` and ``...?cursor=<cursor>``
+- ``minidump://<hash>/modules`` and ``minidump://<hash>/modules?cursor=<cursor>``
+
+Each page is decoded on demand from the cached JSON text, so agents can
+fetch the slices they need without pulling the whole result.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from minidumpmcp.analysis.cache import AnalysisCache, CachedAnalysis
+from minidumpmcp.analysis.projection import FieldSelector
+from minidumpmcp.exceptions import AnalysisNotFoundError, InvalidParameterError
+
+logger = logging.getLogger(__name__)
+
+# Thread summaries carry the thread metadata and only its top frame.
+_THREAD_SUMMARY = FieldSelector(children={"frames": FieldSelector(limit=1)})
+
+
+class AnalysisResourceProvider:
+    """Provider for cursor-paginated analysis resources."""
+
+    def __init__(self, cache: AnalysisCache, page_size: int = 50) -> None:
+        """Initialize the provider.
+
+        Args:
+            cache: Analysis cache shared with the stackwalk tool
+            page_size: Number of items returned per page
+        """
+        self._cache = cache
+        self._page_size = page_size
+
+    async def analysis_summary(self, analysis_hash: str) -> Dict[str, Any]:
+        """
+        Summary of a cached analysis: crash info, system info and item counts.
+
+        Args:
+            analysis_hash: Hash returned by the stackwalk_minidump tool
+        """
+        entry = await self._cache.fetch(analysis_hash)
+        if entry is None:
+            return self._not_found(analysis_hash)
+
+        return {
+            "success": True,
+            "analysis_hash": analysis_hash,
+            "crash_info": entry.member("crash_info"),
+            "system_info": entry.member("system_info"),
+            "thread_count": entry.count("threads"),
+            "module_count": entry.count("modules"),
+            "threads_uri": f"minidump://{analysis_hash}/threads",
+            "modules_uri": f"minidump://{analysis_hash}/modules",
+        }
+
+    async def list_threads(self, analysis_hash: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Page through the threads of a cached analysis.
+
+        Each thread is summarized with its metadata and top frame; the full
+        frame list is available from ``minidump://<hash>/threads/<n>/frames``.
+
+        Args:
+            analysis_hash: Hash returned by the stackwalk_minidump tool
+            cursor: Opaque cursor from a previous page's ``next_cursor``
+        """
+        entry = await self._cache.fetch(analysis_hash)
+        if entry is None:
+            return self._not_found(analysis_hash)
+
+        offset = self._parse_cursor(cursor)
+        if offset is None:
+            return self._invalid_cursor(cursor)
+
+        items = []
+        for position, thread in enumerate(entry.elements("threads", offset, self._page_size, _THREAD_SUMMARY), offset):
+            thread["index"] = position
+            thread["frames_uri"] = f"minidump://{analysis_hash}/threads/{position}/frames"
+            items.append(thread)
+
+        return self._page(entry, f"minidump://{analysis_hash}/threads", offset, entry.count("threads"), items)
+
+    async def list_thread_frames(
+        self, analysis_hash: str, thread_index: int, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Page through the stack frames of one thread of a cached analysis.
+
+        Args:
+            analysis_hash: Hash returned by the stackwalk_minidump tool
+            thread_index: Position of the thread in the analysis' thread list
+            cursor: Opaque cursor from a previous page's ``next_cursor``
+        """
+        entry = await self._cache.fetch(analysis_hash)
+        if entry is None:
+            return self._not_found(analysis_hash)
+
+        offset = self._parse_cursor(cursor)
+        if offset is None:
+            return self._invalid_cursor(cursor)
+
+        frames = entry.frames(thread_index, offset, self._page_size)
+        if frames is None:
+            param_error = InvalidParameterError(
+                "thread_index", thread_index, f"Analysis has {entry.count('threads')} threads"
+            )
+            return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+
+        total, items = frames
+        base_uri = f"minidump://{analysis_hash}/threads/{thread_index}/frames"
+        return self._page(entry, base_uri, offset, total, items)
+
+    async def list_modules(self, analysis_hash: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Page through the loaded modules of a cached analysis.
+
+        Args:
+            analysis_hash: Hash returned by the stackwalk_minidump tool
+            cursor: Opaque cursor from a previous page's ``next_cursor``
+        """
+        entry = await self._cache.fetch(analysis_hash)
+        if entry is None:
+            return self._not_found(analysis_hash)
+
+        offset = self._parse_cursor(cursor)
+        if offset is None:
+            return self._invalid_cursor(cursor)
+
+        items = list(entry.elements("modules", offset, self._page_size))
+        return self._page(entry, f"minidump://{analysis_hash}/modules", offset, entry.count("modules"), items)
+
+    def _page(self, entry: CachedAnalysis, base_uri: str, offset: int, total: int, items: List[Any]) -> Dict[str, Any]:
+        """Build a page response with the cursor of the following page."""
+        next_offset = offset + len(items)
+        has_more = bool(items) and next_offset < total
+        return {
+            "success": True,
+            "analysis_hash": entry.analysis_hash,
+            "total": total,
+            "offset": offset,
+            "items": items,
+            "next_cursor": str(next_offset) if has_more else None,
+            "next_uri": f"{base_uri}?cursor={next_offset}" if has_more else None,
+        }
+
+    @staticmethod
+    def _parse_cursor(cursor: Optional[str]) -> Optional[int]:
+        """Decode a cursor into an item offset, or ``None`` if it is malformed."""
+        if cursor is None or cursor == "":
+            return 0
+        return int(cursor) if cursor.isascii() and cursor.isdigit() else None
+
+    @staticmethod
+    def _invalid_cursor(cursor: Optional[str]) -> Dict[str, Any]:
+        param_error = InvalidParameterError("cursor", cursor, "Cursor must come from a previous page's next_cursor")
+        return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+
+    @staticmethod
+    def _not_found(analysis_hash: str) -> Dict[str, Any]:
+        not_found = AnalysisNotFoundError(analysis_hash)
+        logger.debug("Resource requested for unknown analysis %s", analysis_hash)
+        return {"success": False, "error": str(not_found), "error_code": not_found.error_code}
@@ -0,0 +1,6 @@
+"""Custom HTTP routes served next to the MCP endpoint on HTTP transports."""
+
+from .metrics import MetricsRoute
+from .uploads import UploadRoute
+
+__all__ = ["MetricsRoute", "UploadRoute"]
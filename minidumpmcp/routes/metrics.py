@@ -0,0 +1,26 @@
+"""Prometheus metrics endpoint."""
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from minidumpmcp.metrics import CONTENT_TYPE, MetricsRegistry
+
+
+class MetricsRoute:
+    """Serves the server's metrics in the Prometheus text format.
+
+    ``GET`` the route from a Prometheus scrape job or with ``curl``; every request
+    renders the current values, so scraping costs nothing between scrapes.
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        """Initialize the route.
+
+        Args:
+            registry: Registry whose metrics are served
+        """
+        self._registry = registry
+
+    async def metrics(self, request: Request) -> Response:
+        """Render all metrics."""
+        return Response(self._registry.render(), media_type=CONTENT_TYPE)
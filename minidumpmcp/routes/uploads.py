@@ -0,0 +1,80 @@
+"""Streaming minidump upload endpoint."""
+
+import asyncio
+from typing import Optional
+
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import JSONResponse, Response
+
+from minidumpmcp.exceptions import UploadRejectedError
+from minidumpmcp.storage.dump_store import HANDLE_PREFIX, DumpStore, parse_handle
+
+# Header carrying the SHA-256 of the body, announced by the client
+CONTENT_HASH_HEADER = "x-content-sha256"
+
+
+class UploadRoute:
+    """Accepts dumps over HTTP so clients need no filesystem shared with the server.
+
+    ``POST`` the raw dump as the request body (chunked transfer encoding works) and
+    pass the returned ``handle`` as ``minidump_path`` to the tools. Clients that send
+    the dump's SHA-256 in ``X-Content-SHA256`` get an immediate answer, without
+    transferring the body, when the store already holds the dump. An optional
+    ``source`` query parameter (e.g. a host or product name) is recorded with the
+    submission.
+    """
+
+    def __init__(self, store: DumpStore, max_bytes: Optional[int] = None) -> None:
+        """Initialize the route.
+
+        Args:
+            store: Store receiving the uploads
+            max_bytes: Maximum accepted dump size
+        """
+        self._store = store
+        self._max_bytes = max_bytes
+
+    async def upload(self, request: Request) -> Response:
+        """Store the dump sent as the request body and return its handle."""
+        announced = request.headers.get(CONTENT_HASH_HEADER)
+        source = request.query_params.get("source")
+        if announced is not None:
+            if parse_handle(HANDLE_PREFIX + announced) is None:
+                return _rejected(UploadRejectedError(f"Invalid {CONTENT_HASH_HEADER} header: {announced}"))
+            existing = await asyncio.to_thread(self._store.submit_existing, announced.lower(), source)
+            if existing is not None:
+                return _stored(existing.dump_hash, existing.size, deduplicated=True)
+
+        declared = request.headers.get("content-length")
+        if self._max_bytes is not None and declared is not None and declared.isdigit():
+            if int(declared) > self._max_bytes:
+                return _rejected(
+                    UploadRejectedError(f"Dump exceeds the maximum upload size of {self._max_bytes} bytes", None, 413)
+                )
+
+        try:
+            stored = await self._store.write_stream(request.stream(), announced, self._max_bytes, source)
+        except UploadRejectedError as e:
+            return _rejected(e)
+        except ClientDisconnect:
+            return _rejected(UploadRejectedError("Client disconnected before the upload completed"))
+        return _stored(stored.dump_hash, stored.size, stored.deduplicated)
+
+
+def _stored(dump_hash: str, size: int, deduplicated: bool) -> JSONResponse:
+    return JSONResponse(
+        {
+            "success": True,
+            "handle": HANDLE_PREFIX + dump_hash,
+            "dump_hash": dump_hash,
+            "size": size,
+            "deduplicated": deduplicated,
+        },
+        status_code=200 if deduplicated else 201,
+    )
+
+
+def _rejected(error: UploadRejectedError) -> JSONResponse:
+    return JSONResponse(
+        {"success": False, "error": str(error), "error_code": error.error_code}, status_code=error.status_code
+    )
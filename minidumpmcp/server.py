@@ -5,13 +5,33 @@ import logging
 from typing import cast
 
 from fastmcp import FastMCP
+from starlette.middleware import Middleware
 
+from minidumpmcp.analysis.crashpad import CrashpadIndex
 from minidumpmcp.config import ServerSettings
 from minidumpmcp.config.settings import SseTransportConfig, StreamableHttpConfig
-from minidumpmcp.prompts import CrashAnalysisProvider
+from minidumpmcp.deadline import DeadlineMiddleware
+from minidumpmcp.metrics import (
+    HttpBytesMiddleware,
+    LoopLagMonitor,
+    RequestMetricsMiddleware,
+    ServerMetrics,
+    cache_collector,
+    job_queue_collector,
+    subprocess_collector,
+)
+from minidumpmcp.prompts import CrashAnalysisProvider, TemplateRegistry
 from minidumpmcp.prompts.symbol_preparation_provider import SymbolPreparationProvider
-from minidumpmcp.tools.dump_syms import DumpSymsTool
-from minidumpmcp.tools.stackwalk import StackwalkProvider
+from minidumpmcp.resources import AnalysisResourceProvider
+from minidumpmcp.routes import MetricsRoute, UploadRoute
+from minidumpmcp.services import create_job_provider, create_services
+from minidumpmcp.tools.crashpad import CrashpadProvider
+from minidumpmcp.tools.memory import MemoryProvider
+from minidumpmcp.tools.signatures import SignatureProvider
+from minidumpmcp.tools.similarity import SimilarityProvider
+from minidumpmcp.tools.tracing import TraceProvider
+from minidumpmcp.tracing import JsonLinesFile, RingBuffer, SpanExporter, Tracer, TracingMiddleware
+from minidumpmcp.worker import WorkerPool, worker_environment
 
 
 def setup_logging(settings: ServerSettings) -> None:
@@ -37,22 +57,121 @@ async def run_mcp_server(settings: ServerSettings | None = None) -> None:
     # Initialize FastMCP and register tools and prompts
     mcp: FastMCP[None] = FastMCP(name=settings.name)
 
+    # Requests and jobs are traced; kept traces are queried with get_traces and optionally written to a file
+    tracer: Tracer | None = None
+    if settings.tracing.enabled:
+        traces = RingBuffer(settings.tracing.buffer_size)
+        exporters: list[SpanExporter] = [traces]
+        if settings.tracing.file is not None:
+            exporters.append(
+                JsonLinesFile(settings.tracing.file, settings.tracing.file_max_bytes, settings.tracing.file_backups)
+            )
+        tracer = Tracer(exporters, settings.tracing.sample_rate, settings.tracing.slow_threshold)
+        mcp.add_middleware(TracingMiddleware(tracer))
+        mcp.tool(TraceProvider(traces).get_traces)
+
+    # Every tool call gets the transport's request timeout as its deadline
+    mcp.add_middleware(DeadlineMiddleware(settings.transport_config.timeout))
+
+    # Metrics are served on the HTTP transports only, so only they pay for recording them
+    metrics: ServerMetrics | None = None
+    if settings.metrics.enabled and settings.transport != "stdio":
+        metrics = ServerMetrics()
+        mcp.add_middleware(RequestMetricsMiddleware(metrics))
+
+    # Jobs run either in this process or in worker processes sharing the queue and the analyses
+    worker_count = settings.jobs.workers
+    services = create_services(settings, shared=worker_count > 0)
+    services.dump_store.enforce_retention()
+
     # Register tools
-    stackwalk_provider = StackwalkProvider()
-    mcp.tool(stackwalk_provider.stackwalk_minidump)
+    stackwalk_provider = services.stackwalk
+    mcp.tool(stackwalk_provider.stackwalk_minidump, exclude_args=["timeout", "over_budget"])
+    mcp.tool(stackwalk_provider.parse_stackwalk_report)
+
+    memory_provider = MemoryProvider(services.cache, services.dump_store)
+    mcp.tool(memory_provider.read_dump_memory)
+
+    triage_provider = services.triage
+    mcp.tool(triage_provider.triage_directory)
+
+    # Crashpad databases are ingested incrementally, remembering the reports already seen
+    crashpad_provider = CrashpadProvider(CrashpadIndex(settings.crashpad.state_path), triage_provider)
+    mcp.tool(crashpad_provider.ingest_crashpad_database)
+
+    if services.signature_index is not None:
+        signature_provider = SignatureProvider(services.signature_index)
+        mcp.tool(signature_provider.top_crashers)
 
-    dump_syms_tool = DumpSymsTool()
-    mcp.tool(dump_syms_tool.extract_symbols)
+    if services.similarity_index is not None:
+        similarity_provider = SimilarityProvider(
+            services.similarity_index, services.cache, services.signature_generator, settings.similarity.frame_depth
+        )
+        mcp.tool(similarity_provider.find_similar_crashes)
+
+    mcp.tool(services.dump_syms.extract_symbols)
+
+    # Long analyses, symbol extractions and triages run as background jobs. The queue is
+    # durable, so jobs outlive the submitting request and unfinished jobs survive restarts.
+    job_provider = create_job_provider(settings, services, concurrency=0 if worker_count else None, tracer=tracer)
+    job_scheduler = job_provider.scheduler
+    mcp.tool(job_provider.submit_analysis)
+    mcp.tool(job_provider.submit_symbol_extraction)
+    mcp.tool(job_provider.submit_triage)
+    mcp.tool(job_provider.get_job_status)
+
+    # Prompt templates are loaded once and shared by the prompt providers
+    templates = TemplateRegistry(hot_reload=settings.prompts.hot_reload)
 
     # Register crash analysis prompts
-    crash_provider = CrashAnalysisProvider()
+    crash_provider = CrashAnalysisProvider(templates, settings.prompts.render_cache_entries)
     mcp.prompt(crash_provider.analyze_crash_with_expertise)
     mcp.prompt(crash_provider.analyze_technical_details)
 
     # Register symbol preparation prompts
-    symbol_provider = SymbolPreparationProvider()
+    symbol_provider = SymbolPreparationProvider(templates, settings.prompts.render_cache_entries)
     mcp.prompt(symbol_provider.symbol_transformation_guide)
 
+    # Register paginated analysis resources
+    analysis_resources = AnalysisResourceProvider(services.cache, page_size=settings.cache.page_size)
+    mcp.resource("minidump://{analysis_hash}/summary", mime_type="application/json")(
+        analysis_resources.analysis_summary
+    )
+    for uri in ("minidump://{analysis_hash}/threads", "minidump://{analysis_hash}/threads?cursor={cursor}"):
+        mcp.resource(uri, mime_type="application/json")(analysis_resources.list_threads)
+    for uri in (
+        "minidump://{analysis_hash}/threads/{thread_index}/frames",
+        "minidump://{analysis_hash}/threads/{thread_index}/frames?cursor={cursor}",
+    ):
+        mcp.resource(uri, mime_type="application/json")(analysis_resources.list_thread_frames)
+    for uri in ("minidump://{analysis_hash}/modules", "minidump://{analysis_hash}/modules?cursor={cursor}"):
+        mcp.resource(uri, mime_type="application/json")(analysis_resources.list_modules)
+
+    # Register the dump upload endpoint (served on HTTP transports)
+    if settings.store.upload_enabled:
+        upload_route = UploadRoute(services.dump_store, settings.store.max_upload_bytes)
+        mcp.custom_route(settings.store.upload_path, methods=["POST"])(upload_route.upload)
+
+    # Register the metrics endpoint, reading the other components' counters when scraped
+    http_middleware: list[Middleware] = []
+    lag_monitor: LoopLagMonitor | None = None
+    if metrics is not None:
+        metrics.registry.add_collector(cache_collector(services.cache))
+        metrics.registry.add_collector(job_queue_collector(job_scheduler.queue))
+        metrics.registry.add_collector(subprocess_collector)
+        mcp.custom_route(settings.metrics.path, methods=["GET"])(MetricsRoute(metrics.registry).metrics)
+        http_middleware.append(Middleware(HttpBytesMiddleware, metrics=metrics))
+        lag_monitor = LoopLagMonitor(metrics, settings.metrics.loop_lag_interval)
+        lag_monitor.start()
+
+    # Resume the jobs left unfinished by the previous server
+    job_scheduler.start()
+    worker_pool: WorkerPool | None = None
+    if worker_count:
+        worker_pool = WorkerPool(worker_count, env=worker_environment(settings))
+        await worker_pool.start()
+        logger.info("Started %d job worker processes", worker_count)
+
     # Build run_async arguments based on transport configuration
     try:
         match settings.transport:
@@ -67,6 +186,7 @@ async def run_mcp_server(settings: ServerSettings | None = None) -> None:
                     host=http_config.host,
                     port=http_config.port,
                     path=http_config.path,
+                    middleware=http_middleware,
                 )
             case "sse":
                 sse_config = cast(SseTransportConfig, settings.transport_config)
@@ -76,6 +196,7 @@ async def run_mcp_server(settings: ServerSettings | None = None) -> None:
                     host=sse_config.host,
                     port=sse_config.port,
                     path=sse_config.path,
+                    middleware=http_middleware,
                 )
             case _:
                 raise ValueError(f"Unsupported transport: {settings.transport}")
@@ -85,6 +206,15 @@ async def run_mcp_server(settings: ServerSettings | None = None) -> None:
         # FastMCP might not have explicit shutdown method,
         # but cancellation should stop the server
         raise
+    finally:
+        # Hand running jobs back to the queue so that the next server resumes them at once
+        await job_scheduler.close()
+        if worker_pool is not None:
+            await worker_pool.close()
+        if lag_monitor is not None:
+            await lag_monitor.close()
+        if tracer is not None:
+            tracer.close()
 
 
 def main() -> None:
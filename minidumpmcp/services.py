@@ -0,0 +1,146 @@
+"""Analysis services shared by the MCP server and its job worker processes."""
+
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from minidumpmcp.analysis.cache import AnalysisCache, AnalysisStore
+from minidumpmcp.analysis.signature import DEFAULT_SKIP_FUNCTIONS, SignatureGenerator
+from minidumpmcp.analysis.signature_index import SignatureIndex
+from minidumpmcp.analysis.similarity import SimilarityIndex
+from minidumpmcp.config import ServerSettings
+from minidumpmcp.storage import DumpStore, JobQueue, RetentionPolicy, create_backend
+from minidumpmcp.tools._common import ResourceLimits
+from minidumpmcp.tools.dump_syms import DumpSymsTool
+from minidumpmcp.tools.jobs import JobProvider, JobScheduler
+from minidumpmcp.tools.stackwalk import StackwalkProvider
+from minidumpmcp.tools.triage import TriageProvider
+from minidumpmcp.tracing import Tracer
+
+# Directory analyses are shared through when jobs run in worker processes and none is configured
+DEFAULT_ANALYSIS_DIRECTORY = Path.home() / ".cache" / "rust-minidump-mcp" / "analyses"
+
+
+class AnalysisServices(NamedTuple):
+    """The analysis cache, indexes, dump store and providers built from the settings."""
+
+    cache: AnalysisCache
+    signature_index: Optional[SignatureIndex]
+    signature_generator: SignatureGenerator
+    similarity_index: Optional[SimilarityIndex]
+    dump_store: DumpStore
+    stackwalk: StackwalkProvider
+    triage: TriageProvider
+    dump_syms: DumpSymsTool
+
+
+def analysis_directory(settings: ServerSettings, shared: bool = False) -> Optional[Path]:
+    """Directory backing the analysis cache, if any.
+
+    Args:
+        settings: Server settings
+        shared: Whether analyses are shared with other processes, in which case a
+                directory is used even when none is configured
+    """
+    if settings.cache.directory is not None:
+        return settings.cache.directory
+    return DEFAULT_ANALYSIS_DIRECTORY if shared else None
+
+
+def create_services(settings: ServerSettings, shared: bool = False) -> AnalysisServices:
+    """Build the services that run and store analyses.
+
+    Args:
+        settings: Server settings
+        shared: Whether analyses are shared with other processes through the analysis directory
+    """
+    # Analyses are cached once and shared between the stackwalk tool and the resources, and
+    # with other processes and replicas through the analysis directory or key-value stores
+    backend = create_backend(
+        analysis_directory(settings, shared),
+        settings.cache.remote_urls,
+        settings.cache.max_disk_bytes,
+        settings.cache.remote_timeout,
+    )
+    store = AnalysisStore(backend) if backend is not None else None
+    cache = AnalysisCache(settings.cache.max_entries, settings.cache.max_bytes, store)
+
+    # Crash signatures are indexed persistently as dumps are analyzed
+    signature_index: Optional[SignatureIndex] = None
+    if settings.signatures.enabled:
+        signature_index = SignatureIndex(settings.signatures.database_path)
+    signature_generator = SignatureGenerator(
+        frame_count=settings.signatures.frame_count,
+        skip_functions=[*DEFAULT_SKIP_FUNCTIONS, *settings.signatures.skip_functions],
+    )
+
+    similarity_index: Optional[SimilarityIndex] = None
+    if settings.similarity.enabled:
+        similarity_index = SimilarityIndex(
+            settings.similarity.database_path,
+            bands=settings.similarity.bands,
+            rows=settings.similarity.rows,
+            shingle_size=settings.similarity.shingle_size,
+        )
+
+    # Uploaded dumps are stored by content hash and addressed as sha256:<hash> handles; compressed
+    # dumps may not decompress to more than an upload may hold
+    dump_store = DumpStore(
+        settings.store.path,
+        RetentionPolicy(settings.store.max_age_days, settings.store.max_bytes, settings.store.keep_per_signature),
+        settings.store.max_upload_bytes,
+    )
+
+    # Tool processes run under resource limits, so a pathological input cannot take down the host
+    limits = ResourceLimits(settings.limits.address_space, settings.limits.cpu_seconds, settings.limits.open_files)
+    stackwalk = StackwalkProvider(
+        cache,
+        signature_index,
+        signature_generator,
+        similarity=similarity_index,
+        similarity_depth=settings.similarity.frame_depth,
+        store=dump_store,
+        store_local_dumps=settings.store.store_local_dumps,
+        timeout=settings.stackwalk.timeout,
+        grace_period=settings.stackwalk.grace_period,
+        over_budget=settings.stackwalk.over_budget,
+        limits=limits,
+        max_dump_bytes=settings.store.max_upload_bytes,
+    )
+    triage = TriageProvider(stackwalk, signature_generator)
+    return AnalysisServices(
+        cache,
+        signature_index,
+        signature_generator,
+        similarity_index,
+        dump_store,
+        stackwalk,
+        triage,
+        DumpSymsTool(limits),
+    )
+
+
+def create_job_provider(
+    settings: ServerSettings,
+    services: AnalysisServices,
+    concurrency: Optional[int] = None,
+    tracer: Optional[Tracer] = None,
+) -> JobProvider:
+    """Build the job provider and the scheduler running its jobs from the durable queue.
+
+    Args:
+        settings: Server settings
+        services: Services the jobs run with
+        concurrency: Number of jobs this process runs at once, ``MINIDUMP_MCP_JOBS__CONCURRENCY``
+                     by default; 0 only submits jobs for worker processes to run
+        tracer: Tracer the jobs run under
+    """
+    scheduler = JobScheduler(
+        JobQueue(settings.jobs.database_path, settings.jobs.retry_backoff),
+        concurrency=settings.jobs.concurrency if concurrency is None else concurrency,
+        max_finished=settings.jobs.max_finished,
+        max_attempts=settings.jobs.max_attempts,
+        lease_seconds=settings.jobs.lease_seconds,
+        poll_interval=settings.jobs.poll_interval,
+        tracer=tracer,
+    )
+    return JobProvider(services.stackwalk, scheduler, settings.jobs.timeout, services.triage, services.dump_syms)
@@ -0,0 +1,28 @@
+"""Server-side storage of uploaded minidumps, jobs and shared cache values."""
+
+from .cache_backend import (
+    CacheBackend,
+    FileCacheBackend,
+    HashRing,
+    HttpCacheBackend,
+    ShardedCacheBackend,
+    create_backend,
+)
+from .dump_index import DumpIndex
+from .dump_store import DumpStore, RetentionPolicy, StoredDump
+from .job_queue import JobQueue, JobRecord
+
+__all__ = [
+    "CacheBackend",
+    "DumpIndex",
+    "DumpStore",
+    "FileCacheBackend",
+    "HashRing",
+    "HttpCacheBackend",
+    "JobQueue",
+    "JobRecord",
+    "RetentionPolicy",
+    "ShardedCacheBackend",
+    "StoredDump",
+    "create_backend",
+]
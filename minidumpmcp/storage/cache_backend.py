@@ -0,0 +1,245 @@
+"""Key-value backends for caches shared between processes and server replicas.
+
+A :class:`CacheBackend` stores opaque byte values under short string keys.
+:class:`FileCacheBackend` keeps them in a local directory, which processes on
+one host share.  :class:`HttpCacheBackend` keeps them on a networked key-value
+store speaking the plain HTTP cache protocol (``GET``/``PUT``/``HEAD`` on
+``<url>/<key>``, as served by bazel-remote, nginx with WebDAV or any object
+store gateway), which replicas on different hosts share.  With several nodes,
+:class:`ShardedCacheBackend` places every key on one of them by consistent
+hashing, so all replicas look for a key on the same node and adding or
+removing a node only moves the keys next to it on the :class:`HashRing`.
+
+Backends raise :class:`OSError` when the storage cannot be reached; callers
+treat that as a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import urllib.error
+import urllib.request
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+# Keys are used as file names and URL path segments
+_KEY = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]{0,127}")
+
+# Points every node gets on the hash ring; more points spread keys more evenly
+DEFAULT_VNODES = 64
+
+
+def _check_key(key: str) -> str:
+    if not _KEY.fullmatch(key):
+        raise ValueError(f"Invalid cache key: {key!r}")
+    return key
+
+
+class CacheBackend(ABC):
+    """Storage of byte values by key."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under *key*, or ``None`` when there is none."""
+
+    @abstractmethod
+    def put(self, key: str, value: bytes) -> None:
+        """Store *value* under *key*, replacing a previous value."""
+
+    @abstractmethod
+    def contains(self, key: str) -> bool:
+        """Whether a value is stored under *key*."""
+
+
+class FileCacheBackend(CacheBackend):
+    """Values stored as files of a local directory.
+
+    Files are written to a temporary name and renamed into place, so readers in
+    other processes never see a partial value.  Reading a value touches its file,
+    and the least recently read files are removed once the directory grows
+    beyond *max_bytes*.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 4 * 1024 * 1024 * 1024) -> None:
+        """Open the directory, creating it when needed.
+
+        Args:
+            path: Directory holding the values
+            max_bytes: Maximum combined size of the files in the directory
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under *key*, or ``None`` when there is none."""
+        path = self.path / _check_key(key)
+        try:
+            value = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store *value* under *key*, then remove old values beyond the size limit."""
+        target = self.path / _check_key(key)
+        fd, name = tempfile.mkstemp(dir=self.path, suffix=".part")
+        try:
+            with open(fd, "wb") as f:
+                f.write(value)
+            os.replace(name, target)
+        except BaseException:
+            Path(name).unlink(missing_ok=True)
+            raise
+        self.prune()
+
+    def contains(self, key: str) -> bool:
+        """Whether a value is stored under *key*."""
+        return (self.path / _check_key(key)).is_file()
+
+    def prune(self) -> List[str]:
+        """Remove the least recently read values until the directory fits in its size limit.
+
+        Returns:
+            Keys of the removed values
+        """
+        files = []
+        total = 0
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".part") or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.name))
+                total += stat.st_size
+        removed = []
+        for _, size, name in sorted(files):
+            if total <= self._max_bytes:
+                break
+            (self.path / name).unlink(missing_ok=True)
+            total -= size
+            removed.append(name)
+        return removed
+
+
+class HttpCacheBackend(CacheBackend):
+    """Values stored on a networked key-value store through the HTTP cache protocol."""
+
+    def __init__(self, url: str, timeout: float = 5.0) -> None:
+        """Initialize the backend.
+
+        Args:
+            url: Base URL; values are read and written at ``<url>/<key>``
+            timeout: Seconds a request may take
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method: str, key: str, data: Optional[bytes] = None) -> Optional[bytes]:
+        request = urllib.request.Request(f"{self.url}/{_check_key(key)}", data=data, method=method)
+        if data is not None:
+            request.add_header("Content-Type", "application/octet-stream")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return bytes(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise OSError(f"{method} {request.full_url} failed with HTTP {e.code}") from e
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under *key*, or ``None`` when there is none."""
+        return self._request("GET", key)
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store *value* under *key*."""
+        self._request("PUT", key, value)
+
+    def contains(self, key: str) -> bool:
+        """Whether a value is stored under *key*."""
+        return self._request("HEAD", key) is not None
+
+
+class HashRing:
+    """Consistent hashing of keys onto named nodes."""
+
+    def __init__(self, nodes: Sequence[str], vnodes: int = DEFAULT_VNODES) -> None:
+        """Place *vnodes* points per node on the ring.
+
+        Args:
+            nodes: Node names, e.g. the URLs of the key-value stores
+            vnodes: Points per node
+        """
+        if not nodes:
+            raise ValueError("A hash ring needs at least one node")
+        points = sorted((self._hash(f"{node}#{position}"), node) for node in nodes for position in range(vnodes))
+        self._positions = [position for position, _ in points]
+        self._nodes = [node for _, node in points]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.sha256(value.encode()).digest()[:8], "big")
+
+    def node_for(self, key: str) -> str:
+        """Node owning *key*: the first point clockwise from the key's hash."""
+        index = bisect_right(self._positions, self._hash(key))
+        return self._nodes[index % len(self._nodes)]
+
+
+class ShardedCacheBackend(CacheBackend):
+    """Values spread over several backends by consistent hashing of their keys."""
+
+    def __init__(self, backends: Mapping[str, CacheBackend], vnodes: int = DEFAULT_VNODES) -> None:
+        """Initialize the backend.
+
+        Args:
+            backends: Backends by node name; every replica must use the same names
+            vnodes: Points per node on the hash ring
+        """
+        self._backends: Dict[str, CacheBackend] = dict(backends)
+        self.ring = HashRing(list(self._backends), vnodes)
+
+    def backend_for(self, key: str) -> CacheBackend:
+        """Backend holding *key*."""
+        return self._backends[self.ring.node_for(key)]
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under *key* on its node."""
+        return self.backend_for(key).get(key)
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store *value* under *key* on its node."""
+        self.backend_for(key).put(key, value)
+
+    def contains(self, key: str) -> bool:
+        """Whether the node of *key* holds a value for it."""
+        return self.backend_for(key).contains(key)
+
+
+def create_backend(
+    directory: Optional[Path] = None,
+    urls: Sequence[str] = (),
+    max_bytes: int = 4 * 1024 * 1024 * 1024,
+    timeout: float = 5.0,
+) -> Optional[CacheBackend]:
+    """Backend for the configured storage: the key-value stores at *urls*, else *directory*.
+
+    Returns:
+        The backend, or ``None`` when neither is configured
+    """
+    if urls:
+        if len(urls) == 1:
+            return HttpCacheBackend(urls[0], timeout)
+        return ShardedCacheBackend({url: HttpCacheBackend(url, timeout) for url in urls})
+    if directory is not None:
+        return FileCacheBackend(directory, max_bytes)
+    return None
@@ -0,0 +1,203 @@
+"""SQLite index of the dumps held by the dump store.
+
+Every stored blob has one row with its size, when it was stored and last
+submitted, how many times it was submitted (its reference count) and, once
+analyzed, its crash signature.  The sources a dump was submitted from are
+kept in a side table, and so are aliases: hashes of compressed files that
+decompress to a stored dump.  Retention queries are answered from indexes on the
+last-seen time and the signature, so enforcing a policy after each new dump
+does not scan the store.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dumps (
+    dump_hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    ref_count INTEGER NOT NULL,
+    signature TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dumps_by_last_seen ON dumps (last_seen);
+CREATE INDEX IF NOT EXISTS dumps_by_signature ON dumps (signature, last_seen);
+CREATE TABLE IF NOT EXISTS dump_sources (
+    dump_hash TEXT NOT NULL,
+    source TEXT NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (dump_hash, source)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dump_aliases (
+    alias_hash TEXT PRIMARY KEY,
+    dump_hash TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dump_aliases_by_dump ON dump_aliases (dump_hash);
+"""
+
+
+class DumpIndex:
+    """Metadata and reference counts of stored dumps."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Open (and create if needed) the index database.
+
+        Args:
+            path: Database file, or ``":memory:"`` for a private in-memory index
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def add(self, dump_hash: str, size: int, source: Optional[str] = None, seen_at: Optional[float] = None) -> int:
+        """Record a submission of a dump.
+
+        Args:
+            dump_hash: SHA-256 of the dump
+            size: Size of the dump in bytes
+            source: Where the dump came from, e.g. a path or an uploader name
+            seen_at: Unix time of the submission, defaults to now
+
+        Returns:
+            Reference count of the dump after this submission
+        """
+        now = time.time() if seen_at is None else seen_at
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT INTO dumps (dump_hash, size, stored_at, last_seen, ref_count) VALUES (?, ?, ?, ?, 1) "
+                    "ON CONFLICT (dump_hash) DO UPDATE SET ref_count = ref_count + 1, "
+                    "last_seen = max(last_seen, excluded.last_seen)",
+                    (dump_hash, size, now, now),
+                )
+                row = self._db.execute("SELECT ref_count FROM dumps WHERE dump_hash = ?", (dump_hash,)).fetchone()
+                if source is not None:
+                    self._db.execute(
+                        "INSERT INTO dump_sources (dump_hash, source, last_seen) VALUES (?, ?, ?) "
+                        "ON CONFLICT (dump_hash, source) DO UPDATE SET last_seen = excluded.last_seen",
+                        (dump_hash, source, now),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return int(row[0])
+
+    def get(self, dump_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the metadata of a dump, including its sources."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM dumps WHERE dump_hash = ?", (dump_hash,)).fetchone()
+            if row is None:
+                return None
+            sources = self._db.execute(
+                "SELECT source FROM dump_sources WHERE dump_hash = ? ORDER BY last_seen DESC", (dump_hash,)
+            ).fetchall()
+        return {**dict(row), "sources": [source["source"] for source in sources]}
+
+    def set_signature(self, dump_hash: str, signature: str) -> bool:
+        """Attach the crash signature of an analyzed dump.
+
+        Returns:
+            ``True`` if the dump is indexed
+        """
+        with self._lock:
+            cursor = self._db.execute("UPDATE dumps SET signature = ? WHERE dump_hash = ?", (signature, dump_hash))
+        return cursor.rowcount > 0
+
+    def add_alias(self, alias_hash: str, dump_hash: str) -> None:
+        """Record that the file hashing to *alias_hash* decompresses to *dump_hash*."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO dump_aliases (alias_hash, dump_hash) VALUES (?, ?)", (alias_hash, dump_hash)
+            )
+
+    def alias_of(self, alias_hash: str) -> Optional[str]:
+        """Hash of the dump a compressed file decompresses to, if recorded."""
+        with self._lock:
+            row = self._db.execute("SELECT dump_hash FROM dump_aliases WHERE alias_hash = ?", (alias_hash,)).fetchone()
+        return row["dump_hash"] if row is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        """Number of stored dumps, their total size and the number of submissions."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT count(*), coalesce(sum(size), 0), coalesce(sum(ref_count), 0) FROM dumps"
+            ).fetchone()
+        return {"dumps": int(row[0]), "bytes": int(row[1]), "submissions": int(row[2])}
+
+    def expired(self, before: float, exclude: Sequence[str] = ()) -> List[str]:
+        """Dumps last seen before the Unix time *before*."""
+        with self._lock:
+            rows = self._db.execute("SELECT dump_hash FROM dumps WHERE last_seen < ?", (before,)).fetchall()
+        return [row["dump_hash"] for row in rows if row["dump_hash"] not in exclude]
+
+    def over_budget(self, max_bytes: int, exclude: Sequence[str] = ()) -> List[str]:
+        """Least recently seen dumps whose removal brings the total size within *max_bytes*."""
+        with self._lock:
+            total = int(self._db.execute("SELECT coalesce(sum(size), 0) FROM dumps").fetchone()[0])
+            if total <= max_bytes:
+                return []
+            victims = []
+            for row in self._db.execute("SELECT dump_hash, size FROM dumps ORDER BY last_seen, dump_hash"):
+                if total <= max_bytes:
+                    break
+                if row["dump_hash"] in exclude:
+                    continue
+                victims.append(row["dump_hash"])
+                total -= row["size"]
+        return victims
+
+    def over_quota(self, signature: str, keep: int, exclude: Sequence[str] = ()) -> List[str]:
+        """Dumps of *signature* beyond the *keep* most recently seen."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT dump_hash FROM dumps WHERE signature = ? ORDER BY last_seen DESC, dump_hash LIMIT -1 OFFSET ?",
+                (signature, keep),
+            ).fetchall()
+        return [row["dump_hash"] for row in rows if row["dump_hash"] not in exclude]
+
+    def signatures_over_quota(self, keep: int) -> List[str]:
+        """Signatures with more than *keep* stored dumps."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT signature FROM dumps WHERE signature IS NOT NULL GROUP BY signature HAVING count(*) > ?",
+                (keep,),
+            ).fetchall()
+        return [row["signature"] for row in rows]
+
+    def remove(self, dump_hashes: Sequence[str]) -> None:
+        """Forget dumps, their sources and their aliases."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany("DELETE FROM dumps WHERE dump_hash = ?", [(value,) for value in dump_hashes])
+                self._db.executemany(
+                    "DELETE FROM dump_sources WHERE dump_hash = ?", [(value,) for value in dump_hashes]
+                )
+                self._db.executemany(
+                    "DELETE FROM dump_aliases WHERE dump_hash = ?", [(value,) for value in dump_hashes]
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
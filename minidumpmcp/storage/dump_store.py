@@ -0,0 +1,334 @@
+"""Content-addressed store of minidump files.
+
+Dumps are stored under their SHA-256 as ``<root>/<hash[:2]>/<hash>.dmp`` and
+addressed by handles of the form ``sha256:<hash>``, which every tool taking a
+``minidump_path`` accepts.  Uploads are streamed to a temporary file in the
+store while being hashed, then renamed into place, so memory use does not
+depend on dump size and storing the same dump twice keeps a single copy.
+Local files are hardlinked into the store instead of copied when they live on
+the same filesystem.  Compressed dumps (gzip, zip, xz) are accepted as well and
+decompressed into the store on first use; the index remembers which dump a
+compressed file decompresses to, so later uses skip the decompression.
+
+Submissions, sources and signatures are tracked in a :class:`DumpIndex`
+(``<root>/index.sqlite3``) that the :class:`RetentionPolicy` is enforced from
+whenever a new dump is stored or a dump gets its signature.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, AsyncIterable, Dict, List, NamedTuple, Optional, Sequence, Union
+
+from minidumpmcp.analysis.cache import hash_file
+from minidumpmcp.analysis.compression import COMPRESSION_MAGIC, MAGIC_SIZE, MINIDUMP_MAGIC, decompress_file
+from minidumpmcp.exceptions import UploadRejectedError
+
+from .dump_index import DumpIndex
+
+HANDLE_PREFIX = "sha256:"
+
+_HASH = re.compile(r"[0-9a-f]{64}")
+
+# Leading bytes of the accepted uploads: plain or compressed minidumps
+_ACCEPTED_MAGIC = (MINIDUMP_MAGIC, *COMPRESSION_MAGIC.values())
+
+# Incoming chunks are buffered up to this size before a (threaded) disk write.
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class StoredDump(NamedTuple):
+    """A dump held by the store."""
+
+    dump_hash: str
+    path: Path
+    size: int
+    deduplicated: bool
+
+    @property
+    def handle(self) -> str:
+        """Handle addressing the dump in tool calls."""
+        return f"{HANDLE_PREFIX}{self.dump_hash}"
+
+
+class RetentionPolicy(NamedTuple):
+    """Limits enforced on the store; ``None`` disables a limit."""
+
+    max_age_days: Optional[float] = None
+    max_bytes: Optional[int] = None
+    keep_per_signature: Optional[int] = None
+
+
+def _accepts(head: bytes, complete: bool) -> bool:
+    """Whether an upload starting with *head* may be a (compressed) minidump.
+
+    While *complete* is false, more bytes may still arrive, so a prefix of a magic suffices.
+    """
+    if complete:
+        return any(head.startswith(magic) for magic in _ACCEPTED_MAGIC)
+    return any(magic[: len(head)] == head[: len(magic)] for magic in _ACCEPTED_MAGIC)
+
+
+def parse_handle(value: str) -> Optional[str]:
+    """Return the dump hash of a ``sha256:<hash>`` handle, or ``None`` for other strings."""
+    if not value.startswith(HANDLE_PREFIX):
+        return None
+    dump_hash = value[len(HANDLE_PREFIX) :].lower()
+    return dump_hash if _HASH.fullmatch(dump_hash) else None
+
+
+class DumpStore:
+    """Directory of minidumps sharded by content hash."""
+
+    def __init__(
+        self, root: Union[str, Path], retention: Optional[RetentionPolicy] = None, max_dump_bytes: Optional[int] = None
+    ) -> None:
+        """Create the store directory and its index if needed.
+
+        Args:
+            root: Directory holding the dumps
+            retention: Limits enforced as dumps are added; unlimited when omitted
+            max_dump_bytes: Size compressed dumps may decompress to; unlimited when omitted
+
+        Raises:
+            sqlite3.Error: If the index cannot be opened
+        """
+        self.root = Path(root)
+        self.retention = retention if retention is not None else RetentionPolicy()
+        self.max_dump_bytes = max_dump_bytes
+        self._incoming = self.root / "incoming"
+        self._incoming.mkdir(parents=True, exist_ok=True)
+        self.index = DumpIndex(self.root / "index.sqlite3")
+
+    def path_for(self, dump_hash: str) -> Path:
+        """Location of the dump with *dump_hash*, whether or not it is stored."""
+        return self.root / dump_hash[:2] / f"{dump_hash}.dmp"
+
+    def get(self, dump_hash: str) -> Optional[Path]:
+        """Path of a stored dump, or ``None`` if the store does not hold it."""
+        path = self.path_for(dump_hash)
+        return path if path.is_file() else None
+
+    def resolve(self, handle: str) -> Optional[Path]:
+        """Path of the dump a ``sha256:<hash>`` handle refers to."""
+        dump_hash = parse_handle(handle)
+        return self.get(dump_hash) if dump_hash is not None else None
+
+    def submit_existing(self, dump_hash: str, source: Optional[str] = None) -> Optional[StoredDump]:
+        """Record another submission of a stored dump without receiving it again.
+
+        Returns:
+            The stored dump, or ``None`` if the store does not hold it
+        """
+        path = self.get(dump_hash)
+        if path is None:
+            return None
+        return self._register(StoredDump(dump_hash, path, path.stat().st_size, True), source)
+
+    def _commit(self, temp_path: Path, dump_hash: str, size: int, source: Optional[str]) -> StoredDump:
+        """Move a fully written temporary file into place, or drop it if the dump is stored."""
+        target = self.path_for(dump_hash)
+        if target.is_file():
+            temp_path.unlink()
+            return self._register(StoredDump(dump_hash, target, size, True), source)
+        target.parent.mkdir(exist_ok=True)
+        os.replace(temp_path, target)
+        return self._register(StoredDump(dump_hash, target, size, False), source)
+
+    def _register(self, stored: StoredDump, source: Optional[str]) -> StoredDump:
+        """Index a submission and enforce the retention policy after a new dump."""
+        self.index.add(stored.dump_hash, stored.size, source)
+        if not stored.deduplicated:
+            self.enforce_retention(exclude=[stored.dump_hash])
+        return stored
+
+    def add_file(self, path: Path, source: Optional[str] = None) -> StoredDump:
+        """Store a local dump, hardlinking it when possible.
+
+        Blocking; run on a worker thread from async code.
+
+        Args:
+            path: Dump to store; it must not be modified in place afterwards when hardlinked
+            source: Where the dump came from, defaults to its path
+
+        Raises:
+            OSError: If the file cannot be read or stored
+        """
+        dump_hash = hash_file(path)
+        size = path.stat().st_size
+        source = source if source is not None else str(path.absolute())
+        target = self.path_for(dump_hash)
+        if target.is_file():
+            return self._register(StoredDump(dump_hash, target, size, True), source)
+        target.parent.mkdir(exist_ok=True)
+        try:
+            os.link(path, target)
+        except FileExistsError:
+            return self._register(StoredDump(dump_hash, target, size, True), source)
+        except OSError:
+            # Other filesystem or no hardlink support: copy, then rename into place
+            fd, name = tempfile.mkstemp(dir=self._incoming, suffix=".part")
+            os.close(fd)
+            try:
+                shutil.copyfile(path, name)
+                return self._commit(Path(name), dump_hash, size, source)
+            finally:
+                Path(name).unlink(missing_ok=True)
+        return self._register(StoredDump(dump_hash, target, size, False), source)
+
+    def add_compressed(self, path: Path, compression: str, source: Optional[str] = None) -> StoredDump:
+        """Store the dump a compressed file decompresses to.
+
+        The decompressed dump is streamed into the store's own directory and renamed
+        into place. Files already decompressed once are only hashed again.
+
+        Blocking; run on a worker thread from async code.
+
+        Args:
+            path: Compressed dump
+            compression: Format returned by :func:`~minidumpmcp.analysis.compression.file_compression`
+            source: Where the dump came from, defaults to the path of the compressed file
+
+        Raises:
+            FileValidationError: If the file does not decompress to a minidump, or to one
+                                 larger than ``max_dump_bytes``
+            OSError: If a file cannot be read or stored
+        """
+        compressed_hash = hash_file(path)
+        source = source if source is not None else str(path.absolute())
+        dump_hash = self.index.alias_of(compressed_hash)
+        if dump_hash is not None:
+            stored = self.submit_existing(dump_hash, source)
+            if stored is not None:
+                return stored
+        fd, name = tempfile.mkstemp(dir=self._incoming, suffix=".part")
+        os.close(fd)
+        try:
+            dump_hash, size = decompress_file(path, compression, Path(name), max_bytes=self.max_dump_bytes)
+            stored = self._commit(Path(name), dump_hash, size, source)
+        finally:
+            Path(name).unlink(missing_ok=True)
+        self.index.add_alias(compressed_hash, stored.dump_hash)
+        return stored
+
+    def record_signature(self, dump_hash: str, signature: str) -> List[str]:
+        """Attach the crash signature of a stored dump and apply the per-signature limit.
+
+        Returns:
+            Hashes of the dumps removed by the retention policy
+        """
+        if not self.index.set_signature(dump_hash, signature) or self.retention.keep_per_signature is None:
+            return []
+        victims = self.index.over_quota(signature, self.retention.keep_per_signature)
+        self._remove(victims)
+        return victims
+
+    def enforce_retention(self, exclude: Sequence[str] = ()) -> List[str]:
+        """Remove the dumps the retention policy does not allow to keep.
+
+        Dumps older than the maximum age go first, then dumps beyond the per-signature
+        limit, then the least recently seen dumps until the store fits its size budget.
+
+        Args:
+            exclude: Hashes never removed, e.g. a dump that is about to be analyzed
+
+        Returns:
+            Hashes of the removed dumps
+        """
+        policy = self.retention
+        removed: List[str] = []
+        if policy.max_age_days is not None:
+            victims = self.index.expired(time.time() - policy.max_age_days * 86400, exclude)
+            self._remove(victims)
+            removed.extend(victims)
+        if policy.keep_per_signature is not None:
+            for signature in self.index.signatures_over_quota(policy.keep_per_signature):
+                victims = self.index.over_quota(signature, policy.keep_per_signature, exclude)
+                self._remove(victims)
+                removed.extend(victims)
+        if policy.max_bytes is not None:
+            victims = self.index.over_budget(policy.max_bytes, exclude)
+            self._remove(victims)
+            removed.extend(victims)
+        return removed
+
+    def _remove(self, dump_hashes: Sequence[str]) -> None:
+        for dump_hash in dump_hashes:
+            self.path_for(dump_hash).unlink(missing_ok=True)
+        if dump_hashes:
+            self.index.remove(dump_hashes)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and submission counts of the store."""
+        return self.index.stats()
+
+    async def write_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        expected_hash: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        source: Optional[str] = None,
+    ) -> StoredDump:
+        """Store a dump received as a stream of chunks.
+
+        Chunks are hashed as they arrive and written in bounded batches on a worker
+        thread, so memory use is independent of the dump size. Compressed dumps are
+        stored as received and decompressed when first analyzed.
+
+        Args:
+            chunks: Dump contents
+            expected_hash: SHA-256 announced by the sender, verified after the transfer
+            max_bytes: Maximum accepted size
+            source: Where the dump came from, recorded in the index
+
+        Raises:
+            UploadRejectedError: If the data is not a (compressed) minidump, too large or does not match
+                                 *expected_hash*. Nothing is stored in that case.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        head = bytearray()
+        fd, name = tempfile.mkstemp(dir=self._incoming, suffix=".part")
+        temp_path = Path(name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if len(head) < MAGIC_SIZE:
+                        head += chunk[: MAGIC_SIZE - len(head)]
+                        if not _accepts(bytes(head), complete=False):
+                            raise UploadRejectedError(
+                                "Not a minidump or a gzip, zip or xz compressed minidump", size, 415
+                            )
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise UploadRejectedError(
+                            f"Dump exceeds the maximum upload size of {max_bytes} bytes", size, 413
+                        )
+                    digest.update(chunk)
+                    buffer += chunk
+                    if len(buffer) >= _WRITE_BUFFER_SIZE:
+                        await asyncio.to_thread(f.write, buffer)
+                        buffer = bytearray()
+                if buffer:
+                    await asyncio.to_thread(f.write, buffer)
+            if not _accepts(bytes(head), complete=True):
+                raise UploadRejectedError("Not a minidump or a gzip, zip or xz compressed minidump", size, 415)
+
+            dump_hash = digest.hexdigest()
+            if expected_hash is not None and expected_hash.lower() != dump_hash:
+                raise UploadRejectedError(
+                    f"Content hash {dump_hash} does not match the announced {expected_hash}", size
+                )
+            return await asyncio.to_thread(self._commit, temp_path, dump_hash, size, source)
+        finally:
+            temp_path.unlink(missing_ok=True)
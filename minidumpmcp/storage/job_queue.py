@@ -0,0 +1,377 @@
+"""Durable SQLite queue of background jobs.
+
+Every job is one row holding its kind, JSON arguments, state and progress.  A
+worker *claims* a queued job by taking a lease on it: the row records the
+worker and when the lease runs out, and the worker extends the lease while it
+works.  A job whose lease ran out, because its worker or the whole server
+stopped, is claimed again by the next worker, so unfinished work resumes after
+a restart.  Each claim counts as an attempt; failed attempts are retried with
+exponential backoff until the job's attempt limit is reached.
+
+Jobs submitted with an idempotency key are stored once per key: submitting the
+same key again returns the existing job.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+JOB_STATES = ("queued", "running", "done", "failed")
+
+# Upper bound of the delay before a failed job is retried, in seconds
+MAX_BACKOFF = 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    arguments TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    state TEXT NOT NULL,
+    stage TEXT,
+    completed INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT,
+    error_code TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, available_at);
+CREATE INDEX IF NOT EXISTS jobs_by_lease ON jobs (state, lease_expires_at);
+CREATE INDEX IF NOT EXISTS jobs_by_finished ON jobs (finished_at);
+"""
+
+
+def backoff(attempts: int, base: float) -> float:
+    """Delay before retrying a job that failed *attempts* times."""
+    return float(min(base * 2 ** max(attempts - 1, 0), MAX_BACKOFF))
+
+
+class JobRecord(NamedTuple):
+    """A job as stored in the queue."""
+
+    job_id: str
+    kind: str
+    arguments: Dict[str, Any]
+    idempotency_key: Optional[str]
+    state: str
+    stage: Optional[str]
+    completed: int
+    total: int
+    attempts: int
+    max_attempts: int
+    available_at: float
+    lease_owner: Optional[str]
+    lease_expires_at: Optional[float]
+    submitted_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    error_code: Optional[str]
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "JobRecord":
+        """Decode a row of the ``jobs`` table."""
+        values = dict(row)
+        values["arguments"] = json.loads(values["arguments"])
+        values["result"] = json.loads(values["result"]) if values["result"] is not None else None
+        return cls(**values)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done or failed."""
+        return self.state in ("done", "failed")
+
+
+class JobQueue:
+    """Persistent queue of jobs with leases, retries and idempotency keys."""
+
+    def __init__(self, path: Union[str, Path] = ":memory:", retry_backoff: float = 5.0) -> None:
+        """Open (and create if needed) the queue database.
+
+        Args:
+            path: Database file, or ``":memory:"`` for a private in-memory queue
+            retry_backoff: Delay before the first retry of a failed job in seconds;
+                           it doubles with every further attempt
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.path = str(path)
+        self.retry_backoff = retry_backoff
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def enqueue(
+        self,
+        kind: str,
+        arguments: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        total: int = 1,
+        max_attempts: int = 3,
+        now: Optional[float] = None,
+    ) -> Tuple[JobRecord, bool]:
+        """Add a job, or return the job already submitted with *idempotency_key*.
+
+        Args:
+            kind: Kind of job, selecting the handler that runs it
+            arguments: JSON-serializable arguments of the handler
+            idempotency_key: Optional key identifying the submission
+            total: Number of progress steps of the job
+            max_attempts: Number of times the job is run before it is failed for good
+            now: Unix time of the submission, defaults to now
+
+        Returns:
+            The job and whether it was added by this call
+        """
+        now = time.time() if now is None else now
+        encoded = json.dumps(arguments, sort_keys=True)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = None
+                if idempotency_key is not None:
+                    row = self._db.execute(
+                        "SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                    ).fetchone()
+                created = row is None
+                if row is None:
+                    job_id = uuid.uuid4().hex
+                    self._db.execute(
+                        "INSERT INTO jobs (job_id, kind, arguments, idempotency_key, state, total, max_attempts, "
+                        "available_at, submitted_at) VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+                        (job_id, kind, encoded, idempotency_key, total, max_attempts, now, now),
+                    )
+                    row = self._db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return JobRecord.from_row(row), created
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        """Return the job with *job_id*, if it is known."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return JobRecord.from_row(row) if row is not None else None
+
+    def jobs(self, states: Sequence[str] = JOB_STATES) -> List[JobRecord]:
+        """Jobs in one of *states*, oldest first."""
+        marks = ", ".join("?" for _ in states)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT * FROM jobs WHERE state IN ({marks}) ORDER BY submitted_at, rowid", tuple(states)
+            ).fetchall()
+        return [JobRecord.from_row(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in every state."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = dict.fromkeys(JOB_STATES, 0)
+        counts.update((state, count) for state, count in rows)
+        return counts
+
+    def claim(
+        self, owner: str, lease_seconds: float, kinds: Sequence[str], now: Optional[float] = None
+    ) -> Optional[JobRecord]:
+        """Lease the next runnable job of one of *kinds* to *owner*.
+
+        Runnable jobs are queued jobs whose retry delay has passed and running jobs
+        whose lease ran out.  A job whose lease ran out on its last attempt is failed
+        instead, so a dump that kills its worker is not retried forever.
+        """
+        if not kinds:
+            return None
+        now = time.time() if now is None else now
+        marks = ", ".join("?" for _ in kinds)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "UPDATE jobs SET state = 'failed', finished_at = ?, lease_owner = NULL, lease_expires_at = NULL, "
+                    "error = 'The worker running the job stopped before it finished', error_code = 'JOB_ABANDONED' "
+                    "WHERE state = 'running' AND lease_expires_at < ? AND attempts >= max_attempts "
+                    f"AND kind IN ({marks})",
+                    (now, now, *kinds),
+                )
+                row = self._db.execute(
+                    f"SELECT job_id FROM jobs WHERE kind IN ({marks}) AND ("
+                    "(state = 'queued' AND available_at <= ?) OR (state = 'running' AND lease_expires_at < ?)"
+                    ") ORDER BY available_at, rowid LIMIT 1",
+                    (*kinds, now, now),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET state = 'running', lease_owner = ?, lease_expires_at = ?, "
+                        "attempts = attempts + 1, started_at = ?, stage = NULL, completed = 0 WHERE job_id = ?",
+                        (owner, now + lease_seconds, now, row["job_id"]),
+                    )
+                    row = self._db.execute("SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)).fetchone()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return JobRecord.from_row(row) if row is not None else None
+
+    def heartbeat(
+        self,
+        job_id: str,
+        owner: str,
+        lease_seconds: float,
+        completed: int,
+        total: int,
+        stage: Optional[str],
+        now: Optional[float] = None,
+    ) -> bool:
+        """Extend the lease of a running job and record its progress.
+
+        Returns:
+            ``False`` if *owner* no longer holds the lease
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET lease_expires_at = ?, completed = ?, total = ?, stage = ? "
+                "WHERE job_id = ? AND lease_owner = ? AND state = 'running'",
+                (now + lease_seconds, completed, total, stage, job_id, owner),
+            )
+        return cursor.rowcount > 0
+
+    def complete(
+        self,
+        job_id: str,
+        owner: str,
+        result: Dict[str, Any],
+        total: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> bool:
+        """Mark a job leased to *owner* as done with *result*, and all of its *total* steps as completed.
+
+        Returns:
+            ``False`` if *owner* no longer holds the lease
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET state = 'done', total = coalesce(?, total), completed = coalesce(?, total), "
+                "stage = NULL, finished_at = ?, result = ?, lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE job_id = ? AND lease_owner = ? AND state = 'running'",
+                (total, total, now, json.dumps(result), job_id, owner),
+            )
+        return cursor.rowcount > 0
+
+    def fail(
+        self,
+        job_id: str,
+        owner: str,
+        error: Optional[str],
+        error_code: Optional[str],
+        retry: bool = False,
+        now: Optional[float] = None,
+    ) -> Optional[str]:
+        """Record a failed attempt of a job leased to *owner*.
+
+        With *retry*, a job with attempts left is queued again after the backoff
+        delay; otherwise it is failed for good.
+
+        Returns:
+            The new state of the job, or ``None`` if *owner* no longer holds the lease
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT attempts, max_attempts FROM jobs "
+                    "WHERE job_id = ? AND lease_owner = ? AND state = 'running'",
+                    (job_id, owner),
+                ).fetchone()
+                state = None
+                if row is not None:
+                    state = "queued" if retry and row["attempts"] < row["max_attempts"] else "failed"
+                    self._db.execute(
+                        "UPDATE jobs SET state = ?, available_at = ?, finished_at = ?, error = ?, error_code = ?, "
+                        "lease_owner = NULL, lease_expires_at = NULL WHERE job_id = ?",
+                        (
+                            state,
+                            now + backoff(row["attempts"], self.retry_backoff),
+                            now if state == "failed" else None,
+                            error,
+                            error_code,
+                            job_id,
+                        ),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return state
+
+    def release(self, job_id: str, owner: str, now: Optional[float] = None) -> bool:
+        """Give a job leased to *owner* back to the queue without counting the attempt.
+
+        Used when a worker stops, e.g. on shutdown, so that the job resumes at once.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET state = 'queued', available_at = ?, attempts = max(attempts - 1, 0), "
+                "lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE job_id = ? AND lease_owner = ? AND state = 'running'",
+                (now, job_id, owner),
+            )
+        return cursor.rowcount > 0
+
+    def next_available(self, kinds: Sequence[str]) -> Optional[float]:
+        """Earliest time a queued job or a running job's lease becomes claimable."""
+        if not kinds:
+            return None
+        marks = ", ".join("?" for _ in kinds)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT min(CASE state WHEN 'queued' THEN available_at ELSE lease_expires_at END) FROM jobs "
+                f"WHERE state IN ('queued', 'running') AND kind IN ({marks})",
+                tuple(kinds),
+            ).fetchone()
+        return float(row[0]) if row[0] is not None else None
+
+    def prune(self, keep_finished: int) -> int:
+        """Remove all but the *keep_finished* most recently finished jobs.
+
+        Returns:
+            Number of jobs removed
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM jobs WHERE job_id IN (SELECT job_id FROM jobs WHERE state IN ('done', 'failed') "
+                "ORDER BY finished_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (keep_finished,),
+            )
+        return cursor.rowcount
@@ -9,18 +9,310 @@ quickly inside the execution sandbox.
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
 import shutil
+import signal
+import subprocess
 import sys
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Dict, Iterable, List, Optional, Set, Tuple
+
+from minidumpmcp.tracing import annotate, span
+
+if sys.platform != "win32":
+    import resource
+
+logger = logging.getLogger(__name__)
+
+# Seconds a child may take to exit after SIGTERM before it is sent SIGKILL
+DEFAULT_GRACE_PERIOD = 2.0
+
+# ``ru_maxrss`` is reported in bytes on macOS and in KiB elsewhere
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# Limits are set on the started child where the platform has prlimit; elsewhere the child is started
+# through a Python wrapper that sets its own limits.  preexec_fn is no option, since it is unsafe in a
+# process that spawns from several threads.
+_PRLIMIT = sys.platform != "win32" and hasattr(resource, "prlimit")
+
+# The wrapper: sets the NAME=VALUE limits given before "--", then replaces itself with the command after it
+_SET_LIMITS = """\
+import os, resource, sys
+end = sys.argv.index("--")
+for spec in sys.argv[1:end]:
+    name, value = spec.split("=")
+    limit = getattr(resource, name)
+    hard = resource.getrlimit(limit)[1]
+    resource.setrlimit(limit, (int(value) if hard == resource.RLIM_INFINITY else min(int(value), hard), hard))
+os.execvp(sys.argv[end + 1], sys.argv[end + 1:])
+"""
 
 
 class ToolExecutionError(RuntimeError):
     """Raised when the wrapped CLI tool fails (non-zero exit-status)."""
 
 
+@dataclass(frozen=True)
+class ResourceLimits:
+    """Resource limits applied to a child process; ``None`` keeps the inherited limit."""
+
+    address_space: Optional[int] = None  # Bytes of virtual memory (RLIMIT_AS)
+    cpu_seconds: Optional[int] = None  # CPU seconds before SIGXCPU (RLIMIT_CPU)
+    open_files: Optional[int] = None  # Open file descriptors (RLIMIT_NOFILE)
+
+    def _set(self) -> list[Tuple[str, int]]:
+        return [
+            (name, value)
+            for name, value in (
+                ("RLIMIT_AS", self.address_space),
+                ("RLIMIT_CPU", self.cpu_seconds),
+                ("RLIMIT_NOFILE", self.open_files),
+            )
+            if value is not None
+        ]
+
+    def apply(self, pid: int) -> None:
+        """Lower the soft limits of the running process *pid*; needs ``prlimit`` (Linux)."""
+        for name, value in self._set():
+            limit = getattr(resource, name)
+            _, hard = resource.prlimit(pid, limit)
+            resource.prlimit(pid, limit, (value if hard == resource.RLIM_INFINITY else min(value, hard), hard))
+
+    def wrap(self, args: list[str]) -> list[str]:
+        """Command line that lowers its own soft limits and then executes *args*; for platforms without ``prlimit``."""
+        if not self._set():
+            return args
+        return [sys.executable, "-c", _SET_LIMITS, *(f"{name}={value}" for name, value in self._set()), "--", *args]
+
+
+# Upper bounds in seconds of the buckets counting tool runs by wall time, so latency percentiles can be estimated
+WALL_TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+@dataclass(frozen=True)
+class ResourceUsage:
+    """Resources a child process used, as reported by ``wait4`` when it was reaped."""
+
+    user_seconds: float
+    system_seconds: float
+    max_rss_bytes: int
+    wall_seconds: float
+
+
+@dataclass
+class ToolUsage:
+    """Resources used by all runs of one tool."""
+
+    runs: int = 0
+    failed: int = 0
+    user_seconds: float = 0.0
+    system_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    max_rss_bytes: int = 0  # Largest of any run
+    # Runs per bucket of WALL_TIME_BUCKETS (not cumulative, +Inf last)
+    wall_time_counts: List[int] = field(default_factory=lambda: [0] * (len(WALL_TIME_BUCKETS) + 1))
+
+
+@dataclass
+class SubprocessStats:
+    """Resource usage of the children of all :func:`run_subprocess` calls, and those stopped early."""
+
+    cancelled: int = 0
+    timed_out: int = 0
+    killed: int = 0  # Children that ignored SIGTERM for the whole grace period
+    cpu_seconds: float = 0.0  # CPU time the stopped children had used
+    reclaimed_seconds: float = 0.0  # Unused part of the timeouts of cancelled children
+    tools: Dict[str, ToolUsage] = field(default_factory=dict)
+
+    def record(self, tool: str, usage: ResourceUsage, returncode: int) -> None:
+        """Add a finished run of *tool*."""
+        totals = self.tools.setdefault(tool, ToolUsage())
+        totals.runs += 1
+        totals.failed += returncode != 0
+        totals.user_seconds += usage.user_seconds
+        totals.system_seconds += usage.system_seconds
+        totals.wall_seconds += usage.wall_seconds
+        totals.wall_time_counts[bisect_left(WALL_TIME_BUCKETS, usage.wall_seconds)] += 1
+        totals.max_rss_bytes = max(totals.max_rss_bytes, usage.max_rss_bytes)
+
+
+subprocess_stats = SubprocessStats()
+
+# Stops in progress, referenced until they finish so a repeated cancellation cannot drop them
+_stopping: Set[asyncio.Task[None]] = set()
+
+
+async def _read_pipe(pipe: Optional[IO[bytes]]) -> bytes:
+    """Read *pipe* to its end without blocking the event loop, then close it."""
+    if pipe is None:
+        return b""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    try:
+        return await reader.read()
+    finally:
+        transport.close()
+
+
+class ChildProcess:
+    """A child process reaped with ``wait4``, so its resource usage is known.
+
+    asyncio's own subprocesses are reaped by its child watcher, which discards the
+    usage, so the child is started with :class:`subprocess.Popen`, its pipes are read
+    by the event loop and its exit is awaited on a pidfd where the platform has them.
+    """
+
+    def __init__(self, args: list[str], capture_output: bool = True, limits: Optional[ResourceLimits] = None) -> None:
+        """Start the child; the event loop must be running.
+
+        Args:
+            args: Command line
+            capture_output: Whether stdout and stderr are captured instead of inherited
+            limits: Resource limits applied to the child (not on Windows)
+        """
+        pipe = subprocess.PIPE if capture_output else None
+        if limits is not None and sys.platform != "win32" and not _PRLIMIT:
+            args = limits.wrap(args)
+        self._popen = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=pipe, stderr=pipe)
+        self.pid = self._popen.pid
+        if limits is not None and _PRLIMIT:
+            try:
+                limits.apply(self.pid)
+            except ProcessLookupError:
+                pass  # Exited already
+            except OSError:
+                # Never leave the child running without its limits
+                self._popen.kill()
+                self._popen.wait()
+                raise
+        self.returncode: Optional[int] = None
+        self.usage: Optional[ResourceUsage] = None
+        self._started = time.monotonic()
+        self._reaper = asyncio.ensure_future(self._reap())
+
+    async def _reap(self) -> None:
+        try:
+            pidfd = os.pidfd_open(self.pid)
+        except (AttributeError, OSError):
+            _, status, rusage = await asyncio.to_thread(os.wait4, self.pid, 0)
+        else:
+            loop = asyncio.get_running_loop()
+            exited = asyncio.Event()
+            loop.add_reader(pidfd, exited.set)
+            try:
+                await exited.wait()
+            finally:
+                loop.remove_reader(pidfd)
+                os.close(pidfd)
+            _, status, rusage = os.wait4(self.pid, 0)
+        self.returncode = os.waitstatus_to_exitcode(status)
+        # Popen must neither reap the pid again nor warn about a running child
+        self._popen.returncode = self.returncode
+        self.usage = ResourceUsage(
+            rusage.ru_utime, rusage.ru_stime, rusage.ru_maxrss * _RSS_UNIT, time.monotonic() - self._started
+        )
+
+    async def wait(self) -> int:
+        """Wait until the child has exited and is reaped, and return its exit code."""
+        await asyncio.shield(self._reaper)
+        assert self.returncode is not None
+        return self.returncode
+
+    async def communicate(self) -> Tuple[bytes, bytes]:
+        """Read stdout and stderr to their ends and wait for the child to exit."""
+        stdout, stderr = await asyncio.gather(_read_pipe(self._popen.stdout), _read_pipe(self._popen.stderr))
+        await self.wait()
+        return stdout, stderr
+
+    def send_signal(self, sig: int) -> None:
+        """Send *sig* to the child unless it is reaped already."""
+        if self.returncode is None:
+            os.kill(self.pid, sig)
+
+    def terminate(self) -> None:
+        """Ask the child to exit."""
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        """Kill the child."""
+        self.send_signal(signal.SIGKILL)
+
+
+def _describe(returncode: int) -> str:
+    if returncode < 0:
+        try:
+            return f"{returncode} ({signal.Signals(-returncode).name})"
+        except ValueError:
+            pass
+    return str(returncode)
+
+
+async def stop_process(proc: ChildProcess, grace_period: float = DEFAULT_GRACE_PERIOD) -> bool:
+    """Terminate *proc*, kill it if it outlives *grace_period*, and reap it.
+
+    Returns
+    -------
+    bool
+        Whether the process had to be killed.
+    """
+    if proc.returncode is not None:
+        return False
+    try:
+        proc.terminate()
+        await asyncio.wait_for(proc.wait(), grace_period)
+        return False
+    except ProcessLookupError:
+        await proc.wait()
+        return False
+    except asyncio.TimeoutError:
+        pass
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        pass
+    await proc.wait()
+    return True
+
+
+async def _abandon(
+    proc: ChildProcess, tool: str, reason: str, elapsed: float, timeout: float | None, grace: float
+) -> None:
+    killed = await stop_process(proc, grace)
+    assert proc.usage is not None and proc.returncode is not None
+    subprocess_stats.record(tool, proc.usage, proc.returncode)
+    if reason == "cancelled":
+        subprocess_stats.cancelled += 1
+        if timeout is not None:
+            subprocess_stats.reclaimed_seconds += max(timeout - elapsed, 0.0)
+    else:
+        subprocess_stats.timed_out += 1
+    subprocess_stats.killed += killed
+    cpu = proc.usage.user_seconds + proc.usage.system_seconds
+    subprocess_stats.cpu_seconds += cpu
+    logger.info(
+        "Stopped %s after %.1fs (%s, %s, %.1f CPU seconds, %.1f MiB max RSS)",
+        tool,
+        elapsed,
+        reason,
+        "killed" if killed else "terminated",
+        cpu,
+        proc.usage.max_rss_bytes / (1024 * 1024),
+    )
+
+
 async def run_subprocess(
-    cmd: Iterable[str | Path], *, capture_output: bool = True, timeout: float | None = None
+    cmd: Iterable[str | Path],
+    *,
+    capture_output: bool = True,
+    timeout: float | None = None,
+    grace_period: float = DEFAULT_GRACE_PERIOD,
+    limits: ResourceLimits | None = None,
+    tool: str | None = None,
 ) -> str:  # noqa: D401 – helper wrapper
     """Run *cmd* asynchronously and return its **stdout** as a *string*.
 
@@ -34,42 +326,85 @@ async def run_subprocess(
         Otherwise the child process inherits the parent file-descriptors which
         is useful for manual debugging.
     timeout:
-        Optional maximum runtime in *seconds*.  The subprocess is **forcefully
-        killed** if the limit is exceeded and :class:`asyncio.TimeoutError` is
-        re-raised to the caller.
+        Optional maximum runtime in *seconds*.  The subprocess is stopped if
+        the limit is exceeded and :class:`asyncio.TimeoutError` is re-raised to
+        the caller.
+    grace_period:
+        Seconds a stopped subprocess may take to exit after ``SIGTERM`` before
+        it is sent ``SIGKILL``.
+    limits:
+        Optional resource limits (address space, CPU seconds, open files)
+        applied to the subprocess.
+    tool:
+        Name the run is accounted under, defaults to the executable's name.
+
+    When the limit is exceeded or the calling task is cancelled, e.g. because
+    the MCP client cancelled the request or disconnected, the subprocess is
+    terminated, killed after *grace_period* and reaped before the exception
+    propagates, and counted in :data:`subprocess_stats`.  Every run's CPU time
+    and peak memory are logged and added to the tool's totals there, and
+    recorded on a ``subprocess`` span of the traced request.
     """
 
-    # Ensure *cmd* is fully stringified – ``asyncio.create_subprocess_exec``
-    # will otherwise error on ``Path`` entries.
+    # Ensure *cmd* is fully stringified – ``subprocess.Popen`` would accept
+    # ``Path`` entries, but the error message below would not.
     str_cmd = [str(part) for part in cmd]
+    tool = tool or Path(str_cmd[0]).name
 
-    # On Windows the default event-loop policy does not support ``subprocess``
-    # transports.  Emit a helpful error early so the caller can react.
+    # Children are reaped with ``wait4``, which Windows does not have.  Emit a
+    # helpful error early so the caller can react.
     if sys.platform == "win32":
         raise RuntimeError("Asynchronous subprocess execution is not supported on Windows.")
 
-    # Spawn the child process.
-    proc = await asyncio.create_subprocess_exec(
-        *str_cmd,
-        stdout=asyncio.subprocess.PIPE if capture_output else None,
-        stderr=asyncio.subprocess.PIPE if capture_output else None,
-    )
+    with span("subprocess", tool=tool):
+        # Spawn the child process.
+        proc = ChildProcess(str_cmd, capture_output, limits)
+        annotate(pid=proc.pid)
 
-    try:
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
-    except asyncio.TimeoutError:  # pragma: no cover – unlikely in unit tests
-        proc.kill()
-        raise  # Re-raise for caller
+        started = time.monotonic()
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            reason = "timed out" if isinstance(e, asyncio.TimeoutError) else "cancelled"
+            stopping = asyncio.ensure_future(
+                _abandon(proc, tool, reason, time.monotonic() - started, timeout, grace_period)
+            )
+            _stopping.add(stopping)
+            stopping.add_done_callback(_stopping.discard)
+            # Shielded, so the child is still reaped when the caller is cancelled again meanwhile
+            await asyncio.shield(stopping)
+            raise  # Re-raise for caller
+
+        assert proc.usage is not None and proc.returncode is not None
+        usage = proc.usage
+        subprocess_stats.record(tool, usage, proc.returncode)
+        annotate(
+            returncode=proc.returncode,
+            user_seconds=usage.user_seconds,
+            system_seconds=usage.system_seconds,
+            max_rss_bytes=usage.max_rss_bytes,
+        )
+        logger.log(
+            logging.DEBUG if proc.returncode == 0 else logging.WARNING,
+            "%s exited with %s after %.2fs: %.2fs user, %.2fs system, %.1f MiB max RSS",
+            tool,
+            _describe(proc.returncode),
+            usage.wall_seconds,
+            usage.user_seconds,
+            usage.system_seconds,
+            usage.max_rss_bytes / (1024 * 1024),
+        )
 
-    # ``stdout``/``stderr`` can be *None* when *capture_output* is ``False`` –
-    # guard against ``AttributeError`` when decoding.
-    out_text = stdout.decode() if stdout else ""
-    err_text = stderr.decode() if stderr else ""
+        # ``stdout``/``stderr`` are empty when *capture_output* is ``False``.
+        out_text = stdout.decode()
+        err_text = stderr.decode()
 
-    if proc.returncode != 0:
-        raise ToolExecutionError(f"Command {' '.join(str_cmd)} failed with exit-code {proc.returncode}\n{err_text}")
+        if proc.returncode != 0:
+            raise ToolExecutionError(
+                f"Command {' '.join(str_cmd)} failed with exit-code {_describe(proc.returncode)}\n{err_text}"
+            )
 
-    return out_text
+        return out_text
 
 
 def which(cmd: str) -> str | None:  # noqa: D401 – thin wrapper
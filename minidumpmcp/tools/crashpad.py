@@ -0,0 +1,133 @@
+"""Crashpad database ingestion tools for FastMCP."""
+
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from minidumpmcp.analysis.crashpad import REPORT_STATES, CrashpadIndex, CrashpadReport, read_report_metadata
+from minidumpmcp.exceptions import CrashpadDatabaseError, FileValidationError, InvalidParameterError
+
+from .triage import TriageProvider, is_crashpad_database
+
+
+def _locate(database: Path, report: CrashpadReport) -> CrashpadReport:
+    """Find a report that may have moved to another state directory since it was recorded."""
+    if report.path.exists():
+        return report
+    for state in REPORT_STATES:
+        path = database / state / report.path.name
+        if path.exists():
+            return CrashpadReport(report.uuid, state, path)
+    return report
+
+
+class CrashpadProvider:
+    """Provider for incremental ingestion of Crashpad databases."""
+
+    def __init__(self, index: CrashpadIndex, triage: Optional[TriageProvider] = None) -> None:
+        """Initialize the provider.
+
+        Args:
+            index: State database remembering the reports already ingested
+            triage: Provider reading and analyzing the report minidumps
+        """
+        self._index = index
+        self._triage = triage if triage is not None else TriageProvider()
+
+    async def ingest_crashpad_database(
+        self,
+        database_path: str,
+        stackwalk: bool = False,
+        symbols_path: Optional[str] = None,
+        max_reports: int = 100,
+        concurrency: int = 2,
+        reset: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Ingest the reports added to a Crashpad database since the previous call.
+
+        Reports are read in place from the database's pending/ and completed/ directories.
+        Each new report gets its upload metadata, Crashpad annotations and minidump metadata;
+        with ``stackwalk=True`` it is also fully analyzed, cached and indexed like a
+        stackwalk_minidump result. Call repeatedly to drain large backlogs: reports beyond
+        ``max_reports``, and those the request's deadline left no time to analyze, are
+        returned by the next call.
+
+        Args:
+            database_path: Crashpad database directory (containing pending/ and completed/)
+            stackwalk: Whether to run a full stackwalk on every new report
+            symbols_path: Optional path to symbols directory used by the stackwalks
+            max_reports: Maximum number of reports ingested by this call
+            concurrency: Maximum number of stackwalks running at once
+            reset: Forget previously ingested reports and start over
+
+        Returns:
+            Dictionary with one record per ingested report and the number of reports left
+        """
+        if max_reports < 1:
+            param_error = InvalidParameterError("max_reports", max_reports, "Must be at least 1")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        if concurrency < 1:
+            param_error = InvalidParameterError("concurrency", concurrency, "Must be at least 1")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+
+        database = Path(database_path)
+        if not database.is_dir():
+            file_error = FileValidationError(database, "Directory not found or not a directory")
+            return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+        if not is_crashpad_database(database):
+            db_error = CrashpadDatabaseError(database, "Not a Crashpad database")
+            return {"error": str(db_error), "success": False, "error_code": db_error.error_code}
+
+        start = time.perf_counter()
+        try:
+            if reset:
+                await asyncio.to_thread(self._index.reset, database)
+            discovered = await asyncio.to_thread(self._index.scan, database)
+            reports = await asyncio.to_thread(self._index.unprocessed, database, max_reports)
+        except (OSError, sqlite3.Error) as e:
+            db_error = CrashpadDatabaseError(database, f"Scan or state update failed: {e}")
+            return {"error": str(db_error), "success": False, "error_code": db_error.error_code}
+        scan_ms = round((time.perf_counter() - start) * 1000, 3)
+
+        # Reports may have moved, e.g. from pending/ to completed/ after an upload, since the scan
+        reports = [_locate(database, report) for report in reports]
+        by_path = {str(report.path): report for report in reports}
+        records: List[Dict[str, Any]] = []
+        try:
+            async for record in self._triage.triage(
+                [report.path for report in reports], stackwalk, symbols_path, concurrency=concurrency
+            ):
+                report = by_path[record["minidump_path"]]
+                record["report_id"] = report.uuid
+                record["state"] = report.state
+                record["metadata"] = await asyncio.to_thread(read_report_metadata, report.path)
+                analysis = record.get("stackwalk", {})
+                error = record.get("error") or analysis.get("error")
+                await asyncio.to_thread(
+                    self._index.mark_processed, database, report.uuid, record.get("dump_hash"), error
+                )
+                records.append(record)
+            remaining = await asyncio.to_thread(self._index.pending_count, database)
+        except sqlite3.Error as e:
+            db_error = CrashpadDatabaseError(database, f"State update failed: {e}")
+            return {"error": str(db_error), "success": False, "error_code": db_error.error_code}
+
+        result: Dict[str, Any] = {
+            "success": True,
+            "database": str(database),
+            "discovered": discovered,
+            "ingested": len(records),
+            "remaining": remaining,
+            "reports": records,
+            "timings": {"scan_ms": scan_ms, "wall_ms": round((time.perf_counter() - start) * 1000, 3)},
+        }
+        if len(records) < len(reports):
+            result["stopped_early"] = True
+            result["suggestion"] = (
+                f"The request's deadline left no time to analyze the other {len(reports) - len(records)} reports; "
+                "call again to ingest them"
+            )
+        return result
@@ -12,8 +12,9 @@ from minidumpmcp.exceptions import (
 from minidumpmcp.exceptions import (
     ToolExecutionError as CommonToolExecutionError,
 )
+from minidumpmcp.tracing import span
 
-from ._common import ToolExecutionError, run_subprocess
+from ._common import ResourceLimits, ToolExecutionError, run_subprocess
 
 
 def _get_dump_syms_path() -> Path:
@@ -37,6 +38,14 @@ def _get_dump_syms_path() -> Path:
 class DumpSymsTool:
     """Tool for extracting Breakpad symbols from binaries using dump_syms."""
 
+    def __init__(self, limits: Optional[ResourceLimits] = None) -> None:
+        """Initialize the tool.
+
+        Args:
+            limits: Resource limits of the dump_syms processes
+        """
+        self._limits = limits
+
     async def extract_symbols(
         self,
         binary_path: str,
@@ -62,68 +71,71 @@ class DumpSymsTool:
             RuntimeError: If dump_syms execution fails
         """
         try:
-            binary_file = Path(binary_path).resolve()
-            if not binary_file.exists():
-                file_error = FileValidationError(binary_file, "Binary file not found")
-                return {"success": False, "error": str(file_error), "error_code": file_error.error_code}
-
-            # Set output directory
-            if output_dir:
-                output_path = Path(output_dir).resolve()
-            else:
-                output_path = Path.cwd() / "symbols"
-
-            output_path.mkdir(parents=True, exist_ok=True)
-
-            # Get dump_syms binary
-            try:
-                dump_syms = _get_dump_syms_path()
-            except ValueError as e:
-                platform_error = SymbolExtractionError(binary_file, str(e))
-                return {"success": False, "error": str(platform_error), "error_code": platform_error.error_code}
-
-            if not dump_syms.exists():
-                tool_error = ToolNotFoundError("dump_syms", [dump_syms])
-                return {
-                    "success": False,
-                    "error": str(tool_error),
-                    "error_code": tool_error.error_code,
-                }
+            with span("dump_syms.validate"):
+                binary_file = Path(binary_path).resolve()
+                if not binary_file.exists():
+                    file_error = FileValidationError(binary_file, "Binary file not found")
+                    return {"success": False, "error": str(file_error), "error_code": file_error.error_code}
+
+                # Set output directory
+                if output_dir:
+                    output_path = Path(output_dir).resolve()
+                else:
+                    output_path = Path.cwd() / "symbols"
+
+                output_path.mkdir(parents=True, exist_ok=True)
+
+                # Get dump_syms binary
+                try:
+                    dump_syms = _get_dump_syms_path()
+                except ValueError as e:
+                    platform_error = SymbolExtractionError(binary_file, str(e))
+                    return {"success": False, "error": str(platform_error), "error_code": platform_error.error_code}
+
+                if not dump_syms.exists():
+                    tool_error = ToolNotFoundError("dump_syms", [dump_syms])
+                    return {
+                        "success": False,
+                        "error": str(tool_error),
+                        "error_code": tool_error.error_code,
+                    }
 
             # Run dump_syms to extract symbols
             cmd = [str(dump_syms), str(binary_file)]
-            stdout = await run_subprocess(cmd)
+            stdout = await run_subprocess(cmd, limits=self._limits, tool="dump_syms")
 
             # Parse the symbol data
-            if not stdout:
-                output_error = SymbolExtractionError(binary_file, "dump_syms produced no output")
-                return {"success": False, "error": str(output_error), "error_code": output_error.error_code}
-
-            # Extract module info from first line
-            # Format: MODULE <os> <arch> <id> <name>
-            first_line = stdout.split("\n")[0]
-            parts = first_line.split()
-
-            if len(parts) < 5 or parts[0] != "MODULE":
-                header_error = SymbolExtractionError(
-                    binary_file,
-                    f"Invalid symbol header format. Expected 'MODULE <os> <arch> <id> <name>', got: {first_line}",
-                )
-                return {"success": False, "error": str(header_error), "error_code": header_error.error_code}
-
-            module_os = parts[1]
-            module_arch = parts[2]
-            module_id = parts[3]
-            module_name = parts[4]
+            with span("dump_syms.parse"):
+                if not stdout:
+                    output_error = SymbolExtractionError(binary_file, "dump_syms produced no output")
+                    return {"success": False, "error": str(output_error), "error_code": output_error.error_code}
+
+                # Extract module info from first line
+                # Format: MODULE <os> <arch> <id> <name>
+                first_line = stdout.split("\n")[0]
+                parts = first_line.split()
+
+                if len(parts) < 5 or parts[0] != "MODULE":
+                    header_error = SymbolExtractionError(
+                        binary_file,
+                        f"Invalid symbol header format. Expected 'MODULE <os> <arch> <id> <name>', got: {first_line}",
+                    )
+                    return {"success": False, "error": str(header_error), "error_code": header_error.error_code}
+
+                module_os = parts[1]
+                module_arch = parts[2]
+                module_id = parts[3]
+                module_name = parts[4]
 
             # Create Breakpad directory structure: <module>/<id>/<module>.sym
-            symbol_dir = output_path / module_name / module_id
-            symbol_dir.mkdir(parents=True, exist_ok=True)
+            with span("dump_syms.write", bytes=len(stdout)):
+                symbol_dir = output_path / module_name / module_id
+                symbol_dir.mkdir(parents=True, exist_ok=True)
 
-            symbol_file = symbol_dir / f"{module_name}.sym"
+                symbol_file = symbol_dir / f"{module_name}.sym"
 
-            # Write symbol content
-            symbol_file.write_text(stdout)
+                # Write symbol content
+                symbol_file.write_text(stdout)
 
             return {
                 "success": True,
@@ -0,0 +1,551 @@
+"""Background jobs for FastMCP.
+
+Walking a large full-memory dump can take minutes, longer than many MCP clients
+wait for a tool call, and so can extracting symbols from a batch of binaries or
+triaging a whole directory.  The ``submit_*`` tools store the work in the
+server's durable :class:`~minidumpmcp.storage.job_queue.JobQueue` and return a
+job id at once; ``get_job_status`` reports whether the job is queued, running,
+done or failed.  Jobs are run by the :class:`JobScheduler`'s workers rather than
+by the request that submitted them, so they finish even when the submitting
+client disconnects, and jobs left unfinished by a restart are resumed by the
+next server.  Finished analyses land in the shared analysis cache and are read
+through the ``minidump://<analysis_hash>/...`` resources, or returned from the
+cache by a repeated stackwalk_minidump call.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, ContextManager, Dict, List, Optional, Set, Tuple
+
+from minidumpmcp.exceptions import FileValidationError, InvalidParameterError, JobNotFoundError, MinidumpMCPError
+from minidumpmcp.storage.dump_store import parse_handle
+from minidumpmcp.storage.job_queue import JobQueue, JobRecord
+from minidumpmcp.tracing import Tracer
+
+from .dump_syms import DumpSymsTool
+from .stackwalk import StackwalkProvider
+from .triage import TriageProvider
+
+# Seconds a minidump-stackwalk run started by a job may take before it is killed
+DEFAULT_JOB_TIMEOUT = 3600.0
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(value: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(value, timezone.utc).isoformat() if value is not None else None
+
+
+class Job:
+    """A job being run by a worker; its handler reports progress through :meth:`update`."""
+
+    __slots__ = ("job_id", "kind", "arguments", "attempt", "stage", "completed", "total")
+
+    def __init__(self, record: JobRecord) -> None:
+        self.job_id = record.job_id
+        self.kind = record.kind
+        self.arguments = record.arguments
+        self.attempt = record.attempts
+        self.stage: Optional[str] = None
+        self.completed = 0
+        self.total = record.total
+
+    def update(self, completed: int, stage: Optional[str] = None, total: Optional[int] = None) -> None:
+        """Record progress: *completed* of the job's *total* steps, and the stage being worked on."""
+        if total is not None:
+            self.total = total
+        self.completed = min(completed, self.total)
+        self.stage = stage
+
+
+JobHandler = Callable[[Job], Awaitable[Dict[str, Any]]]
+
+
+def job_status(record: JobRecord, running: Optional[Job] = None) -> Dict[str, Any]:
+    """Status report of a job, as returned by get_job_status.
+
+    Args:
+        record: The job as stored in the queue
+        running: The job's live progress, when it runs in this process
+    """
+    stage, completed, total = record.stage, record.completed, record.total
+    if running is not None and record.state == "running":
+        stage, completed, total = running.stage, running.completed, running.total
+    end = record.finished_at if record.finished_at is not None else time.time()
+    status: Dict[str, Any] = {
+        "job_id": record.job_id,
+        "kind": record.kind,
+        "arguments": record.arguments,
+        "idempotency_key": record.idempotency_key,
+        "state": record.state,
+        "progress": {"stage": stage, "completed": completed, "total": total},
+        "attempts": record.attempts,
+        "max_attempts": record.max_attempts,
+        "submitted_at": _timestamp(record.submitted_at),
+        "started_at": _timestamp(record.started_at),
+        "finished_at": _timestamp(record.finished_at),
+        "elapsed_seconds": round(end - record.started_at, 3) if record.started_at is not None else None,
+    }
+    if record.state == "done":
+        status["result"] = record.result
+    elif record.state == "failed":
+        status.update({"error": record.error, "error_code": record.error_code})
+    elif record.state == "queued" and record.error is not None:
+        # A failed attempt waiting for its retry
+        status.update(
+            {
+                "last_error": record.error,
+                "last_error_code": record.error_code,
+                "next_attempt_at": _timestamp(record.available_at),
+            }
+        )
+    return status
+
+
+class JobScheduler:
+    """Runs the jobs of a durable queue with a bounded number of workers.
+
+    Handlers are registered per job kind before :meth:`start`; only jobs of
+    registered kinds are claimed.  Workers hold a lease on the job they run and
+    renew it every third of *lease_seconds*.  When the server stops, running
+    jobs are handed back to the queue; jobs of a server that died are claimed
+    again once their lease runs out.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        concurrency: int = 2,
+        max_finished: int = 256,
+        max_attempts: int = 3,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 1.0,
+        tracer: Optional[Tracer] = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            queue: Queue holding the jobs, a private in-memory queue by default
+            concurrency: Number of workers, i.e. of jobs running at once
+            max_finished: Number of finished jobs whose status is kept
+            max_attempts: Number of times a job is run before it is failed for good
+            lease_seconds: How long a job stays leased to a worker without a renewal
+            poll_interval: Longest time an idle worker waits before checking the queue again
+            tracer: Tracer running every job attempt as a trace with the job id as request id
+        """
+        self.queue = queue if queue is not None else JobQueue()
+        self.concurrency = concurrency
+        self.max_finished = max_finished
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.tracer = tracer
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._running: Dict[str, Job] = {}
+        self._workers: Set["asyncio.Task[None]"] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closing = False
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Run jobs of *kind* with *handler*.
+
+        The handler returns the job result, a tool response whose ``success`` tells
+        whether the job is done or failed.  Failed results are final; exceptions
+        other than :class:`~minidumpmcp.exceptions.MinidumpMCPError` are retried.
+        """
+        self._handlers[kind] = handler
+
+    @property
+    def kinds(self) -> Tuple[str, ...]:
+        """Job kinds with a registered handler."""
+        return tuple(self._handlers)
+
+    def start(self) -> None:
+        """Start the workers; jobs left in the queue by a previous server are resumed."""
+        if self._workers:
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for _ in range(self.concurrency):
+            worker = loop.create_task(self._worker(self._wakeup))
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+
+    async def close(self) -> None:
+        """Stop the workers, handing the jobs they are running back to the queue."""
+        # asyncio.wait_for can swallow a cancellation racing with its timeout (Python < 3.12),
+        # so idle workers also check the flag between waits
+        self._closing = True
+        workers = list(self._workers)
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def submit(
+        self, kind: str, arguments: Dict[str, Any], idempotency_key: Optional[str] = None, total: int = 1
+    ) -> Tuple[JobRecord, bool]:
+        """Queue a job, or return the job already submitted with *idempotency_key*.
+
+        Returns:
+            The job and whether it was added by this call
+        """
+        record, created = await asyncio.to_thread(
+            self.queue.enqueue, kind, arguments, idempotency_key, total, self.max_attempts
+        )
+        if created and self._wakeup is not None:
+            self._wakeup.set()
+        return record, created
+
+    async def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status report of the job with *job_id*, if it is known."""
+        record = await asyncio.to_thread(self.queue.get, job_id)
+        return job_status(record, self._running.get(job_id)) if record is not None else None
+
+    async def _worker(self, wakeup: asyncio.Event) -> None:
+        while not self._closing:
+            wakeup.clear()
+            try:
+                record = await asyncio.to_thread(self.queue.claim, self.owner, self.lease_seconds, self.kinds)
+                next_available = None
+                if record is None:
+                    next_available = await asyncio.to_thread(self.queue.next_available, self.kinds)
+            except Exception as e:
+                logger.error("Could not claim a job: %s", e)
+                record = next_available = None
+            if record is not None:
+                await self._run(record)
+                continue
+            delay = self.poll_interval
+            if next_available is not None:
+                delay = min(delay, max(next_available - time.time(), 0.0))
+            try:
+                await asyncio.wait_for(wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, record: JobRecord) -> None:
+        job = Job(record)
+        self._running[job.job_id] = job
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            retry = False
+            try:
+                with self._trace(job, record):
+                    result = await self._handlers[job.kind](job)
+            except MinidumpMCPError as e:
+                result = {"error": str(e), "success": False, "error_code": e.error_code}
+            except Exception as e:
+                logger.exception("Job %s (%s) failed on attempt %d", job.job_id, job.kind, job.attempt)
+                result = {"error": f"{type(e).__name__}: {e}", "success": False, "error_code": "JOB_FAILED"}
+                retry = True
+            await self._finish(job, result, retry)
+        except asyncio.CancelledError:
+            # The server is stopping: let the next one resume the job at once
+            try:
+                await asyncio.shield(asyncio.to_thread(self.queue.release, job.job_id, self.owner))
+            except Exception as e:
+                logger.warning("Could not hand job %s back to the queue: %s", job.job_id, e)
+            raise
+        finally:
+            heartbeat.cancel()
+            del self._running[job.job_id]
+
+    async def _finish(self, job: Job, result: Dict[str, Any], retry: bool) -> None:
+        """Store the outcome of *job*; errors are logged, so that the worker keeps running."""
+        try:
+            if result.get("success"):
+                try:
+                    await asyncio.to_thread(self.queue.complete, job.job_id, self.owner, result, job.total)
+                except (TypeError, ValueError) as e:
+                    # The result is not serializable to JSON; running the job again would not change that
+                    logger.error("Could not store the result of job %s (%s): %s", job.job_id, job.kind, e)
+                    await asyncio.to_thread(
+                        self.queue.fail, job.job_id, self.owner, f"Could not store the result: {e}", "JOB_FAILED"
+                    )
+            else:
+                await asyncio.to_thread(
+                    self.queue.fail, job.job_id, self.owner, result.get("error"), result.get("error_code"), retry
+                )
+        except Exception as e:
+            logger.error(
+                "Could not record the outcome of job %s; it runs again once its lease expires: %s", job.job_id, e
+            )
+        try:
+            await asyncio.to_thread(self.queue.prune, self.max_finished)
+        except Exception as e:
+            logger.warning("Could not prune finished jobs: %s", e)
+
+    def _trace(self, job: Job, record: JobRecord) -> ContextManager[Any]:
+        if self.tracer is None:
+            return contextlib.nullcontext()
+        queued = max(time.time() - record.available_at, 0.0)
+        return self.tracer.trace(f"job {job.kind}", job.job_id, attempt=job.attempt, queued_seconds=queued)
+
+    async def _heartbeat(self, job: Job) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                held = await asyncio.to_thread(
+                    self.queue.heartbeat,
+                    job.job_id,
+                    self.owner,
+                    self.lease_seconds,
+                    job.completed,
+                    job.total,
+                    job.stage,
+                )
+            except Exception as e:
+                logger.warning("Could not renew the lease of job %s: %s", job.job_id, e)
+                continue
+            if not held:
+                logger.warning("Lost the lease of job %s; another worker may run it again", job.job_id)
+                return
+
+
+class JobProvider:
+    """Provider for analyses, symbol extractions and triages that outlast a tool call."""
+
+    def __init__(
+        self,
+        stackwalk: Optional[StackwalkProvider] = None,
+        scheduler: Optional[JobScheduler] = None,
+        timeout: float = DEFAULT_JOB_TIMEOUT,
+        triage: Optional[TriageProvider] = None,
+        dump_syms: Optional[DumpSymsTool] = None,
+    ) -> None:
+        """Initialize the provider and register its job handlers with the scheduler.
+
+        Args:
+            stackwalk: Provider running the analyses; its cache receives the results
+            scheduler: Scheduler shared by the server's jobs, a private one by default
+            timeout: Seconds a minidump-stackwalk run started by an analysis job may take
+            triage: Provider running triage jobs, one sharing *stackwalk* by default
+            dump_syms: Tool running symbol extraction jobs
+        """
+        self._stackwalk = stackwalk if stackwalk is not None else StackwalkProvider()
+        self._scheduler = scheduler if scheduler is not None else JobScheduler()
+        self._timeout = timeout
+        self._triage = triage if triage is not None else TriageProvider(self._stackwalk)
+        self._dump_syms = dump_syms if dump_syms is not None else DumpSymsTool()
+        self._scheduler.register("analysis", self._run_analysis)
+        self._scheduler.register("extract_symbols", self._run_symbol_extraction)
+        self._scheduler.register("triage", self._run_triage)
+
+    @property
+    def scheduler(self) -> JobScheduler:
+        """Scheduler running the submitted jobs."""
+        return self._scheduler
+
+    async def submit_analysis(
+        self, minidump_path: str, symbols_path: Optional[str] = None, idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Start analyzing a minidump in the background and return a job id immediately.
+
+        Use this instead of stackwalk_minidump for large or full-memory dumps, whose
+        analysis can take longer than a tool call may. Poll get_job_status with the
+        returned job id; when the job is done its result holds the ``analysis_hash``
+        whose ``minidump://<analysis_hash>/...`` resources page through the analysis.
+        The job keeps running if the client disconnects and survives server restarts.
+
+        Args:
+            minidump_path: Path to the minidump file (.dmp), or the ``sha256:<hash>`` handle
+                           returned by the dump upload endpoint. Compressed dumps are accepted.
+            symbols_path: Optional path to symbols directory
+            idempotency_key: Optional key identifying this submission; submitting the same key
+                             again returns the existing job instead of starting another
+
+        Returns:
+            Dictionary with the ``job_id`` and the job status
+        """
+        if parse_handle(minidump_path) is None:
+            minidump_file = Path(minidump_path)
+            if not minidump_file.is_file():
+                reason = "File not found" if not minidump_file.exists() else "Path is not a file"
+                file_error = FileValidationError(minidump_file, reason)
+                return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+            minidump_path = str(minidump_file.absolute())
+        symbols_error = self._check_directory(symbols_path, "Symbols directory not found or not a directory")
+        if symbols_error is not None:
+            return symbols_error
+        arguments = {
+            "minidump_path": minidump_path,
+            "symbols_path": str(Path(symbols_path).absolute()) if symbols_path else None,
+        }
+        return await self._submit("analysis", arguments, idempotency_key)
+
+    async def submit_symbol_extraction(
+        self, binary_paths: List[str], output_dir: Optional[str] = None, idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Start extracting Breakpad symbols from a batch of binaries in the background.
+
+        Runs extract_symbols on every binary in turn; get_job_status reports how many
+        are done. The result lists the symbol file or the error of every binary.
+
+        Args:
+            binary_paths: Paths to the binary files (PDB, DWARF, etc.)
+            output_dir: Directory to save the symbol files, defaults to ./symbols/
+            idempotency_key: Optional key identifying this submission; submitting the same key
+                             again returns the existing job instead of starting another
+
+        Returns:
+            Dictionary with the ``job_id`` and the job status
+        """
+        if not binary_paths:
+            param_error = InvalidParameterError("binary_paths", binary_paths, "Must list at least one binary")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        for binary_path in binary_paths:
+            if not Path(binary_path).is_file():
+                file_error = FileValidationError(Path(binary_path), "Binary file not found")
+                return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+        arguments = {
+            "binary_paths": [str(Path(binary_path).absolute()) for binary_path in binary_paths],
+            "output_dir": str(Path(output_dir or "symbols").absolute()),
+        }
+        return await self._submit("extract_symbols", arguments, idempotency_key, total=len(binary_paths))
+
+    async def submit_triage(
+        self,
+        directory: str,
+        recursive: bool = True,
+        stackwalk: bool = False,
+        symbols_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        concurrency: int = 2,
+        output_path: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Start triaging a directory or Crashpad database in the background.
+
+        Runs triage_directory as a job; get_job_status reports how many dumps are done.
+        For large directories give ``output_path`` so that the records are written there
+        rather than kept in the job result.
+
+        Args:
+            directory: Directory of .dmp files, or a Crashpad database directory
+            recursive: Whether to search subdirectories
+            stackwalk: Whether to run a full stackwalk on every dump
+            symbols_path: Optional path to symbols directory used by the stackwalks
+            max_workers: Number of worker processes for metadata reading, defaults to the CPU count
+            concurrency: Maximum number of stackwalks running at once
+            output_path: Optional file receiving one JSON record per line (NDJSON)
+            idempotency_key: Optional key identifying this submission; submitting the same key
+                             again returns the existing job instead of starting another
+
+        Returns:
+            Dictionary with the ``job_id`` and the job status
+        """
+        directory_error = self._check_directory(directory, "Directory not found or not a directory")
+        if directory_error is not None:
+            return directory_error
+        symbols_error = self._check_directory(symbols_path, "Symbols directory not found or not a directory")
+        if symbols_error is not None:
+            return symbols_error
+        if max_workers is not None and max_workers < 1:
+            param_error = InvalidParameterError("max_workers", max_workers, "Must be at least 1")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        if concurrency < 1:
+            param_error = InvalidParameterError("concurrency", concurrency, "Must be at least 1")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        arguments = {
+            "directory": str(Path(directory).absolute()),
+            "recursive": recursive,
+            "stackwalk": stackwalk,
+            "symbols_path": str(Path(symbols_path).absolute()) if symbols_path else None,
+            "max_workers": max_workers,
+            "concurrency": concurrency,
+            "output_path": str(Path(output_path).absolute()) if output_path else None,
+        }
+        return await self._submit("triage", arguments, idempotency_key, total=0)
+
+    async def get_job_status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Report the state and progress of a job started by one of the submit tools.
+
+        Args:
+            job_id: Job id returned by submit_analysis, submit_symbol_extraction or submit_triage
+
+        Returns:
+            Dictionary with the job ``state`` (queued, running, done or failed), its
+            ``progress`` and attempts, timestamps, and the ``result`` of a done job or
+            the ``error`` of a failed one
+        """
+        if not job_id:
+            param_error = InvalidParameterError("job_id", job_id, "Must not be empty")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        status = await self._scheduler.status(job_id)
+        if status is None:
+            not_found = JobNotFoundError(job_id)
+            return {"error": str(not_found), "success": False, "error_code": not_found.error_code}
+        return {"success": True, **status}
+
+    @staticmethod
+    def _check_directory(path: Optional[str], reason: str) -> Optional[Dict[str, Any]]:
+        if path and not Path(path).is_dir():
+            file_error = FileValidationError(Path(path), reason)
+            return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+        return None
+
+    async def _submit(
+        self, kind: str, arguments: Dict[str, Any], idempotency_key: Optional[str], total: int = 1
+    ) -> Dict[str, Any]:
+        record, created = await self._scheduler.submit(kind, arguments, idempotency_key, total)
+        if not created and (record.kind != kind or record.arguments != arguments):
+            param_error = InvalidParameterError(
+                "idempotency_key", idempotency_key, f"Already used by job {record.job_id} with other arguments"
+            )
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        return {"success": True, "deduplicated": not created, **job_status(record)}
+
+    async def _run_analysis(self, job: Job) -> Dict[str, Any]:
+        job.update(0, "stackwalk")
+        result = await self._stackwalk.stackwalk_minidump(
+            job.arguments["minidump_path"],
+            job.arguments["symbols_path"],
+            fields=["crash_info"],
+            max_frames=0,
+            timeout=self._timeout,
+            over_budget="run",
+        )
+        if not result["success"]:
+            return result
+        analysis_hash = result["analysis_hash"]
+        return {
+            "success": True,
+            "analysis_hash": analysis_hash,
+            "cached": result["cached"],
+            "crash_type": (result["data"].get("crash_info") or {}).get("type"),
+            "signature": result.get("signature"),
+            "summary_uri": f"minidump://{analysis_hash}/summary",
+        }
+
+    async def _run_symbol_extraction(self, job: Job) -> Dict[str, Any]:
+        output_dir = job.arguments["output_dir"]
+        symbols: List[Dict[str, Any]] = []
+        for position, binary_path in enumerate(job.arguments["binary_paths"]):
+            job.update(position, Path(binary_path).name)
+            extracted = await self._dump_syms.extract_symbols(binary_path, output_dir)
+            symbols.append({"binary_path": binary_path, **extracted})
+        return {
+            "success": True,
+            "output_dir": output_dir,
+            "symbols": symbols,
+            "failed_count": sum(not extracted["success"] for extracted in symbols),
+        }
+
+    async def _run_triage(self, job: Job) -> Dict[str, Any]:
+        def progress(completed: int, total: int) -> None:
+            job.update(completed, "triage", total)
+
+        return await self._triage.run_triage(**job.arguments, progress=progress)
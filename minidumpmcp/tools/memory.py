@@ -0,0 +1,288 @@
+"""Memory inspection tools for FastMCP."""
+
+import asyncio
+import struct
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from minidumpmcp.analysis.cache import AnalysisCache
+from minidumpmcp.analysis.compression import file_compression
+from minidumpmcp.analysis.minidump import MemoryRegion, MinidumpReader
+from minidumpmcp.exceptions import (
+    AnalysisNotFoundError,
+    FileValidationError,
+    InvalidParameterError,
+    MemoryNotCapturedError,
+    MinidumpMCPError,
+)
+from minidumpmcp.storage.dump_store import DumpStore, parse_handle
+
+MAX_READ_BYTES = 4096
+
+_LINE_WIDTH = 16
+
+# Regions listed on each side of an address that is not captured
+_NEARBY_REGIONS = 2
+
+_WORD_FORMATS = {4: "<I", 8: "<Q"}
+
+
+class _OpenDump:
+    """A mapped dump with the address indexes used to annotate its memory."""
+
+    def __init__(self, reader: MinidumpReader) -> None:
+        self.reader = reader
+        system_info = reader.system_info()
+        self.word_size = reader.pointer_size(system_info)
+        reader.memory_regions()
+        modules = sorted(
+            (int(module["base_addr"], 16), module["size"], module["filename"]) for module in reader.modules(system_info)
+        )
+        self.module_bases = [base for base, _, _ in modules]
+        self.modules = modules
+
+    def module_at(self, address: int) -> Optional[str]:
+        """``module+0xoffset`` of an address inside a loaded module."""
+        index = bisect_right(self.module_bases, address) - 1
+        if index < 0:
+            return None
+        base, size, filename = self.modules[index]
+        return f"{filename}+0x{address - base:x}" if address < base + size else None
+
+
+def _ascii(data: memoryview) -> str:
+    return "".join(chr(byte) if 0x20 <= byte < 0x7F else "." for byte in data)
+
+
+class MemoryProvider:
+    """Provider for reading the process memory captured in minidumps."""
+
+    def __init__(
+        self,
+        cache: Optional[AnalysisCache] = None,
+        store: Optional[DumpStore] = None,
+        max_open_dumps: int = 8,
+    ) -> None:
+        """Initialize the provider.
+
+        Args:
+            cache: Analysis cache used to annotate addresses with symbols
+            store: Optional store resolving ``sha256:<hash>`` handles of uploaded dumps
+            max_open_dumps: Number of dumps kept mapped between calls
+        """
+        self._cache = cache if cache is not None else AnalysisCache()
+        self._store = store
+        self._max_open_dumps = max_open_dumps
+        self._dumps: "OrderedDict[Tuple[str, int, int], _OpenDump]" = OrderedDict()
+        self._symbols: "OrderedDict[str, Dict[int, str]]" = OrderedDict()
+
+    def close(self) -> None:
+        """Unmap every dump kept open."""
+        while self._dumps:
+            _, dump = self._dumps.popitem()
+            dump.reader.close()
+
+    async def read_dump_memory(
+        self,
+        minidump_path: str,
+        address: str,
+        length: int = 256,
+        before: int = 0,
+        annotate: bool = True,
+        analysis_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Read process memory captured in a minidump, e.g. around a faulting address.
+
+        Minidumps usually capture the stack of every thread and a little memory around the
+        instruction and registers of the crashing thread; full-memory dumps capture everything.
+        The result shows the bytes as hex and ASCII lines and as pointer-sized words. Words
+        pointing into a loaded module are annotated as ``module+offset``, and with the
+        ``analysis_hash`` of a stackwalk_minidump result, return addresses of walked frames are
+        annotated with their function. Reads stop at the end of the captured region.
+
+        Args:
+            minidump_path: Path to the minidump file, or the ``sha256:<hash>`` handle of an uploaded dump
+            address: Virtual address to read, e.g. "0x0012fe84" (hexadecimal with 0x prefix, or decimal)
+            length: Number of bytes to read, at most 4096 (default: 256)
+            before: Number of bytes to include before ``address``, e.g. to see a stack frame's locals
+            annotate: Whether to annotate words pointing into modules
+            analysis_hash: Optional hash returned by stackwalk_minidump for symbol annotations
+
+        Returns:
+            Dictionary with the containing region, hex/ASCII lines and annotated words; when the
+            address is not captured, an error listing the nearest captured regions
+        """
+        try:
+            value = int(address, 0)
+        except ValueError:
+            param_error = InvalidParameterError("address", address, "Must be a hexadecimal (0x...) or decimal number")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        if value < 0:
+            param_error = InvalidParameterError("address", address, "Must not be negative")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        if not 1 <= length <= MAX_READ_BYTES:
+            param_error = InvalidParameterError("length", length, f"Must be between 1 and {MAX_READ_BYTES}")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        if before < 0:
+            param_error = InvalidParameterError("before", before, "Must not be negative")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+
+        symbols: Dict[int, str] = {}
+        if analysis_hash is not None:
+            found = await self._analysis_symbols(analysis_hash)
+            if found is None:
+                not_found = AnalysisNotFoundError(analysis_hash)
+                return {"error": str(not_found), "success": False, "error_code": not_found.error_code}
+            symbols = found
+
+        try:
+            dump = await self._open(minidump_path)
+        except MinidumpMCPError as e:
+            return {"error": str(e), "success": False, "error_code": e.error_code}
+
+        reader = dump.reader
+        width = dump.word_size * 2
+        region = reader.find_region(value)
+        if region is None:
+            not_captured = MemoryNotCapturedError(reader.path, f"0x{value:0{width}x}")
+            return {
+                "error": str(not_captured),
+                "success": False,
+                "error_code": not_captured.error_code,
+                "nearby_regions": [self._region(nearby, width) for nearby in self._nearby(reader, value)],
+            }
+
+        start = max(value - before, region.start)
+        view = reader.memory(start, length) or memoryview(b"")
+        with view:
+            lines = []
+            for offset in range(0, len(view), _LINE_WIDTH):
+                line = view[offset : offset + _LINE_WIDTH]
+                lines.append(f"0x{start + offset:0{width}x}  {line.hex(' '):<47}  |{_ascii(line)}|")
+            words = self._words(dump, view, start, symbols, annotate, width)
+            size = len(view)
+
+        return {
+            "success": True,
+            "address": f"0x{value:0{width}x}",
+            "start": f"0x{start:0{width}x}",
+            "size": size,
+            "truncated": size < length,
+            "region": self._region(region, width),
+            "word_size": dump.word_size,
+            "lines": lines,
+            "words": words,
+        }
+
+    @staticmethod
+    def _words(
+        dump: _OpenDump, view: memoryview, start: int, symbols: Dict[int, str], annotate: bool, width: int
+    ) -> List[Dict[str, str]]:
+        """Decode the aligned pointer-sized words of *view*."""
+        word_size = dump.word_size
+        skip = -start % word_size
+        usable = (len(view) - skip) // word_size * word_size
+        words: List[Dict[str, str]] = []
+        if usable <= 0:
+            return words
+        for index, (word,) in enumerate(struct.iter_unpack(_WORD_FORMATS[word_size], view[skip : skip + usable])):
+            entry = {"address": f"0x{start + skip + index * word_size:0{width}x}", "value": f"0x{word:0{width}x}"}
+            annotation = symbols.get(word) or (dump.module_at(word) if annotate else None)
+            if annotation is not None:
+                entry["annotation"] = annotation
+            words.append(entry)
+        return words
+
+    @staticmethod
+    def _region(region: MemoryRegion, width: int) -> Dict[str, Any]:
+        return {"start": f"0x{region.start:0{width}x}", "end": f"0x{region.end:0{width}x}", "size": region.size}
+
+    @staticmethod
+    def _nearby(reader: MinidumpReader, address: int) -> List[MemoryRegion]:
+        """Captured regions closest to *address*, in address order."""
+        regions = reader.memory_regions()
+        index = bisect_right([region.start for region in regions], address)
+        return regions[max(index - _NEARBY_REGIONS, 0) : index + _NEARBY_REGIONS]
+
+    async def _analysis_symbols(self, analysis_hash: str) -> Optional[Dict[int, str]]:
+        """Map the addresses of walked frames to ``module!function+offset``."""
+        symbols = self._symbols.get(analysis_hash)
+        if symbols is not None:
+            self._symbols.move_to_end(analysis_hash)
+            return symbols
+        entry = await self._cache.fetch(analysis_hash)
+        if entry is None:
+            return None
+        model = entry.model()
+        symbols = {}
+        for thread in model.threads:
+            for frame in model.frames(thread):
+                if frame.offset is None or frame.function is None:
+                    continue
+                label = f"{frame.module}!{frame.function}" if frame.module else frame.function
+                if frame.function_offset:
+                    label += f"+0x{frame.function_offset:x}"
+                symbols.setdefault(frame.offset, label)
+        self._symbols[analysis_hash] = symbols
+        if len(self._symbols) > self._max_open_dumps:
+            self._symbols.popitem(last=False)
+        return symbols
+
+    async def _open(self, minidump_path: str) -> _OpenDump:
+        """Map a dump, reusing the mapping of earlier calls while the file is unchanged.
+
+        Raises:
+            FileValidationError: If the dump cannot be found or read
+        """
+        dump_hash = parse_handle(minidump_path)
+        if dump_hash is not None:
+            stored = self._store.get(dump_hash) if self._store is not None else None
+            if stored is None:
+                raise FileValidationError(Path(minidump_path), "Unknown dump handle; upload the dump first")
+            path = stored
+        else:
+            path = Path(minidump_path)
+            if not path.is_file():
+                raise FileValidationError(path, "File not found" if not path.exists() else "Path is not a file")
+
+        try:
+            stat = path.stat()
+        except OSError as e:
+            raise FileValidationError(path, f"File could not be read: {e}") from e
+        key = (str(path.absolute()), stat.st_mtime_ns, stat.st_size)
+        dump = self._dumps.get(key)
+        if dump is not None:
+            self._dumps.move_to_end(key)
+            return dump
+
+        dump = await asyncio.to_thread(self._map, path)
+        existing = self._dumps.get(key)
+        if existing is not None:
+            # A concurrent call mapped the same dump meanwhile; keep a single mapping
+            dump.reader.close()
+            self._dumps.move_to_end(key)
+            return existing
+        self._dumps[key] = dump
+        if len(self._dumps) > self._max_open_dumps:
+            _, evicted = self._dumps.popitem(last=False)
+            evicted.reader.close()
+        return dump
+
+    def _map(self, path: Path) -> _OpenDump:
+        try:
+            compression = file_compression(path)
+            if compression is not None:
+                if self._store is None:
+                    raise FileValidationError(path, f"Dump is {compression} compressed; decompress it first")
+                path = self._store.add_compressed(path, compression).path
+        except OSError as e:
+            raise FileValidationError(path, f"File could not be read: {e}") from e
+        reader = MinidumpReader(path)
+        try:
+            return _OpenDump(reader)
+        except Exception:
+            reader.close()
+            raise
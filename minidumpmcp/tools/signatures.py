@@ -0,0 +1,89 @@
+"""Crash signature tools for FastMCP."""
+
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from minidumpmcp.analysis.signature_index import SignatureIndex
+from minidumpmcp.exceptions import InvalidParameterError, SignatureIndexError
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class SignatureProvider:
+    """Provider for queries over the crash signature index."""
+
+    def __init__(self, index: SignatureIndex) -> None:
+        """Initialize the provider.
+
+        Args:
+            index: Signature index fed by the stackwalk tool
+        """
+        self._index = index
+
+    async def top_crashers(
+        self,
+        limit: int = 10,
+        since_hours: Optional[float] = None,
+        sample_dumps: int = 3,
+    ) -> Dict[str, Any]:
+        """
+        List the crash signatures with the most dumps.
+
+        Every dump analyzed with stackwalk_minidump is grouped by its crash signature, the
+        normalized top frames of the crashing thread. This answers from the signature index
+        without re-analyzing any dump.
+
+        Args:
+            limit: Maximum number of signatures to return (default: 10)
+            since_hours: Only count dumps analyzed in the last N hours
+            sample_dumps: Number of recent dump hashes listed per signature (default: 3)
+
+        Returns:
+            Dictionary containing the ranked signatures with dump counts, share of all
+            dumps, first/last seen times and sample dump hashes
+        """
+        if limit < 1:
+            param_error = InvalidParameterError("limit", limit, "Must be at least 1")
+            return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+        if since_hours is not None and since_hours <= 0:
+            param_error = InvalidParameterError("since_hours", since_hours, "Must be positive")
+            return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+
+        started = time.perf_counter()
+        since = time.time() - since_hours * 3600 if since_hours is not None else None
+        try:
+            rows, total = await asyncio.to_thread(self._query, limit, since, max(sample_dumps, 0))
+        except sqlite3.Error as e:
+            index_error = SignatureIndexError(self._index.path, str(e))
+            return {"success": False, "error": str(index_error), "error_code": index_error.error_code}
+
+        crashers = [
+            {
+                "rank": rank,
+                "signature": row["signature"],
+                "crash_type": row["crash_type"],
+                "count": row["dump_count"],
+                "percent": round(100.0 * row["dump_count"] / total, 2) if total else 0.0,
+                "first_seen": _isoformat(row["first_seen"]),
+                "last_seen": _isoformat(row["last_seen"]),
+                "sample_dumps": row["sample_dumps"],
+            }
+            for rank, row in enumerate(rows, 1)
+        ]
+        return {
+            "success": True,
+            "total_dumps": total,
+            "crashers": crashers,
+            "query_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    def _query(self, limit: int, since: Optional[float], sample_dumps: int) -> Tuple[List[Dict[str, Any]], int]:
+        rows = self._index.top(limit, since)
+        for row in rows:
+            row["sample_dumps"] = self._index.dumps(row["signature"], sample_dumps) if sample_dumps else []
+        return rows, self._index.total_dumps(since)
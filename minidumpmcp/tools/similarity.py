@@ -0,0 +1,126 @@
+"""Near-duplicate crash search tools for FastMCP."""
+
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from minidumpmcp.analysis.cache import AnalysisCache, hash_minidump
+from minidumpmcp.analysis.signature import SignatureGenerator, crash_model
+from minidumpmcp.analysis.similarity import SimilarityIndex
+from minidumpmcp.exceptions import (
+    AnalysisNotFoundError,
+    FileValidationError,
+    InvalidParameterError,
+    SignatureIndexError,
+)
+
+
+class SimilarityProvider:
+    """Provider for near-duplicate searches over previously analyzed crashes."""
+
+    def __init__(
+        self,
+        index: SimilarityIndex,
+        cache: AnalysisCache,
+        signature_generator: Optional[SignatureGenerator] = None,
+        depth: int = 32,
+    ) -> None:
+        """Initialize the provider.
+
+        Args:
+            index: Similarity index fed by the stackwalk tool
+            cache: Analysis cache used to look up crashes by analysis hash
+            signature_generator: Generator normalizing frame labels, must match the one feeding the index
+            depth: Number of crashing-thread frames sketched, must match the one feeding the index
+        """
+        self._index = index
+        self._cache = cache
+        self._generator = signature_generator if signature_generator is not None else SignatureGenerator()
+        self._depth = depth
+
+    async def find_similar_crashes(
+        self,
+        minidump_path: Optional[str] = None,
+        analysis_hash: Optional[str] = None,
+        k: int = 5,
+        min_similarity: float = 0.5,
+    ) -> Dict[str, Any]:
+        """
+        Find previously analyzed crashes whose crashing stacks are nearly identical.
+
+        Unlike exact signatures, this also matches crashes that differ by a few frames
+        (e.g. one extra inlined frame). Reuse the analysis of a close match instead of
+        analyzing a near-identical crash from scratch. Give either a dump that was already
+        analyzed with stackwalk_minidump or the analysis_hash it returned.
+
+        Args:
+            minidump_path: Path to a previously analyzed minidump file
+            analysis_hash: Hash returned by the stackwalk_minidump tool
+            k: Maximum number of similar crashes to return (default: 5)
+            min_similarity: Minimum estimated similarity between 0 and 1 (default: 0.5)
+
+        Returns:
+            Dictionary containing the closest prior crashes with their similarity, signature,
+            dump hash and analysis hash
+        """
+        if (minidump_path is None) == (analysis_hash is None):
+            param_error = InvalidParameterError(
+                "minidump_path", minidump_path, "Provide exactly one of minidump_path or analysis_hash"
+            )
+            return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+        if k < 1:
+            param_error = InvalidParameterError("k", k, "Must be at least 1")
+            return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+        if not 0.0 <= min_similarity <= 1.0:
+            param_error = InvalidParameterError("min_similarity", min_similarity, "Must be between 0 and 1")
+            return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+
+        started = time.perf_counter()
+        exclude: Optional[str] = None
+        try:
+            if analysis_hash is not None:
+                entry = await self._cache.fetch(analysis_hash)
+                if entry is None:
+                    not_found = AnalysisNotFoundError(analysis_hash)
+                    return {"success": False, "error": str(not_found), "error_code": not_found.error_code}
+                labels = self._generator.labels(crash_model(entry.json_text), self._depth)
+                sketch = self._index.sketch(labels)
+            else:
+                minidump_file = Path(str(minidump_path))
+                if not minidump_file.is_file():
+                    file_error = FileValidationError(minidump_file, "File not found")
+                    return {"success": False, "error": str(file_error), "error_code": file_error.error_code}
+                exclude = await hash_minidump(minidump_file)
+                stored = await asyncio.to_thread(self._index.stored_sketch, exclude)
+                if stored is None:
+                    param_error = InvalidParameterError(
+                        "minidump_path", minidump_path, "Dump has not been analyzed yet; run stackwalk_minidump first"
+                    )
+                    return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+                sketch = stored
+
+            # One extra result in case the query analysis itself is indexed
+            matches = await asyncio.to_thread(self._index.query, sketch, k + 1, min_similarity, exclude)
+        except OSError as e:
+            file_error = FileValidationError(Path(str(minidump_path)), f"File could not be read: {e}")
+            return {"success": False, "error": str(file_error), "error_code": file_error.error_code}
+        except sqlite3.Error as e:
+            index_error = SignatureIndexError(self._index.path, str(e))
+            return {"success": False, "error": str(index_error), "error_code": index_error.error_code}
+
+        similar: List[Dict[str, Any]] = []
+        for match in matches:
+            if analysis_hash is not None and match["analysis_hash"] == analysis_hash:
+                continue
+            match["similarity"] = round(match["similarity"], 3)
+            match["seen_at"] = datetime.fromtimestamp(match["seen_at"], timezone.utc).isoformat()
+            similar.append(match)
+
+        return {
+            "success": True,
+            "similar_crashes": similar[:k],
+            "query_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
@@ -1,20 +1,63 @@
 """Stackwalk tools for FastMCP."""
 
+import asyncio
+import hashlib
 import json
+import logging
+import sqlite3
 import sys
+import tempfile
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from minidumpmcp.analysis.cache import AnalysisCache, CachedAnalysis, analysis_key, hash_minidump, symbols_fingerprint
+from minidumpmcp.analysis.compression import decompress_file, file_compression
+from minidumpmcp.analysis.minidump import read_minidump_info
+from minidumpmcp.analysis.projection import FieldSelector, build_selector, project_json
+from minidumpmcp.analysis.signature import SignatureGenerator, crash_model
+from minidumpmcp.analysis.signature_index import SignatureIndex
+from minidumpmcp.analysis.similarity import SimilarityIndex
+from minidumpmcp.analysis.text_report import parse_text_report
+from minidumpmcp.deadline import RuntimeModel, budget
 from minidumpmcp.exceptions import (
+    DeadlineExceededError,
     FileValidationError,
+    InvalidParameterError,
     MinidumpAnalysisError,
+    MinidumpMCPError,
     ToolNotFoundError,
 )
 from minidumpmcp.exceptions import (
     ToolExecutionError as CommonToolExecutionError,
 )
+from minidumpmcp.storage.dump_store import DumpStore, parse_handle
+from minidumpmcp.tracing import annotate, span
 
-from ._common import ToolExecutionError, run_subprocess, which
+from ._common import DEFAULT_GRACE_PERIOD, ResourceLimits, ToolExecutionError, run_subprocess, which
+
+OUTPUT_FORMATS = ("json", "text", "both")
+
+# What happens to an analysis estimated to outlast its time budget
+OVER_BUDGET_POLICIES = ("triage", "reject", "run")
+
+# Seconds a minidump-stackwalk run may take before it is killed
+DEFAULT_TIMEOUT = 30.0
+
+# Compressed dumps analyzed without a store whose decompressed hash is remembered
+_MAX_DECOMPRESSED = 1024
+
+logger = logging.getLogger(__name__)
+
+
+def _dump_profile(path: Path) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """Size of the dump at *path* and its triage metadata, when it can be read."""
+    try:
+        info = read_minidump_info(path)
+    except MinidumpMCPError:
+        return path.stat().st_size, None
+    return info["size"], info
 
 
 def _get_bin_path(bin_name: str) -> Path:
@@ -34,89 +77,402 @@ def _get_bin_path(bin_name: str) -> Path:
 class StackwalkProvider:
     """Provider for minidump stackwalk tools."""
 
+    def __init__(
+        self,
+        cache: Optional[AnalysisCache] = None,
+        signatures: Optional[SignatureIndex] = None,
+        signature_generator: Optional[SignatureGenerator] = None,
+        similarity: Optional[SimilarityIndex] = None,
+        similarity_depth: int = 32,
+        store: Optional[DumpStore] = None,
+        store_local_dumps: bool = False,
+        timeout: float = DEFAULT_TIMEOUT,
+        grace_period: float = DEFAULT_GRACE_PERIOD,
+        runtime_model: Optional[RuntimeModel] = None,
+        over_budget: str = "triage",
+        limits: Optional[ResourceLimits] = None,
+        max_dump_bytes: Optional[int] = None,
+    ) -> None:
+        """Initialize the provider.
+
+        Args:
+            cache: Analysis cache shared with the analysis resources. A private cache is
+                   created when omitted.
+            signatures: Optional signature index updated with every new analysis
+            signature_generator: Generator used for the index, defaults to the standard rules
+            similarity: Optional near-duplicate index updated with every new analysis
+            similarity_depth: Number of crashing-thread frames sketched for the similarity index
+            store: Optional store resolving ``sha256:<hash>`` handles of uploaded dumps
+            store_local_dumps: Whether local dumps are added (hardlinked when possible) to the
+                               store before they are analyzed, so cached analyses keep a copy
+                               of their dump under the store's retention policy
+            timeout: Seconds a minidump-stackwalk run may take before it is stopped
+            grace_period: Seconds a minidump-stackwalk run that timed out or was cancelled
+                          may take to exit after SIGTERM before it is killed
+            runtime_model: Model estimating minidump-stackwalk runtimes, fed with every run.
+                           A private model is created when omitted.
+            over_budget: What happens to an analysis estimated to take longer than its
+                         timeout or the request's remaining deadline: "triage" answers
+                         with the dump's metadata, "reject" with an error, "run" runs it
+            limits: Resource limits of the minidump-stackwalk processes
+            max_dump_bytes: Size compressed dumps analyzed without a store may decompress to;
+                            unlimited when omitted
+        """
+        self._cache = cache if cache is not None else AnalysisCache()
+        self._signatures = signatures
+        self._signature_generator = signature_generator if signature_generator is not None else SignatureGenerator()
+        self._similarity = similarity
+        self._similarity_depth = similarity_depth
+        self._store = store
+        self._store_local_dumps = store_local_dumps
+        self._timeout = timeout
+        self._grace_period = grace_period
+        self._runtime = runtime_model if runtime_model is not None else RuntimeModel()
+        self._over_budget = over_budget
+        self._limits = limits
+        self._max_dump_bytes = max_dump_bytes
+        # Hash of a compressed dump -> hash of the dump, for compressed input without a store
+        self._decompressed: "OrderedDict[str, str]" = OrderedDict()
+
+    @property
+    def cache(self) -> AnalysisCache:
+        """Cache holding the JSON analyses produced by this provider."""
+        return self._cache
+
+    @property
+    def timeout(self) -> float:
+        """Seconds a minidump-stackwalk run may take unless a call overrides it."""
+        return self._timeout
+
     async def stackwalk_minidump(
-        self, minidump_path: str, symbols_path: Optional[str] = None, output_format: str = "json"
+        self,
+        minidump_path: str,
+        symbols_path: Optional[str] = None,
+        output_format: str = "json",
+        fields: Optional[List[str]] = None,
+        max_frames: Optional[int] = None,
+        timeout: Optional[float] = None,
+        over_budget: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Analyze a minidump file using minidump-stackwalk CLI tool.
 
         Args:
-            minidump_path: Path to the minidump file (.dmp)
+            minidump_path: Path to the minidump file (.dmp), or the ``sha256:<hash>`` handle
+                           returned by the dump upload endpoint. gzip, zip and xz compressed
+                           dumps are detected and decompressed transparently.
             symbols_path: Optional path to symbols directory
-            output_format: Output format (json, text) - defaults to json
+            output_format: Output format (json, text, both) - defaults to json. "both" returns the
+                           JSON result in ``data`` and the human-readable report in ``text``.
+            fields: Optional projection of the JSON result, e.g. ["crash_info", "crashing_thread",
+                    "threads[*].frames[:10]"]. Only the selected fields are returned.
+            max_frames: Optional maximum number of frames kept per thread
+            timeout: Seconds minidump-stackwalk may run, defaults to the provider's timeout.
+                     Not exposed to MCP clients; long analyses go through submit_analysis.
+            over_budget: Policy for analyses estimated to outlast the timeout or the request's
+                         deadline ("triage", "reject" or "run"), defaults to the provider's.
+                         Not exposed to MCP clients.
+
+        Analyses that cannot finish in time are not started. By default the response then
+        carries the dump's metadata, including ``crash_info``, with ``downgraded`` set.
 
         Returns:
-            Dictionary containing crash analysis results
+            Dictionary containing crash analysis results and an ``analysis_hash`` that
+            addresses the cached analysis through the ``minidump://<analysis_hash>/...``
+            resources.
 
         Raises:
             FileNotFoundError: If minidump file or CLI tool not found
             ToolExecutionError: If minidump-stackwalk execution fails
             json.JSONDecodeError: If output parsing fails
         """
-        # Validate input file
-        minidump_file = Path(minidump_path)
-        if not minidump_file.exists():
-            file_error = FileValidationError(minidump_file, "File not found")
-            return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+        # Validate arguments before doing any work
+        with span("stackwalk.validate"):
+            if output_format not in OUTPUT_FORMATS:
+                param_error = InvalidParameterError(
+                    "output_format", output_format, f"Must be one of: {', '.join(OUTPUT_FORMATS)}"
+                )
+                return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
 
-        if not minidump_file.is_file():
-            file_error = FileValidationError(minidump_file, "Path is not a file")
-            return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+            if (fields is not None or max_frames is not None) and output_format == "text":
+                param_error = InvalidParameterError(
+                    "output_format", output_format, "Field projection requires output_format='json' or 'both'"
+                )
+                return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
 
-        # Get absolute path to the minidump-stackwalk binary
-        # project_root = Path(__file__).parent.parent.parent
+            if max_frames is not None and max_frames < 0:
+                param_error = InvalidParameterError("max_frames", max_frames, "Must not be negative")
+                return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
 
-        stackwalk_binary = _get_bin_path("minidump-stackwalk")
+            if over_budget is not None and over_budget not in OVER_BUDGET_POLICIES:
+                param_error = InvalidParameterError(
+                    "over_budget", over_budget, f"Must be one of: {', '.join(OVER_BUDGET_POLICIES)}"
+                )
+                return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
 
-        # If not found in project tools, try to find it on PATH
-        if not stackwalk_binary.exists():
-            which_result = which("minidump-stackwalk")
-            if which_result:
-                stackwalk_binary = Path(which_result)
-            else:
-                tool_error = ToolNotFoundError("minidump-stackwalk", [stackwalk_binary])
-                return {
-                    "error": str(tool_error),
-                    "success": False,
-                    "error_code": tool_error.error_code,
-                }
-
-        # Build command
-        cmd: list[str | Path] = [stackwalk_binary]
-
-        if output_format == "json":
-            cmd.append("--json")
-
-        cmd.append(minidump_file.absolute())
-
-        # Add symbols path if provided
-        if symbols_path:
-            symbols_dir = Path(symbols_path)
-            if symbols_dir.exists() and symbols_dir.is_dir():
-                cmd.extend(["--symbols-path", symbols_dir.absolute()])
+            try:
+                selector = build_selector(fields, max_frames)
+            except ValueError as e:
+                param_error = InvalidParameterError("fields", fields, f"Invalid projection: {e}")
+                return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+
+            # Validate input file; stored dumps are addressed by their hash, which is then known
+            dump_hash = parse_handle(minidump_path)
+            in_store = dump_hash is not None
+            if dump_hash is not None:
+                stored = self._store.get(dump_hash) if self._store is not None else None
+                if stored is None:
+                    file_error = FileValidationError(Path(minidump_path), "Unknown dump handle; upload the dump first")
+                    return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+                minidump_file = stored
             else:
-                symbols_error = FileValidationError(symbols_dir, "Symbols directory not found or not a directory")
-                return {"error": str(symbols_error), "success": False, "error_code": symbols_error.error_code}
+                minidump_file = Path(minidump_path)
+                if not minidump_file.exists():
+                    file_error = FileValidationError(minidump_file, "File not found")
+                    return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+
+                if not minidump_file.is_file():
+                    file_error = FileValidationError(minidump_file, "Path is not a file")
+                    return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+
+            # Validate symbols path if provided
+            symbols_dir: Optional[Path] = None
+            if symbols_path:
+                symbols_dir = Path(symbols_path)
+                if not (symbols_dir.exists() and symbols_dir.is_dir()):
+                    symbols_error = FileValidationError(symbols_dir, "Symbols directory not found or not a directory")
+                    return {"error": str(symbols_error), "success": False, "error_code": symbols_error.error_code}
+
+        try:
+            with span("stackwalk.prepare"):
+                compression = await asyncio.to_thread(file_compression, minidump_file)
+                if compression is not None and self._store is not None:
+                    # Decompress into the store, which remembers what the compressed file decompresses to
+                    stored_dump = await asyncio.to_thread(self._store.add_compressed, minidump_file, compression)
+                    dump_hash, minidump_file, in_store = stored_dump.dump_hash, stored_dump.path, True
+                elif compression is None and not in_store and self._store is not None and self._store_local_dumps:
+                    stored_dump = await asyncio.to_thread(self._store.add_file, minidump_file)
+                    dump_hash, minidump_file, in_store = stored_dump.dump_hash, stored_dump.path, True
+                elif compression is None and dump_hash is None:
+                    dump_hash = await hash_minidump(minidump_file)
+                annotate(compression=compression, in_store=in_store)
+            if compression is not None and self._store is None:
+                return await self._stackwalk_compressed(
+                    minidump_file, compression, symbols_dir, output_format, selector, timeout, over_budget
+                )
+        except FileValidationError as e:
+            return {"error": str(e), "success": False, "error_code": e.error_code}
+        except (OSError, sqlite3.Error) as e:
+            file_error = FileValidationError(minidump_file, f"File could not be read: {e}")
+            return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+
+        # Only compressed dumps analyzed without a store leave the hash unknown, and they returned above
+        assert dump_hash is not None
+        return await self._stackwalk(
+            minidump_file,
+            dump_hash,
+            symbols_dir,
+            output_format,
+            selector,
+            in_store,
+            timeout=timeout,
+            over_budget=over_budget,
+        )
+
+    async def _stackwalk_compressed(
+        self,
+        compressed_file: Path,
+        compression: str,
+        symbols_dir: Optional[Path],
+        output_format: str,
+        selector: Optional[FieldSelector],
+        timeout: Optional[float] = None,
+        over_budget: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Analyze a compressed dump without a store, decompressing it into a scratch directory.
+
+        Dumps decompressed once are remembered by the hash of the compressed file, so
+        repeated calls are answered from the cache without decompressing again.
+        """
+        with span("stackwalk.hash"):
+            compressed_hash = await hash_minidump(compressed_file)
+        known_hash = self._decompressed.get(compressed_hash)
+        if known_hash is not None:
+            self._decompressed.move_to_end(compressed_hash)
+            with span("stackwalk.cache"):
+                cached = await self._cached(await self._analysis_key(known_hash, symbols_dir), output_format)
+                annotate(hit=cached is not None)
+            # On a miss (the analysis was evicted) the dump is decompressed again below, since
+            # minidump-stackwalk cannot read the compressed file
+            if cached is not None:
+                return await self._from_cache(cached, known_hash, output_format, selector)
+
+        with tempfile.TemporaryDirectory(prefix="minidumpmcp-") as scratch:
+            minidump_file = Path(scratch) / "minidump.dmp"
+            with span("stackwalk.decompress", compression=compression):
+                dump_hash, _ = await asyncio.to_thread(
+                    decompress_file, compressed_file, compression, minidump_file, max_bytes=self._max_dump_bytes
+                )
+            self._decompressed[compressed_hash] = dump_hash
+            if len(self._decompressed) > _MAX_DECOMPRESSED:
+                self._decompressed.popitem(last=False)
+            return await self._stackwalk(
+                minidump_file,
+                dump_hash,
+                symbols_dir,
+                output_format,
+                selector,
+                source_file=compressed_file,
+                timeout=timeout,
+                over_budget=over_budget,
+            )
+
+    @staticmethod
+    async def _analysis_key(dump_hash: str, symbols_dir: Optional[Path]) -> str:
+        """Analysis hash of the dump with *dump_hash* walked with the current contents of *symbols_dir*."""
+        if symbols_dir is None:
+            return analysis_key(dump_hash)
+        return analysis_key(dump_hash, symbols_dir, await asyncio.to_thread(symbols_fingerprint, symbols_dir))
+
+    async def _cached(self, analysis_hash: str, output_format: str) -> Optional[CachedAnalysis]:
+        """Cached analysis able to serve *output_format*, if any."""
+        cached = await self._cache.fetch(analysis_hash)
+        if cached is not None and (output_format == "json" or cached.text_report is not None):
+            return cached
+        return None
+
+    async def _from_cache(
+        self, cached: CachedAnalysis, dump_hash: str, output_format: str, selector: Optional[FieldSelector]
+    ) -> Dict[str, Any]:
+        """Result served from a cached analysis of the dump with *dump_hash*."""
+        with span("stackwalk.project"):
+            result = await asyncio.to_thread(self._result, cached, output_format, selector, cached=True)
+        if self._signatures is not None:
+            with span("stackwalk.signature"):
+                result["signature"] = await self._lookup_signature(dump_hash)
+        return result
+
+    async def _stackwalk(
+        self,
+        minidump_file: Path,
+        dump_hash: str,
+        symbols_dir: Optional[Path],
+        output_format: str,
+        selector: Optional[FieldSelector],
+        in_store: bool = False,
+        source_file: Optional[Path] = None,
+        timeout: Optional[float] = None,
+        over_budget: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Serve an analysis from the cache, or run minidump-stackwalk and cache the result.
+
+        Args:
+            minidump_file: Uncompressed dump to analyze
+            dump_hash: SHA-256 of the dump
+            symbols_dir: Optional symbols directory
+            output_format: Validated output format
+            selector: Field projection of the JSON result
+            in_store: Whether the dump is held by the store
+            source_file: Path recorded with the analysis, defaults to *minidump_file*
+            timeout: Seconds minidump-stackwalk may run, defaults to the provider's timeout
+            over_budget: Policy for analyses estimated to outlast their budget, defaults to
+                         the provider's
+        """
+        with span("stackwalk.cache"):
+            analysis_hash = await self._analysis_key(dump_hash, symbols_dir)
+            cached = await self._cached(analysis_hash, output_format)
+            annotate(hit=cached is not None)
+        if cached is not None:
+            return await self._from_cache(cached, dump_hash, output_format, selector)
+
+        with span("stackwalk.locate"):
+            # Get absolute path to the minidump-stackwalk binary
+            stackwalk_binary = _get_bin_path("minidump-stackwalk")
+
+            # If not found in project tools, try to find it on PATH
+            if not stackwalk_binary.exists():
+                which_result = which("minidump-stackwalk")
+                if which_result:
+                    stackwalk_binary = Path(which_result)
+                else:
+                    tool_error = ToolNotFoundError("minidump-stackwalk", [stackwalk_binary])
+                    return {
+                        "error": str(tool_error),
+                        "success": False,
+                        "error_code": tool_error.error_code,
+                    }
+
+        # Do not start an analysis that cannot finish before the timeout or the request's deadline
+        with span("stackwalk.estimate"):
+            timeout = budget(self._timeout if timeout is None else timeout)
+            policy = over_budget or self._over_budget
+            try:
+                size, info = await asyncio.to_thread(_dump_profile, minidump_file)
+            except OSError:
+                size, info = 0, None
+            modules = info["module_count"] if info is not None else 0
+            estimate = self._runtime.estimate(size, modules)
+            annotate(size=size, modules=modules, estimated_seconds=estimate, budget_seconds=timeout)
+        # Nothing is spawned once the deadline has passed, whatever the policy
+        if timeout <= 0 or (estimate > timeout and policy != "run"):
+            if policy == "triage" and info is not None:
+                return self._downgraded(info, estimate, timeout)
+            deadline_error = DeadlineExceededError(source_file or minidump_file, estimate, timeout)
+            return {
+                "error": str(deadline_error),
+                "success": False,
+                "error_code": deadline_error.error_code,
+                "estimated_seconds": round(estimate, 1),
+                "budget_seconds": round(timeout, 1),
+            }
+
+        # Build command. Cyborg mode writes the JSON result to a file and the human-readable
+        # report to stdout, so a single walk serves every output format.
+        work_dir = tempfile.TemporaryDirectory(prefix="minidumpmcp-")
+        json_output = Path(work_dir.name) / "analysis.json"
+        cmd: list[str | Path] = [stackwalk_binary, "--cyborg", json_output, minidump_file.absolute()]
+
+        if symbols_dir is not None:
+            cmd.extend(["--symbols-path", symbols_dir.absolute()])
 
         try:
             # Execute minidump-stackwalk with timeout using async helper
-            stdout = await run_subprocess(cmd, timeout=30.0)
+            started = time.monotonic()
+            stdout = await run_subprocess(
+                cmd, timeout=timeout, grace_period=self._grace_period, limits=self._limits, tool="minidump-stackwalk"
+            )
+            self._runtime.observe(size, modules, time.monotonic() - started)
+            with span("stackwalk.read"):
+                json_text = json_output.read_text(encoding="utf-8")
+                annotate(bytes=len(json_text))
 
-            if output_format == "json":
-                try:
-                    # Parse JSON output
-                    parsed_output = json.loads(stdout)
-                    return {"success": True, "data": parsed_output, "command": " ".join(str(c) for c in cmd)}
-                except json.JSONDecodeError as e:
-                    parse_error = MinidumpAnalysisError(
-                        minidump_file,
-                        "Failed to parse analysis output",
-                        {"parse_error": str(e), "raw_output": stdout[:500]},  # Limit output size
+            try:
+                # Index the JSON output for the cache, then decode only the projected fields. Both
+                # scan the whole document, so they run on a worker thread like AnalysisStore.load.
+                with span("stackwalk.index"):
+                    entry = await asyncio.to_thread(
+                        CachedAnalysis,
+                        analysis_hash,
+                        source_file or minidump_file,
+                        " ".join(str(c) for c in cmd),
+                        json_text,
+                        stdout,
                     )
-                    return {"error": str(parse_error), "success": False, "error_code": parse_error.error_code}
-            else:
-                # Return raw text output
-                return {"success": True, "data": stdout, "command": " ".join(str(c) for c in cmd)}
+                with span("stackwalk.project"):
+                    result = await asyncio.to_thread(self._result, entry, output_format, selector, cached=False)
+                with span("stackwalk.publish"):
+                    await self._cache.publish(entry)
+                if self._signatures is not None or self._similarity is not None or in_store:
+                    with span("stackwalk.signature"):
+                        result["signature"] = await self._index_analysis(entry, dump_hash, in_store)
+                return result
+            except json.JSONDecodeError as e:
+                parse_error = MinidumpAnalysisError(
+                    minidump_file,
+                    "Failed to parse analysis output",
+                    {"parse_error": str(e), "raw_output": json_text[:500]},  # Limit output size
+                )
+                return {"error": str(parse_error), "success": False, "error_code": parse_error.error_code}
 
         except ToolExecutionError as e:
             # Convert common tool error to our custom error
@@ -148,6 +504,20 @@ class StackwalkProvider:
                 "error_code": exec_error.error_code,
             }
 
+        except asyncio.TimeoutError:
+            timeout_error = CommonToolExecutionError(
+                "minidump-stackwalk",
+                [str(c) for c in cmd],
+                -1,
+                f"Killed after the {timeout:.3g}s timeout; analyze large dumps with submit_analysis",
+            )
+            return {
+                "error": str(timeout_error),
+                "command": " ".join(str(c) for c in cmd),
+                "success": False,
+                "error_code": timeout_error.error_code,
+            }
+
         except Exception as e:
             unexpected_error = MinidumpAnalysisError(
                 minidump_file,
@@ -155,3 +525,132 @@ class StackwalkProvider:
                 {"exception_type": type(e).__name__, "exception_message": str(e)},
             )
             return {"error": str(unexpected_error), "success": False, "error_code": unexpected_error.error_code}
+
+        finally:
+            work_dir.cleanup()
+
+    async def parse_stackwalk_report(
+        self,
+        report_path: str,
+        fields: Optional[List[str]] = None,
+        max_frames: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Parse a text report produced by minidump-stackwalk into structured JSON.
+
+        Use this for reports saved by text-mode pipelines: the result has the same shape as
+        ``stackwalk_minidump`` JSON output and is cached, so it can be projected and paged
+        through the ``minidump://<analysis_hash>/...`` resources without re-running stackwalk.
+
+        Args:
+            report_path: Path to a saved minidump-stackwalk text report
+            fields: Optional projection of the result, e.g. ["crash_info", "threads[*].frames[:10]"]
+            max_frames: Optional maximum number of frames kept per thread
+
+        Returns:
+            Dictionary containing the structured analysis and its ``analysis_hash``
+        """
+        if max_frames is not None and max_frames < 0:
+            param_error = InvalidParameterError("max_frames", max_frames, "Must not be negative")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+
+        try:
+            selector = build_selector(fields, max_frames)
+        except ValueError as e:
+            param_error = InvalidParameterError("fields", fields, f"Invalid projection: {e}")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+
+        report_file = Path(report_path)
+        if not report_file.is_file():
+            reason = "File not found" if not report_file.exists() else "Path is not a file"
+            file_error = FileValidationError(report_file, reason)
+            return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+
+        try:
+            text = await asyncio.to_thread(report_file.read_text, encoding="utf-8", errors="replace")
+        except OSError as e:
+            file_error = FileValidationError(report_file, f"File could not be read: {e}")
+            return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+
+        analysis_hash = analysis_key(hashlib.sha256(text.encode()).hexdigest())
+        cached = await self._cache.fetch(analysis_hash)
+        if cached is None:
+            parsed = await asyncio.to_thread(parse_text_report, text.splitlines())
+            if not parsed["threads"] and parsed["crash_info"]["type"] is None:
+                parse_error = MinidumpAnalysisError(
+                    report_file, "Not a minidump-stackwalk text report", {"raw_output": text[:500]}
+                )
+                return {"error": str(parse_error), "success": False, "error_code": parse_error.error_code}
+            entry = await asyncio.to_thread(
+                lambda: CachedAnalysis(analysis_hash, report_file, "parse_stackwalk_report", json.dumps(parsed), text)
+            )
+            await self._cache.publish(entry)
+            return await asyncio.to_thread(self._result, entry, "json", selector, cached=False)
+        return await asyncio.to_thread(self._result, cached, "json", selector, cached=True)
+
+    async def _index_analysis(self, entry: CachedAnalysis, dump_hash: str, in_store: bool = False) -> Optional[str]:
+        """Record the signature and similarity sketch of a new analysis.
+
+        The signature of a dump held by the store is recorded there as well, which
+        applies the store's per-signature retention limit.
+
+        Returns:
+            The crash signature of the analysis
+        """
+        model = await asyncio.to_thread(crash_model, entry.json_text)
+        signature = self._signature_generator.from_result(model)
+        try:
+            if self._signatures is not None:
+                await asyncio.to_thread(self._signatures.record, signature, dump_hash)
+            if self._similarity is not None:
+                await asyncio.to_thread(
+                    self._similarity.add,
+                    dump_hash,
+                    self._signature_generator.labels(model, self._similarity_depth),
+                    analysis_hash=entry.analysis_hash,
+                    signature=signature.signature,
+                    crash_type=signature.crash_type,
+                    minidump_path=str(entry.minidump_path),
+                )
+            if in_store and self._store is not None:
+                await asyncio.to_thread(self._store.record_signature, dump_hash, signature.signature)
+        except sqlite3.Error as e:
+            # The analysis itself succeeded; a broken index must not hide it
+            logger.warning("Failed to index analysis of %s: %s", entry.minidump_path, e)
+        return signature.signature
+
+    async def _lookup_signature(self, dump_hash: str) -> Optional[str]:
+        """Return the indexed signature of a dump, if any."""
+        if self._signatures is None:
+            return None
+        try:
+            return await asyncio.to_thread(self._signatures.signature_of, dump_hash)
+        except sqlite3.Error as e:
+            logger.warning("Failed to read signature of %s: %s", dump_hash, e)
+            return None
+
+    @staticmethod
+    def _downgraded(info: Dict[str, Any], estimate: float, budget_seconds: float) -> Dict[str, Any]:
+        """Response with the triage metadata of a dump whose analysis would not finish in time."""
+        return {
+            "success": True,
+            "downgraded": True,
+            "data": info,
+            "estimated_seconds": round(estimate, 1),
+            "budget_seconds": round(budget_seconds, 1),
+            "suggestion": "Run submit_analysis for the full analysis in the background",
+        }
+
+    def _result(
+        self, entry: CachedAnalysis, output_format: str, selector: Optional[FieldSelector], *, cached: bool
+    ) -> Dict[str, Any]:
+        """Build the tool response for a (possibly cached) analysis."""
+        result: Dict[str, Any] = {"success": True}
+        if output_format == "text":
+            result["data"] = entry.text_report
+        else:
+            result["data"] = project_json(entry.json_text, selector)
+            if output_format == "both":
+                result["text"] = entry.text_report
+        result.update({"command": entry.command, "analysis_hash": entry.analysis_hash, "cached": cached})
+        return result
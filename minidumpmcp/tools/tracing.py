@@ -0,0 +1,55 @@
+"""Trace query tool for FastMCP."""
+
+from typing import Any, Dict, Optional
+
+from minidumpmcp.exceptions import InvalidParameterError
+from minidumpmcp.tracing import RingBuffer
+
+
+class TraceProvider:
+    """Provider for queries over the recently kept request traces."""
+
+    def __init__(self, traces: RingBuffer) -> None:
+        """Initialize the provider.
+
+        Args:
+            traces: Ring buffer the tracer exports kept traces to
+        """
+        self._traces = traces
+
+    async def get_traces(
+        self,
+        request_id: Optional[str] = None,
+        name: Optional[str] = None,
+        min_duration_ms: Optional[float] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        List recent request traces with the time spent in every stage.
+
+        Tool calls, prompt renders, resource reads and background jobs are traced; a
+        sample of them, and every slow one, is kept. Each trace lists its spans, e.g.
+        validation, cache lookup, the minidump-stackwalk run and result projection of
+        a stackwalk_minidump call, with start time, duration and attributes, to tell
+        where a slow request spent its time.
+
+        Args:
+            request_id: Only the trace of this request (a job id for background jobs, or
+                        the request_id passed in the request's _meta)
+            name: Only traces whose name contains this text, e.g. "stackwalk_minidump"
+            min_duration_ms: Only traces that took at least this many milliseconds
+            limit: Maximum number of traces to return, most recent first (default: 20)
+
+        Returns:
+            Dictionary containing the matching traces and the number of traces held
+        """
+        if limit < 1:
+            param_error = InvalidParameterError("limit", limit, "Must be at least 1")
+            return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+        if min_duration_ms is not None and min_duration_ms < 0:
+            param_error = InvalidParameterError("min_duration_ms", min_duration_ms, "Must not be negative")
+            return {"success": False, "error": str(param_error), "error_code": param_error.error_code}
+
+        min_duration = min_duration_ms / 1000 if min_duration_ms is not None else None
+        traces = self._traces.query(request_id, name, min_duration, limit)
+        return {"success": True, "traces": traces, "held": len(self._traces)}
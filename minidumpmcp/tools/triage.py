@@ -0,0 +1,333 @@
+"""Batch triage of minidump directories for FastMCP and the CLI."""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from minidumpmcp.analysis.cache import hash_file
+from minidumpmcp.analysis.classifier import classify
+from minidumpmcp.analysis.minidump import read_minidump_info
+from minidumpmcp.analysis.signature import SignatureGenerator, crash_model
+from minidumpmcp.deadline import budget
+from minidumpmcp.exceptions import FileValidationError, InvalidParameterError, MinidumpMCPError
+
+from .stackwalk import StackwalkProvider
+
+MINIDUMP_SUFFIXES = (".dmp", ".mdmp")
+
+# Report directories of a Crashpad database, in processing order.
+CRASHPAD_REPORT_DIRS = ("new", "pending", "completed")
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def _pool_size(max_workers: Optional[int], dump_count: int) -> int:
+    """Number of worker processes for *dump_count* dumps; small batches do not need a full pool."""
+    return min(max_workers or os.cpu_count() or 1, dump_count)
+
+
+def _pool_context() -> BaseContext:
+    """Start method of the worker processes.
+
+    Forking the server would copy locks held by its other threads (executor
+    workers, the job scheduler, SQLite connections) into children that then
+    run Python code, so workers are started from a fork server or spawned.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Imported once by the fork server instead of by every worker
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def is_crashpad_database(directory: Path) -> bool:
+    """Whether *directory* looks like a Crashpad crash report database."""
+    return (directory / "settings.dat").is_file() or (directory / "completed").is_dir()
+
+
+def find_minidumps(directory: Path, recursive: bool = True) -> Iterator[Path]:
+    """Yield the minidump files under *directory* in a stable order.
+
+    For a Crashpad database only the ``new``, ``pending`` and ``completed`` report
+    directories are searched, so attachments and metadata files are left alone.
+    """
+    if is_crashpad_database(directory):
+        roots = [directory / name for name in CRASHPAD_REPORT_DIRS if (directory / name).is_dir()]
+    else:
+        roots = [directory]
+    for root in roots:
+        candidates = root.rglob("*") if recursive else root.iterdir()
+        for path in sorted(candidates):
+            if path.suffix.lower() in MINIDUMP_SUFFIXES and path.is_file():
+                yield path
+
+
+def triage_file(minidump_path: str) -> Dict[str, Any]:
+    """Hash a minidump and read its metadata.
+
+    Runs in worker processes, so it only takes and returns plain picklable values.
+    Failures are reported in the record instead of raised.
+    """
+    path = Path(minidump_path)
+    record: Dict[str, Any] = {"minidump_path": minidump_path}
+    timings: Dict[str, float] = {}
+    try:
+        start = time.perf_counter()
+        record["dump_hash"] = hash_file(path)
+        timings["hash_ms"] = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        record.update(read_minidump_info(path))
+        timings["read_ms"] = _elapsed_ms(start)
+        record["success"] = True
+    except MinidumpMCPError as e:
+        record.update({"success": False, "error": str(e), "error_code": e.error_code})
+    except OSError as e:
+        file_error = FileValidationError(path, f"File could not be read: {e}")
+        record.update({"success": False, "error": str(file_error), "error_code": file_error.error_code})
+    record["timings"] = timings
+    return record
+
+
+class TriageProvider:
+    """Provider for triaging whole directories of minidumps."""
+
+    def __init__(
+        self,
+        stackwalk: Optional[StackwalkProvider] = None,
+        signature_generator: Optional[SignatureGenerator] = None,
+    ) -> None:
+        """Initialize the provider.
+
+        Args:
+            stackwalk: Provider used for full analyses; its cache and indexes are shared
+            signature_generator: Generator for signatures of analyses the stackwalk provider
+                                 does not index itself
+        """
+        self._stackwalk = stackwalk if stackwalk is not None else StackwalkProvider()
+        self._generator = signature_generator if signature_generator is not None else SignatureGenerator()
+
+    async def triage(
+        self,
+        paths: List[Path],
+        stackwalk: bool = False,
+        symbols_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        concurrency: int = 2,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Triage *paths*, yielding one record per dump as soon as it is done.
+
+        Hashing and metadata reading fan out over a process pool; full stackwalks run
+        in this process with at most *concurrency* ``minidump-stackwalk`` children.
+        Under a request deadline the generator ends early, without records for the
+        remaining dumps, once the deadline leaves no time for stackwalks that a fresh
+        request could have fitted.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        # Stackwalks estimated to outlast even this are too slow for any request
+        initial_budget = budget(self._stackwalk.timeout)
+        out_of_time = False
+
+        async def run(pool: ProcessPoolExecutor, path: Path) -> Optional[Dict[str, Any]]:
+            nonlocal out_of_time
+            record = await loop.run_in_executor(pool, triage_file, str(path))
+            if stackwalk and record["success"]:
+                start = time.perf_counter()
+                async with semaphore:
+                    if out_of_time:
+                        return None
+                    record["timings"]["queue_ms"] = _elapsed_ms(start)
+                    start = time.perf_counter()
+                    analysis = await self._analyze(path, symbols_path, initial_budget)
+                    if analysis is None:
+                        out_of_time = True
+                        return None
+                    record["stackwalk"] = analysis
+                    record["timings"]["stackwalk_ms"] = _elapsed_ms(start)
+            return record
+
+        if not paths:
+            return
+        pool = ProcessPoolExecutor(_pool_size(max_workers, len(paths)), mp_context=_pool_context())
+        try:
+            tasks = [asyncio.ensure_future(run(pool, path)) for path in paths]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    record = await next_done
+                    if record is None:
+                        break
+                    yield record
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            # Joining the workers would block the event loop; they exit on their own once idle
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _analyze(
+        self, path: Path, symbols_path: Optional[str], initial_budget: float
+    ) -> Optional[Dict[str, Any]]:
+        """Run a full stackwalk and keep only what identifies the crash.
+
+        Returns ``None`` if the stackwalk was turned away because the request's deadline
+        no longer leaves the time it would have had at *initial_budget* seconds.
+        """
+        # The dump's metadata is already in the record, so an analysis that cannot finish in time is skipped
+        result = await self._stackwalk.stackwalk_minidump(
+            str(path), symbols_path, fields=["crash_info"], max_frames=0, over_budget="reject"
+        )
+        if not result["success"]:
+            if result["error_code"] == "DEADLINE_EXCEEDED" and result["estimated_seconds"] <= initial_budget:
+                return None
+            return {key: result[key] for key in ("success", "error", "error_code")}
+        signature = result.get("signature")
+        findings: List[str] = []
+        entry = await self._stackwalk.cache.fetch(result["analysis_hash"])
+        if entry is not None:
+            model = crash_model(entry.json_text)
+            if signature is None:
+                signature = self._generator.from_result(model).signature
+            findings = [finding.kind for finding in classify(model)]
+        return {
+            "success": True,
+            "analysis_hash": result["analysis_hash"],
+            "cached": result["cached"],
+            "crash_type": (result["data"].get("crash_info") or {}).get("type"),
+            "signature": signature,
+            "findings": findings,
+        }
+
+    async def triage_directory(
+        self,
+        directory: str,
+        recursive: bool = True,
+        stackwalk: bool = False,
+        symbols_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        concurrency: int = 2,
+        output_path: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Triage every minidump in a directory or Crashpad database in one call.
+
+        Each dump is hashed and its header, system info, exception and module list are
+        read natively, which takes milliseconds per dump. With ``stackwalk=True`` every
+        dump is also fully analyzed (results are cached and indexed like stackwalk_minidump
+        results) and gets a crash signature, so identical crashes can be grouped, and the
+        kinds of crash patterns recognized in it (null_dereference, stack_overflow, panic, ...).
+        Stackwalks stop early when the request's deadline runs out; the response then lists
+        only the dumps done and suggests submit_triage for the whole directory.
+
+        Args:
+            directory: Directory of .dmp files, or a Crashpad database directory
+            recursive: Whether to search subdirectories
+            stackwalk: Whether to run a full stackwalk on every dump
+            symbols_path: Optional path to symbols directory used by the stackwalks
+            max_workers: Number of worker processes for metadata reading, defaults to the CPU count
+            concurrency: Maximum number of stackwalks running at once
+            output_path: Optional file receiving one JSON record per line (NDJSON). When given,
+                         records are written there instead of returned.
+
+        Returns:
+            Dictionary with one record per dump done (metadata, optional analysis and per-stage
+            timings in milliseconds), counts and total stage timings
+        """
+        return await self.run_triage(
+            directory, recursive, stackwalk, symbols_path, max_workers, concurrency, output_path
+        )
+
+    async def run_triage(
+        self,
+        directory: str,
+        recursive: bool = True,
+        stackwalk: bool = False,
+        symbols_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        concurrency: int = 2,
+        output_path: Optional[str] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """Triage a directory like :meth:`triage_directory`, reporting progress.
+
+        Kept apart from the tool because MCP tool parameters must be JSON serializable.
+
+        Args:
+            progress: Called with the number of dumps done and the number found, after the
+                      search and after every dump
+        """
+        if max_workers is not None and max_workers < 1:
+            param_error = InvalidParameterError("max_workers", max_workers, "Must be at least 1")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+        if concurrency < 1:
+            param_error = InvalidParameterError("concurrency", concurrency, "Must be at least 1")
+            return {"error": str(param_error), "success": False, "error_code": param_error.error_code}
+
+        root = Path(directory)
+        if not root.is_dir():
+            reason = "Directory not found" if not root.exists() else "Path is not a directory"
+            file_error = FileValidationError(root, reason)
+            return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+
+        start = time.perf_counter()
+        paths = await asyncio.to_thread(lambda: list(find_minidumps(root, recursive)))
+        discover_ms = _elapsed_ms(start)
+        if progress is not None:
+            progress(0, len(paths))
+
+        records: List[Dict[str, Any]] = []
+        totals: Dict[str, float] = {}
+        failed = done = 0
+        output = None
+        try:
+            if output_path:
+                output = open(output_path, "w", encoding="utf-8")
+            async for record in self.triage(paths, stackwalk, symbols_path, max_workers, concurrency):
+                if not (record["success"] and record.get("stackwalk", {}).get("success", True)):
+                    failed += 1
+                for stage, elapsed in record["timings"].items():
+                    totals[stage] = round(totals.get(stage, 0.0) + elapsed, 3)
+                if output is not None:
+                    output.write(json.dumps(record) + "\n")
+                else:
+                    records.append(record)
+                done += 1
+                if progress is not None:
+                    progress(done, len(paths))
+        except OSError as e:
+            file_error = FileValidationError(Path(output_path or directory), f"Could not write output: {e}")
+            return {"error": str(file_error), "success": False, "error_code": file_error.error_code}
+        finally:
+            if output is not None:
+                output.close()
+
+        result: Dict[str, Any] = {
+            "success": True,
+            "directory": str(root),
+            "crashpad_database": is_crashpad_database(root),
+            "dump_count": len(paths),
+            "failed_count": failed,
+            "timings": {"discover_ms": discover_ms, **totals, "wall_ms": _elapsed_ms(start)},
+            "workers": _pool_size(max_workers, len(paths)),
+        }
+        if done < len(paths):
+            result["stopped_early"] = True
+            result["suggestion"] = (
+                f"The request's deadline left no time to analyze the other {len(paths) - done} dumps; "
+                "run submit_triage to triage the directory in the background without the deadline"
+            )
+        if output_path:
+            result["output_path"] = output_path
+        else:
+            result["records"] = records
+        return result
@@ -0,0 +1,316 @@
+"""Request tracing with per-stage spans.
+
+Every MCP request and background job runs as a trace identified by a request
+id, which propagates through the request's tasks and threads in a context
+variable.  Code marks its stages with :func:`span`; outside a recording trace
+this only checks the context variable, so instrumented code costs nothing when
+tracing is off or the request is not sampled.
+
+A :class:`Tracer` decides which traces are kept: a random share of them
+(head sampling), plus every trace slower than a threshold, which needs the
+trace to be recorded until it ends.  Kept traces go to the exporters, an
+in-memory ring buffer queried with the ``get_traces`` tool and a rotating
+JSON-lines file.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import logging.handlers
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Union
+
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+
+logger = logging.getLogger(__name__)
+
+# Spans recorded per trace; triages of large directories would otherwise grow without bound
+MAX_SPANS = 512
+
+# Innermost open span of the current request
+_current: ContextVar[Optional["Span"]] = ContextVar("span", default=None)
+
+
+@dataclass
+class _Trace:
+    """Spans of one request, finished ones first in order of completion."""
+
+    request_id: str
+    recording: bool
+    spans: List["Span"] = field(default_factory=list)
+    dropped: int = 0
+
+
+@dataclass
+class Span:
+    """A timed stage of a request."""
+
+    name: str
+    request_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    _trace: Optional[_Trace] = field(default=None, repr=False)
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set(self, **attributes: Any) -> None:
+        """Add *attributes* to the span."""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the finished span."""
+        return {
+            "request_id": self.request_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "status": "ok" if self.error is None else "error",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def _finish(self, error: Optional[BaseException]) -> None:
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+def request_id() -> Optional[str]:
+    """Id of the request being handled, or ``None`` outside of a request."""
+    current = _current.get()
+    return current.request_id if current is not None else None
+
+
+def annotate(**attributes: Any) -> None:
+    """Add *attributes* to the innermost span of the current request, if it is recorded."""
+    current = _current.get()
+    if current is not None and current._trace is not None and current._trace.recording:
+        current.attributes.update(attributes)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time the block as stage *name* of the current request.
+
+    Yields the span, or ``None`` when the request is not recorded.  Exceptions
+    leaving the block are recorded on the span and propagate.
+    """
+    parent = _current.get()
+    trace = parent._trace if parent is not None else None
+    if parent is None or trace is None or not trace.recording:
+        yield None
+        return
+    child = Span(name, parent.request_id, uuid.uuid4().hex[:16], parent.span_id, time.time(), attributes, _trace=trace)
+    token = _current.set(child)
+    error: Optional[BaseException] = None
+    try:
+        yield child
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current.reset(token)
+        child._finish(error)
+        if len(trace.spans) < MAX_SPANS:
+            trace.spans.append(child)
+        else:
+            trace.dropped += 1
+
+
+class SpanExporter(ABC):
+    """Destination of the spans of kept traces."""
+
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None:
+        """Write the spans of one trace, the root span last."""
+
+    def close(self) -> None:  # noqa: B027 - optional for exporters without resources
+        """Release the exporter's resources."""
+
+
+class RingBuffer(SpanExporter):
+    """Keeps the most recent traces in memory for :meth:`query`."""
+
+    def __init__(self, capacity: int = 256) -> None:
+        """Initialize the buffer.
+
+        Args:
+            capacity: Number of traces kept
+        """
+        self._traces: Deque[List[Dict[str, Any]]] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Add a trace, dropping the oldest one when the buffer is full."""
+        self._traces.append([s.to_dict() for s in spans])
+
+    def query(
+        self,
+        request_id: Optional[str] = None,
+        name: Optional[str] = None,
+        min_duration: Optional[float] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Most recent traces first, filtered by request id, root span name and duration.
+
+        Args:
+            request_id: Only the trace of this request
+            name: Only traces whose root span name contains this text
+            min_duration: Only traces that took at least this many seconds
+            limit: Maximum number of traces returned
+        """
+        traces = []
+        for spans in reversed(self._traces):
+            root = spans[-1]
+            if request_id is not None and root["request_id"] != request_id:
+                continue
+            if name is not None and name not in root["name"]:
+                continue
+            if min_duration is not None and root["duration_ms"] < min_duration * 1000:
+                continue
+            traces.append({**root, "spans": spans[:-1]})
+            if len(traces) >= limit:
+                break
+        return traces
+
+
+class JsonLinesFile(SpanExporter):
+    """Appends spans as JSON lines to a file rotated by size."""
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 10 * 1024 * 1024, backups: int = 3) -> None:
+        """Initialize the exporter.
+
+        Args:
+            path: File the spans are appended to
+            max_bytes: Size at which the file is rotated
+            backups: Number of rotated files kept (``path.1`` is the most recent)
+        """
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The handler already implements size-based rotation and serializes writes
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Append one line per span."""
+        lines = "\n".join(json.dumps(s.to_dict(), default=str) for s in spans)
+        self._handler.handle(logging.makeLogRecord({"msg": lines, "levelno": logging.INFO}))
+
+    def close(self) -> None:
+        """Close the file."""
+        self._handler.close()
+
+
+class Tracer:
+    """Starts traces and hands the kept ones to the exporters."""
+
+    def __init__(
+        self,
+        exporters: Sequence[SpanExporter],
+        sample_rate: float = 1.0,
+        slow_threshold: Optional[float] = None,
+    ) -> None:
+        """Initialize the tracer.
+
+        Args:
+            exporters: Destinations of kept traces
+            sample_rate: Share of traces kept, from 0 to 1
+            slow_threshold: Traces taking at least this many seconds are kept regardless
+                            of sampling; every trace is then recorded until it ends
+        """
+        self.exporters = list(exporters)
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+
+    @contextlib.contextmanager
+    def trace(
+        self, name: str, request_id: Optional[str] = None, force: bool = False, **attributes: Any
+    ) -> Iterator[Span]:
+        """Run the block as a new request, with *name* as its root span.
+
+        Args:
+            name: Name of the root span, e.g. ``tool stackwalk_minidump``
+            request_id: Id of the request, a random one by default
+            force: Keep the trace regardless of sampling
+            attributes: Attributes of the root span
+        """
+        sampled = force or random.random() < self.sample_rate
+        trace = _Trace(request_id or uuid.uuid4().hex, sampled or self.slow_threshold is not None)
+        root = Span(name, trace.request_id, uuid.uuid4().hex[:16], None, time.time(), attributes, _trace=trace)
+        token = _current.set(root)
+        error: Optional[BaseException] = None
+        try:
+            yield root
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current.reset(token)
+            root._finish(error)
+            assert root.duration is not None
+            slow = self.slow_threshold is not None and root.duration >= self.slow_threshold
+            if sampled or slow:
+                if trace.dropped:
+                    root.set(dropped_spans=trace.dropped)
+                self._export([*trace.spans, root])
+
+    def _export(self, spans: List[Span]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not export trace %s: %s", spans[-1].request_id, e)
+
+    def close(self) -> None:
+        """Close the exporters."""
+        for exporter in self.exporters:
+            exporter.close()
+
+
+class TracingMiddleware(Middleware):
+    """Runs every tool call, prompt render and resource read as a trace.
+
+    Callers can pass their own ``request_id`` in the request's ``_meta`` to find
+    the trace afterwards, and ``trace: true`` to keep it regardless of sampling.
+    """
+
+    def __init__(self, tracer: Tracer) -> None:
+        """Initialize the middleware."""
+        self._tracer = tracer
+
+    async def _traced(self, name: str, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        meta = getattr(context.message, "meta", None)
+        requested = getattr(meta, "request_id", None) if meta is not None else None
+        force = getattr(meta, "trace", None) is True if meta is not None else False
+        with self._tracer.trace(name, requested if isinstance(requested, str) and requested else None, force):
+            return await call_next(context)
+
+    async def on_call_tool(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        """Trace a tool call."""
+        return await self._traced(f"tool {context.message.name}", context, call_next)
+
+    async def on_get_prompt(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        """Trace a prompt render."""
+        return await self._traced(f"prompt {context.message.name}", context, call_next)
+
+    async def on_read_resource(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        """Trace a resource read."""
+        return await self._traced(f"resource {context.message.uri}", context, call_next)
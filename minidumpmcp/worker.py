@@ -0,0 +1,147 @@
+"""Job worker processes.
+
+A single server process runs every job on one core.  With
+``MINIDUMP_MCP_JOBS__WORKERS`` set, the server only holds the MCP sessions and
+submits jobs, while a :class:`WorkerPool` of ``rust-minidump-mcp worker``
+processes claims them from the shared durable queue.  The workers write their
+analyses to the shared analysis directory, where the server's resources and
+stackwalk_minidump find them.  Workers can also be started by hand, e.g. on
+another core set, as long as they use the same queue database and analysis
+directory.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from minidumpmcp.config import ServerSettings
+from minidumpmcp.services import analysis_directory, create_job_provider, create_services
+
+logger = logging.getLogger(__name__)
+
+
+def worker_environment(settings: ServerSettings) -> Dict[str, str]:
+    """Environment variables that make worker processes share the server's queue and analyses.
+
+    Settings given to the server on the command line do not reach the workers otherwise.
+    """
+    return {
+        "MINIDUMP_MCP_LOG_LEVEL": settings.log_level,
+        "MINIDUMP_MCP_JOBS__DATABASE_PATH": str(settings.jobs.database_path),
+        "MINIDUMP_MCP_CACHE__DIRECTORY": str(analysis_directory(settings, shared=True)),
+    }
+
+
+class WorkerPool:
+    """Starts job worker processes and restarts those that exit.
+
+    Workers are stopped with SIGTERM, which makes them hand their running jobs
+    back to the queue, and killed when they do not exit within *grace_period*.
+    Jobs of a killed worker are resumed once their lease runs out.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        command: Optional[Sequence[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+        restart_delay: float = 1.0,
+        grace_period: float = 10.0,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            count: Number of worker processes
+            command: Command starting one worker, ``python -m minidumpmcp worker`` by default
+            env: Environment variables set for the workers on top of this process' environment
+            restart_delay: Seconds before a worker that exited is started again
+            grace_period: Seconds a stopping worker may take before it is killed
+        """
+        self.count = count
+        self.command = list(command) if command is not None else [sys.executable, "-m", "minidumpmcp", "worker"]
+        self.env = {**os.environ, **(env or {})}
+        self.restart_delay = restart_delay
+        self.grace_period = grace_period
+        self._processes: Dict[int, asyncio.subprocess.Process] = {}
+        self._supervisors: List["asyncio.Task[None]"] = []
+
+    @property
+    def pids(self) -> List[int]:
+        """Process ids of the running workers."""
+        return [process.pid for process in self._processes.values() if process.returncode is None]
+
+    async def start(self) -> None:
+        """Start the workers."""
+        if self._supervisors:
+            return
+        loop = asyncio.get_running_loop()
+        self._supervisors = [loop.create_task(self._supervise(slot)) for slot in range(self.count)]
+
+    async def close(self) -> None:
+        """Stop the workers and wait for them to exit."""
+        supervisors, self._supervisors = self._supervisors, []
+        for supervisor in supervisors:
+            supervisor.cancel()
+        await asyncio.gather(*supervisors, return_exceptions=True)
+
+    async def _supervise(self, slot: int) -> None:
+        while True:
+            # The workers' stdout is kept off the server's, which carries the STDIO transport
+            process = await asyncio.create_subprocess_exec(
+                *self.command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, env=self.env
+            )
+            self._processes[slot] = process
+            try:
+                returncode = await process.wait()
+            except asyncio.CancelledError:
+                await self._stop(process)
+                raise
+            logger.warning("Job worker %d (pid %d) exited with code %d; restarting", slot, process.pid, returncode)
+            await asyncio.sleep(self.restart_delay)
+
+    async def _stop(self, process: asyncio.subprocess.Process) -> None:
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), self.grace_period)
+        except asyncio.TimeoutError:
+            logger.warning("Job worker pid %d did not stop within %gs; killing it", process.pid, self.grace_period)
+            process.kill()
+            await process.wait()
+
+
+async def run_worker(settings: Optional[ServerSettings] = None, concurrency: Optional[int] = None) -> None:
+    """Run queued jobs until SIGTERM or SIGINT, then hand the running ones back to the queue.
+
+    Args:
+        settings: Server settings, read from the environment by default
+        concurrency: Number of jobs run at once, ``MINIDUMP_MCP_JOBS__CONCURRENCY`` by default
+    """
+    from minidumpmcp.server import setup_logging
+
+    if settings is None:
+        settings = ServerSettings()
+    setup_logging(settings)
+
+    provider = create_job_provider(settings, create_services(settings, shared=True), concurrency)
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signum, stopping.set)
+        except NotImplementedError:
+            # Windows: the pool's terminate() ends the process at once and the lease recovers the job
+            pass
+
+    provider.scheduler.start()
+    logger.info("Job worker %s running %d jobs at once", provider.scheduler.owner, provider.scheduler.concurrency)
+    try:
+        await stopping.wait()
+    finally:
+        await provider.scheduler.close()
+        logger.info("Job worker %s stopped", provider.scheduler.owner)
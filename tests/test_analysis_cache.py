@@ -0,0 +1,139 @@
+"""Tests for the analysis cache and its shared directory."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from minidumpmcp.analysis.cache import (
+    AnalysisCache,
+    AnalysisStore,
+    CachedAnalysis,
+    analysis_key,
+    hash_minidump,
+    symbols_fingerprint,
+)
+from minidumpmcp.storage.cache_backend import FileCacheBackend
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+
+class TestCachedAnalysis:
+    """Tests for span-indexed analyses."""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        self.entry = CachedAnalysis("hash", Path("test.dmp"), "minidump-stackwalk --json test.dmp", SAMPLE_JSON)
+        self.full = json.loads(SAMPLE_JSON)
+
+    def test_member(self) -> None:
+        """Test decoding a single top-level member."""
+        assert self.entry.member("crash_info") == self.full["crash_info"]
+        assert self.entry.member("missing") is None
+
+    def test_counts_and_elements(self) -> None:
+        """Test indexed list access."""
+        assert self.entry.count("threads") == 2
+        assert self.entry.count("modules") == len(self.full["modules"])
+        assert list(self.entry.elements("modules", 2, 3)) == self.full["modules"][2:5]
+        assert self.entry.element("threads", 1) == self.full["threads"][1]
+        assert self.entry.element("threads", 5) is None
+
+    def test_frames_page(self) -> None:
+        """Test paging through the frames of a thread."""
+        assert self.entry.frames(0, 1, 2) == (4, self.full["threads"][0]["frames"][1:3])
+        assert self.entry.frames(9, 0, 2) is None
+
+    def test_rejects_non_object(self) -> None:
+        """Test that non-object documents are rejected."""
+        with pytest.raises(json.JSONDecodeError):
+            CachedAnalysis("hash", Path("test.dmp"), "cmd", "[1, 2]")
+
+
+class TestAnalysisCache:
+    """Tests for the LRU cache."""
+
+    def test_lru_eviction(self) -> None:
+        """Test that the least recently used entry is evicted first."""
+        cache = AnalysisCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.put(CachedAnalysis(key, Path("x.dmp"), "cmd", "{}"))
+        cache.get("a")
+        cache.put(CachedAnalysis("c", Path("x.dmp"), "cmd", "{}"))
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+        assert cache.evictions == 1
+
+    def test_byte_budget(self) -> None:
+        """Test eviction driven by the byte budget."""
+        cache = AnalysisCache(max_bytes=len(SAMPLE_JSON) + 100)
+        cache.put(CachedAnalysis("a", Path("x.dmp"), "cmd", SAMPLE_JSON))
+        cache.put(CachedAnalysis("b", Path("x.dmp"), "cmd", SAMPLE_JSON))
+
+        assert list(cache._entries) == ["b"]
+        assert cache.size == cache._entries["b"].size
+
+    @pytest.mark.asyncio
+    async def test_analysis_key_depends_on_content_and_symbols(self, tmp_path: Path) -> None:
+        """Test analysis hashes for identical and different inputs."""
+        first = tmp_path / "a.dmp"
+        second = tmp_path / "b.dmp"
+        first.write_bytes(b"MDMP same")
+        second.write_bytes(b"MDMP same")
+
+        first_hash = await hash_minidump(first)
+        assert first_hash == await hash_minidump(second)
+        assert analysis_key(first_hash) != analysis_key(first_hash, tmp_path)
+        assert analysis_key(first_hash, tmp_path, "old") != analysis_key(first_hash, tmp_path, "new")
+
+    def test_symbols_fingerprint(self, tmp_path: Path) -> None:
+        """Test that only added or changed symbol files change the fingerprint."""
+        module = tmp_path / "app.pdb" / "0123456789ABCDEF0"
+        module.mkdir(parents=True)
+        empty = symbols_fingerprint(tmp_path)
+
+        (tmp_path / "README.txt").write_text("not a symbol file")
+        assert symbols_fingerprint(tmp_path) == empty
+
+        (module / "app.sym").write_text("MODULE windows x86_64 0123456789ABCDEF0 app.pdb\n")
+        added = symbols_fingerprint(tmp_path)
+        assert added != empty
+
+        (module / "app.sym").write_text("MODULE windows x86_64 0123456789ABCDEF0 app.pdb\nFILE 0 app.cc\n")
+        assert symbols_fingerprint(tmp_path) not in (empty, added)
+
+
+class TestAnalysisStore:
+    """Tests for sharing analyses through a backend."""
+
+    @pytest.mark.asyncio
+    async def test_shared_between_caches(self, tmp_path: Path) -> None:
+        """Test that an analysis published by one cache is fetched by another one sharing the backend."""
+        writer = AnalysisCache(store=AnalysisStore(FileCacheBackend(tmp_path)))
+        await writer.publish(CachedAnalysis("a", Path("x.dmp"), "cmd", SAMPLE_JSON, "Operating system: Windows NT\n"))
+
+        reader = AnalysisCache(store=AnalysisStore(FileCacheBackend(tmp_path)))
+        assert reader.get("a") is None
+        entry = await reader.fetch("a")
+
+        assert entry is not None
+        assert (entry.minidump_path, entry.command) == (Path("x.dmp"), "cmd")
+        assert entry.json_text == SAMPLE_JSON
+        assert entry.text_report == "Operating system: Windows NT\n"
+        assert entry.count("threads") == 2
+        assert "a" in reader
+        assert await reader.fetch("a") is entry
+        assert await reader.fetch("missing") is None
+        assert (reader.hits, reader.shared_hits, reader.misses) == (1, 1, 1)
+        assert [path.name for path in tmp_path.iterdir()] == ["a.analysis"]
+
+    @pytest.mark.asyncio
+    async def test_unreadable_entry_is_a_miss(self, tmp_path: Path) -> None:
+        """Test that a corrupt stored analysis is ignored."""
+        (tmp_path / "a.analysis").write_bytes(b"not json\n{}")
+        cache = AnalysisCache(store=AnalysisStore(FileCacheBackend(tmp_path)))
+
+        assert await cache.fetch("a") is None
+        assert cache.misses == 1
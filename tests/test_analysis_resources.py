@@ -0,0 +1,91 @@
+"""Tests for paginated analysis resources."""
+
+from pathlib import Path
+
+import pytest
+
+from minidumpmcp.analysis.cache import AnalysisCache, CachedAnalysis
+from minidumpmcp.resources import AnalysisResourceProvider
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+
+class TestAnalysisResourceProvider:
+    """Tests for AnalysisResourceProvider."""
+
+    def setup_method(self) -> None:
+        """Set up test fixtures."""
+        cache = AnalysisCache()
+        cache.put(CachedAnalysis("abc", Path("test.dmp"), "cmd", SAMPLE_JSON))
+        self.provider = AnalysisResourceProvider(cache, page_size=5)
+
+    @pytest.mark.asyncio
+    async def test_summary(self) -> None:
+        """Test the analysis summary resource."""
+        result = await self.provider.analysis_summary("abc")
+
+        assert result["success"] is True
+        assert result["crash_info"]["type"] == "EXCEPTION_ACCESS_VIOLATION_WRITE"
+        assert result["thread_count"] == 2
+        assert result["module_count"] == 13
+
+    @pytest.mark.asyncio
+    async def test_threads_are_summarized(self) -> None:
+        """Test that thread pages carry only the top frame."""
+        result = await self.provider.list_threads("abc")
+
+        assert result["total"] == 2
+        assert result["next_cursor"] is None
+        first = result["items"][0]
+        assert first["thread_id"] == 3060
+        assert len(first["frames"]) == 1
+        assert first["frames_uri"] == "minidump://abc/threads/0/frames"
+
+    @pytest.mark.asyncio
+    async def test_modules_pagination(self) -> None:
+        """Test following cursors through all module pages."""
+        names = []
+        cursor = None
+        while True:
+            page = await self.provider.list_modules("abc", cursor)
+            names.extend(module["filename"] for module in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+            assert page["next_uri"] == f"minidump://abc/modules?cursor={cursor}"
+
+        assert len(names) == 13
+        assert names[0] == "test_app.exe"
+
+    @pytest.mark.asyncio
+    async def test_thread_frames(self) -> None:
+        """Test the per-thread frames resource."""
+        result = await self.provider.list_thread_frames("abc", 0, cursor="3")
+
+        assert result["total"] == 4
+        assert [frame["frame"] for frame in result["items"]] == [3]
+
+    @pytest.mark.asyncio
+    async def test_unknown_thread(self) -> None:
+        """Test requesting frames of a thread that does not exist."""
+        result = await self.provider.list_thread_frames("abc", 7)
+
+        assert result["success"] is False
+        assert result["error_code"] == "INVALID_PARAMETER"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cursor", ["-1", "\u00b2", "\u0663"])
+    async def test_invalid_cursor(self, cursor: str) -> None:
+        """Test rejection of malformed cursors, including non-ASCII digits."""
+        result = await self.provider.list_threads("abc", cursor=cursor)
+
+        assert result["success"] is False
+        assert result["error_code"] == "INVALID_PARAMETER"
+
+    @pytest.mark.asyncio
+    async def test_unknown_analysis(self) -> None:
+        """Test requesting an analysis that is not cached."""
+        result = await self.provider.list_threads("missing")
+
+        assert result["success"] is False
+        assert result["error_code"] == "ANALYSIS_NOT_FOUND"
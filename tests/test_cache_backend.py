@@ -0,0 +1,200 @@
+"""Tests for the shared cache backends and consistent hashing."""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import pytest
+
+from minidumpmcp.analysis.cache import AnalysisCache, AnalysisStore, CachedAnalysis
+from minidumpmcp.storage import (
+    FileCacheBackend,
+    HashRing,
+    HttpCacheBackend,
+    ShardedCacheBackend,
+    create_backend,
+)
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+
+class KeyValueServer(ThreadingHTTPServer):
+    """Local stand-in for a networked key-value store speaking the HTTP cache protocol."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), KeyValueHandler)
+        self.values: Dict[str, bytes] = {}
+        self.requests: List[str] = []
+
+    @property
+    def url(self) -> str:
+        """Base URL of the store."""
+        return f"http://127.0.0.1:{self.server_address[1]}/cache"
+
+
+class KeyValueHandler(BaseHTTPRequestHandler):
+    """GET, HEAD and PUT of values under /cache/<key>."""
+
+    server: KeyValueServer
+
+    def _reply(self, status: int, body: bytes = b"") -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Return a value."""
+        self.server.requests.append(f"GET {self.path}")
+        value = self.server.values.get(self.path)
+        self._reply(404) if value is None else self._reply(200, value)
+
+    do_HEAD = do_GET  # noqa: N815
+
+    def do_PUT(self) -> None:  # noqa: N802
+        """Store a value."""
+        self.server.requests.append(f"PUT {self.path}")
+        self.server.values[self.path] = self.rfile.read(int(self.headers["Content-Length"]))
+        self._reply(201)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Keep the test output quiet."""
+
+
+@pytest.fixture
+def kv_servers() -> Iterator[List[KeyValueServer]]:
+    """Two key-value stores running in background threads."""
+    servers = [KeyValueServer(), KeyValueServer()]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield servers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestFileCacheBackend:
+    """Tests for values kept in a local directory."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test storing, reading and replacing values."""
+        backend = FileCacheBackend(tmp_path / "cache")
+        backend.put("a.analysis", b"one")
+        backend.put("a.analysis", b"two")
+
+        assert backend.get("a.analysis") == b"two"
+        assert backend.contains("a.analysis")
+        assert backend.get("b.analysis") is None
+        assert not backend.contains("b.analysis")
+        with pytest.raises(ValueError):
+            backend.get("../escape")
+
+    def test_size_limit(self, tmp_path: Path) -> None:
+        """Test that the least recently read values are removed beyond the size limit."""
+        backend = FileCacheBackend(tmp_path, max_bytes=250)
+        for key in ("a", "b"):
+            backend.put(key, b"x" * 100)
+        os.utime(tmp_path / "a", (1, 1))
+        os.utime(tmp_path / "b", (2, 2))
+        assert backend.get("a") is not None
+        backend.put("c", b"x" * 100)
+
+        assert not backend.contains("b")
+        assert backend.contains("a") and backend.contains("c")
+
+
+class TestHashRing:
+    """Tests for consistent hashing."""
+
+    def test_placement_is_stable_and_balanced(self) -> None:
+        """Test that every ring places keys alike, evenly, and that a new node only takes its share."""
+        keys = [f"{position:064x}.analysis" for position in range(3000)]
+        nodes = ["http://a", "http://b", "http://c"]
+        ring = HashRing(nodes)
+        placement = {key: ring.node_for(key) for key in keys}
+
+        assert placement == {key: HashRing(list(reversed(nodes))).node_for(key) for key in keys}
+        for node in nodes:
+            assert 600 < list(placement.values()).count(node) < 1400
+
+        grown = HashRing([*nodes, "http://d"])
+        moved = [key for key in keys if grown.node_for(key) != placement[key]]
+        assert all(grown.node_for(key) == "http://d" for key in moved)
+        assert 400 < len(moved) < 1200
+
+    def test_requires_nodes(self) -> None:
+        """Test that an empty ring is rejected."""
+        with pytest.raises(ValueError):
+            HashRing([])
+
+
+class TestHttpCacheBackend:
+    """Tests for values kept on networked key-value stores."""
+
+    def test_round_trip(self, kv_servers: List[KeyValueServer]) -> None:
+        """Test storing and reading values over HTTP."""
+        server = kv_servers[0]
+        backend = HttpCacheBackend(server.url + "/")
+        backend.put("a.analysis", b"value")
+
+        assert server.values == {"/cache/a.analysis": b"value"}
+        assert backend.get("a.analysis") == b"value"
+        assert backend.contains("a.analysis")
+        assert backend.get("b.analysis") is None
+        assert not backend.contains("b.analysis")
+
+    def test_unreachable(self) -> None:
+        """Test that an unreachable store raises OSError."""
+        backend = HttpCacheBackend("http://127.0.0.1:9/cache", timeout=1.0)
+        with pytest.raises(OSError):
+            backend.get("a.analysis")
+
+    def test_sharded(self, kv_servers: List[KeyValueServer]) -> None:
+        """Test that every key is stored on the node the ring assigns it."""
+        backend = create_backend(urls=[server.url for server in kv_servers])
+        assert isinstance(backend, ShardedCacheBackend)
+        keys = [f"{position}.analysis" for position in range(20)]
+        for key in keys:
+            backend.put(key, key.encode())
+
+        assert all(backend.get(key) == key.encode() for key in keys)
+        for server in kv_servers:
+            stored = {path.rsplit("/", 1)[1] for path in server.values}
+            assert stored == {key for key in keys if backend.ring.node_for(key) == server.url}
+            assert stored
+
+
+class TestReplicas:
+    """Tests for analyses shared by server replicas."""
+
+    @pytest.mark.asyncio
+    async def test_analysis_is_shared(self, kv_servers: List[KeyValueServer]) -> None:
+        """Test that an analysis published by one replica is served to another without redoing it."""
+        urls = [server.url for server in kv_servers]
+        replica_a = AnalysisCache(
+            store=AnalysisStore(ShardedCacheBackend({url: HttpCacheBackend(url) for url in urls}))
+        )
+        replica_b = AnalysisCache(
+            store=AnalysisStore(ShardedCacheBackend({url: HttpCacheBackend(url) for url in urls}))
+        )
+
+        await replica_a.publish(CachedAnalysis("f" * 64, Path("x.dmp"), "cmd", SAMPLE_JSON))
+        entry = await replica_b.fetch("f" * 64)
+
+        assert entry is not None and entry.json_text == SAMPLE_JSON
+        assert replica_b.shared_hits == 1
+        assert sum(len(server.values) for server in kv_servers) == 1
+
+    @pytest.mark.asyncio
+    async def test_unreachable_store_is_a_miss(self) -> None:
+        """Test that replicas keep working when the key-value store is down."""
+        cache = AnalysisCache(store=AnalysisStore(HttpCacheBackend("http://127.0.0.1:9/cache", timeout=1.0)))
+        entry = CachedAnalysis("a", Path("x.dmp"), "cmd", SAMPLE_JSON)
+
+        await cache.publish(entry)
+        assert await cache.fetch("a") is entry
+        assert await cache.fetch("b") is None
+        assert cache.misses == 1
@@ -0,0 +1,210 @@
+"""Tests for the heuristic crash classifier."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+
+from minidumpmcp.analysis.classifier import classify, format_findings
+from minidumpmcp.analysis.model import StackwalkResult
+from minidumpmcp.analysis.signature import crash_model
+from minidumpmcp.prompts import CrashAnalysisProvider
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+
+def _result(
+    crash_type: str,
+    address: Optional[str],
+    functions: Sequence[Optional[str]],
+    registers: Optional[Dict[str, str]] = None,
+    frame_count: Optional[int] = None,
+    assertion: Optional[str] = None,
+) -> StackwalkResult:
+    frames: List[Dict[str, Any]] = [
+        {"module": "app", "function": function, "module_offset": f"0x{0x1000 + position:016x}", "trust": "cfi"}
+        for position, function in enumerate(functions)
+    ]
+    if registers is not None:
+        frames[0]["registers"] = registers
+    thread: Dict[str, Any] = {"frames": frames, "frame_count": frame_count or len(frames)}
+    return StackwalkResult.from_dict(
+        {
+            "crash_info": {"type": crash_type, "address": address, "crashing_thread": 0, "assertion": assertion},
+            "threads": [thread],
+            "crashing_thread": {"threads_index": 0, **thread},
+        }
+    )
+
+
+class TestClassify:
+    """Tests for the individual crash patterns."""
+
+    def test_sample_is_null_dereference(self) -> None:
+        """Test the sample crash: a write 0x45 bytes past NULL."""
+        findings = classify(StackwalkResult.from_json(SAMPLE_JSON))
+
+        assert [finding.kind for finding in findings] == ["null_dereference"]
+        assert findings[0].confidence == "high"
+        assert "Write to 0x00000045" in findings[0].summary
+        assert "held in eax" in findings[0].evidence
+
+    def test_crash_model_suffices(self) -> None:
+        """Test that the partially decoded model gives the same findings."""
+        assert classify(crash_model(SAMPLE_JSON)) == classify(StackwalkResult.from_json(SAMPLE_JSON))
+
+    def test_null_function_pointer(self) -> None:
+        """Test that executing at NULL is reported as a call through a NULL pointer."""
+        (finding,) = classify(_result("EXCEPTION_ACCESS_VIOLATION_EXEC", "0x0000000000000000", ["main"]))
+
+        assert finding.kind == "null_dereference"
+        assert "function pointer" in finding.summary
+
+    def test_non_access_fault_is_not_null_dereference(self) -> None:
+        """Test that a small address of another exception type is ignored."""
+        assert classify(_result("EXCEPTION_ILLEGAL_INSTRUCTION", "0x0000000000000010", ["main"])) == []
+
+    def test_stack_overflow_from_exception_type(self) -> None:
+        """Test the explicit stack overflow exception with recursion evidence."""
+        result = _result("EXCEPTION_STACK_OVERFLOW", "0x00000000001f2ff8", ["recurse(int)"] * 20 + ["main"])
+        (finding,) = classify(result)
+
+        assert finding.kind == "stack_overflow"
+        assert finding.confidence == "high"
+        assert "recursion through recurse" in finding.summary
+
+    def test_stack_overflow_from_guard_page(self) -> None:
+        """Test a segfault just below the stack pointer of a deeply recursive thread."""
+        result = _result(
+            "SIGSEGV /SEGV_MAPERR",
+            "0x00007ffd5a1fefe8",
+            ["walk"] * 64,
+            registers={"rsp": "0x00007ffd5a1ff000", "rip": "0x0000555555555123"},
+            frame_count=40000,
+        )
+        (finding,) = classify(result)
+
+        assert finding.kind == "stack_overflow"
+        assert finding.confidence == "high"
+        assert any("stack pointer" in line for line in finding.evidence)
+        assert "crashing thread has 40000 frames" in finding.evidence
+
+    def test_shallow_recursion_is_not_overflow(self) -> None:
+        """Test that recursion alone, without a deep stack or guard hit, is not reported."""
+        assert classify(_result("SIGSEGV /SEGV_MAPERR", "0x00007f0000001000", ["walk"] * 10)) == []
+
+    def test_panic_wins_over_abort(self) -> None:
+        """Test that a Rust panic ending in abort is reported as a panic with its origin."""
+        functions: List[Optional[str]] = [
+            "__GI_raise",
+            "__GI_abort",
+            "std::sys::unix::abort_internal",
+            "std::panicking::rust_panic_with_hook",
+            "core::panicking::panic_fmt::h0123456789abcdef",
+            "app::config::load",
+            "main",
+        ]
+        (finding,) = classify(_result("SIGABRT", "0x0000000000000000", functions))
+
+        assert finding.kind == "panic"
+        assert finding.summary.endswith("raised from app::config::load")
+
+    @pytest.mark.parametrize(
+        "crash_type,functions,kind",
+        [
+            ("SIGABRT", ["__GI_raise", "__GI_abort", "app::check"], "abort"),
+            ("SIGABRT", ["__GI_raise", "__GI_abort", "__assert_fail", "app::check"], "assertion_failure"),
+            ("SIGABRT", ["__GI_abort", "__stack_chk_fail", "app::parse"], "stack_buffer_overrun"),
+            (
+                "EXCEPTION_STACK_BUFFER_OVERRUN / FAST_FAIL_STACK_COOKIE_CHECK_FAILURE",
+                ["app!0x10"],
+                "stack_buffer_overrun",
+            ),
+            ("SIGABRT", [None, None], "abort"),
+        ],
+    )
+    def test_termination(self, crash_type: str, functions: List[Optional[str]], kind: str) -> None:
+        """Test abort, assertion and stack protector frames and exception types."""
+        (finding,) = classify(_result(crash_type, None, functions))
+
+        assert finding.kind == kind
+
+    def test_assertion_message(self) -> None:
+        """Test that an assertion recorded in crash_info is quoted."""
+        (finding,) = classify(_result("SIGABRT", None, ["main"], assertion="size > 0"))
+
+        assert finding.kind == "assertion_failure"
+        assert finding.summary == "Assertion failed: size > 0"
+
+    def test_use_after_free_in_fault_address(self) -> None:
+        """Test a field access through a pointer read from freed memory."""
+        result = _result(
+            "EXCEPTION_ACCESS_VIOLATION_READ",
+            "0x00000000feeefef6",
+            ["Widget::draw"],
+            registers={"rcx": "0x00000000feeefeee", "rip": "0x0000000140001000"},
+        )
+        (finding,) = classify(result)
+
+        assert finding.kind == "use_after_free"
+        assert finding.confidence == "high"
+        assert finding.evidence == (
+            "fault address = 0x00000000feeefef6 = 0x00000000feeefeee + 0x8",
+            "rcx = 0x00000000feeefeee",
+        )
+
+    def test_poison_in_registers_only(self) -> None:
+        """Test 64-bit fill patterns found only in registers."""
+        result = _result(
+            "EXCEPTION_ACCESS_VIOLATION_READ",
+            "0x0000123400000000",
+            ["Widget::draw"],
+            registers={"rax": "0xdddddddddddddddd", "rbx": "0xcdcdcdcdcdcdcdcd"},
+        )
+        findings = classify(result)
+
+        assert [(finding.kind, finding.confidence) for finding in findings] == [
+            ("use_after_free", "medium"),
+            ("uninitialized_memory", "medium"),
+        ]
+
+    def test_format_findings(self) -> None:
+        """Test the compact Markdown block, with and without findings."""
+        block = format_findings(classify(StackwalkResult.from_json(SAMPLE_JSON)))
+
+        assert block.startswith("## Findings\n")
+        assert "- **null_dereference** (high): Write to 0x00000045" in block
+        assert "  - Evidence: crash type EXCEPTION_ACCESS_VIOLATION_WRITE;" in block
+        assert "No known crash pattern matched" in format_findings([])
+
+
+class TestPromptFindings:
+    """Tests for the findings injected into the analysis prompts."""
+
+    @pytest.mark.asyncio
+    async def test_findings_precede_output(self) -> None:
+        """Test that both prompts carry the findings ahead of the stackwalk output."""
+        provider = CrashAnalysisProvider()
+        expertise = await provider.analyze_crash_with_expertise(SAMPLE_JSON)
+        technical = await provider.analyze_technical_details(SAMPLE_JSON)
+
+        for prompt in (expertise, technical):
+            assert "**null_dereference** (high)" in prompt
+            assert prompt.index("\n## Findings\n") < prompt.index("## Stackwalk Output")
+
+    @pytest.mark.asyncio
+    async def test_complete_tool_result(self) -> None:
+        """Test that a complete stackwalk_minidump result is unwrapped for classification."""
+        wrapped = json.dumps({"success": True, "data": json.loads(SAMPLE_JSON)})
+        prompt = await CrashAnalysisProvider().analyze_crash_with_expertise(wrapped)
+
+        assert "**null_dereference** (high)" in prompt
+
+    @pytest.mark.asyncio
+    async def test_unclassifiable_data(self) -> None:
+        """Test that data the classifier cannot read still produces a prompt."""
+        prompt = await CrashAnalysisProvider().analyze_crash_with_expertise(json.dumps({"modules": [{}]}))
+
+        assert "## Findings" not in prompt
+        assert "## Stackwalk Output" in prompt
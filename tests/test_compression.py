@@ -0,0 +1,109 @@
+"""Tests for compressed minidump detection and decompression."""
+
+import gzip
+import hashlib
+import io
+import lzma
+import struct
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from minidumpmcp.analysis.compression import decompress_file, detect_compression, file_compression
+from minidumpmcp.exceptions import FileValidationError
+
+TEST_DUMP = (Path(__file__).parent / "testdata" / "test.dmp").read_bytes()
+
+
+def zipped(**members: bytes) -> bytes:
+    """Build a zip archive holding *members*."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def patched_zip(flag_bits: int = 0, method: int = zipfile.ZIP_DEFLATED) -> bytes:
+    """Build a zip archive holding a minidump whose headers claim other flags and compression method."""
+    data = bytearray(zipped(**{"a.dmp": TEST_DUMP}))
+    # Offsets of the flags in the local file header and in the central directory entry
+    for offset in (6, data.rfind(b"PK\x01\x02") + 8):
+        struct.pack_into("<HH", data, offset, flag_bits, method)
+    return bytes(data)
+
+
+class TestDetection:
+    """Tests for magic-byte detection."""
+
+    def test_detect_compression(self) -> None:
+        """Test that formats are recognized by content, not name."""
+        assert detect_compression(gzip.compress(TEST_DUMP)) == "gzip"
+        assert detect_compression(lzma.compress(TEST_DUMP)) == "xz"
+        assert detect_compression(zipped(**{"crash.dmp": TEST_DUMP})) == "zip"
+        assert detect_compression(TEST_DUMP) is None
+        assert detect_compression(b"") is None
+
+    def test_file_compression(self, tmp_path: Path) -> None:
+        """Test detection of a misnamed compressed file."""
+        path = tmp_path / "crash.dmp"
+        path.write_bytes(gzip.compress(TEST_DUMP))
+
+        assert file_compression(path) == "gzip"
+
+
+class TestDecompression:
+    """Tests for streaming decompression."""
+
+    @pytest.mark.parametrize(
+        ("compression", "data"),
+        [
+            ("gzip", gzip.compress(TEST_DUMP)),
+            ("xz", lzma.compress(TEST_DUMP)),
+            ("zip", zipped(**{"crash.dmp": TEST_DUMP, "log.txt": b"log"})),
+            ("zip", zipped(**{"upload": TEST_DUMP})),
+        ],
+    )
+    def test_round_trip(self, tmp_path: Path, compression: str, data: bytes) -> None:
+        """Test that the decompressed dump and its hash match the original."""
+        source = tmp_path / "crash.compressed"
+        source.write_bytes(data)
+        target = tmp_path / "crash.dmp"
+
+        dump_hash, size = decompress_file(source, compression, target, chunk_size=4096)
+
+        assert target.read_bytes() == TEST_DUMP
+        assert (dump_hash, size) == (hashlib.sha256(TEST_DUMP).hexdigest(), len(TEST_DUMP))
+
+    @pytest.mark.parametrize(
+        ("compression", "data", "reason"),
+        [
+            ("gzip", gzip.compress(b"not a minidump"), "not a minidump"),
+            ("gzip", gzip.compress(TEST_DUMP)[:100], "Corrupt gzip data"),
+            ("xz", b"\xfd7zXZ\x00garbage", "Corrupt xz data"),
+            ("zip", zipped(**{"a.dmp": TEST_DUMP, "b.dmp": TEST_DUMP}), "exactly one minidump"),
+            ("zip", patched_zip(flag_bits=0x1), "Unsupported zip data: .*encrypted"),
+            ("zip", patched_zip(method=9), "Unsupported zip data: .*compression method"),
+        ],
+    )
+    def test_invalid_input(self, tmp_path: Path, compression: str, data: bytes, reason: str) -> None:
+        """Test that corrupt archives and non-minidump contents are rejected."""
+        source = tmp_path / "crash.compressed"
+        source.write_bytes(data)
+
+        with pytest.raises(FileValidationError, match=reason):
+            decompress_file(source, compression, tmp_path / "crash.dmp")
+
+    def test_size_limit(self, tmp_path: Path) -> None:
+        """Test that decompression stops once the dump grows past the limit."""
+        source = tmp_path / "bomb.dmp.xz"
+        source.write_bytes(lzma.compress(TEST_DUMP + bytes(64 * 1024 * 1024)))  # Decompresses 300x
+        target = tmp_path / "crash.dmp"
+
+        with pytest.raises(FileValidationError, match="exceeds 1048576 bytes"):
+            decompress_file(source, "xz", target, chunk_size=4096, max_bytes=1024 * 1024)
+        assert target.stat().st_size <= 1024 * 1024
+
+        size = len(TEST_DUMP) + 64 * 1024 * 1024
+        assert decompress_file(source, "xz", target, max_bytes=size)[1] == size
@@ -0,0 +1,230 @@
+"""Tests for Crashpad database ingestion."""
+
+import os
+import shutil
+import struct
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from minidumpmcp.analysis.crashpad import CrashpadIndex, read_report_metadata
+from minidumpmcp.analysis.minidump import read_minidump_info
+from minidumpmcp.tools.crashpad import CrashpadProvider
+from minidumpmcp.tools.triage import TriageProvider
+
+TEST_DUMP = Path(__file__).parent / "testdata" / "test.dmp"
+REPORT_ID = uuid.UUID("0b8f1c3e-6a2d-4e0f-9a1b-2c3d4e5f6a7b")
+CLIENT_ID = uuid.UUID("11111111-2222-3333-4444-555555555555")
+
+
+def build_crashpad_dump(annotations: Dict[str, str]) -> bytes:
+    """Build a minidump holding only a Crashpad info stream with annotations."""
+    blob = bytearray(96)
+
+    def append(data: bytes) -> int:
+        rva = len(blob)
+        blob.extend(data)
+        return rva
+
+    def utf8(text: str) -> int:
+        encoded = text.encode()
+        return append(struct.pack("<I", len(encoded)) + encoded + b"\0")
+
+    entries = [(utf8(key), utf8(value)) for key, value in annotations.items()]
+    simple_rva = append(struct.pack("<I", len(entries)) + b"".join(struct.pack("<II", *entry) for entry in entries))
+    list_rva = append(struct.pack("<3I", 2, utf8("first"), utf8("second")))
+    objects_rva = append(struct.pack("<I", 1) + struct.pack("<IHHI", utf8("channel"), 1, 0, utf8("beta")))
+    module_rva = append(struct.pack("<7I", 1, 12, list_rva, 0, 0, 16, objects_rva))
+    links_rva = append(struct.pack("<4I", 1, 0, 28, module_rva))
+
+    struct.pack_into("<4sIIIIIQ", blob, 0, b"MDMP", 0xA793, 1, 32, 0, 0, 0)
+    struct.pack_into("<III", blob, 32, 0x43500001, 52, 44)
+    struct.pack_into(
+        "<I16s16sIIII",
+        blob,
+        44,
+        1,
+        REPORT_ID.bytes_le,
+        CLIENT_ID.bytes_le,
+        4 + 8 * len(entries),
+        simple_rva,
+        16,
+        links_rva,
+    )
+    return bytes(blob)
+
+
+def add_report(database: Path, state: str, report_id: str, meta: bool = True) -> Path:
+    """Add a report (a copy of the test dump) to a Crashpad database."""
+    (database / state).mkdir(parents=True, exist_ok=True)
+    path = database / state / f"{report_id}.dmp"
+    shutil.copy(TEST_DUMP, path)
+    if meta:
+        path.with_suffix(".meta").write_bytes(struct.pack("<iiqqB7x", 1, 2, 1700000000, 1690000000, 1) + b"remote-1")
+    return path
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Path:
+    """Crashpad database with two pending reports and one completed report."""
+    root = tmp_path / "Crashpad"
+    (root / "new").mkdir(parents=True)
+    (root / "new" / "in-progress.dmp").write_bytes(b"MDMP")
+    add_report(root, "pending", "report-a")
+    add_report(root, "pending", "report-b", meta=False)
+    add_report(root, "completed", "report-c")
+    return root
+
+
+class TestCrashpadInfo:
+    """Tests for decoding the Crashpad info stream."""
+
+    def test_annotations(self, tmp_path: Path) -> None:
+        """Test report ids, simple annotations and module annotations."""
+        path = tmp_path / "crashpad.dmp"
+        path.write_bytes(build_crashpad_dump({"prod": "MyApp", "ver": "1.2.3"}))
+
+        info = read_minidump_info(path)["crashpad_info"]
+
+        assert info["report_id"] == str(REPORT_ID)
+        assert info["client_id"] == str(CLIENT_ID)
+        assert info["simple_annotations"] == {"prod": "MyApp", "ver": "1.2.3"}
+        assert info["module_annotations"] == [
+            {
+                "module": None,
+                "list_annotations": ["first", "second"],
+                "simple_annotations": {},
+                "annotation_objects": {"channel": "beta"},
+            }
+        ]
+
+    def test_absent_without_stream(self) -> None:
+        """Test that dumps without the stream have no crashpad_info."""
+        assert "crashpad_info" not in read_minidump_info(TEST_DUMP)
+
+
+class TestReportMetadata:
+    """Tests for .meta files."""
+
+    def test_read(self, database: Path) -> None:
+        """Test upload state and remote id."""
+        metadata = read_report_metadata(database / "pending" / "report-a.dmp")
+
+        assert metadata is not None
+        assert metadata["uploaded"] is True
+        assert metadata["upload_attempts"] == 2
+        assert metadata["remote_id"] == "remote-1"
+        assert metadata["created"].startswith("2023-07-22")
+
+    def test_missing_or_invalid(self, database: Path) -> None:
+        """Test reports without usable metadata."""
+        assert read_report_metadata(database / "pending" / "report-b.dmp") is None
+        (database / "pending" / "report-b.meta").write_bytes(b"short")
+        assert read_report_metadata(database / "pending" / "report-b.dmp") is None
+
+
+class TestCrashpadIndex:
+    """Tests for incremental scanning."""
+
+    def test_only_new_reports_are_discovered(self, database: Path) -> None:
+        """Test that rescans only add new reports and skip in-progress ones."""
+        index = CrashpadIndex(":memory:")
+
+        assert index.scan(database) == 3
+        assert index.scan(database) == 0
+        add_report(database, "pending", "report-d")
+        assert index.scan(database) == 1
+        assert sorted(report.uuid for report in index.unprocessed(database)) == [
+            "report-a",
+            "report-b",
+            "report-c",
+            "report-d",
+        ]
+        assert len(index.unprocessed(database, limit=2)) == 2
+
+    def test_processed_reports_stay_processed_when_moved(self, database: Path) -> None:
+        """Test that uploading (moving to completed/) does not re-queue a report."""
+        index = CrashpadIndex(":memory:")
+        index.scan(database)
+        index.mark_processed(database, "report-a", "hash")
+        (database / "pending" / "report-a.dmp").rename(database / "completed" / "report-a.dmp")
+
+        assert index.scan(database) == 0
+        assert "report-a" not in {report.uuid for report in index.unprocessed(database)}
+        assert index.pending_count(database) == 2
+
+    def test_unchanged_directories_are_not_listed(self, database: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that directories with an old, unchanged mtime are skipped entirely."""
+        for state in ("pending", "completed"):
+            os.utime(database / state, ns=(1_000_000_000, 1_000_000_000))
+        index = CrashpadIndex(":memory:")
+        index.scan(database)
+
+        def fail(path: object) -> None:
+            raise AssertionError("directory listed")
+
+        monkeypatch.setattr("minidumpmcp.analysis.crashpad.os.scandir", fail)
+        assert index.scan(database) == 0
+
+    def test_reset(self, database: Path) -> None:
+        """Test that a reset makes every report new again."""
+        index = CrashpadIndex(":memory:")
+        index.scan(database)
+
+        index.reset(database)
+
+        assert index.scan(database) == 3
+
+
+class TestIngestCrashpadDatabase:
+    """Tests for the ingest_crashpad_database tool."""
+
+    @pytest.mark.asyncio
+    async def test_incremental_ingestion(self, database: Path) -> None:
+        """Test paging through new reports and ingesting nothing twice."""
+        provider = CrashpadProvider(CrashpadIndex(":memory:"))
+
+        first = await provider.ingest_crashpad_database(str(database), max_reports=2)
+        second = await provider.ingest_crashpad_database(str(database))
+        third = await provider.ingest_crashpad_database(str(database))
+
+        assert (first["discovered"], first["ingested"], first["remaining"]) == (3, 2, 1)
+        assert (second["discovered"], second["ingested"], second["remaining"]) == (0, 1, 0)
+        assert third["ingested"] == 0
+        reports = {report["report_id"]: report for report in first["reports"] + second["reports"]}
+        assert reports.keys() == {"report-a", "report-b", "report-c"}
+        assert reports["report-a"]["metadata"]["remote_id"] == "remote-1"
+        assert reports["report-b"]["metadata"] is None
+        assert reports["report-c"]["state"] == "completed"
+        assert reports["report-c"]["crash_info"]["type"] == "EXCEPTION_ACCESS_VIOLATION_WRITE"
+
+    @pytest.mark.asyncio
+    async def test_reports_left_by_the_deadline_are_ingested_next(self, database: Path) -> None:
+        """Test that reports the deadline left no time for stay unprocessed."""
+
+        class OutOfTimeTriage(TriageProvider):
+            async def triage(self, paths: List[Path], *args: Any, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+                async for record in super().triage(paths[:1], *args, **kwargs):
+                    yield record
+
+        index = CrashpadIndex(":memory:")
+
+        first = await CrashpadProvider(index, OutOfTimeTriage()).ingest_crashpad_database(str(database))
+        second = await CrashpadProvider(index).ingest_crashpad_database(str(database))
+
+        assert (first["ingested"], first["remaining"], first["stopped_early"]) == (1, 2, True)
+        assert "call again" in first["suggestion"]
+        assert (second["ingested"], second["remaining"]) == (2, 0)
+        assert "stopped_early" not in second
+
+    @pytest.mark.asyncio
+    async def test_rejects_other_directories(self, tmp_path: Path) -> None:
+        """Test that plain directories are not mistaken for Crashpad databases."""
+        provider = CrashpadProvider(CrashpadIndex(":memory:"))
+
+        result = await provider.ingest_crashpad_database(str(tmp_path))
+
+        assert result["error_code"] == "CRASHPAD_DATABASE_FAILED"
+        assert (await provider.ingest_crashpad_database(str(tmp_path / "missing")))["success"] is False
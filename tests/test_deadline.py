@@ -0,0 +1,103 @@
+"""Tests for request deadlines and runtime estimates."""
+
+import asyncio
+from typing import Any, Optional
+
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.server.middleware import MiddlewareContext
+from mcp.types import CallToolRequestParams
+
+from minidumpmcp.deadline import MIB, DeadlineMiddleware, RuntimeModel, budget, deadline, remaining
+
+
+class TestDeadline:
+    """Tests for the deadline of the current request."""
+
+    def test_nesting(self) -> None:
+        """Test that inner deadlines can only shorten the enclosing one."""
+        assert remaining() is None
+        assert budget(30.0) == 30.0
+        with deadline(10.0):
+            assert budget(30.0) <= 10.0
+            with deadline(60.0):
+                assert (remaining() or 0) <= 10.0
+            with deadline(1.0):
+                assert budget(30.0) <= 1.0
+            assert 9.0 < (remaining() or 0) <= 10.0
+        assert remaining() is None
+
+    def test_budget_is_never_negative(self) -> None:
+        """Test that a passed deadline leaves a budget of zero rather than a negative one."""
+        with deadline(-1.0):
+            assert budget(30.0) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_middleware(self) -> None:
+        """Test that tool calls run under the transport's deadline."""
+        mcp: FastMCP[None] = FastMCP("test")
+        mcp.add_middleware(DeadlineMiddleware(5.0))
+
+        @mcp.tool
+        async def left() -> Optional[float]:
+            return remaining()
+
+        async with Client(mcp) as client:
+            result = await client.call_tool("left", {})
+
+        assert 4.0 < result.data <= 5.0
+
+    @pytest.mark.asyncio
+    async def test_middleware_caller_timeout(self) -> None:
+        """Test that a timeout in the request's _meta shortens the deadline, but cannot extend it."""
+        middleware = DeadlineMiddleware(5.0)
+
+        async def call_next(context: Any) -> Optional[float]:
+            await asyncio.sleep(0)
+            return remaining()
+
+        async def call(meta: dict[str, Any]) -> float:
+            message = CallToolRequestParams.model_validate({"name": "left", "arguments": {}, "_meta": meta})
+            left = await middleware.on_call_tool(MiddlewareContext(message=message), call_next)
+            assert isinstance(left, float)
+            return left
+
+        assert await call({"timeout": 1}) <= 1.0
+        assert 4.0 < await call({"timeout": 60}) <= 5.0
+        assert 4.0 < await call({"timeout": "soon"}) <= 5.0
+
+
+class TestRuntimeModel:
+    """Tests for stackwalk runtime estimates."""
+
+    def test_prior(self) -> None:
+        """Test estimates before any run is observed."""
+        model = RuntimeModel(base=1.0, per_mib=0.5, per_module=0.1, margin=0.0)
+        assert model.estimate(0) == 1.0
+        assert model.estimate(4 * MIB, 10) == 4.0
+        assert RuntimeModel(base=1.0, per_mib=0.0, per_module=0.0, margin=0.5).estimate(MIB) == 1.5
+
+    def test_learns_from_runs(self) -> None:
+        """Test that observed runtimes replace the prior."""
+        model = RuntimeModel(margin=0.0)
+        for mib, modules in [(1, 10), (100, 20), (500, 40), (50, 200), (1000, 100)]:
+            model.observe(mib * MIB, modules, 2.0 + 0.1 * mib + 0.05 * modules)
+
+        assert model.coefficients == pytest.approx((2.0, 0.1, 0.05))
+        assert model.estimate(2000 * MIB, 0) == pytest.approx(202.0)
+
+    def test_alike_runs_scale_prior(self) -> None:
+        """Test that runs of alike dumps scale the prior to their runtime."""
+        model = RuntimeModel(base=1.0, per_mib=0.0, per_module=0.0, margin=0.0)
+        for _ in range(3):
+            model.observe(MIB, 10, 3.0)
+
+        assert model.estimate(MIB, 10) == pytest.approx(3.0)
+
+    def test_window(self) -> None:
+        """Test that only recent runs count."""
+        model = RuntimeModel(base=1.0, per_mib=0.0, per_module=0.0, window=3, margin=0.0)
+        for seconds in (100.0, 100.0, 100.0, 2.0, 2.0, 2.0):
+            model.observe(MIB, 10, seconds)
+
+        assert model.estimate(MIB, 10) == pytest.approx(2.0)
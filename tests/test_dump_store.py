@@ -0,0 +1,409 @@
+"""Tests for the dump store and the upload endpoint."""
+
+import gzip
+import hashlib
+import lzma
+import tracemalloc
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from minidumpmcp.analysis.cache import AnalysisCache, CachedAnalysis
+from minidumpmcp.analysis.compression import decompress_file
+from minidumpmcp.exceptions import FileValidationError, UploadRejectedError
+from minidumpmcp.routes import UploadRoute
+from minidumpmcp.storage import DumpIndex, DumpStore, RetentionPolicy
+from minidumpmcp.storage.dump_store import parse_handle
+from minidumpmcp.tools.stackwalk import StackwalkProvider
+
+TEST_DUMP = (Path(__file__).parent / "testdata" / "test.dmp").read_bytes()
+TEST_HASH = hashlib.sha256(TEST_DUMP).hexdigest()
+
+
+async def chunked(data: bytes, size: int = 1000) -> AsyncIterator[bytes]:
+    """Yield *data* in chunks."""
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class TestDumpStore:
+    """Tests for streaming writes into the store."""
+
+    @pytest.mark.asyncio
+    async def test_write_and_deduplicate(self, tmp_path: Path) -> None:
+        """Test that a dump is stored once under its hash."""
+        store = DumpStore(tmp_path)
+
+        first = await store.write_stream(chunked(TEST_DUMP))
+        second = await store.write_stream(chunked(TEST_DUMP, 3))
+
+        assert first.dump_hash == TEST_HASH
+        assert (first.deduplicated, second.deduplicated) == (False, True)
+        assert first.path == second.path == tmp_path / TEST_HASH[:2] / f"{TEST_HASH}.dmp"
+        assert first.path.read_bytes() == TEST_DUMP
+        assert store.resolve(first.handle) == first.path
+        assert list((tmp_path / "incoming").iterdir()) == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("data", "kwargs", "status"),
+        [
+            (b"\x7fELF" + TEST_DUMP, {}, 415),
+            (b"\x1f", {}, 415),
+            (b"MD", {}, 415),
+            (TEST_DUMP, {"max_bytes": 1000}, 413),
+            (TEST_DUMP, {"expected_hash": "0" * 64}, 400),
+        ],
+    )
+    async def test_rejections_store_nothing(self, tmp_path: Path, data: bytes, kwargs: dict, status: int) -> None:
+        """Test that rejected uploads leave no files behind."""
+        store = DumpStore(tmp_path)
+
+        with pytest.raises(UploadRejectedError) as error:
+            await store.write_stream(chunked(data), **kwargs)
+
+        assert error.value.status_code == status
+        assert list(tmp_path.rglob("*.dmp")) == []
+        assert list((tmp_path / "incoming").iterdir()) == []
+        assert store.stats()["dumps"] == 0
+
+    @pytest.mark.asyncio
+    async def test_memory_does_not_grow_with_size(self, tmp_path: Path) -> None:
+        """Test that a large upload is written without holding it in memory."""
+        chunk = b"\0" * 65536
+
+        async def large() -> AsyncIterator[bytes]:
+            yield b"MDMP" + chunk[4:]
+            for _ in range(255):
+                yield chunk
+
+        tracemalloc.start()
+        try:
+            stored = await DumpStore(tmp_path).write_stream(large())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert stored.size == 256 * 65536
+        assert peak < 4 * 1024 * 1024
+
+    @pytest.mark.asyncio
+    async def test_compressed_upload_is_decompressed_once(self, tmp_path: Path) -> None:
+        """Test that compressed uploads are kept as received and decompressed into the store on use."""
+        store = DumpStore(tmp_path)
+        upload = await store.write_stream(chunked(gzip.compress(TEST_DUMP)))
+
+        first = store.add_compressed(upload.path, "gzip")
+        second = store.add_compressed(upload.path, "gzip")
+
+        assert first.dump_hash == second.dump_hash == TEST_HASH
+        assert (first.deduplicated, second.deduplicated) == (False, True)
+        assert first.path.read_bytes() == TEST_DUMP
+        assert store.index.alias_of(upload.dump_hash) == TEST_HASH
+
+    @pytest.mark.asyncio
+    async def test_compressed_dump_size_limit(self, tmp_path: Path) -> None:
+        """Test that a compressed dump decompressing past the store's limit is rejected and not kept."""
+        store = DumpStore(tmp_path, max_dump_bytes=len(TEST_DUMP) - 1)
+        upload = await store.write_stream(chunked(gzip.compress(TEST_DUMP)))
+
+        with pytest.raises(FileValidationError, match="exceeds"):
+            store.add_compressed(upload.path, "gzip")
+        assert store.get(TEST_HASH) is None
+        assert list((tmp_path / "incoming").iterdir()) == []
+
+    def test_parse_handle(self) -> None:
+        """Test handle validation."""
+        assert parse_handle(f"sha256:{TEST_HASH.upper()}") == TEST_HASH
+        assert parse_handle("sha256:1234") is None
+        assert parse_handle("/tmp/test.dmp") is None
+
+
+class TestDumpIndex:
+    """Tests for the metadata index and its retention queries."""
+
+    def test_reference_counts_and_sources(self) -> None:
+        """Test that repeated submissions count references and remember their sources."""
+        index = DumpIndex(":memory:")
+
+        assert index.add("a" * 64, 10, "host-1", seen_at=1.0) == 1
+        assert index.add("a" * 64, 10, "host-2", seen_at=2.0) == 2
+        assert index.set_signature("a" * 64, "crash | main") is True
+        assert index.set_signature("b" * 64, "crash | main") is False
+
+        entry = index.get("a" * 64)
+        assert entry is not None
+        assert (entry["ref_count"], entry["stored_at"], entry["last_seen"]) == (2, 1.0, 2.0)
+        assert entry["sources"] == ["host-2", "host-1"]
+        assert index.stats() == {"dumps": 1, "bytes": 10, "submissions": 2}
+
+    def test_retention_queries(self) -> None:
+        """Test age, size and per-signature selections, oldest first."""
+        index = DumpIndex(":memory:")
+        for i, name in enumerate("abcd"):
+            index.add(name * 64, 100, seen_at=float(i))
+            index.set_signature(name * 64, "one" if name in "abc" else "two")
+
+        assert index.expired(2.0) == ["a" * 64, "b" * 64]
+        assert index.expired(2.0, exclude=["a" * 64]) == ["b" * 64]
+        assert index.over_budget(250) == ["a" * 64, "b" * 64]
+        assert index.over_budget(400) == []
+        assert index.signatures_over_quota(2) == ["one"]
+        assert index.over_quota("one", 2) == ["a" * 64]
+
+        index.remove(["a" * 64, "b" * 64])
+        assert index.stats()["dumps"] == 2
+
+
+class TestRetention:
+    """Tests for local dumps and retention policies of the store."""
+
+    def test_add_file_hardlinks_and_deduplicates(self, tmp_path: Path) -> None:
+        """Test that local dumps are linked into the store once."""
+        dump = tmp_path / "crash.dmp"
+        dump.write_bytes(TEST_DUMP)
+        store = DumpStore(tmp_path / "store")
+
+        first = store.add_file(dump)
+        second = store.add_file(dump, source="again")
+
+        assert (first.deduplicated, second.deduplicated) == (False, True)
+        assert first.path.samefile(dump)
+        entry = store.index.get(TEST_HASH)
+        assert entry is not None
+        assert entry["ref_count"] == 2
+        assert entry["sources"] == ["again", str(dump.absolute())]
+
+    @pytest.mark.asyncio
+    async def test_size_budget_removes_least_recently_seen(self, tmp_path: Path) -> None:
+        """Test that a new dump evicts older dumps beyond the size budget, never itself."""
+        store = DumpStore(tmp_path, RetentionPolicy(max_bytes=len(TEST_DUMP) + 10))
+        older = await store.write_stream(chunked(TEST_DUMP))
+        newer = await store.write_stream(chunked(TEST_DUMP + b"\0"))
+
+        assert not older.path.exists()
+        assert newer.path.exists()
+        assert store.index.get(older.dump_hash) is None
+        assert store.stats()["dumps"] == 1
+
+    @pytest.mark.asyncio
+    async def test_keep_per_signature(self, tmp_path: Path) -> None:
+        """Test that only the most recent dumps of a signature are kept."""
+        store = DumpStore(tmp_path, RetentionPolicy(keep_per_signature=1))
+        first = await store.write_stream(chunked(TEST_DUMP))
+        second = await store.write_stream(chunked(TEST_DUMP + b"\0"))
+
+        assert store.record_signature(first.dump_hash, "crash | main") == []
+        assert store.record_signature(second.dump_hash, "crash | main") == [first.dump_hash]
+        assert store.get(first.dump_hash) is None
+        assert store.get(second.dump_hash) == second.path
+
+    @pytest.mark.asyncio
+    async def test_max_age(self, tmp_path: Path) -> None:
+        """Test that dumps not seen within the maximum age are removed."""
+        store = DumpStore(tmp_path, RetentionPolicy(max_age_days=1))
+        stale = await store.write_stream(chunked(TEST_DUMP))
+        store.index.remove([stale.dump_hash])
+        store.index.add(stale.dump_hash, stale.size, seen_at=0.0)
+
+        assert store.enforce_retention() == [stale.dump_hash]
+        assert not stale.path.exists()
+
+
+class TestUploadRoute:
+    """Tests for the HTTP upload endpoint."""
+
+    @pytest.fixture
+    def client(self, tmp_path: Path) -> httpx.AsyncClient:
+        """Client of an app serving only the upload route."""
+        route = UploadRoute(DumpStore(tmp_path), max_bytes=1024 * 1024)
+        app = Starlette(routes=[Route("/dumps", route.upload, methods=["POST"])])
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    @pytest.mark.asyncio
+    async def test_upload_and_dedupe(self, client: httpx.AsyncClient) -> None:
+        """Test a fresh upload and a repeated one."""
+        first = await client.post("/dumps", content=TEST_DUMP)
+        second = await client.post("/dumps", content=TEST_DUMP)
+
+        assert first.status_code == 201
+        assert first.json()["handle"] == f"sha256:{TEST_HASH}"
+        assert second.status_code == 200
+        assert second.json()["deduplicated"] is True
+
+    @pytest.mark.asyncio
+    async def test_sources_are_recorded(self, tmp_path: Path) -> None:
+        """Test that uploads and announced duplicates count as submissions with their source."""
+        store = DumpStore(tmp_path)
+        app = Starlette(routes=[Route("/dumps", UploadRoute(store).upload, methods=["POST"])])
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.post("/dumps?source=build-1", content=TEST_DUMP)
+            await client.post("/dumps?source=build-2", content=b"", headers={"X-Content-SHA256": TEST_HASH})
+
+        entry = store.index.get(TEST_HASH)
+        assert entry is not None
+        assert entry["ref_count"] == 2
+        assert sorted(entry["sources"]) == ["build-1", "build-2"]
+
+    @pytest.mark.asyncio
+    async def test_chunked_body(self, client: httpx.AsyncClient) -> None:
+        """Test uploads with chunked transfer encoding."""
+        response = await client.post("/dumps", content=chunked(TEST_DUMP))
+
+        assert response.status_code == 201
+        assert response.json()["size"] == len(TEST_DUMP)
+
+    @pytest.mark.asyncio
+    async def test_announced_hash_short_circuits(self, client: httpx.AsyncClient) -> None:
+        """Test that a known announced hash is answered without reading the body."""
+        await client.post("/dumps", content=TEST_DUMP)
+
+        response = await client.post("/dumps", content=b"", headers={"X-Content-SHA256": TEST_HASH})
+
+        assert response.status_code == 200
+        assert response.json()["size"] == len(TEST_DUMP)
+
+    @pytest.mark.asyncio
+    async def test_rejections(self, client: httpx.AsyncClient) -> None:
+        """Test error responses."""
+        assert (await client.post("/dumps", content=b"not a dump")).status_code == 415
+        assert (await client.post("/dumps", content=b"MDMP" + b"\0" * 2 * 1024 * 1024)).status_code == 413
+        bad_header = await client.post("/dumps", content=TEST_DUMP, headers={"X-Content-SHA256": "abc"})
+        assert bad_header.status_code == 400
+        assert bad_header.json()["error_code"] == "UPLOAD_REJECTED"
+
+
+class TestStackwalkHandles:
+    """Tests for analyzing stored dumps by handle."""
+
+    @pytest.mark.asyncio
+    async def test_handle_resolves_to_stored_dump(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that stackwalk_minidump analyzes the stored file and reuses its hash."""
+        store = DumpStore(tmp_path / "store")
+        stored = await store.write_stream(chunked(TEST_DUMP))
+        fake_binary = tmp_path / "minidump-stackwalk"
+        fake_binary.write_text("")
+        analyzed: List[str] = []
+        testdata = Path(__file__).parent / "testdata" / "stackwalk"
+
+        async def fake_run_subprocess(cmd: list, **kwargs: object) -> str:
+            analyzed.append(str(cmd[-1]))
+            Path(cmd[cmd.index("--cyborg") + 1]).write_text((testdata / "test_app.json").read_text())
+            return ""
+
+        async def no_hashing(path: Path) -> str:
+            raise AssertionError("stored dumps are not rehashed")
+
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk._get_bin_path", lambda name: fake_binary)
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.run_subprocess", fake_run_subprocess)
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.hash_minidump", no_hashing)
+        provider = StackwalkProvider(store=store)
+
+        result = await provider.stackwalk_minidump(stored.handle, fields=["crash_info"])
+        missing = await provider.stackwalk_minidump(f"sha256:{'0' * 64}")
+
+        assert result["success"] is True
+        assert analyzed == [str(stored.path.absolute())]
+        assert missing["error_code"] == "FILE_VALIDATION_FAILED"
+        assert "Unknown dump handle" in missing["error"]
+
+    @pytest.mark.asyncio
+    async def test_local_dumps_are_stored(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that local dumps are added to the store and analyzed from there."""
+        store = DumpStore(tmp_path / "store")
+        dump = tmp_path / "crash.dmp"
+        dump.write_bytes(TEST_DUMP)
+        fake_binary = tmp_path / "minidump-stackwalk"
+        fake_binary.write_text("")
+        analyzed: List[str] = []
+        testdata = Path(__file__).parent / "testdata" / "stackwalk"
+
+        async def fake_run_subprocess(cmd: list, **kwargs: object) -> str:
+            analyzed.append(str(cmd[-1]))
+            Path(cmd[cmd.index("--cyborg") + 1]).write_text((testdata / "test_app.json").read_text())
+            return ""
+
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk._get_bin_path", lambda name: fake_binary)
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.run_subprocess", fake_run_subprocess)
+        provider = StackwalkProvider(store=store, store_local_dumps=True)
+
+        result = await provider.stackwalk_minidump(str(dump), fields=["crash_info"])
+
+        assert result["success"] is True
+        assert analyzed == [str(store.path_for(TEST_HASH).absolute())]
+        entry = store.index.get(TEST_HASH)
+        assert entry is not None
+        assert entry["signature"] == result["signature"]
+
+    @pytest.mark.asyncio
+    async def test_compressed_dumps_without_store(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that compressed dumps are decompressed for analysis and later served from the cache."""
+        dump = tmp_path / "crash.dmp.xz"
+        dump.write_bytes(lzma.compress(TEST_DUMP))
+        fake_binary = tmp_path / "minidump-stackwalk"
+        fake_binary.write_text("")
+        analyzed: List[bytes] = []
+        testdata = Path(__file__).parent / "testdata" / "stackwalk"
+
+        async def fake_run_subprocess(cmd: list, **kwargs: object) -> str:
+            analyzed.append(Path(cmd[-1]).read_bytes())
+            Path(cmd[cmd.index("--cyborg") + 1]).write_text((testdata / "test_app.json").read_text())
+            return ""
+
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk._get_bin_path", lambda name: fake_binary)
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.run_subprocess", fake_run_subprocess)
+        decompressions: List[Path] = []
+
+        def counting_decompress(path: Path, *args: Any, **kwargs: Any) -> Tuple[str, int]:
+            decompressions.append(path)
+            return decompress_file(path, *args, **kwargs)
+
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.decompress_file", counting_decompress)
+        provider = StackwalkProvider()
+
+        first = await provider.stackwalk_minidump(str(dump), fields=["crash_info"])
+        second = await provider.stackwalk_minidump(str(dump), fields=["crash_info"])
+
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert analyzed == [TEST_DUMP]
+        assert decompressions == [dump]
+
+    @pytest.mark.asyncio
+    async def test_evicted_compressed_analysis(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a compressed dump is never walked as is, even when its analysis is evicted mid-call."""
+        dump = tmp_path / "crash.dmp.gz"
+        dump.write_bytes(gzip.compress(TEST_DUMP))
+        fake_binary = tmp_path / "minidump-stackwalk"
+        fake_binary.write_text("")
+        analyzed: List[bytes] = []
+        testdata = Path(__file__).parent / "testdata" / "stackwalk"
+
+        async def fake_run_subprocess(cmd: list, **kwargs: object) -> str:
+            analyzed.append(Path(cmd[-1]).read_bytes())
+            Path(cmd[cmd.index("--cyborg") + 1]).write_text((testdata / "test_app.json").read_text())
+            return ""
+
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk._get_bin_path", lambda name: fake_binary)
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.run_subprocess", fake_run_subprocess)
+        cache = AnalysisCache()
+        provider = StackwalkProvider(cache)
+        first = await provider.stackwalk_minidump(str(dump), fields=["crash_info"])
+
+        # The analysis is found once more, then evicted right after that lookup
+        fetch = cache.fetch
+        lookups: List[str] = []
+
+        async def evicting_fetch(analysis_hash: str) -> Optional[CachedAnalysis]:
+            lookups.append(analysis_hash)
+            return await fetch(analysis_hash) if len(lookups) == 1 else None
+
+        monkeypatch.setattr(cache, "fetch", evicting_fetch)
+        second = await provider.stackwalk_minidump(str(dump), fields=["crash_info"])
+        third = await provider.stackwalk_minidump(str(dump), fields=["crash_info"])
+
+        assert (first["cached"], second["cached"], third["cached"]) == (False, True, False)
+        assert analyzed == [TEST_DUMP, TEST_DUMP]
@@ -5,13 +5,20 @@ from pathlib import Path
 from minidumpmcp.exceptions import (
     ConfigurationError,
     ConnectionError,
+    CrashpadDatabaseError,
+    DeadlineExceededError,
     FileValidationError,
+    InvalidParameterError,
+    JobNotFoundError,
+    MemoryNotCapturedError,
     MinidumpAnalysisError,
     MinidumpMCPError,
     PathTraversalError,
+    SignatureIndexError,
     SymbolExtractionError,
     ToolExecutionError,
     ToolNotFoundError,
+    UploadRejectedError,
 )
 
 
@@ -170,3 +177,58 @@ class TestNetworkErrors:
         )
         assert "not responding" in str(error)
         assert "increase timeout" in str(error)
+
+
+class TestParameterErrors:
+    """Test request parameter errors."""
+
+    def test_invalid_parameter_error(self) -> None:
+        """Test InvalidParameterError."""
+        error = InvalidParameterError("fields", ["threads["], "Invalid projection: bad segment")
+        assert "Invalid value for parameter 'fields'" in str(error)
+        assert "threads[*].frames[:10]" in str(error)
+        assert error.error_code == "INVALID_PARAMETER"
+
+    def test_memory_not_captured_error(self) -> None:
+        """Test MemoryNotCapturedError."""
+        error = MemoryNotCapturedError(Path("/tmp/crash.dmp"), "0x00000045")
+        assert "Memory at 0x00000045 is not captured in 'crash.dmp'" in str(error)
+        assert "listed regions" in str(error)
+        assert error.error_code == "MEMORY_NOT_CAPTURED"
+
+    def test_job_not_found_error(self) -> None:
+        """Test JobNotFoundError."""
+        error = JobNotFoundError("0123abcd")
+        assert "No analysis job found for '0123abcd'" in str(error)
+        assert "Submit the analysis again" in str(error)
+        assert error.error_code == "JOB_NOT_FOUND"
+
+    def test_deadline_exceeded_error(self) -> None:
+        """Test DeadlineExceededError."""
+        error = DeadlineExceededError(Path("/tmp/crash.dmp"), 42.04, -0.5)
+        assert "estimated to take 42.0s, but only 0.0s are left" in str(error)
+        assert "submit_analysis" in str(error)
+        assert error.error_code == "DEADLINE_EXCEEDED"
+
+    def test_signature_index_error(self) -> None:
+        """Test SignatureIndexError."""
+        error = SignatureIndexError("/tmp/signatures.sqlite3", "database is locked")
+        assert "Signature index '/tmp/signatures.sqlite3'" in str(error)
+        assert "Retry the request" in str(error)
+        assert error.error_code == "SIGNATURE_INDEX_FAILED"
+
+    def test_crashpad_database_error(self) -> None:
+        """Test CrashpadDatabaseError."""
+        error = CrashpadDatabaseError(Path("/tmp/crashes"), "Not a Crashpad database")
+        assert "Cannot ingest Crashpad database '/tmp/crashes'" in str(error)
+        assert "'pending' and 'completed'" in str(error)
+        assert error.error_code == "CRASHPAD_DATABASE_FAILED"
+
+    def test_upload_rejected_error(self) -> None:
+        """Test UploadRejectedError."""
+        error = UploadRejectedError("Dump exceeds the maximum upload size of 10 bytes", 11, 413)
+        assert "Upload rejected" in str(error)
+        assert "received_bytes=11" in str(error)
+        assert "MINIDUMP_MCP_STORE__MAX_UPLOAD_BYTES" in str(error)
+        assert error.status_code == 413
+        assert error.error_code == "UPLOAD_REJECTED"
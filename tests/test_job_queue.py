@@ -0,0 +1,128 @@
+"""Tests for the durable job queue."""
+
+from pathlib import Path
+
+from minidumpmcp.storage import JobQueue
+from minidumpmcp.storage.job_queue import MAX_BACKOFF, backoff
+
+KINDS = ("analysis",)
+
+
+class TestJobQueue:
+    """Tests for leases, retries and idempotency keys."""
+
+    def test_claim_and_complete(self) -> None:
+        """Test the lifecycle of a job and that a claimed job is not handed out twice."""
+        queue = JobQueue()
+        record, created = queue.enqueue("analysis", {"minidump_path": "/tmp/a.dmp"}, now=100.0)
+        assert created is True
+        assert record.state == "queued"
+
+        claimed = queue.claim("worker-1", 60.0, KINDS, now=101.0)
+        assert claimed is not None and claimed.job_id == record.job_id
+        assert (claimed.state, claimed.attempts, claimed.lease_expires_at) == ("running", 1, 161.0)
+        assert queue.claim("worker-2", 60.0, KINDS, now=102.0) is None
+        assert queue.claim("worker-2", 60.0, ("triage",), now=102.0) is None
+
+        assert queue.heartbeat(record.job_id, "worker-1", 60.0, 0, 1, "stackwalk", now=150.0) is True
+        assert queue.complete(record.job_id, "worker-2", {"success": True}) is False
+        assert queue.complete(record.job_id, "worker-1", {"success": True, "analysis_hash": "abc"}, now=160.0)
+
+        done = queue.get(record.job_id)
+        assert done is not None
+        assert (done.state, done.completed, done.finished_at) == ("done", 1, 160.0)
+        assert done.result == {"success": True, "analysis_hash": "abc"}
+        assert done.lease_owner is None
+
+    def test_idempotency_key(self) -> None:
+        """Test that a key is stored once and returns the first job."""
+        queue = JobQueue()
+        first, created = queue.enqueue("analysis", {"minidump_path": "a"}, idempotency_key="key-1")
+        again, created_again = queue.enqueue("analysis", {"minidump_path": "b"}, idempotency_key="key-1")
+
+        assert created is True and created_again is False
+        assert again.job_id == first.job_id
+        assert again.arguments == {"minidump_path": "a"}
+        assert len(queue.jobs()) == 1
+
+    def test_retry_with_backoff(self) -> None:
+        """Test that failed attempts are retried after a doubling delay until the limit."""
+        queue = JobQueue(retry_backoff=10.0)
+        record, _ = queue.enqueue("analysis", {}, max_attempts=2, now=0.0)
+
+        queue.claim("worker", 60.0, KINDS, now=0.0)
+        assert queue.fail(record.job_id, "worker", "boom", "JOB_FAILED", retry=True, now=1.0) == "queued"
+        assert queue.claim("worker", 60.0, KINDS, now=5.0) is None
+        assert queue.next_available(KINDS) == 11.0
+
+        assert queue.claim("worker", 60.0, KINDS, now=11.0) is not None
+        assert queue.fail(record.job_id, "worker", "boom", "JOB_FAILED", retry=True, now=12.0) == "failed"
+        failed = queue.get(record.job_id)
+        assert failed is not None
+        assert (failed.state, failed.attempts, failed.error_code) == ("failed", 2, "JOB_FAILED")
+
+    def test_final_failure(self) -> None:
+        """Test that a failure without retry is final."""
+        queue = JobQueue()
+        record, _ = queue.enqueue("analysis", {})
+        queue.claim("worker", 60.0, KINDS)
+
+        assert queue.fail(record.job_id, "worker", "bad dump", "TOOL_EXECUTION_FAILED") == "failed"
+        assert queue.fail(record.job_id, "worker", "bad dump", "TOOL_EXECUTION_FAILED") is None
+
+    def test_expired_lease_is_claimed_again(self) -> None:
+        """Test that the job of a stopped worker is resumed, and abandoned after its last attempt."""
+        queue = JobQueue()
+        record, _ = queue.enqueue("analysis", {}, max_attempts=2, now=0.0)
+        queue.claim("dead-1", 60.0, KINDS, now=0.0)
+
+        assert queue.claim("worker", 60.0, KINDS, now=59.0) is None
+        resumed = queue.claim("dead-2", 60.0, KINDS, now=61.0)
+        assert resumed is not None and (resumed.lease_owner, resumed.attempts) == ("dead-2", 2)
+        assert queue.heartbeat(record.job_id, "dead-1", 60.0, 0, 1, None) is False
+
+        assert queue.claim("worker", 60.0, KINDS, now=200.0) is None
+        abandoned = queue.get(record.job_id)
+        assert abandoned is not None
+        assert (abandoned.state, abandoned.error_code) == ("failed", "JOB_ABANDONED")
+
+    def test_release(self) -> None:
+        """Test that a released job is queued again without using up an attempt."""
+        queue = JobQueue()
+        record, _ = queue.enqueue("analysis", {})
+        queue.claim("worker", 60.0, KINDS)
+
+        assert queue.release(record.job_id, "worker") is True
+        released = queue.get(record.job_id)
+        assert released is not None and (released.state, released.attempts) == ("queued", 0)
+
+    def test_prune(self) -> None:
+        """Test that only the most recently finished jobs are kept."""
+        queue = JobQueue()
+        ids = []
+        for position in range(3):
+            record, _ = queue.enqueue("analysis", {"n": position})
+            queue.claim("worker", 60.0, KINDS)
+            queue.complete(record.job_id, "worker", {"success": True}, now=float(position))
+            ids.append(record.job_id)
+        pending, _ = queue.enqueue("analysis", {"n": 3})
+
+        assert queue.prune(1) == 2
+        assert [record.job_id for record in queue.jobs()] == [ids[2], pending.job_id]
+        assert queue.counts() == {"queued": 1, "running": 0, "done": 1, "failed": 0}
+
+    def test_persistent(self, tmp_path: Path) -> None:
+        """Test that jobs survive reopening the database."""
+        path = tmp_path / "jobs" / "jobs.sqlite3"
+        queue = JobQueue(path)
+        record, _ = queue.enqueue("analysis", {"minidump_path": "a"}, idempotency_key="key")
+        queue.close()
+
+        reopened = JobQueue(path)
+        assert [job.job_id for job in reopened.jobs(("queued",))] == [record.job_id]
+        assert reopened.enqueue("analysis", {"minidump_path": "a"}, idempotency_key="key")[1] is False
+
+    def test_backoff_is_capped(self) -> None:
+        """Test the doubling delay and its upper bound."""
+        assert [backoff(attempts, 5.0) for attempts in (1, 2, 3)] == [5.0, 10.0, 20.0]
+        assert backoff(40, 5.0) == MAX_BACKOFF
@@ -0,0 +1,371 @@
+"""Tests for background jobs."""
+
+import asyncio
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import pytest
+import pytest_asyncio
+
+from minidumpmcp.storage import JobQueue
+from minidumpmcp.tools._common import ToolExecutionError
+from minidumpmcp.tools.dump_syms import DumpSymsTool
+from minidumpmcp.tools.jobs import Job, JobProvider, JobScheduler
+from minidumpmcp.tools.stackwalk import StackwalkProvider
+from minidumpmcp.tracing import RingBuffer, Tracer, span
+
+TESTDATA = Path(__file__).parent / "testdata"
+
+
+async def _wait_finished(provider: JobProvider, job_id: str) -> Dict[str, Any]:
+    for _ in range(200):
+        status = await provider.get_job_status(job_id)
+        if status["state"] in ("done", "failed"):
+            return status
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+async def _wait_state(provider: JobProvider, job_id: str, state: str) -> Dict[str, Any]:
+    for _ in range(200):
+        status = await provider.get_job_status(job_id)
+        if status["state"] == state:
+            return status
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach {state}")
+
+
+class FakeDumpSyms(DumpSymsTool):
+    """dump_syms stand-in that fails for binaries named ``broken``."""
+
+    async def extract_symbols(self, binary_path: str, output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Pretend to extract symbols."""
+        await asyncio.sleep(0)
+        if "broken" in binary_path:
+            return {"success": False, "error": "bad binary", "error_code": "SYMBOL_EXTRACTION_FAILED"}
+        return {"success": True, "symbol_file": f"{output_dir}/{Path(binary_path).name}.sym"}
+
+
+@pytest.fixture
+def timeouts() -> List[object]:
+    """Timeouts the fake minidump-stackwalk runs were started with."""
+    return []
+
+
+@pytest.fixture
+def release(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, timeouts: List[object]) -> asyncio.Event:
+    """Event letting the fake minidump-stackwalk runs finish."""
+    fake_binary = tmp_path / "minidump-stackwalk"
+    fake_binary.write_text("")
+    release = asyncio.Event()
+
+    async def fake_run_subprocess(cmd: list[str | Path], **kwargs: object) -> str:
+        timeouts.append(kwargs.get("timeout"))
+        await release.wait()
+        if "broken" in str(cmd[-1]):
+            raise ToolExecutionError(f"Command {cmd[0]} failed with exit-code 2\nbad dump")
+        Path(cmd[cmd.index("--cyborg") + 1]).write_text((TESTDATA / "stackwalk" / "test_app.json").read_text())
+        return ""
+
+    monkeypatch.setattr("minidumpmcp.tools.stackwalk._get_bin_path", lambda name: fake_binary)
+    monkeypatch.setattr("minidumpmcp.tools.stackwalk.run_subprocess", fake_run_subprocess)
+    return release
+
+
+@pytest.fixture
+def minidump_file(tmp_path: Path) -> Path:
+    """Placeholder minidump file."""
+    path = tmp_path / "test.dmp"
+    path.write_bytes(b"MDMP")
+    return path
+
+
+@pytest_asyncio.fixture
+async def provider(release: asyncio.Event) -> AsyncIterator[JobProvider]:
+    """Provider whose scheduler is running, with one worker."""
+    provider = JobProvider(
+        StackwalkProvider(), JobScheduler(concurrency=1, poll_interval=0.01), timeout=900.0, dump_syms=FakeDumpSyms()
+    )
+    provider.scheduler.start()
+    yield provider
+    await provider.scheduler.close()
+
+
+class TestJobProvider:
+    """Tests for the submit tools and get_job_status."""
+
+    @pytest.mark.asyncio
+    async def test_analysis_job(
+        self, provider: JobProvider, release: asyncio.Event, minidump_file: Path, timeouts: List[object]
+    ) -> None:
+        """Test that an analysis is queued at once, runs with the job timeout and lands in the cache."""
+        submitted = await provider.submit_analysis(str(minidump_file))
+        assert submitted["success"] is True
+        assert submitted["state"] == "queued"
+        assert submitted["deduplicated"] is False
+
+        running = await _wait_state(provider, submitted["job_id"], "running")
+        assert running["progress"] == {"stage": "stackwalk", "completed": 0, "total": 1}
+        assert running["attempts"] == 1
+
+        release.set()
+        status = await _wait_finished(provider, submitted["job_id"])
+
+        assert status["state"] == "done"
+        assert status["progress"]["completed"] == 1
+        result = status["result"]
+        assert result["crash_type"] == "EXCEPTION_ACCESS_VIOLATION_WRITE"
+        assert result["summary_uri"] == f"minidump://{result['analysis_hash']}/summary"
+        assert timeouts == [900.0]
+        stackwalk = await provider._stackwalk.stackwalk_minidump(str(minidump_file))
+        assert stackwalk["cached"] is True
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, provider: JobProvider, release: asyncio.Event, tmp_path: Path) -> None:
+        """Test that jobs beyond the number of workers wait in the queue."""
+        paths = []
+        for name in ("a", "b"):
+            path = tmp_path / f"{name}.dmp"
+            path.write_bytes(name.encode())
+            paths.append(path)
+
+        first, second = [await provider.submit_analysis(str(path)) for path in paths]
+        await _wait_state(provider, first["job_id"], "running")
+
+        assert (await provider.get_job_status(second["job_id"]))["state"] == "queued"
+        release.set()
+        assert (await _wait_finished(provider, second["job_id"]))["state"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_failed_job(self, provider: JobProvider, release: asyncio.Event, tmp_path: Path) -> None:
+        """Test that a failing analysis is reported with its error and not retried."""
+        broken = tmp_path / "broken.dmp"
+        broken.write_bytes(b"MDMP")
+        release.set()
+
+        status = await _wait_finished(provider, (await provider.submit_analysis(str(broken)))["job_id"])
+
+        assert status["state"] == "failed"
+        assert status["error_code"] == "TOOL_EXECUTION_FAILED"
+        assert status["attempts"] == 1
+        assert "result" not in status
+
+    @pytest.mark.asyncio
+    async def test_idempotency_key(self, provider: JobProvider, minidump_file: Path, tmp_path: Path) -> None:
+        """Test that a repeated submission returns the existing job and a reused key is rejected."""
+        first = await provider.submit_analysis(str(minidump_file), idempotency_key="upload-42")
+        again = await provider.submit_analysis(str(minidump_file), idempotency_key="upload-42")
+
+        assert again["job_id"] == first["job_id"]
+        assert again["deduplicated"] is True
+        other = await provider.submit_analysis(str(minidump_file), str(tmp_path), idempotency_key="upload-42")
+        assert other["error_code"] == "INVALID_PARAMETER"
+
+    @pytest.mark.asyncio
+    async def test_symbol_extraction_job(self, provider: JobProvider, tmp_path: Path) -> None:
+        """Test that every binary of the batch is reported."""
+        binaries = []
+        for name in ("app.pdb", "broken.pdb"):
+            (tmp_path / name).write_bytes(b"")
+            binaries.append(str(tmp_path / name))
+
+        submitted = await provider.submit_symbol_extraction(binaries, str(tmp_path / "symbols"))
+        assert submitted["progress"]["total"] == 2
+        status = await _wait_finished(provider, submitted["job_id"])
+
+        assert status["state"] == "done"
+        result = status["result"]
+        assert result["failed_count"] == 1
+        assert [entry["binary_path"] for entry in result["symbols"]] == binaries
+        assert result["symbols"][0]["symbol_file"] == f"{tmp_path / 'symbols'}/app.pdb.sym"
+
+    @pytest.mark.asyncio
+    async def test_triage_job(self, provider: JobProvider, tmp_path: Path) -> None:
+        """Test that a triage job counts the dumps it triaged."""
+        dumps = tmp_path / "dumps"
+        dumps.mkdir()
+        for name in ("a.dmp", "b.dmp"):
+            shutil.copy(TESTDATA / "test.dmp", dumps / name)
+
+        status = await _wait_finished(provider, (await provider.submit_triage(str(dumps)))["job_id"])
+
+        assert status["state"] == "done"
+        assert status["progress"] == {"stage": None, "completed": 2, "total": 2}
+        assert status["result"]["dump_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_requests(self, provider: JobProvider, tmp_path: Path) -> None:
+        """Test validation at submission and unknown job ids."""
+        missing = await provider.submit_analysis(str(tmp_path / "missing.dmp"))
+        assert missing["error_code"] == "FILE_VALIDATION_FAILED"
+        assert (await provider.submit_analysis(str(tmp_path)))["error_code"] == "FILE_VALIDATION_FAILED"
+        assert (await provider.submit_symbol_extraction([]))["error_code"] == "INVALID_PARAMETER"
+        assert (await provider.submit_triage(str(tmp_path / "missing")))["error_code"] == "FILE_VALIDATION_FAILED"
+        assert (await provider.get_job_status("0123abcd"))["error_code"] == "JOB_NOT_FOUND"
+        assert (await provider.get_job_status(""))["error_code"] == "INVALID_PARAMETER"
+        assert provider.scheduler.queue.jobs() == []
+
+
+class TestJobScheduler:
+    """Tests for running, retrying and resuming jobs."""
+
+    @pytest.mark.asyncio
+    async def test_retry_after_exception(self) -> None:
+        """Test that an unexpected exception is retried and the next attempt can succeed."""
+        scheduler = JobScheduler(JobQueue(retry_backoff=0.0), poll_interval=0.01)
+        attempts: List[int] = []
+
+        async def flaky(job: Job) -> Dict[str, Any]:
+            attempts.append(job.attempt)
+            if job.attempt == 1:
+                raise RuntimeError("boom")
+            return {"success": True}
+
+        scheduler.register("flaky", flaky)
+        scheduler.start()
+        try:
+            record, _ = await scheduler.submit("flaky", {})
+            for _ in range(200):
+                status = await scheduler.status(record.job_id)
+                if status is not None and status["state"] == "done":
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await scheduler.close()
+
+        assert attempts == [1, 2]
+        assert status is not None and status["attempts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_queue_errors_do_not_stop_workers(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a result that cannot be stored fails its job and a locked database is retried."""
+        queue = JobQueue(retry_backoff=0.0)
+        complete = queue.complete
+        locked: List[str] = []
+
+        def flaky_complete(job_id: str, *args: Any, **kwargs: Any) -> bool:
+            if not locked:
+                locked.append(job_id)
+                raise sqlite3.OperationalError("database is locked")
+            return complete(job_id, *args, **kwargs)
+
+        monkeypatch.setattr(queue, "complete", flaky_complete)
+        scheduler = JobScheduler(queue, concurrency=1, lease_seconds=0.2, poll_interval=0.01)
+
+        async def work(job: Job) -> Dict[str, Any]:
+            return {"success": True, "value": object() if job.arguments["unserializable"] else 1}
+
+        scheduler.register("work", work)
+        scheduler.start()
+        try:
+            locked_job, _ = await scheduler.submit("work", {"unserializable": False})
+            for _ in range(300):
+                status = await scheduler.status(locked_job.job_id)
+                if status is not None and status["state"] == "done":
+                    break
+                await asyncio.sleep(0.01)
+            bad_job, _ = await scheduler.submit("work", {"unserializable": True})
+            for _ in range(200):
+                bad = await scheduler.status(bad_job.job_id)
+                if bad is not None and bad["state"] == "failed":
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await scheduler.close()
+
+        assert status is not None and (status["state"], status["attempts"]) == ("done", 2)
+        assert bad is not None and bad["state"] == "failed" and bad["attempts"] == 1
+        assert "Could not store the result" in bad["error"]
+
+    @pytest.mark.asyncio
+    async def test_attempts_are_traced(self) -> None:
+        """Test that every attempt runs as a trace of the job, with its spans and outcome."""
+        traces = RingBuffer()
+        scheduler = JobScheduler(JobQueue(retry_backoff=0.0), poll_interval=0.01, tracer=Tracer([traces]))
+
+        async def flaky(job: Job) -> Dict[str, Any]:
+            with span("flaky.step"):
+                if job.attempt == 1:
+                    raise RuntimeError("boom")
+            return {"success": True}
+
+        scheduler.register("flaky", flaky)
+        scheduler.start()
+        try:
+            record, _ = await scheduler.submit("flaky", {})
+            for _ in range(200):
+                if len(traces) == 2:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await scheduler.close()
+
+        second, first = traces.query(request_id=record.job_id)
+        assert (first["name"], first["status"], first["error"]) == ("job flaky", "error", "RuntimeError: boom")
+        assert first["attributes"]["attempt"] == 1 and first["attributes"]["queued_seconds"] >= 0
+        assert [s["name"] for s in first["spans"]] == ["flaky.step"]
+        assert (second["status"], second["attributes"]["attempt"]) == ("ok", 2)
+
+    @pytest.mark.asyncio
+    async def test_close_hands_jobs_back(self, tmp_path: Path) -> None:
+        """Test that jobs running at shutdown are resumed by the next server."""
+        path = tmp_path / "jobs.sqlite3"
+        started = asyncio.Event()
+
+        async def stuck(job: Job) -> Dict[str, Any]:
+            started.set()
+            await asyncio.Event().wait()
+            return {"success": True}
+
+        first = JobScheduler(JobQueue(path), poll_interval=0.01)
+        first.register("work", stuck)
+        first.start()
+        record, _ = await first.submit("work", {"n": 1})
+        await asyncio.wait_for(started.wait(), 1)
+        await first.close()
+
+        status = await first.status(record.job_id)
+        assert status is not None and (status["state"], status["attempts"]) == ("queued", 0)
+
+        async def finish(job: Job) -> Dict[str, Any]:
+            return {"success": True, "arguments": job.arguments}
+
+        second = JobScheduler(JobQueue(path), poll_interval=0.01)
+        second.register("work", finish)
+        second.start()
+        try:
+            for _ in range(200):
+                status = await second.status(record.job_id)
+                if status is not None and status["state"] == "done":
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await second.close()
+
+        assert status is not None and status["result"] == {"success": True, "arguments": {"n": 1}}
+
+    @pytest.mark.asyncio
+    async def test_resume_after_crash(self, tmp_path: Path) -> None:
+        """Test that a job whose worker died is run again once its lease runs out."""
+        queue = JobQueue(tmp_path / "jobs.sqlite3")
+        record, _ = queue.enqueue("work", {}, max_attempts=3)
+        queue.claim("dead-server", 0.05, ("work",))
+
+        async def finish(job: Job) -> Dict[str, Any]:
+            return {"success": True}
+
+        scheduler = JobScheduler(queue, lease_seconds=1.0, poll_interval=0.01)
+        scheduler.register("work", finish)
+        scheduler.start()
+        try:
+            for _ in range(200):
+                status = await scheduler.status(record.job_id)
+                if status is not None and status["state"] == "done":
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await scheduler.close()
+
+        assert status is not None and (status["state"], status["attempts"]) == ("done", 2)
@@ -0,0 +1,125 @@
+"""Tests for the dump memory tool."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from minidumpmcp.analysis.cache import AnalysisCache, CachedAnalysis
+from minidumpmcp.tools.memory import MemoryProvider
+
+TEST_DUMP = Path(__file__).parent / "testdata" / "test.dmp"
+TEST_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+
+@pytest.fixture
+def provider() -> MemoryProvider:
+    """Provider with the stackwalk analysis of the test dump cached as "test"."""
+    cache = AnalysisCache()
+    cache.put(CachedAnalysis("test", TEST_DUMP, "minidump-stackwalk", TEST_JSON, None))
+    return MemoryProvider(cache)
+
+
+class TestReadDumpMemory:
+    """Tests for read_dump_memory."""
+
+    @pytest.mark.asyncio
+    async def test_stack_around_frame(self, provider: MemoryProvider) -> None:
+        """Test hex lines and pointer-sized words around the crashing frame's stack pointer."""
+        result = await provider.read_dump_memory(str(TEST_DUMP), "0x0012fe84", length=32, before=16)
+
+        assert result["success"] is True
+        assert (result["start"], result["size"], result["word_size"]) == ("0x0012fe74", 32, 4)
+        assert result["region"] == {"start": "0x0012f31c", "end": "0x00130000", "size": 3300}
+        assert result["lines"][1] == ("0x0012fe84  45 00 00 00 70 ff 12 00 00 42 40 00 b8 27 87 00  |E...p....B@..'..|")
+        words = {word["address"]: word for word in result["words"]}
+        assert words["0x0012fe84"] == {"address": "0x0012fe84", "value": "0x00000045"}
+        assert words["0x0012fe8c"]["annotation"] == "test_app.exe+0x4200"
+
+    @pytest.mark.asyncio
+    async def test_symbol_annotations(self, provider: MemoryProvider) -> None:
+        """Test that return addresses of walked frames get their function."""
+        result = await provider.read_dump_memory(str(TEST_DUMP), "0x0012fe8c", length=4, analysis_hash="test")
+
+        frame = json.loads(TEST_JSON)["threads"][0]["frames"][1]
+        assert result["words"][0]["annotation"] == f"test_app.exe!{frame['function']}+0x10"
+
+    @pytest.mark.asyncio
+    async def test_read_stops_at_region_end(self, provider: MemoryProvider) -> None:
+        """Test that reads are clamped to the captured region."""
+        result = await provider.read_dump_memory(str(TEST_DUMP), "0x12fff8", length=64, before=0x10000)
+
+        assert result["start"] == "0x0012f31c"
+        assert result["size"] == 64
+
+        tail = await provider.read_dump_memory(str(TEST_DUMP), "0x12fff8", length=64)
+        assert (tail["size"], tail["truncated"]) == (8, True)
+
+    @pytest.mark.asyncio
+    async def test_not_captured(self, provider: MemoryProvider) -> None:
+        """Test that uncaptured addresses list the nearest regions."""
+        result = await provider.read_dump_memory(str(TEST_DUMP), "0x45")
+
+        assert result["error_code"] == "MEMORY_NOT_CAPTURED"
+        assert result["nearby_regions"][0]["start"] == "0x0012f31c"
+
+    @pytest.mark.asyncio
+    async def test_mapping_is_reused(self, provider: MemoryProvider, tmp_path: Path) -> None:
+        """Test that dumps stay mapped between calls and are remapped when they change."""
+        dump = tmp_path / "crash.dmp"
+        dump.write_bytes(TEST_DUMP.read_bytes())
+
+        await provider.read_dump_memory(str(dump), "0x0012fe84")
+        await provider.read_dump_memory(str(dump), "0x0012fe88")
+        assert len(provider._dumps) == 1
+
+        dump.write_bytes(TEST_DUMP.read_bytes() + b"\0")
+        await provider.read_dump_memory(str(dump), "0x0012fe84")
+        assert len(provider._dumps) == 2
+        provider.close()
+        assert not provider._dumps
+
+    @pytest.mark.asyncio
+    async def test_concurrent_opens_keep_one_mapping(
+        self, provider: MemoryProvider, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that concurrent calls mapping the same dump unmap the duplicates."""
+        mapped: List[Any] = []
+        map_dump = provider._map
+
+        def recording_map(path: Path) -> Any:
+            dump = map_dump(path)
+            mapped.append(dump)
+            return dump
+
+        monkeypatch.setattr(provider, "_map", recording_map)
+
+        results = await asyncio.gather(
+            *(provider.read_dump_memory(str(TEST_DUMP), "0x0012fe84", length=4) for _ in range(4))
+        )
+
+        assert all(result["success"] for result in results)
+        (kept,) = provider._dumps.values()
+        assert [dump.reader._data.closed for dump in mapped] == [dump is not kept for dump in mapped]
+        provider.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("kwargs", "error_code"),
+        [
+            ({"address": "crash"}, "INVALID_PARAMETER"),
+            ({"address": "0x10", "length": 0}, "INVALID_PARAMETER"),
+            ({"address": "0x10", "length": 4097}, "INVALID_PARAMETER"),
+            ({"address": "0x10", "before": -1}, "INVALID_PARAMETER"),
+            ({"address": "0x10", "analysis_hash": "unknown"}, "ANALYSIS_NOT_FOUND"),
+            ({"address": "0x10", "minidump_path": "/nonexistent.dmp"}, "FILE_VALIDATION_FAILED"),
+        ],
+    )
+    async def test_invalid_arguments(self, provider: MemoryProvider, kwargs: dict, error_code: str) -> None:
+        """Test argument validation."""
+        result = await provider.read_dump_memory(**{"minidump_path": str(TEST_DUMP), **kwargs})
+
+        assert result["success"] is False
+        assert result["error_code"] == error_code
@@ -0,0 +1,204 @@
+"""Tests for the Prometheus metrics registry, middleware and endpoint."""
+
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from minidumpmcp.analysis.cache import AnalysisCache, CachedAnalysis
+from minidumpmcp.metrics import (
+    HttpBytesMiddleware,
+    LoopLagMonitor,
+    MetricsRegistry,
+    RequestMetricsMiddleware,
+    ServerMetrics,
+    cache_collector,
+    job_queue_collector,
+    subprocess_collector,
+)
+from minidumpmcp.routes import MetricsRoute
+from minidumpmcp.storage import JobQueue
+from minidumpmcp.tools import _common
+from minidumpmcp.tools._common import ResourceUsage, SubprocessStats
+
+
+def _samples(text: str) -> dict[str, float]:
+    """Sample lines of a rendered registry by name and labels."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestRegistry:
+    """Tests for metric types and the text format."""
+
+    def test_render(self) -> None:
+        """Test counters, gauges and cumulative histogram buckets in the text format."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("path",))
+        registry.gauge("temperature", "Temperature").set(-1.5)
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        requests.inc(path='/a"b')
+        requests.inc(2, path='/a"b')
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        text = registry.render()
+
+        assert "# HELP requests_total Requests\n# TYPE requests_total counter\n" in text
+        assert "# TYPE latency_seconds histogram\n" in text
+        assert _samples(text) == {
+            'requests_total{path="/a\\"b"}': 3,
+            "temperature": -1.5,
+            'latency_seconds_bucket{le="0.1"}': 2,
+            'latency_seconds_bucket{le="1"}': 3,
+            'latency_seconds_bucket{le="+Inf"}': 4,
+            "latency_seconds_sum": 3.65,
+            "latency_seconds_count": 4,
+        }
+
+    def test_labels_must_match(self) -> None:
+        """Test that values need exactly the metric's labels and names are unique."""
+        registry = MetricsRegistry()
+        counter = registry.counter("runs_total", "Runs", ("tool",))
+        with pytest.raises(ValueError, match="tool"):
+            counter.inc()
+        with pytest.raises(ValueError):
+            counter.inc(tool="a", outcome="ok")
+        with pytest.raises(ValueError, match="already registered"):
+            registry.gauge("runs_total", "Runs")
+
+    @pytest.mark.asyncio
+    async def test_collectors(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that collectors report the cache, queue and subprocess state at scrape time."""
+        cache = AnalysisCache(max_entries=1)
+        queue = JobQueue()
+        stats = SubprocessStats()
+        monkeypatch.setattr(_common, "subprocess_stats", stats)
+        registry = MetricsRegistry()
+        registry.add_collector(cache_collector(cache))
+        registry.add_collector(job_queue_collector(queue))
+        registry.add_collector(subprocess_collector)
+
+        for key in ("a", "b"):
+            cache.put(CachedAnalysis(key, Path("x.dmp"), "cmd", "{}"))
+        await cache.fetch("a")
+        await cache.fetch("b")
+        queue.enqueue("analysis", {"n": 1})
+        stats.record("dump_syms", ResourceUsage(1.5, 0.5, 1024, 3.0), 0)
+        stats.record("dump_syms", ResourceUsage(0.5, 0.0, 4096, 1.0), 1)
+        stats.timed_out += 1
+
+        samples = _samples(registry.render())
+
+        assert samples['minidump_mcp_analysis_cache_lookups_total{result="hit"}'] == 1
+        assert samples['minidump_mcp_analysis_cache_lookups_total{result="miss"}'] == 1
+        assert samples["minidump_mcp_analysis_cache_evictions_total"] == 1
+        assert samples["minidump_mcp_analysis_cache_entries"] == 1
+        assert samples["minidump_mcp_analysis_cache_bytes"] == cache.size
+        assert samples['minidump_mcp_jobs{state="queued"}'] == 1
+        assert samples['minidump_mcp_jobs{state="running"}'] == 0
+        assert samples['minidump_mcp_subprocess_runs_total{tool="dump_syms",outcome="ok"}'] == 1
+        assert samples['minidump_mcp_subprocess_runs_total{tool="dump_syms",outcome="failed"}'] == 1
+        assert samples['minidump_mcp_subprocess_duration_seconds_bucket{tool="dump_syms",le="1"}'] == 1
+        assert samples['minidump_mcp_subprocess_duration_seconds_bucket{tool="dump_syms",le="5"}'] == 2
+        assert samples['minidump_mcp_subprocess_duration_seconds_bucket{tool="dump_syms",le="+Inf"}'] == 2
+        assert samples['minidump_mcp_subprocess_duration_seconds_count{tool="dump_syms"}'] == 2
+        assert samples['minidump_mcp_subprocess_duration_seconds_sum{tool="dump_syms"}'] == 4.0
+        assert samples['minidump_mcp_subprocess_cpu_seconds_total{tool="dump_syms",mode="user"}'] == 2.0
+        assert samples['minidump_mcp_subprocess_max_rss_bytes{tool="dump_syms"}'] == 4096
+        assert samples['minidump_mcp_subprocess_stopped_total{reason="timed_out"}'] == 1
+
+
+class TestServerMetrics:
+    """Tests for the middleware and monitors feeding the server's metrics."""
+
+    @pytest.mark.asyncio
+    async def test_request_duration(self) -> None:
+        """Test that tools, prompts and resources are timed under bounded label values."""
+        metrics = ServerMetrics()
+        mcp: FastMCP[None] = FastMCP("test")
+        mcp.add_middleware(RequestMetricsMiddleware(metrics))
+
+        @mcp.tool
+        def echo(text: str) -> str:
+            return text
+
+        @mcp.tool
+        def fail() -> str:
+            raise ValueError("broken")
+
+        @mcp.prompt
+        def explain() -> str:
+            return "Explain the crash"
+
+        @mcp.resource("minidump://{analysis_hash}/threads/{thread_index}/frames")
+        def frames(analysis_hash: str, thread_index: int) -> str:
+            return "[]"
+
+        async with Client(mcp) as client:
+            await client.call_tool("echo", {"text": "hi"})
+            await client.call_tool("echo", {"text": "again"})
+            with pytest.raises(ToolError):
+                await client.call_tool("fail", {})
+            await client.get_prompt("explain")
+            await client.read_resource(f"minidump://{'ab' * 32}/threads/3/frames")
+
+        samples = _samples(metrics.registry.render())
+        name = "minidump_mcp_request_duration_seconds_count"
+        assert samples[f'{name}{{kind="tool",name="echo",outcome="ok"}}'] == 2
+        assert samples[f'{name}{{kind="tool",name="fail",outcome="error"}}'] == 1
+        assert samples[f'{name}{{kind="prompt",name="explain",outcome="ok"}}'] == 1
+        assert samples[f'{name}{{kind="resource",name="minidump://{{hash}}/threads/{{n}}/frames",outcome="ok"}}'] == 1
+
+    @pytest.mark.asyncio
+    async def test_endpoint_and_http_bytes(self) -> None:
+        """Test that the route serves the registry and HTTP bodies are counted in both directions."""
+        metrics = ServerMetrics()
+
+        async def echo(request: Request) -> Response:
+            return Response(await request.body())
+
+        app = Starlette(
+            routes=[
+                Route("/echo", echo, methods=["POST"]),
+                Route("/metrics", MetricsRoute(metrics.registry).metrics, methods=["GET"]),
+            ],
+            middleware=[Middleware(HttpBytesMiddleware, metrics=metrics)],
+        )
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.post("/echo", content=b"x" * 1000)
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        samples = _samples(response.text)
+        assert samples['minidump_mcp_http_bytes_total{direction="in"}'] == 1000
+        assert samples['minidump_mcp_http_bytes_total{direction="out"}'] == 1000
+
+    @pytest.mark.asyncio
+    async def test_loop_lag(self) -> None:
+        """Test that blocking the event loop shows up as lag."""
+        metrics = ServerMetrics()
+        monitor = LoopLagMonitor(metrics, interval=0.05)
+        monitor.start()
+        await asyncio.sleep(0.1)
+        time.sleep(0.3)
+        await asyncio.sleep(0.1)
+        await monitor.close()
+
+        samples = _samples(metrics.registry.render())
+        assert samples["minidump_mcp_event_loop_lag_seconds_count"] >= 2
+        assert samples["minidump_mcp_event_loop_lag_seconds_sum"] >= 0.2
@@ -0,0 +1,121 @@
+"""Tests for the native minidump metadata reader."""
+
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from minidumpmcp.analysis.minidump import MemoryRegion, MinidumpReader, exception_name, read_minidump_info
+from minidumpmcp.exceptions import FileValidationError
+
+TEST_DUMP = Path(__file__).parent / "testdata" / "test.dmp"
+EXPECTED = json.loads((Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text())
+
+
+class TestMinidumpReader:
+    """Tests decoding the test dump against its stackwalk analysis."""
+
+    def test_summary_matches_stackwalk(self) -> None:
+        """Test that crash, system and process info agree with minidump-stackwalk."""
+        info = read_minidump_info(TEST_DUMP)
+
+        assert info["crash_info"]["type"] == EXPECTED["crash_info"]["type"]
+        assert info["crash_info"]["address"] == EXPECTED["crash_info"]["address"]
+        assert info["crash_info"]["crashing_thread"] == EXPECTED["crash_info"]["crashing_thread"]
+        for key in ("os", "os_ver", "cpu_arch", "cpu_count"):
+            assert info["system_info"][key] == EXPECTED["system_info"][key]
+        assert info["pid"] == EXPECTED["pid"]
+        assert info["thread_count"] == len(EXPECTED["threads"])
+        assert info["size"] == TEST_DUMP.stat().st_size
+        assert "modules" not in info
+
+    def test_modules_match_stackwalk(self) -> None:
+        """Test module identifiers, which symbol lookups depend on."""
+        modules = {module["filename"]: module for module in read_minidump_info(TEST_DUMP, True)["modules"]}
+        expected = {module["filename"]: module for module in EXPECTED["modules"]}
+
+        assert modules.keys() == expected.keys()
+        for name in ("test_app.exe", "ntdll.dll", "kernel32.dll"):
+            module = expected[name]
+            for key in ("base_addr", "debug_file", "debug_id"):
+                assert modules[name][key] == module[key], (name, key)
+        assert modules["test_app.exe"]["code_id"] == expected["test_app.exe"]["code_id"]
+        assert modules["kernel32.dll"]["version"] == "5.1.2600.2945"
+        assert modules["test_app.exe"]["version"] is None
+
+    def test_streams(self) -> None:
+        """Test the stream directory."""
+        with MinidumpReader(TEST_DUMP) as reader:
+            assert reader.stream(0x1234) is None
+            assert reader.stream(7) is not None
+            assert {"Exception", "ModuleList", "SystemInfo", "ThreadList"} <= set(reader.summary()["streams"])
+
+    @pytest.mark.parametrize("content", [b"", b"not a minidump at all", b"MDMP"])
+    def test_rejects_invalid_files(self, tmp_path: Path, content: bytes) -> None:
+        """Test that empty, foreign and truncated files raise a validation error."""
+        path = tmp_path / "bad.dmp"
+        path.write_bytes(content)
+
+        with pytest.raises(FileValidationError, match="Invalid format"):
+            read_minidump_info(path)
+
+    def test_truncated_streams_are_skipped(self, tmp_path: Path) -> None:
+        """Test that streams pointing past the end of the file read as absent."""
+        path = tmp_path / "truncated.dmp"
+        path.write_bytes(TEST_DUMP.read_bytes()[:400])
+
+        info = read_minidump_info(path)
+
+        assert info["system_info"]["os"] == "Windows NT"
+        assert info["module_count"] == 0
+
+
+def read_memory(reader: MinidumpReader, address: int, size: int) -> bytes:
+    """Copy captured memory out of a reader, releasing the view."""
+    view = reader.memory(address, size)
+    assert view is not None
+    with view:
+        return bytes(view)
+
+
+class TestMemory:
+    """Tests for captured memory lookups."""
+
+    def test_memory_list(self) -> None:
+        """Test that regions are sorted and addresses resolve to zero-copy slices."""
+        with MinidumpReader(TEST_DUMP) as reader:
+            regions = reader.memory_regions()
+            assert [region.start for region in regions] == sorted(region.start for region in regions)
+            assert MemoryRegion(0x0012F31C, 3300, 5689) in regions
+
+            assert reader.find_region(0x0012F31C - 1) is None
+            assert reader.find_region(0x0012FFFF) == MemoryRegion(0x0012F31C, 3300, 5689)
+            assert read_memory(reader, 0x0012FE84, 8) == bytes.fromhex("4500000070ff1200")
+            assert len(read_memory(reader, 0x0012FFFC, 64)) == 4
+            assert reader.memory(0x45, 4) is None
+
+    def test_memory64_list(self, tmp_path: Path) -> None:
+        """Test full-memory dumps, whose ranges share one base RVA."""
+        header = struct.pack("<4sIIIIIQ", b"MDMP", 0xA793, 1, 32, 0, 0, 0)
+        directory = struct.pack("<III", 9, 48, 44)
+        stream = struct.pack("<QQQQQQ", 2, 92, 0x2000, 16, 0x1000, 8)
+        path = tmp_path / "full.dmp"
+        path.write_bytes(header + directory + stream + b"A" * 16 + b"B" * 8)
+
+        with MinidumpReader(path) as reader:
+            assert reader.memory_regions() == [MemoryRegion(0x1000, 8, 108), MemoryRegion(0x2000, 16, 92)]
+            assert read_memory(reader, 0x1004, 100) == b"BBBB"
+            assert read_memory(reader, 0x200F, 1) == b"A"
+
+
+class TestExceptionName:
+    """Tests for exception naming per platform."""
+
+    def test_names(self) -> None:
+        """Test Windows, POSIX and macOS codes."""
+        assert exception_name("Windows NT", 0xC0000005, (0, 0x10)) == "EXCEPTION_ACCESS_VIOLATION_READ"
+        assert exception_name("Windows NT", 0xC00000FD) == "EXCEPTION_STACK_OVERFLOW"
+        assert exception_name("Linux", 11) == "SIGSEGV"
+        assert exception_name("Mac OS X", 1) == "EXC_BAD_ACCESS"
+        assert exception_name("Linux", 99) == "0x00000063"
@@ -0,0 +1,110 @@
+"""Tests for the columnar stackwalk result model."""
+
+import json
+import tracemalloc
+from pathlib import Path
+
+from minidumpmcp.analysis.cache import CachedAnalysis
+from minidumpmcp.analysis.model import StackwalkResult
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+
+class TestStackwalkResult:
+    """Tests for building, querying and materializing the model."""
+
+    def test_round_trip(self) -> None:
+        """Test that materialization reproduces the original document."""
+        expected = json.loads(SAMPLE_JSON)
+
+        assert StackwalkResult.from_json(SAMPLE_JSON).to_dict() == expected
+        assert StackwalkResult.from_dict(expected).to_dict() == expected
+
+    def test_typed_frames(self) -> None:
+        """Test typed frame views over the columns."""
+        result = StackwalkResult.from_json(SAMPLE_JSON)
+        top = next(result.frames(result.threads[0]))
+
+        assert top.module == "test_app.exe"
+        assert top.function == "`anonymous namespace'::CrashFunction"
+        assert top.line == 58
+        assert top.offset == 0x0040429E
+        assert top.trust == "context"
+        assert len(list(result.frames(result.threads[0], limit=2))) == 2
+
+    def test_crashing_thread_shares_frames(self) -> None:
+        """Test that the crashing thread copy is not stored twice."""
+        result = StackwalkResult.from_json(SAMPLE_JSON)
+
+        assert result.crashing_thread is result.threads[0]
+        assert result.frame_total == sum(thread.stored_frames for thread in result.threads)
+
+    def test_strings_are_interned(self) -> None:
+        """Test that repeated names share one table entry."""
+        result = StackwalkResult.from_json(SAMPLE_JSON)
+        modules = {frame.module for thread in result.threads for frame in result.frames(thread)}
+
+        assert result.module_for("kernel32.dll") is not None
+        assert all(result.module_for(name) is not None for name in modules)
+        assert len(result.strings) < 3 * result.frame_total + 3 * len(result.modules)
+
+    def test_irregular_values_are_preserved(self) -> None:
+        """Test that values outside the column formats survive a round trip."""
+        data = json.loads(SAMPLE_JSON)
+        frame = data["threads"][1]["frames"][0]
+        frame["module"] = "unknown.so"
+        frame["offset"] = "0x7c90E514"
+        frame["inlines"] = [{"function": "inlined", "file": None, "line": None}]
+        frame["trust"] = "future_trust"
+        data["crashing_thread"] = None
+
+        assert StackwalkResult.from_dict(data).to_dict() == data
+
+    def test_max_frames(self) -> None:
+        """Test frame limits during materialization."""
+        result = StackwalkResult.from_json(SAMPLE_JSON).to_dict(max_frames=1)
+
+        assert all(len(thread["frames"]) == 1 for thread in result["threads"])
+        assert len(result["crashing_thread"]["frames"]) == 1
+
+    def test_smaller_than_dicts(self) -> None:
+        """Test that the model retains much less memory than decoded dicts."""
+        data = json.loads(SAMPLE_JSON)
+        frames = data["threads"][0]["frames"][1:]
+        data["threads"] = [
+            {
+                "thread_id": i,
+                "thread_name": None,
+                "frame_count": 100,
+                "frames": [dict(frames[j % 3]) for j in range(100)],
+            }
+            for i in range(20)
+        ]
+        for thread in data["threads"]:
+            for position, frame in enumerate(thread["frames"]):
+                frame["frame"] = position
+        data["crashing_thread"] = None
+        text = json.dumps(data)
+
+        tracemalloc.start()
+        decoded = json.loads(text)
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del decoded
+
+        tracemalloc.start()
+        model = StackwalkResult.from_json(text)
+        model_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        assert model.to_dict() == data
+        assert model_bytes * 4 < dict_bytes
+
+    def test_cached_analysis_model(self) -> None:
+        """Test building the model from a cache entry."""
+        entry = CachedAnalysis("hash", Path("test.dmp"), "cmd", SAMPLE_JSON)
+
+        model = entry.model()
+
+        assert len(model.threads) == 2
+        assert model.header["crash_info"]["type"] == "EXCEPTION_ACCESS_VIOLATION_WRITE"
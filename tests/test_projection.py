@@ -0,0 +1,110 @@
+"""Tests for stackwalk JSON field projection."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from minidumpmcp.analysis import projection
+from minidumpmcp.analysis.projection import build_selector, parse_projection, project_json
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+
+class TestParseProjection:
+    """Tests for the projection grammar."""
+
+    def test_simple_fields(self) -> None:
+        """Test top-level field names."""
+        selector = parse_projection(["crash_info", "modules"])
+        assert set(selector.children) == {"crash_info", "modules"}
+        assert selector.children["crash_info"].is_whole
+
+    def test_nested_limit(self) -> None:
+        """Test list slicing on a nested path."""
+        selector = parse_projection(["threads[*].frames[:3]"])
+        threads = selector.children["threads"]
+        assert threads.limit is None
+        assert not threads.keep_rest
+        assert threads.children["frames"].limit == 3
+
+    def test_whole_field_wins_over_limit(self) -> None:
+        """Test that an unlimited mention of a list overrides a limited one."""
+        selector = parse_projection(["modules[:2]", "modules"])
+        assert selector.children["modules"].is_whole
+
+    @pytest.mark.parametrize("spec", ["", "threads[", "threads[1]", "threads..frames", "9lives"])
+    def test_invalid_spec(self, spec: str) -> None:
+        """Test rejection of malformed paths."""
+        with pytest.raises(ValueError):
+            parse_projection([spec])
+
+
+class TestProjectJson:
+    """Tests for projected decoding."""
+
+    def test_no_selector_decodes_everything(self) -> None:
+        """Test that a missing selector is equivalent to json.loads."""
+        assert project_json(SAMPLE_JSON, None) == json.loads(SAMPLE_JSON)
+
+    def test_top_level_projection(self) -> None:
+        """Test selecting top-level keys."""
+        result = project_json(SAMPLE_JSON, build_selector(["crash_info", "system_info"], None))
+        full = json.loads(SAMPLE_JSON)
+        assert result == {"crash_info": full["crash_info"], "system_info": full["system_info"]}
+
+    def test_thread_frame_projection(self) -> None:
+        """Test projecting frames out of every thread."""
+        result = project_json(SAMPLE_JSON, build_selector(["threads[*].frames[:2]"], None))
+        assert list(result) == ["threads"]
+        assert [list(t) for t in result["threads"]] == [["frames"], ["frames"]]
+        assert [f["frame"] for f in result["threads"][0]["frames"]] == [0, 1]
+
+    def test_max_frames_caps_every_thread(self) -> None:
+        """Test per-thread frame cap without a projection."""
+        result = project_json(SAMPLE_JSON, build_selector(None, 1))
+        full = json.loads(SAMPLE_JSON)
+        assert result["modules"] == full["modules"]
+        assert all(len(t["frames"]) == 1 for t in result["threads"])
+        assert len(result["crashing_thread"]["frames"]) == 1
+        assert result["crashing_thread"]["thread_id"] == 3060
+
+    def test_max_frames_tightens_projection_limit(self) -> None:
+        """Test that max_frames lowers an explicit frame slice."""
+        result = project_json(SAMPLE_JSON, build_selector(["crashing_thread.frames[:3]"], 2))
+        assert list(result) == ["crashing_thread"]
+        assert len(result["crashing_thread"]["frames"]) == 2
+
+    def test_max_frames_ignores_unselected_threads(self) -> None:
+        """Test that the frame cap does not pull in unselected fields."""
+        result = project_json(SAMPLE_JSON, build_selector(["crash_info"], 5))
+        assert list(result) == ["crash_info"]
+
+    def test_skips_tricky_strings(self) -> None:
+        """Test skipping strings containing brackets and escaped quotes."""
+        text = '{"skip": {"a": "}]\\"{[", "b": [1, -2.5e3, true, null]}, "keep": "x"}'
+        assert project_json(text, build_selector(["keep"], None)) == {"keep": "x"}
+
+    def test_skipped_values_are_not_decoded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that skipped containers are scanned without decoding any of their children."""
+        decoded = []
+
+        def recording_decode(text: str, idx: int = 0) -> Any:
+            value, end = json.JSONDecoder().raw_decode(text, idx)
+            decoded.append(value)
+            return value, end
+
+        monkeypatch.setattr(projection, "_decode", recording_decode)
+        text = '{"skip": [{"frames": [{"a": 1}, "x"]}, {"b": {}}], "keep": "x"}'
+        assert project_json(text, build_selector(["keep"], None)) == {"keep": "x"}
+        assert decoded == ["x"]
+
+    @pytest.mark.parametrize(
+        "text",
+        ['{"keep": 1', '{"skip": [1, 2}', '{"skip": [{"a": "1]}]}', '{"skip": {"a": "x}', '{"keep": 1} trailing', ""],
+    )
+    def test_malformed_json(self, text: str) -> None:
+        """Test that malformed input raises JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            project_json(text, build_selector(["keep"], None))
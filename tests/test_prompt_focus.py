@@ -0,0 +1,101 @@
+"""Tests for the focus-aware technical analysis prompt."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from minidumpmcp.prompts import CrashAnalysisProvider
+from minidumpmcp.prompts.focus import REGISTER_FRAMES, focus_slice
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+
+@pytest.fixture
+def sample() -> Dict[str, Any]:
+    """Sample stackwalk result."""
+    data: Dict[str, Any] = json.loads(SAMPLE_JSON)
+    return data
+
+
+class TestFocusSlice:
+    """Tests for the data sent with each focus."""
+
+    def test_all_is_unchanged(self, sample: Dict[str, Any]) -> None:
+        """Test that the full result is sent without a focus."""
+        assert focus_slice(sample, "all") is sample
+
+    def test_registers(self, sample: Dict[str, Any]) -> None:
+        """Test that only the crashing thread's top frames are kept, with the CPU context."""
+        sample["crashing_thread"]["frames"] *= 5
+        data = focus_slice(sample, "registers")
+
+        assert set(data) == {"status", "system_info", "crash_info", "crashing_thread"}
+        assert len(data["crashing_thread"]["frames"]) == REGISTER_FRAMES
+        assert data["crashing_thread"]["frames"][0]["registers"]["eip"] == "0x0040429e"
+
+    def test_memory(self, sample: Dict[str, Any]) -> None:
+        """Test that the fault address and register values are placed in their regions."""
+        data = focus_slice(sample, "memory")
+
+        assert len(data["crashing_thread"]["frames"]) == 1
+        regions = {region["from"]: region for region in data["address_regions"]}
+        assert regions["fault address"] == {"from": "fault address", "address": "0x45", "region": "null page"}
+        assert regions["eip"]["module"] == "test_app.exe"
+        assert regions["eip"]["module_offset"] == "0x429e"
+        assert "esi" not in regions
+        assert [module["filename"] for module in data["modules"]] == ["test_app.exe", "kernel32.dll"]
+
+    def test_stack_frames(self, sample: Dict[str, Any]) -> None:
+        """Test that every crashing frame is kept with the modules it belongs to."""
+        data = focus_slice(sample, "stack_frames")
+
+        frames = data["crashing_thread"]["frames"]
+        assert len(frames) == len(sample["crashing_thread"]["frames"])
+        assert {module["filename"] for module in data["modules"]} == {frame["module"] for frame in frames}
+        assert "threads" not in data
+
+    def test_unknown_focus(self, sample: Dict[str, Any]) -> None:
+        """Test that an unknown focus is rejected."""
+        with pytest.raises(ValueError):
+            focus_slice(sample, "heap")
+
+
+class TestFocusedPrompt:
+    """Tests for the prompt sent for each technical focus."""
+
+    @pytest.mark.asyncio
+    async def test_sections_follow_focus(self) -> None:
+        """Test that template sections of other focuses are left out."""
+        provider = CrashAnalysisProvider()
+        registers = await provider.analyze_technical_details(SAMPLE_JSON, "registers")
+        everything = await provider.analyze_technical_details(SAMPLE_JSON, "all")
+
+        assert "### Register State Analysis" in registers
+        assert "### Memory Access Patterns" not in registers
+        assert "### Memory Access Patterns" in everything
+        assert "<!-- focus" not in everything
+        assert "reduced to the crashing thread" in registers
+        assert '"threads":' not in registers and '"threads":' in everything
+
+    @pytest.mark.asyncio
+    async def test_measure(self) -> None:
+        """Test the measurement of every focus against the full prompt."""
+        result = await CrashAnalysisProvider().measure_technical_focus(SAMPLE_JSON)
+
+        sizes = result["focus"]
+        assert result["success"] is True
+        assert sizes["all"]["saved_bytes"] == 0
+        for focus in ("registers", "memory", "stack_frames"):
+            assert sizes[focus]["saved_bytes"] == sizes["all"]["bytes"] - sizes[focus]["bytes"] > 0
+            assert sizes[focus]["reduction"] > 2
+            assert sizes[focus]["estimated_tokens"] < sizes["all"]["estimated_tokens"]
+
+    @pytest.mark.asyncio
+    async def test_measure_invalid_output(self) -> None:
+        """Test that measuring invalid output reports the error."""
+        result = await CrashAnalysisProvider().measure_technical_focus("[]")
+
+        assert result["success"] is False
+        assert "must be a JSON object" in result["error"]
@@ -0,0 +1,170 @@
+"""Tests for the prompt template registry and the rendered prompt cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from minidumpmcp.prompts import CrashAnalysisProvider, RenderCache, Template, TemplateRegistry
+from minidumpmcp.prompts.symbol_preparation_provider import SymbolPreparationProvider
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+TEMPLATES = ("analyze_crash_with_expertise", "analyze_technical_details", "symbol_transformation_guide")
+
+
+@pytest.fixture
+def template_dir(tmp_path: Path) -> Path:
+    """Directory with small stand-ins for the packaged templates."""
+    for name in TEMPLATES:
+        (tmp_path / f"{name}.md").write_text(f"# {name} v1\n", encoding="utf-8")
+    return tmp_path
+
+
+def _touch(path: Path, text: str) -> None:
+    """Rewrite *path* and move its mtime forward so that the change is seen on any filesystem."""
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+class TestTemplateRegistry:
+    """Tests for loading and reloading templates."""
+
+    def test_packaged_templates(self) -> None:
+        """Test that the templates shipped with the package are loaded by default."""
+        registry = TemplateRegistry()
+
+        assert set(TEMPLATES) <= set(registry.names)
+        template = registry.get("analyze_crash_with_expertise")
+        assert template is not None
+        assert template.text.startswith("#")
+        assert registry.get("missing") is None
+
+    def test_loaded_once(self, template_dir: Path) -> None:
+        """Test that changes on disk are ignored without hot reload."""
+        registry = TemplateRegistry(template_dir)
+        path = template_dir / "analyze_technical_details.md"
+        _touch(path, "# changed\n")
+        path.with_name("symbol_transformation_guide.md").unlink()
+
+        template = registry.get("analyze_technical_details")
+        assert template is not None and template.text == "# analyze_technical_details v1\n"
+        assert registry.get("symbol_transformation_guide") is not None
+
+    def test_hot_reload(self, template_dir: Path) -> None:
+        """Test that changed, added and removed templates are picked up with hot reload."""
+        registry = TemplateRegistry(template_dir, hot_reload=True)
+        before = registry.get("analyze_technical_details")
+        path = template_dir / "analyze_technical_details.md"
+        _touch(path, "# changed\n")
+
+        after = registry.get("analyze_technical_details")
+        assert before is not None and after is not None
+        assert after.text == "# changed\n"
+        assert after.version != before.version
+        assert registry.get("analyze_technical_details") is after
+
+        (template_dir / "extra.md").write_text("# extra\n", encoding="utf-8")
+        path.unlink()
+        assert registry.get("extra") is not None
+        assert registry.get("analyze_technical_details") is None
+        assert "analyze_technical_details" not in registry.names
+
+
+class TestTemplateSections:
+    """Tests for selecting the sections of a template by focus."""
+
+    TEXT = (
+        "# Intro\n"
+        "<!-- focus: registers -->\n"
+        "registers\n"
+        "<!-- focus: memory, registers -->\n"
+        "shared\n"
+        "<!-- focus: * -->\n"
+        "always\n"
+    )
+
+    @pytest.mark.parametrize(
+        "focus,expected",
+        [
+            ("registers", "# Intro\nregisters\nshared\nalways\n"),
+            ("memory", "# Intro\nshared\nalways\n"),
+            ("stack_frames", "# Intro\nalways\n"),
+            ("all", "# Intro\nregisters\nshared\nalways\n"),
+        ],
+    )
+    def test_sections(self, focus: str, expected: str) -> None:
+        """Test that tagged sections are kept for their focus and markers are dropped."""
+        assert Template("t", self.TEXT, 0).sections(focus) == expected
+
+    def test_untagged_template(self) -> None:
+        """Test that a template without markers is kept whole."""
+        assert Template("t", "# Plain\n", 0).sections("memory") == "# Plain\n"
+
+
+class TestRenderCache:
+    """Tests for the LRU cache of rendered prompts."""
+
+    def test_lru_eviction(self) -> None:
+        """Test that the least recently used prompt is evicted first."""
+        cache = RenderCache(max_entries=2)
+        cache.put(("a",), "A")
+        cache.put(("b",), "B")
+        assert cache.get(("a",)) == "A"
+        cache.put(("c",), "C")
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == "A"
+        assert cache.get(("c",)) == "C"
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (3, 1)
+
+
+class TestProviderCaching:
+    """Tests for the providers serving repeated prompts from memory."""
+
+    @pytest.mark.asyncio
+    async def test_crash_prompts_cached_by_arguments(self, template_dir: Path) -> None:
+        """Test that prompts are cached per output and focus, and invalidated by template reloads."""
+        provider = CrashAnalysisProvider(TemplateRegistry(template_dir, hot_reload=True), render_cache_entries=8)
+
+        first = await provider.analyze_crash_with_expertise(SAMPLE_JSON, ["root_cause"])
+        assert await provider.analyze_crash_with_expertise(SAMPLE_JSON, ["root_cause"]) is first
+        focused = await provider.analyze_crash_with_expertise(SAMPLE_JSON, ["prevention"])
+        assert focused is not first and "**Focus Areas:** prevention" in focused
+        registers = await provider.analyze_technical_details(SAMPLE_JSON, "registers")
+        assert await provider.analyze_technical_details(SAMPLE_JSON, "memory") != registers
+
+        _touch(template_dir / "analyze_crash_with_expertise.md", "# analyze_crash_with_expertise v2\n")
+        reloaded = await provider.analyze_crash_with_expertise(SAMPLE_JSON, ["root_cause"])
+        assert reloaded.startswith("# analyze_crash_with_expertise v2")
+
+    @pytest.mark.asyncio
+    async def test_missing_template(self, template_dir: Path) -> None:
+        """Test the error prompt when a template is missing."""
+        (template_dir / "analyze_technical_details.md").unlink()
+        provider = CrashAnalysisProvider(TemplateRegistry(template_dir))
+
+        prompt = await provider.analyze_technical_details(SAMPLE_JSON)
+
+        assert prompt.startswith("## Error in analyze_technical_details")
+        assert "Template file not found" in prompt
+
+    @pytest.mark.asyncio
+    async def test_invalid_output_not_cached(self, template_dir: Path) -> None:
+        """Test that error prompts are not cached."""
+        provider = CrashAnalysisProvider(TemplateRegistry(template_dir))
+
+        assert (await provider.analyze_crash_with_expertise("not json")).startswith("## Error")
+        assert len(provider._rendered) == 0
+
+    @pytest.mark.asyncio
+    async def test_symbol_guide_cached(self, template_dir: Path) -> None:
+        """Test that the symbol guide is rendered once per set of arguments."""
+        provider = SymbolPreparationProvider(TemplateRegistry(template_dir))
+
+        first = await provider.symbol_transformation_guide(["app.pdb"], target_modules=["app.exe"])
+        assert first.startswith("# symbol_transformation_guide v1")
+        assert await provider.symbol_transformation_guide(["app.pdb"], target_modules=["app.exe"]) is first
+        assert await provider.symbol_transformation_guide(["app.pdb"]) is not first
@@ -178,6 +178,160 @@ class TestEnvironmentVariables:
         assert config.message_path == "/msg"
         assert config.sse_path == "/events"
 
+    def test_cache_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test analysis cache environment variables."""
+        monkeypatch.setenv("MINIDUMP_MCP_CACHE__MAX_ENTRIES", "4")
+        monkeypatch.setenv("MINIDUMP_MCP_CACHE__PAGE_SIZE", "10")
+        monkeypatch.setenv("MINIDUMP_MCP_CACHE__DIRECTORY", "~/analyses")
+        monkeypatch.setenv("MINIDUMP_MCP_CACHE__MAX_DISK_BYTES", "1048576")
+        monkeypatch.setenv("MINIDUMP_MCP_CACHE__REMOTE_URLS", '["http://kv-a:8080/cache", "http://kv-b:8080/cache"]')
+        monkeypatch.setenv("MINIDUMP_MCP_CACHE__REMOTE_TIMEOUT", "2.5")
+
+        settings = ServerSettings()
+
+        assert settings.cache.max_entries == 4
+        assert settings.cache.page_size == 10
+        assert settings.cache.directory == Path.home() / "analyses"
+        assert settings.cache.max_disk_bytes == 1048576
+        assert settings.cache.remote_urls == ["http://kv-a:8080/cache", "http://kv-b:8080/cache"]
+        assert settings.cache.remote_timeout == 2.5
+
+    def test_limits_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test tool process resource limit environment variables."""
+        assert ServerSettings().limits.address_space is None
+
+        monkeypatch.setenv("MINIDUMP_MCP_LIMITS__ADDRESS_SPACE", "4294967296")
+        monkeypatch.setenv("MINIDUMP_MCP_LIMITS__CPU_SECONDS", "120")
+        monkeypatch.setenv("MINIDUMP_MCP_LIMITS__OPEN_FILES", "256")
+
+        settings = ServerSettings()
+
+        assert settings.limits.address_space == 4294967296
+        assert settings.limits.cpu_seconds == 120
+        assert settings.limits.open_files == 256
+
+    def test_signature_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test crash signature environment variables."""
+        monkeypatch.setenv("MINIDUMP_MCP_SIGNATURES__DATABASE_PATH", "~/crashes/signatures.sqlite3")
+        monkeypatch.setenv("MINIDUMP_MCP_SIGNATURES__FRAME_COUNT", "8")
+        monkeypatch.setenv("MINIDUMP_MCP_SIGNATURES__SKIP_FUNCTIONS", '["my_assert$"]')
+
+        settings = ServerSettings()
+
+        assert settings.signatures.database_path == Path.home() / "crashes" / "signatures.sqlite3"
+        assert settings.signatures.frame_count == 8
+        assert settings.signatures.skip_functions == ["my_assert$"]
+
+    def test_crashpad_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test Crashpad ingestion environment variables."""
+        monkeypatch.setenv("MINIDUMP_MCP_CRASHPAD__STATE_PATH", "~/crashes/crashpad.sqlite3")
+
+        settings = ServerSettings()
+
+        assert settings.crashpad.state_path == Path.home() / "crashes" / "crashpad.sqlite3"
+
+    def test_store_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test dump store and upload environment variables."""
+        monkeypatch.setenv("MINIDUMP_MCP_STORE__PATH", "~/crashes/dumps")
+        monkeypatch.setenv("MINIDUMP_MCP_STORE__UPLOAD_PATH", "/upload")
+        monkeypatch.setenv("MINIDUMP_MCP_STORE__MAX_UPLOAD_BYTES", "1048576")
+
+        settings = ServerSettings()
+
+        assert settings.store.path == Path.home() / "crashes" / "dumps"
+        assert settings.store.upload_path == "/upload"
+        assert settings.store.max_upload_bytes == 1048576
+        assert settings.store.upload_enabled is True
+        assert settings.store.max_age_days is None
+
+    def test_store_retention_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test dump store retention environment variables."""
+        monkeypatch.setenv("MINIDUMP_MCP_STORE__STORE_LOCAL_DUMPS", "true")
+        monkeypatch.setenv("MINIDUMP_MCP_STORE__MAX_AGE_DAYS", "7.5")
+        monkeypatch.setenv("MINIDUMP_MCP_STORE__MAX_BYTES", "1048576")
+        monkeypatch.setenv("MINIDUMP_MCP_STORE__KEEP_PER_SIGNATURE", "3")
+
+        settings = ServerSettings()
+
+        assert settings.store.store_local_dumps is True
+        assert settings.store.max_age_days == 7.5
+        assert settings.store.max_bytes == 1048576
+        assert settings.store.keep_per_signature == 3
+
+    def test_prompt_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test prompt template environment variables."""
+        monkeypatch.setenv("MINIDUMP_MCP_PROMPTS__HOT_RELOAD", "true")
+        monkeypatch.setenv("MINIDUMP_MCP_PROMPTS__RENDER_CACHE_ENTRIES", "8")
+
+        settings = ServerSettings()
+
+        assert settings.prompts.hot_reload is True
+        assert settings.prompts.render_cache_entries == 8
+
+    def test_metrics_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test metrics endpoint environment variables."""
+        monkeypatch.setenv("MINIDUMP_MCP_METRICS__ENABLED", "false")
+        monkeypatch.setenv("MINIDUMP_MCP_METRICS__PATH", "/internal/metrics")
+        monkeypatch.setenv("MINIDUMP_MCP_METRICS__LOOP_LAG_INTERVAL", "2")
+
+        settings = ServerSettings()
+
+        assert settings.metrics.enabled is False
+        assert settings.metrics.path == "/internal/metrics"
+        assert settings.metrics.loop_lag_interval == 2.0
+
+    def test_tracing_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test request tracing environment variables."""
+        monkeypatch.setenv("MINIDUMP_MCP_TRACING__SAMPLE_RATE", "0.5")
+        monkeypatch.setenv("MINIDUMP_MCP_TRACING__SLOW_THRESHOLD", "2.5")
+        monkeypatch.setenv("MINIDUMP_MCP_TRACING__BUFFER_SIZE", "32")
+        monkeypatch.setenv("MINIDUMP_MCP_TRACING__FILE", "~/traces/spans.jsonl")
+        monkeypatch.setenv("MINIDUMP_MCP_TRACING__FILE_MAX_BYTES", "1048576")
+        monkeypatch.setenv("MINIDUMP_MCP_TRACING__FILE_BACKUPS", "5")
+
+        settings = ServerSettings()
+
+        assert settings.tracing.enabled is True
+        assert settings.tracing.sample_rate == 0.5
+        assert settings.tracing.slow_threshold == 2.5
+        assert settings.tracing.buffer_size == 32
+        assert settings.tracing.file == Path.home() / "traces" / "spans.jsonl"
+        assert (settings.tracing.file_max_bytes, settings.tracing.file_backups) == (1048576, 5)
+
+        monkeypatch.setenv("MINIDUMP_MCP_TRACING__SAMPLE_RATE", "2")
+        with pytest.raises(ValidationError):
+            ServerSettings()
+
+    def test_job_env_vars(self, monkeypatch: MonkeyPatch) -> None:
+        """Test stackwalk timeout, background job and job queue environment variables."""
+        monkeypatch.setenv("MINIDUMP_MCP_STACKWALK__TIMEOUT", "45")
+        monkeypatch.setenv("MINIDUMP_MCP_STACKWALK__GRACE_PERIOD", "0.5")
+        monkeypatch.setenv("MINIDUMP_MCP_STACKWALK__OVER_BUDGET", "reject")
+        monkeypatch.setenv("MINIDUMP_MCP_JOBS__CONCURRENCY", "4")
+        monkeypatch.setenv("MINIDUMP_MCP_JOBS__TIMEOUT", "7200")
+        monkeypatch.setenv("MINIDUMP_MCP_JOBS__MAX_FINISHED", "16")
+        monkeypatch.setenv("MINIDUMP_MCP_JOBS__DATABASE_PATH", "~/jobs.sqlite3")
+        monkeypatch.setenv("MINIDUMP_MCP_JOBS__MAX_ATTEMPTS", "5")
+        monkeypatch.setenv("MINIDUMP_MCP_JOBS__RETRY_BACKOFF", "0.5")
+        monkeypatch.setenv("MINIDUMP_MCP_JOBS__LEASE_SECONDS", "30")
+        monkeypatch.setenv("MINIDUMP_MCP_JOBS__WORKERS", "4")
+        monkeypatch.setenv("MINIDUMP_MCP_JOBS__POLL_INTERVAL", "0.25")
+
+        settings = ServerSettings()
+
+        assert settings.stackwalk.timeout == 45.0
+        assert settings.stackwalk.grace_period == 0.5
+        assert settings.stackwalk.over_budget == "reject"
+        assert settings.jobs.concurrency == 4
+        assert settings.jobs.timeout == 7200.0
+        assert settings.jobs.max_finished == 16
+        assert settings.jobs.database_path == Path.home() / "jobs.sqlite3"
+        assert settings.jobs.max_attempts == 5
+        assert settings.jobs.retry_backoff == 0.5
+        assert settings.jobs.lease_seconds == 30.0
+        assert settings.jobs.workers == 4
+        assert settings.jobs.poll_interval == 0.25
+
     def test_env_file_loading(self, tmp_path: Path) -> None:
         """Test loading configuration from .env file."""
         env_file = tmp_path / ".env"
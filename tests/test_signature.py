@@ -0,0 +1,85 @@
+"""Tests for crash signature computation."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from minidumpmcp.analysis.model import Frame, StackwalkResult
+from minidumpmcp.analysis.signature import SignatureGenerator, normalize_function
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+
+def _frame(function: str | None, module: str | None = "app", module_offset: int | None = 0x10) -> Frame:
+    return Frame(module, function, None, None, None, module_offset, None, "cfi", function is None)
+
+
+class TestNormalizeFunction:
+    """Tests for function name normalization."""
+
+    @pytest.mark.parametrize(
+        "function,expected",
+        [
+            ("ns::Widget<int, std::vector<int>>::draw(int, char const*) const", "ns::Widget<T>::draw"),
+            ("core::panicking::panic_fmt::h0123456789abcdef", "core::panicking::panic_fmt"),
+            ("operator new(unsigned long)", "operator new"),
+            ("main", "main"),
+            ("  spaced   name(int)", "spaced name"),
+        ],
+    )
+    def test_normalize(self, function: str, expected: str) -> None:
+        """Test argument, template and hash removal."""
+        assert normalize_function(function) == expected
+
+
+class TestSignatureGenerator:
+    """Tests for building signatures from frames and results."""
+
+    def test_fixture_signature(self) -> None:
+        """Test the signature of the sample analysis."""
+        signature = SignatureGenerator().from_json(SAMPLE_JSON)
+
+        assert signature.frames[:3] == ("`anonymous namespace'::CrashFunction", "main", "__tmainCRTStartup")
+        assert signature.frames[3] == "kernel32.dll@0x16fd7"
+        assert signature.signature == " | ".join(signature.frames)
+        assert signature.crash_type == "EXCEPTION_ACCESS_VIOLATION_WRITE"
+
+    def test_matches_model(self) -> None:
+        """Test that the JSON shortcut agrees with the full model."""
+        generator = SignatureGenerator()
+
+        assert generator.from_json(SAMPLE_JSON) == generator.from_result(StackwalkResult.from_json(SAMPLE_JSON))
+
+    def test_skip_list_and_frame_count(self) -> None:
+        """Test that crash plumbing frames are skipped and the length is capped."""
+        frames = [
+            _frame("__GI_raise"),
+            _frame("abort"),
+            _frame("core::panicking::panic_fmt::h0123456789abcdef"),
+            _frame("malloc"),
+            _frame("app::parse(char const*)"),
+            _frame(None),
+            _frame("main"),
+        ]
+        signature = SignatureGenerator(frame_count=2).from_frames(frames)
+
+        assert signature.frames == ("app::parse", "app@0x10")
+
+    def test_custom_skip_list(self) -> None:
+        """Test replacing the default skip list."""
+        frames = [_frame("my_assert"), _frame("abort"), _frame("main")]
+        signature = SignatureGenerator(skip_functions=[r"my_assert$"]).from_frames(frames)
+
+        assert signature.frames == ("abort", "main")
+
+    def test_without_crashing_thread(self) -> None:
+        """Test the fallback to crash_info.crashing_thread and the empty signature."""
+        data = json.loads(SAMPLE_JSON)
+        data["crashing_thread"] = None
+        generator = SignatureGenerator()
+
+        assert generator.from_json(json.dumps(data)) == generator.from_json(SAMPLE_JSON)
+
+        data["crash_info"]["crashing_thread"] = None
+        assert generator.from_json(json.dumps(data)).signature == "EMPTY: EXCEPTION_ACCESS_VIOLATION_WRITE"
@@ -0,0 +1,97 @@
+"""Tests for the persistent crash signature index and the top_crashers tool."""
+
+from pathlib import Path
+
+import pytest
+
+from minidumpmcp.analysis.signature import CrashSignature
+from minidumpmcp.analysis.signature_index import SignatureIndex
+from minidumpmcp.tools.signatures import SignatureProvider
+
+SIG_A = CrashSignature("a | main", ("a", "main"), "SIGSEGV")
+SIG_B = CrashSignature("b | main", ("b", "main"), "SIGABRT")
+
+
+class TestSignatureIndex:
+    """Tests for recording and querying signatures."""
+
+    def setup_method(self) -> None:
+        """Create an in-memory index."""
+        self.index = SignatureIndex(":memory:")
+
+    def teardown_method(self) -> None:
+        """Close the index."""
+        self.index.close()
+
+    def test_counts_distinct_dumps(self) -> None:
+        """Test that each dump is counted once per signature."""
+        assert self.index.record(SIG_A, "dump1", seen_at=100.0) is True
+        assert self.index.record(SIG_A, "dump2", seen_at=200.0) is True
+        assert self.index.record(SIG_A, "dump1", seen_at=300.0) is False
+        self.index.record(SIG_B, "dump3", seen_at=150.0)
+
+        top = self.index.top()
+        assert [row["signature"] for row in top] == ["a | main", "b | main"]
+        assert top[0]["dump_count"] == 2
+        assert (top[0]["first_seen"], top[0]["last_seen"]) == (100.0, 300.0)
+        assert self.index.total_dumps() == 3
+        assert self.index.dumps("a | main") == ["dump2", "dump1"]
+
+    def test_reanalysis_moves_dump(self) -> None:
+        """Test that a dump re-analyzed with a new signature is moved."""
+        self.index.record(SIG_A, "dump1", seen_at=100.0)
+        self.index.record(SIG_B, "dump1", seen_at=200.0)
+
+        assert [row["signature"] for row in self.index.top()] == ["b | main"]
+        assert self.index.signature_of("dump1") == "b | main"
+
+    def test_since(self) -> None:
+        """Test restricting counts to recent dumps."""
+        self.index.record(SIG_A, "dump1", seen_at=100.0)
+        self.index.record(SIG_A, "dump2", seen_at=110.0)
+        self.index.record(SIG_B, "dump3", seen_at=500.0)
+
+        recent = self.index.top(since=400.0)
+        assert [(row["signature"], row["dump_count"]) for row in recent] == [("b | main", 1)]
+        assert self.index.total_dumps(since=400.0) == 1
+
+    def test_persistence(self, tmp_path: Path) -> None:
+        """Test that the index survives reopening."""
+        path = tmp_path / "nested" / "signatures.sqlite3"
+        index = SignatureIndex(path)
+        index.record(SIG_A, "dump1")
+        index.close()
+
+        reopened = SignatureIndex(path)
+        assert reopened.top()[0]["signature"] == "a | main"
+        reopened.close()
+
+
+class TestTopCrashers:
+    """Tests for the top_crashers tool."""
+
+    @pytest.mark.asyncio
+    async def test_top_crashers(self) -> None:
+        """Test ranking, shares and samples."""
+        index = SignatureIndex(":memory:")
+        for number in range(3):
+            index.record(SIG_A, f"a{number}")
+        index.record(SIG_B, "b0")
+
+        result = await SignatureProvider(index).top_crashers(limit=1, sample_dumps=2)
+
+        assert result["success"] is True
+        assert result["total_dumps"] == 4
+        (crasher,) = result["crashers"]
+        assert crasher["signature"] == "a | main"
+        assert crasher["count"] == 3
+        assert crasher["percent"] == 75.0
+        assert len(crasher["sample_dumps"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self) -> None:
+        """Test argument validation."""
+        provider = SignatureProvider(SignatureIndex(":memory:"))
+
+        assert (await provider.top_crashers(limit=0))["error_code"] == "INVALID_PARAMETER"
+        assert (await provider.top_crashers(since_hours=-1))["error_code"] == "INVALID_PARAMETER"
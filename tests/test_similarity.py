@@ -0,0 +1,109 @@
+"""Tests for near-duplicate crash search."""
+
+from pathlib import Path
+
+import pytest
+
+from minidumpmcp.analysis.cache import AnalysisCache, CachedAnalysis, hash_minidump
+from minidumpmcp.analysis.signature import SignatureGenerator
+from minidumpmcp.analysis.similarity import MinHasher, SimilarityIndex, estimate_similarity, shingles
+from minidumpmcp.tools.similarity import SimilarityProvider
+
+SAMPLE_JSON = (Path(__file__).parent / "testdata" / "stackwalk" / "test_app.json").read_text()
+
+BASE = [f"app::layer{depth}" for depth in range(20)]
+
+
+class TestMinHash:
+    """Tests for sketches and similarity estimates."""
+
+    def test_identical_and_disjoint(self) -> None:
+        """Test the extremes of the estimate."""
+        hasher = MinHasher(64)
+        sketch = hasher.sketch(shingles(BASE))
+
+        assert estimate_similarity(sketch, hasher.sketch(shingles(BASE))) == 1.0
+        assert estimate_similarity(sketch, hasher.sketch(shingles([f"other{i}" for i in range(20)]))) < 0.1
+        assert estimate_similarity(sketch, hasher.sketch([])) == 0.0
+
+    def test_estimate_tracks_jaccard(self) -> None:
+        """Test that one inserted frame keeps the estimate close to the true Jaccard."""
+        first = shingles(BASE)
+        second = shingles(BASE[:5] + ["app::inlined"] + BASE[5:])
+        jaccard = len(first & second) / len(first | second)
+        hasher = MinHasher(256)
+
+        assert estimate_similarity(hasher.sketch(first), hasher.sketch(second)) == pytest.approx(jaccard, abs=0.1)
+
+
+class TestSimilarityIndex:
+    """Tests for LSH candidate search."""
+
+    def setup_method(self) -> None:
+        """Index a family of near-identical stacks and unrelated ones."""
+        self.index = SimilarityIndex(":memory:")
+        self.index.add("original", BASE, signature="app::layer0 | app::layer1")
+        self.index.add("inlined", BASE[:3] + ["app::inlined"] + BASE[3:], seen_at=1.0)
+        for number in range(50):
+            self.index.add(f"unrelated{number}", [f"lib{number}::f{depth}" for depth in range(20)])
+
+    def teardown_method(self) -> None:
+        """Close the index."""
+        self.index.close()
+
+    def test_finds_near_duplicate(self) -> None:
+        """Test that the variant with an extra frame is found first."""
+        matches = self.index.query(self.index.sketch(BASE), k=3, min_similarity=0.5, exclude="original")
+
+        assert [match["dump_hash"] for match in matches] == ["inlined"]
+        assert 0.5 <= matches[0]["similarity"] < 1.0
+
+    def test_stored_sketch_and_replace(self) -> None:
+        """Test looking up stored sketches and re-adding a dump."""
+        sketch = self.index.stored_sketch("original")
+        assert sketch is not None
+        assert estimate_similarity(sketch, self.index.sketch(BASE)) == 1.0
+
+        self.index.add("original", ["something::else"])
+        assert len(self.index) == 52
+        matches = self.index.query(self.index.sketch(BASE), min_similarity=0.9)
+        assert [match["dump_hash"] for match in matches] == []
+
+
+class TestFindSimilarCrashes:
+    """Tests for the find_similar_crashes tool."""
+
+    @pytest.mark.asyncio
+    async def test_by_path_and_analysis_hash(self, tmp_path: Path) -> None:
+        """Test lookups by analyzed dump and by cached analysis."""
+        index = SimilarityIndex(":memory:")
+        cache = AnalysisCache()
+        provider = SimilarityProvider(index, cache)
+
+        minidump_file = tmp_path / "crash.dmp"
+        minidump_file.write_bytes(b"MDMP")
+        entry = CachedAnalysis("analysis-1", minidump_file, "cmd", SAMPLE_JSON)
+        cache.put(entry)
+        labels = SignatureGenerator().labels(entry.model(), 32)
+        index.add(await hash_minidump(minidump_file), labels, analysis_hash="analysis-1")
+        index.add("previous", labels[:2] + ["extra"] + labels[2:], analysis_hash="analysis-0")
+
+        by_hash = await provider.find_similar_crashes(analysis_hash="analysis-1", min_similarity=0.3)
+        by_path = await provider.find_similar_crashes(minidump_path=str(minidump_file), min_similarity=0.3)
+
+        assert by_hash["success"] is True
+        assert [match["analysis_hash"] for match in by_hash["similar_crashes"]] == ["analysis-0"]
+        assert by_path["similar_crashes"] == by_hash["similar_crashes"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_inputs(self, tmp_path: Path) -> None:
+        """Test errors for missing arguments, analyses and unindexed dumps."""
+        provider = SimilarityProvider(SimilarityIndex(":memory:"), AnalysisCache())
+        unindexed = tmp_path / "new.dmp"
+        unindexed.write_bytes(b"MDMP")
+
+        assert (await provider.find_similar_crashes())["error_code"] == "INVALID_PARAMETER"
+        assert (await provider.find_similar_crashes(analysis_hash="nope"))["error_code"] == "ANALYSIS_NOT_FOUND"
+        result = await provider.find_similar_crashes(minidump_path=str(unindexed))
+        assert result["error_code"] == "INVALID_PARAMETER"
+        assert "run stackwalk_minidump first" in result["error"]
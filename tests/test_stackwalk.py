@@ -1,10 +1,19 @@
 """Tests for stackwalk tools."""
 
+import asyncio
+import threading
 from pathlib import Path
+from typing import Any
 
 import pytest
 
+from minidumpmcp.analysis.cache import CachedAnalysis
+from minidumpmcp.analysis.signature_index import SignatureIndex
+from minidumpmcp.analysis.similarity import SimilarityIndex
+from minidumpmcp.deadline import RuntimeModel, deadline
+from minidumpmcp.tools import stackwalk as stackwalk_module
 from minidumpmcp.tools.stackwalk import StackwalkProvider
+from minidumpmcp.tracing import RingBuffer, Tracer
 
 
 class TestStackwalkProvider:
@@ -173,3 +182,318 @@ class TestStackwalkProvider:
         assert main_module["filename"] == "test_app.exe"
         assert main_module["loaded_symbols"] is True
         assert main_module["missing_symbols"] is False
+
+
+class TestStackwalkOutput:
+    """Tests for output formats, projection and caching of stackwalk_minidump."""
+
+    @pytest.fixture
+    def provider(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> StackwalkProvider:
+        """Provider whose stackwalk binary replays a recorded cyborg-mode result."""
+        fake_binary = tmp_path / "minidump-stackwalk"
+        fake_binary.write_text("")
+        testdata = Path(__file__).parent / "testdata" / "stackwalk"
+        self.calls = 0
+        self.timeouts: list[object] = []
+
+        async def fake_run_subprocess(cmd: list[str | Path], **kwargs: object) -> str:
+            self.calls += 1
+            self.timeouts.append(kwargs.get("timeout"))
+            json_output = Path(cmd[cmd.index("--cyborg") + 1])
+            json_output.write_text((testdata / "test_app.json").read_text())
+            return (testdata / "test_app.txt").read_text()
+
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk._get_bin_path", lambda name: fake_binary)
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.run_subprocess", fake_run_subprocess)
+        return StackwalkProvider()
+
+    @pytest.fixture
+    def minidump_file(self, tmp_path: Path) -> Path:
+        """Placeholder minidump file."""
+        path = tmp_path / "test.dmp"
+        path.write_bytes(b"MDMP")
+        return path
+
+    @pytest.mark.asyncio
+    async def test_fields_and_max_frames(self, provider: StackwalkProvider, minidump_file: Path) -> None:
+        """Test that only projected fields are returned."""
+        result = await provider.stackwalk_minidump(
+            str(minidump_file), fields=["crash_info", "crashing_thread"], max_frames=2
+        )
+
+        assert result["success"] is True
+        assert set(result["data"]) == {"crash_info", "crashing_thread"}
+        assert len(result["data"]["crashing_thread"]["frames"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_indexing_and_projection_leave_the_event_loop(
+        self, provider: StackwalkProvider, minidump_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that new and cached analyses are indexed and projected on worker threads."""
+        loop_thread = threading.get_ident()
+        threads: list[tuple[str, int]] = []
+        index = CachedAnalysis.__init__
+        project = stackwalk_module.project_json
+
+        def recording_index(self: CachedAnalysis, *args: Any) -> None:
+            threads.append(("index", threading.get_ident()))
+            index(self, *args)
+
+        def recording_project(text: str, selector: Any) -> Any:
+            threads.append(("project", threading.get_ident()))
+            return project(text, selector)
+
+        monkeypatch.setattr(CachedAnalysis, "__init__", recording_index)
+        monkeypatch.setattr(stackwalk_module, "project_json", recording_project)
+
+        await provider.stackwalk_minidump(str(minidump_file), fields=["crash_info"])
+        cached = await provider.stackwalk_minidump(str(minidump_file), fields=["crash_info"])
+
+        assert cached["cached"] is True
+        assert [stage for stage, _ in threads] == ["index", "project", "project"]
+        assert all(thread != loop_thread for _, thread in threads)
+
+    @pytest.mark.asyncio
+    async def test_new_symbols_bypass_the_cache(
+        self, provider: StackwalkProvider, minidump_file: Path, tmp_path: Path
+    ) -> None:
+        """Test that symbols written after an analysis, e.g. by extract_symbols, lead to a fresh walk."""
+        symbols = tmp_path / "symbols"
+        symbols.mkdir()
+
+        first = await provider.stackwalk_minidump(str(minidump_file), str(symbols))
+        again = await provider.stackwalk_minidump(str(minidump_file), str(symbols))
+        module = symbols / "test_app.pdb" / "5A9832E5287241C1838ED98914E9B7FF1"
+        module.mkdir(parents=True)
+        (module / "test_app.sym").write_text("MODULE windows x86_64 5A9832E5287241C1838ED98914E9B7FF1 test_app.pdb\n")
+        fresh = await provider.stackwalk_minidump(str(minidump_file), str(symbols))
+
+        assert (first["cached"], again["cached"], fresh["cached"]) == (False, True, False)
+        assert fresh["analysis_hash"] != first["analysis_hash"]
+        assert self.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_projection(self, provider: StackwalkProvider, minidump_file: Path) -> None:
+        """Test rejection of malformed field paths."""
+        result = await provider.stackwalk_minidump(str(minidump_file), fields=["threads[oops]"])
+
+        assert result["success"] is False
+        assert result["error_code"] == "INVALID_PARAMETER"
+
+    @pytest.mark.asyncio
+    async def test_projection_requires_json(self, provider: StackwalkProvider, minidump_file: Path) -> None:
+        """Test that projections are rejected for text output."""
+        result = await provider.stackwalk_minidump(str(minidump_file), output_format="text", max_frames=3)
+
+        assert result["success"] is False
+        assert "output_format" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_output_format(self, provider: StackwalkProvider, minidump_file: Path) -> None:
+        """Test rejection of unsupported output formats."""
+        result = await provider.stackwalk_minidump(str(minidump_file), output_format="xml")
+
+        assert result["success"] is False
+        assert result["error_code"] == "INVALID_PARAMETER"
+
+    @pytest.mark.asyncio
+    async def test_both_formats_from_one_run(self, provider: StackwalkProvider, minidump_file: Path) -> None:
+        """Test that output_format='both' returns JSON and text from a single walk."""
+        result = await provider.stackwalk_minidump(str(minidump_file), output_format="both", max_frames=1)
+
+        assert self.calls == 1
+        assert result["success"] is True
+        assert "--cyborg" in result["command"]
+        assert len(result["data"]["crashing_thread"]["frames"]) == 1
+        assert result["text"].startswith("Operating system: Windows NT")
+
+    @pytest.mark.asyncio
+    async def test_text_report_is_free_after_json(self, provider: StackwalkProvider, minidump_file: Path) -> None:
+        """Test that the text report is served from the cache once the JSON exists."""
+        await provider.stackwalk_minidump(str(minidump_file))
+        result = await provider.stackwalk_minidump(str(minidump_file), output_format="text")
+
+        assert self.calls == 1
+        assert result["cached"] is True
+        assert "Crash reason:  EXCEPTION_ACCESS_VIOLATION_WRITE" in result["data"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_analysis_is_cached(self, provider: StackwalkProvider, minidump_file: Path) -> None:
+        """Test that a second call is served from the analysis cache."""
+        first = await provider.stackwalk_minidump(str(minidump_file))
+        second = await provider.stackwalk_minidump(str(minidump_file), fields=["crash_info"])
+
+        assert self.calls == 1
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert second["analysis_hash"] == first["analysis_hash"]
+        assert second["data"] == {"crash_info": first["data"]["crash_info"]}
+        assert first["analysis_hash"] in provider.cache
+
+    @pytest.mark.asyncio
+    async def test_stages_are_traced(self, provider: StackwalkProvider, minidump_file: Path) -> None:
+        """Test that every stage of a fresh and of a cached analysis is a span of the request."""
+        traces = RingBuffer()
+        tracer = Tracer([traces])
+        for _ in range(2):
+            with tracer.trace("tool stackwalk_minidump"):
+                await provider.stackwalk_minidump(str(minidump_file))
+
+        cached, fresh = traces.query()
+        assert [s["name"] for s in fresh["spans"]] == [
+            "stackwalk.validate",
+            "stackwalk.prepare",
+            "stackwalk.cache",
+            "stackwalk.locate",
+            "stackwalk.estimate",
+            "stackwalk.read",
+            "stackwalk.index",
+            "stackwalk.project",
+            "stackwalk.publish",
+        ]
+        assert [s["name"] for s in cached["spans"]] == [
+            "stackwalk.validate",
+            "stackwalk.prepare",
+            "stackwalk.cache",
+            "stackwalk.project",
+        ]
+        assert cached["spans"][2]["attributes"] == {"hit": True}
+
+    @pytest.mark.asyncio
+    async def test_timeout(
+        self, provider: StackwalkProvider, minidump_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the provider's timeout applies unless a call overrides it, and that a timeout is reported."""
+        await provider.stackwalk_minidump(str(minidump_file))
+        await StackwalkProvider(timeout=5.0).stackwalk_minidump(str(minidump_file))
+        await StackwalkProvider().stackwalk_minidump(str(minidump_file), timeout=600.0)
+        assert self.timeouts == [30.0, 5.0, 600.0]
+
+        async def slow_run_subprocess(cmd: list[str | Path], **kwargs: object) -> str:
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.run_subprocess", slow_run_subprocess)
+        result = await StackwalkProvider(timeout=5.0).stackwalk_minidump(str(minidump_file))
+
+        assert result["success"] is False
+        assert result["error_code"] == "TOOL_EXECUTION_FAILED"
+        assert "Killed after the 5s timeout" in result["error"]
+        assert "submit_analysis" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_over_budget(self, provider: StackwalkProvider) -> None:
+        """Test that analyses estimated to outlast their budget are downgraded or rejected up front."""
+        dump = Path(__file__).parent / "testdata" / "test.dmp"
+        slow = RuntimeModel(base=60.0)
+
+        downgraded = await StackwalkProvider(runtime_model=slow).stackwalk_minidump(str(dump))
+        assert downgraded["success"] is True
+        assert downgraded["downgraded"] is True
+        assert downgraded["data"]["crash_info"]["type"] == "EXCEPTION_ACCESS_VIOLATION_WRITE"
+        assert downgraded["data"]["module_count"] == 13
+        assert (downgraded["estimated_seconds"], downgraded["budget_seconds"]) == (75.2, 30.0)
+
+        rejected = await StackwalkProvider(runtime_model=slow, over_budget="reject").stackwalk_minidump(str(dump))
+        assert rejected["success"] is False
+        assert rejected["error_code"] == "DEADLINE_EXCEEDED"
+        assert self.calls == 0
+
+        ran = await StackwalkProvider(runtime_model=slow).stackwalk_minidump(str(dump), over_budget="run")
+        assert ran["success"] is True
+        assert "downgraded" not in ran
+        assert self.calls == 1
+
+        invalid = await provider.stackwalk_minidump(str(dump), over_budget="later")
+        assert invalid["error_code"] == "INVALID_PARAMETER"
+
+    @pytest.mark.asyncio
+    async def test_request_deadline(self, provider: StackwalkProvider) -> None:
+        """Test that the request's deadline caps the timeout and turns away analyses it cannot fit."""
+        dump = Path(__file__).parent / "testdata" / "test.dmp"
+        with deadline(0.1):
+            downgraded = await provider.stackwalk_minidump(str(dump))
+        assert downgraded["downgraded"] is True
+        assert self.calls == 0
+
+        with deadline(-1.0):
+            rejected = await provider.stackwalk_minidump(str(dump), over_budget="run")
+        assert rejected["error_code"] == "DEADLINE_EXCEEDED"
+        assert rejected["budget_seconds"] == 0.0
+        assert self.calls == 0
+
+        with deadline(5.0):
+            result = await provider.stackwalk_minidump(str(dump))
+        assert result["success"] is True
+        assert isinstance(self.timeouts[0], float) and 4.0 < self.timeouts[0] <= 5.0
+
+
+class TestStackwalkSignatures:
+    """Tests for feeding the signature index from stackwalk_minidump."""
+
+    @pytest.mark.asyncio
+    async def test_new_analysis_is_indexed(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that fresh and cached analyses report the indexed signature."""
+        testdata = Path(__file__).parent / "testdata" / "stackwalk"
+        fake_binary = tmp_path / "minidump-stackwalk"
+        fake_binary.write_text("")
+
+        async def fake_run_subprocess(cmd: list[str | Path], **kwargs: object) -> str:
+            Path(cmd[cmd.index("--cyborg") + 1]).write_text((testdata / "test_app.json").read_text())
+            return ""
+
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk._get_bin_path", lambda name: fake_binary)
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.run_subprocess", fake_run_subprocess)
+        minidump_file = tmp_path / "test.dmp"
+        minidump_file.write_bytes(b"MDMP")
+        index = SignatureIndex(":memory:")
+        similarity = SimilarityIndex(":memory:")
+        provider = StackwalkProvider(signatures=index, similarity=similarity)
+
+        first = await provider.stackwalk_minidump(str(minidump_file))
+        second = await provider.stackwalk_minidump(str(minidump_file))
+
+        assert first["signature"].startswith("`anonymous namespace'::CrashFunction | main")
+        assert second["cached"] is True
+        assert second["signature"] == first["signature"]
+        assert index.top()[0]["dump_count"] == 1
+        assert len(similarity) == 1
+
+
+class TestParseStackwalkReport:
+    """Tests for parsing saved text reports into cached analyses."""
+
+    @pytest.mark.asyncio
+    async def test_report_is_parsed_and_cached(self) -> None:
+        """Test that a text report becomes a projectable cached analysis."""
+        provider = StackwalkProvider()
+        report = Path(__file__).parent / "testdata" / "stackwalk" / "test_app.txt"
+
+        first = await provider.parse_stackwalk_report(str(report), fields=["crash_info", "crashing_thread"])
+        second = await provider.parse_stackwalk_report(str(report), max_frames=1)
+
+        assert first["success"] is True
+        assert first["cached"] is False
+        assert first["data"]["crash_info"]["type"] == "EXCEPTION_ACCESS_VIOLATION_WRITE"
+        assert first["data"]["crashing_thread"]["thread_id"] == 3060
+        assert second["cached"] is True
+        assert len(second["data"]["threads"][0]["frames"]) == 1
+        assert provider.cache.get(first["analysis_hash"]) is not None
+
+    @pytest.mark.asyncio
+    async def test_not_a_report(self, tmp_path: Path) -> None:
+        """Test that unrelated files are rejected."""
+        path = tmp_path / "notes.txt"
+        path.write_text("hello\n")
+
+        result = await StackwalkProvider().parse_stackwalk_report(str(path))
+
+        assert result["success"] is False
+        assert result["error_code"] == "MINIDUMP_ANALYSIS_FAILED"
+
+    @pytest.mark.asyncio
+    async def test_missing_report(self) -> None:
+        """Test handling of a missing report file."""
+        result = await StackwalkProvider().parse_stackwalk_report("/nonexistent/report.txt")
+
+        assert result["success"] is False
+        assert result["error_code"] == "FILE_VALIDATION_FAILED"
@@ -0,0 +1,146 @@
+"""Tests for running, limiting and stopping minidump tool subprocesses."""
+
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from minidumpmcp.tools import _common
+from minidumpmcp.tools._common import ResourceLimits, SubprocessStats, ToolExecutionError, run_subprocess
+
+
+async def _started(pid_file: Path) -> int:
+    deadline = time.monotonic() + 30
+    while not pid_file.exists() or not pid_file.read_text():
+        assert time.monotonic() < deadline, "Child did not start"
+        await asyncio.sleep(0.01)
+    return int(pid_file.read_text())
+
+
+def _child(pid_file: Path, ignore_sigterm: bool = False) -> list[str]:
+    """Command of a child that records its pid, then sleeps."""
+    script = "import os, signal, time\n"
+    if ignore_sigterm:
+        script += "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+    script += f"open({str(pid_file)!r}, 'w').write(str(os.getpid()))\ntime.sleep(60)\n"
+    return [sys.executable, "-c", script]
+
+
+def _reaped(pid: int) -> bool:
+    """Whether *pid* is gone, zombies included."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    return False
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch: pytest.MonkeyPatch) -> SubprocessStats:
+    """Fresh counters for every test."""
+    stats = SubprocessStats()
+    monkeypatch.setattr(_common, "subprocess_stats", stats)
+    return stats
+
+
+class TestResources:
+    """Tests for resource limits and usage of run_subprocess children."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("prlimit", [True, False], ids=["prlimit", "wrapper"])
+    async def test_limits_are_applied(self, monkeypatch: pytest.MonkeyPatch, prlimit: bool) -> None:
+        """Test that the configured limits are set in the child and others are inherited."""
+        if prlimit and not hasattr(resource, "prlimit"):
+            pytest.skip("prlimit is not available")
+        monkeypatch.setattr(_common, "_PRLIMIT", prlimit)
+        script = (
+            "import json, resource; "
+            "print(json.dumps([resource.getrlimit(getattr(resource, name))[0] "
+            "for name in ('RLIMIT_AS', 'RLIMIT_CPU', 'RLIMIT_NOFILE')]))"
+        )
+        limits = ResourceLimits(address_space=8 * 1024**3, open_files=64)
+
+        output = await run_subprocess([sys.executable, "-c", script], limits=limits)
+
+        address_space, cpu_seconds, open_files = json.loads(output)
+        assert (address_space, open_files) == (8 * 1024**3, 64)
+        assert cpu_seconds == resource.getrlimit(resource.RLIMIT_CPU)[0]
+
+    @pytest.mark.asyncio
+    async def test_cpu_limit(self, stats: SubprocessStats) -> None:
+        """Test that a child spinning past its CPU limit is stopped by SIGXCPU and accounted as failed."""
+        with pytest.raises(ToolExecutionError, match="SIGXCPU"):
+            await run_subprocess(
+                [sys.executable, "-c", "while True: pass"], limits=ResourceLimits(cpu_seconds=1), tool="spin"
+            )
+
+        usage = stats.tools["spin"]
+        assert (usage.runs, usage.failed) == (1, 1)
+        assert usage.user_seconds + usage.system_seconds >= 0.9
+
+    @pytest.mark.asyncio
+    async def test_usage_is_recorded(self, stats: SubprocessStats) -> None:
+        """Test that CPU time and peak memory of every run are added to the tool's totals."""
+        script = "data = bytearray(64 * 1024 * 1024); print(len(data))"
+        for _ in range(2):
+            assert await run_subprocess([sys.executable, "-c", script], tool="alloc") == f"{64 * 1024 * 1024}\n"
+
+        usage = stats.tools["alloc"]
+        assert (usage.runs, usage.failed) == (2, 0)
+        assert usage.max_rss_bytes > 64 * 1024 * 1024
+        assert usage.wall_seconds > 0 and usage.user_seconds > 0
+
+
+class TestRunSubprocess:
+    """Tests for timeouts and cancellation of run_subprocess."""
+
+    @pytest.mark.asyncio
+    async def test_cancellation_stops_child(self, tmp_path: Path, stats: SubprocessStats) -> None:
+        """Test that cancelling the caller terminates and reaps the child before the cancellation propagates."""
+        pid_file = tmp_path / "pid"
+        task = asyncio.ensure_future(run_subprocess(_child(pid_file), timeout=60.0))
+        pid = await _started(pid_file)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert _reaped(pid)
+        assert (stats.cancelled, stats.timed_out, stats.killed) == (1, 0, 0)
+        assert 50.0 < stats.reclaimed_seconds < 60.0
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_child_ignoring_sigterm(self, tmp_path: Path, stats: SubprocessStats) -> None:
+        """Test that a child ignoring SIGTERM is killed after the grace period."""
+        pid_file = tmp_path / "pid"
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await run_subprocess(_child(pid_file, ignore_sigterm=True), timeout=2.0, grace_period=0.2)
+
+        assert time.monotonic() - started < 10
+        assert _reaped(await _started(pid_file))
+        assert (stats.cancelled, stats.timed_out, stats.killed) == (0, 1, 1)
+        assert stats.reclaimed_seconds == 0.0
+
+    @pytest.mark.asyncio
+    async def test_repeated_cancellation_still_reaps(self, tmp_path: Path, stats: SubprocessStats) -> None:
+        """Test that the child is reaped even when the caller is cancelled again while it is stopped."""
+        pid_file = tmp_path / "pid"
+        task = asyncio.ensure_future(run_subprocess(_child(pid_file, ignore_sigterm=True), grace_period=0.5))
+        pid = await _started(pid_file)
+
+        task.cancel()
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert not _reaped(pid)
+
+        await asyncio.gather(*_common._stopping)
+        assert _reaped(pid)
+        assert (stats.cancelled, stats.killed) == (1, 1)
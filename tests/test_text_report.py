@@ -0,0 +1,70 @@
+"""Tests for the minidump-stackwalk text report parser."""
+
+import json
+from pathlib import Path
+
+from minidumpmcp.analysis.text_report import parse_text_report
+
+TESTDATA = Path(__file__).parent / "testdata" / "stackwalk"
+
+
+class TestParseTextReport:
+    """Tests comparing the parsed text report with the JSON output of the same run."""
+
+    def setup_method(self) -> None:
+        """Parse the text fixture and load its JSON counterpart."""
+        with open(TESTDATA / "test_app.txt", encoding="utf-8") as f:
+            self.parsed = parse_text_report(f)
+        self.expected = json.loads((TESTDATA / "test_app.json").read_text())
+
+    def test_header(self) -> None:
+        """Test system and crash information."""
+        assert self.parsed["crash_info"] == {
+            "type": self.expected["crash_info"]["type"],
+            "address": self.expected["crash_info"]["address"],
+            "crashing_thread": self.expected["crash_info"]["crashing_thread"],
+            "assertion": None,
+        }
+        for key in ("os", "os_ver", "cpu_arch", "cpu_info", "cpu_count"):
+            assert self.parsed["system_info"][key] == self.expected["system_info"][key]
+
+    def test_modules(self) -> None:
+        """Test loaded modules, address ranges and symbol status."""
+        assert self.parsed["main_module"] == self.expected["main_module"]
+        assert len(self.parsed["modules"]) == len(self.expected["modules"])
+        for parsed, expected in zip(self.parsed["modules"], self.expected["modules"], strict=True):
+            for key in ("filename", "base_addr", "end_addr", "version", "missing_symbols"):
+                assert parsed[key] == expected[key], key
+
+    def test_threads(self) -> None:
+        """Test thread metadata and symbolized frames."""
+        assert self.parsed["thread_count"] == len(self.expected["threads"])
+        for parsed, expected in zip(self.parsed["threads"], self.expected["threads"], strict=True):
+            assert parsed["thread_id"] == expected["thread_id"]
+            assert parsed["frame_count"] == expected["frame_count"]
+            for parsed_frame, expected_frame in zip(parsed["frames"], expected["frames"], strict=True):
+                for key in ("frame", "module", "function", "function_offset", "file", "line", "trust"):
+                    assert parsed_frame[key] == expected_frame[key], key
+
+    def test_frame_addresses(self) -> None:
+        """Test addresses recovered from registers and module offsets."""
+        top = self.parsed["threads"][0]["frames"][0]
+        assert top["offset"] == "0x0040429e"
+        assert top["module_offset"] == "0x0000429e"
+        assert top["registers"]["esp"] == "0x0012fe84"
+
+        kernel_frame = self.parsed["threads"][0]["frames"][3]
+        assert kernel_frame["module_offset"] == "0x00016fd7"
+        assert kernel_frame["offset"] == "0x7c816fd7"
+
+    def test_crashing_thread(self) -> None:
+        """Test that the crashed thread is duplicated like in the JSON output."""
+        crashing = self.parsed["crashing_thread"]
+        assert crashing["threads_index"] == 0
+        assert crashing["thread_id"] == self.parsed["threads"][0]["thread_id"]
+
+    def test_unknown_lines_are_ignored(self) -> None:
+        """Test that an empty or unrelated input yields an empty result."""
+        parsed = parse_text_report(["not a report\n", "\n"])
+        assert parsed["threads"] == []
+        assert parsed["crashing_thread"] is None
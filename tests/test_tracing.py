@@ -0,0 +1,189 @@
+"""Tests for request tracing."""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.server.middleware import MiddlewareContext
+from mcp.types import CallToolRequestParams
+
+from minidumpmcp.tools._common import run_subprocess
+from minidumpmcp.tools.tracing import TraceProvider
+from minidumpmcp.tracing import (
+    JsonLinesFile,
+    RingBuffer,
+    Tracer,
+    TracingMiddleware,
+    annotate,
+    request_id,
+    span,
+)
+
+
+class TestTracer:
+    """Tests for traces, spans and sampling."""
+
+    def test_spans(self) -> None:
+        """Test that spans nest under the current span and are exported with the root last."""
+        traces = RingBuffer()
+        tracer = Tracer([traces])
+
+        with span("outside") as outside:
+            assert outside is None and request_id() is None
+        with tracer.trace("tool stackwalk_minidump", request_id="req-1", caller="test") as root:
+            assert request_id() == "req-1"
+            with span("stackwalk.cache") as cache:
+                annotate(hit=False)
+                with span("subprocess", tool="minidump-stackwalk") as child:
+                    assert child is not None and cache is not None
+                    assert child.parent_id == cache.span_id
+            with pytest.raises(ValueError):
+                with span("stackwalk.index"):
+                    raise ValueError("bad JSON")
+        assert request_id() is None
+
+        (trace,) = traces.query()
+        assert trace["request_id"] == "req-1" and trace["span_id"] == root.span_id
+        assert trace["attributes"] == {"caller": "test"} and trace["status"] == "ok"
+        spans = {s["name"]: s for s in trace["spans"]}
+        assert list(spans) == ["subprocess", "stackwalk.cache", "stackwalk.index"]
+        assert spans["stackwalk.cache"]["parent_id"] == root.span_id
+        assert spans["stackwalk.cache"]["attributes"] == {"hit": False}
+        assert spans["subprocess"]["attributes"] == {"tool": "minidump-stackwalk"}
+        assert (spans["stackwalk.index"]["status"], spans["stackwalk.index"]["error"]) == (
+            "error",
+            "ValueError: bad JSON",
+        )
+
+    @pytest.mark.asyncio
+    async def test_propagation(self) -> None:
+        """Test that the request id and spans follow the request into tasks and threads."""
+        traces = RingBuffer()
+        tracer = Tracer([traces])
+
+        def in_thread() -> str | None:
+            with span("thread"):
+                return request_id()
+
+        async def in_task(position: int) -> None:
+            with span("task", position=position):
+                await asyncio.sleep(0)
+
+        with tracer.trace("tool triage_directory", request_id="req-2"):
+            assert await asyncio.to_thread(in_thread) == "req-2"
+            await asyncio.gather(in_task(1), in_task(2))
+
+        (trace,) = traces.query()
+        assert sorted(s["name"] for s in trace["spans"]) == ["task", "task", "thread"]
+        assert {s["request_id"] for s in trace["spans"]} == {"req-2"}
+
+    def test_sampling(self) -> None:
+        """Test that unsampled traces are not recorded, unless slow or forced."""
+        traces = RingBuffer()
+        with Tracer([traces], sample_rate=0.0).trace("tool fast"):
+            with span("stage") as stage:
+                assert stage is None
+        assert len(traces) == 0
+
+        with Tracer([traces], sample_rate=0.0).trace("tool forced", force=True):
+            pass
+        tracer = Tracer([traces], sample_rate=0.0, slow_threshold=0.05)
+        with tracer.trace("tool fast"):
+            with span("stage"):
+                pass
+        with tracer.trace("tool slow"):
+            with span("stage"):
+                time.sleep(0.06)
+
+        assert [t["name"] for t in traces.query()] == ["tool slow", "tool forced"]
+        assert [s["name"] for s in traces.query(name="slow")[0]["spans"]] == ["stage"]
+
+    def test_ring_buffer_query(self) -> None:
+        """Test that the buffer keeps the latest traces and filters them."""
+        traces = RingBuffer(capacity=3)
+        tracer = Tracer([traces])
+        for position in range(4):
+            with tracer.trace(f"tool {'slow' if position == 2 else 'fast'}", request_id=f"req-{position}"):
+                if position == 2:
+                    time.sleep(0.02)
+
+        assert [t["request_id"] for t in traces.query()] == ["req-3", "req-2", "req-1"]
+        assert [t["request_id"] for t in traces.query(limit=1)] == ["req-3"]
+        assert [t["request_id"] for t in traces.query(name="slow")] == ["req-2"]
+        assert [t["request_id"] for t in traces.query(min_duration=0.02)] == ["req-2"]
+        assert traces.query(request_id="req-0") == []
+
+    def test_json_lines_rotation(self, tmp_path: Path) -> None:
+        """Test that spans are appended as JSON lines and the file is rotated by size."""
+        path = tmp_path / "traces" / "spans.jsonl"
+        exporter = JsonLinesFile(path, max_bytes=1024, backups=2)
+        tracer = Tracer([exporter])
+        for position in range(20):
+            with tracer.trace("tool stackwalk_minidump", request_id=f"req-{position}"):
+                with span("stackwalk.validate"):
+                    pass
+        tracer.close()
+
+        assert sorted(p.name for p in path.parent.iterdir()) == ["spans.jsonl", "spans.jsonl.1", "spans.jsonl.2"]
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert lines[-1]["request_id"] == "req-19" and lines[-1]["name"] == "tool stackwalk_minidump"
+        assert lines[-2]["name"] == "stackwalk.validate" and lines[-2]["parent_id"] == lines[-1]["span_id"]
+
+
+class TestTracingMiddleware:
+    """Tests for tracing MCP requests."""
+
+    @pytest.mark.asyncio
+    async def test_tool_call(self) -> None:
+        """Test that a tool call is traced with the subprocess it runs, and found with get_traces."""
+        traces = RingBuffer()
+        mcp: FastMCP[None] = FastMCP("test")
+        mcp.add_middleware(TracingMiddleware(Tracer([traces])))
+        mcp.tool(TraceProvider(traces).get_traces)
+
+        @mcp.tool
+        async def echo(text: str) -> str:
+            return await run_subprocess([sys.executable, "-c", f"print({text!r})"], tool="python")
+
+        async with Client(mcp) as client:
+            await client.call_tool("echo", {"text": "hi"})
+            result = await client.call_tool("get_traces", {"name": "echo"})
+
+        (trace,) = result.data["traces"]
+        assert trace["name"] == "tool echo"
+        (subprocess_span,) = trace["spans"]
+        assert subprocess_span["name"] == "subprocess"
+        assert subprocess_span["attributes"]["tool"] == "python"
+        assert subprocess_span["attributes"]["returncode"] == 0
+        assert subprocess_span["attributes"]["pid"] > 0
+
+    @pytest.mark.asyncio
+    async def test_request_meta(self) -> None:
+        """Test that callers can choose the request id and force a trace to be kept."""
+        traces = RingBuffer()
+        middleware = TracingMiddleware(Tracer([traces], sample_rate=0.0))
+
+        async def call_next(context: Any) -> str | None:
+            return request_id()
+
+        async def call(meta: dict[str, Any]) -> Any:
+            message = CallToolRequestParams.model_validate({"name": "echo", "arguments": {}, "_meta": meta})
+            return await middleware.on_call_tool(MiddlewareContext(message=message), call_next)
+
+        assert await call({"request_id": "client-1"}) == "client-1"
+        assert await call({"request_id": "client-2", "trace": True}) == "client-2"
+        assert [t["request_id"] for t in traces.query()] == ["client-2"]
+
+    @pytest.mark.asyncio
+    async def test_get_traces_validation(self) -> None:
+        """Test that invalid queries are rejected."""
+        provider = TraceProvider(RingBuffer())
+
+        assert (await provider.get_traces(limit=0))["error_code"] == "INVALID_PARAMETER"
+        assert (await provider.get_traces(min_duration_ms=-1))["error_code"] == "INVALID_PARAMETER"
+        assert await provider.get_traces() == {"success": True, "traces": [], "held": 0}
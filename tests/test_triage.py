@@ -0,0 +1,222 @@
+"""Tests for directory triage."""
+
+import asyncio
+import json
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from fastmcp import FastMCP
+
+from minidumpmcp.tools.stackwalk import StackwalkProvider
+from minidumpmcp.tools.triage import TriageProvider, find_minidumps, triage_file
+
+TESTDATA = Path(__file__).parent / "testdata"
+
+
+@pytest.fixture
+def dump_dir(tmp_path: Path) -> Path:
+    """Directory with two copies of the test dump, one nested, and a corrupt dump."""
+    root = tmp_path / "dumps"
+    (root / "nested").mkdir(parents=True)
+    shutil.copy(TESTDATA / "test.dmp", root / "a.dmp")
+    shutil.copy(TESTDATA / "test.dmp", root / "nested" / "b.DMP")
+    (root / "corrupt.dmp").write_bytes(b"garbage")
+    (root / "notes.txt").write_text("not a dump")
+    return root
+
+
+class TestFindMinidumps:
+    """Tests for locating dumps."""
+
+    def test_plain_directory(self, dump_dir: Path) -> None:
+        """Test recursive and flat discovery by extension."""
+        assert [path.name for path in find_minidumps(dump_dir)] == ["a.dmp", "corrupt.dmp", "b.DMP"]
+        assert [path.name for path in find_minidumps(dump_dir, recursive=False)] == ["a.dmp", "corrupt.dmp"]
+
+    def test_crashpad_database(self, tmp_path: Path) -> None:
+        """Test that only the report directories of a Crashpad database are searched."""
+        for name in ("completed", "pending", "attachments"):
+            (tmp_path / name).mkdir()
+            shutil.copy(TESTDATA / "test.dmp", tmp_path / name / f"{name}.dmp")
+
+        assert [path.parent.name for path in find_minidumps(tmp_path)] == ["pending", "completed"]
+
+
+class TestTriageFile:
+    """Tests for the per-dump worker."""
+
+    def test_record(self) -> None:
+        """Test metadata and timings of a readable dump."""
+        record = triage_file(str(TESTDATA / "test.dmp"))
+
+        assert record["success"] is True
+        assert len(record["dump_hash"]) == 64
+        assert record["crash_info"]["type"] == "EXCEPTION_ACCESS_VIOLATION_WRITE"
+        assert record["main_module"]["filename"] == "test_app.exe"
+        assert set(record["timings"]) == {"hash_ms", "read_ms"}
+        json.dumps(record)
+
+    def test_failure_is_recorded(self, tmp_path: Path) -> None:
+        """Test that unreadable dumps produce an error record."""
+        assert triage_file(str(tmp_path / "missing.dmp"))["error_code"] == "FILE_VALIDATION_FAILED"
+
+
+class TestTriageDirectory:
+    """Tests for the triage_directory tool."""
+
+    @pytest.mark.asyncio
+    async def test_metadata_only(self, dump_dir: Path) -> None:
+        """Test that every dump gets a record and failures are counted."""
+        result = await TriageProvider().triage_directory(str(dump_dir), max_workers=2)
+
+        assert result["success"] is True
+        assert result["dump_count"] == 3
+        assert result["failed_count"] == 1
+        records = {Path(record["minidump_path"]).name: record for record in result["records"]}
+        assert records["a.dmp"]["dump_hash"] == records["b.DMP"]["dump_hash"]
+        assert records["corrupt.dmp"]["success"] is False
+        assert {"discover_ms", "hash_ms", "read_ms", "wall_ms"} <= set(result["timings"])
+
+    @pytest.mark.asyncio
+    async def test_worker_pool(self, dump_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that workers are not forked, are not joined on the event loop and are reported as used."""
+        pools: List[Any] = []
+
+        class RecordingPool(ProcessPoolExecutor):
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                super().__init__(*args, **kwargs)
+                self.shutdowns: List[Tuple[bool, bool]] = []
+                pools.append(self)
+
+            def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+                self.shutdowns.append((wait, cancel_futures))
+                super().shutdown(wait, cancel_futures=cancel_futures)
+
+        monkeypatch.setattr("minidumpmcp.tools.triage.ProcessPoolExecutor", RecordingPool)
+
+        result = await TriageProvider().triage_directory(str(dump_dir), max_workers=8)
+
+        assert result["workers"] == 3
+        assert pools[0]._max_workers == 3
+        assert pools[0]._mp_context.get_start_method() != "fork"
+
+        records = TriageProvider().triage(sorted(find_minidumps(dump_dir)), max_workers=1)
+        await records.__anext__()
+        await records.aclose()
+        assert pools[1].shutdowns == [(False, True)]
+
+    @pytest.mark.asyncio
+    async def test_ndjson_output(self, dump_dir: Path, tmp_path: Path) -> None:
+        """Test that records are streamed to the output file one per line."""
+        output = tmp_path / "triage.ndjson"
+
+        result = await TriageProvider().triage_directory(str(dump_dir), max_workers=1, output_path=str(output))
+
+        assert "records" not in result
+        lines = output.read_text().splitlines()
+        assert len(lines) == 3
+        assert {json.loads(line)["minidump_path"] for line in lines} == {str(path) for path in find_minidumps(dump_dir)}
+
+    @pytest.mark.asyncio
+    async def test_stackwalk_is_bounded_and_signed(
+        self, dump_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test full analyses: concurrency limit, shared cache and signatures."""
+        fake_binary = tmp_path / "minidump-stackwalk"
+        fake_binary.write_text("")
+        running = 0
+        peak = 0
+
+        async def fake_run_subprocess(cmd: list[str | Path], **kwargs: object) -> str:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            Path(cmd[cmd.index("--cyborg") + 1]).write_text((TESTDATA / "stackwalk" / "test_app.json").read_text())
+            running -= 1
+            return ""
+
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk._get_bin_path", lambda name: fake_binary)
+        monkeypatch.setattr("minidumpmcp.tools.stackwalk.run_subprocess", fake_run_subprocess)
+        (dump_dir / "corrupt.dmp").unlink()
+
+        result = await TriageProvider(StackwalkProvider()).triage_directory(
+            str(dump_dir), stackwalk=True, concurrency=1
+        )
+
+        assert result["failed_count"] == 0
+        assert peak == 1
+        analyses = [record["stackwalk"] for record in result["records"]]
+        assert sorted(analysis["cached"] for analysis in analyses) == [False, True]
+        assert all(analysis["signature"].startswith("`anonymous namespace'::CrashFunction") for analysis in analyses)
+        assert all(analysis["findings"] == ["null_dereference"] for analysis in analyses)
+        assert "stackwalk_ms" in result["timings"]
+
+    @pytest.mark.asyncio
+    async def test_stackwalk_stops_when_out_of_time(self, dump_dir: Path) -> None:
+        """Test that stackwalks stop early at the deadline, while dumps too slow for any request only fail."""
+        (dump_dir / "corrupt.dmp").unlink()
+        shutil.copy(TESTDATA / "test.dmp", dump_dir / "c.dmp")
+        others_done = asyncio.Event()
+        finished: List[str] = []
+        # b.DMP is too slow for any request, c.dmp is turned away once the others used up the deadline
+        estimates = {"b.DMP": 75.0, "c.dmp": 1.0}
+
+        class DeadlineStackwalk(StackwalkProvider):
+            async def stackwalk_minidump(self, minidump_path: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+                name = Path(minidump_path).name
+                if name == "c.dmp":
+                    await others_done.wait()
+                    await asyncio.sleep(0.1)
+                else:
+                    finished.append(name)
+                    if len(finished) == 2:
+                        others_done.set()
+                if name == "a.dmp":
+                    return {"success": True, "analysis_hash": "a" * 64, "cached": False, "data": {}}
+                return {
+                    "success": False,
+                    "error": "Over budget",
+                    "error_code": "DEADLINE_EXCEEDED",
+                    "estimated_seconds": estimates[name],
+                    "budget_seconds": 0.5,
+                }
+
+        result = await TriageProvider(DeadlineStackwalk()).triage_directory(
+            str(dump_dir), stackwalk=True, concurrency=3
+        )
+
+        assert result["dump_count"] == 3
+        assert result["stopped_early"] is True
+        assert "submit_triage" in result["suggestion"]
+        records = {Path(record["minidump_path"]).name: record for record in result["records"]}
+        assert set(records) == {"a.dmp", "b.DMP"}
+        assert records["a.dmp"]["stackwalk"]["success"] is True
+        assert records["b.DMP"]["stackwalk"]["error_code"] == "DEADLINE_EXCEEDED"
+        assert result["failed_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self, dump_dir: Path) -> None:
+        """Test argument validation."""
+        provider = TriageProvider()
+
+        assert (await provider.triage_directory(str(dump_dir / "missing")))["error_code"] == "FILE_VALIDATION_FAILED"
+        assert (await provider.triage_directory(str(dump_dir), max_workers=0))["error_code"] == "INVALID_PARAMETER"
+        assert (await provider.triage_directory(str(dump_dir), concurrency=0))["error_code"] == "INVALID_PARAMETER"
+
+    @pytest.mark.asyncio
+    async def test_progress(self, dump_dir: Path) -> None:
+        """Test that run_triage reports progress and the tool can be registered with FastMCP."""
+        calls: List[Tuple[int, int]] = []
+
+        result = await TriageProvider().run_triage(
+            str(dump_dir), max_workers=1, progress=lambda done, total: calls.append((done, total))
+        )
+
+        assert result["dump_count"] == 3
+        assert calls == [(0, 3), (1, 3), (2, 3), (3, 3)]
+        tool = FastMCP("test").tool(TriageProvider().triage_directory)
+        assert "progress" not in tool.parameters["properties"]
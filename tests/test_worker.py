@@ -0,0 +1,96 @@
+"""Tests for job worker processes."""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from minidumpmcp.config import ServerSettings
+from minidumpmcp.config.settings import AnalysisCacheConfig, JobConfig
+from minidumpmcp.storage import JobQueue
+from minidumpmcp.tools.jobs import JobProvider, JobScheduler
+from minidumpmcp.worker import WorkerPool, worker_environment
+
+TESTDATA = Path(__file__).parent / "testdata"
+
+
+async def _wait_for(check: Callable[[], bool], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not check():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        await asyncio.sleep(0.05)
+
+
+class TestWorkerPool:
+    """Tests for starting, restarting and stopping worker processes."""
+
+    @pytest.mark.asyncio
+    async def test_workers_run_submitted_jobs(self, tmp_path: Path) -> None:
+        """Test that jobs submitted by a server without workers of its own are run by the pool."""
+        settings = ServerSettings(
+            jobs=JobConfig(database_path=tmp_path / "jobs.sqlite3"),
+            cache=AnalysisCacheConfig(directory=tmp_path / "analyses"),
+        )
+        env = {
+            **worker_environment(settings),
+            "MINIDUMP_MCP_JOBS__POLL_INTERVAL": "0.05",
+            "MINIDUMP_MCP_SIGNATURES__ENABLED": "false",
+            "MINIDUMP_MCP_SIMILARITY__ENABLED": "false",
+            "MINIDUMP_MCP_STORE__PATH": str(tmp_path / "store"),
+        }
+        dumps = tmp_path / "dumps"
+        dumps.mkdir()
+        shutil.copy(TESTDATA / "test.dmp", dumps / "a.dmp")
+
+        provider = JobProvider(scheduler=JobScheduler(JobQueue(settings.jobs.database_path), concurrency=0))
+        submitted = await provider.submit_triage(str(dumps))
+        pool = WorkerPool(2, env=env)
+        await pool.start()
+        try:
+            deadline = time.monotonic() + 60
+            status = await provider.get_job_status(submitted["job_id"])
+            while status["state"] not in ("done", "failed") and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                status = await provider.get_job_status(submitted["job_id"])
+            assert len(pool.pids) == 2
+        finally:
+            await pool.close()
+
+        assert status["state"] == "done"
+        assert status["result"]["dump_count"] == 1
+        assert pool.pids == []
+
+    @pytest.mark.asyncio
+    async def test_restarts_exited_workers(self, tmp_path: Path) -> None:
+        """Test that a worker that exits is started again."""
+        starts = tmp_path / "starts"
+        command = [sys.executable, "-c", f"open({str(starts)!r}, 'a').write('x'); raise SystemExit(3)"]
+        pool = WorkerPool(1, command, restart_delay=0.01)
+        await pool.start()
+        try:
+            await _wait_for(lambda: starts.exists() and len(starts.read_text()) >= 2)
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_close_kills_stuck_workers(self, tmp_path: Path) -> None:
+        """Test that a worker ignoring SIGTERM is killed after the grace period."""
+        ready = tmp_path / "ready"
+        script = (
+            "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+            f"open({str(ready)!r}, 'w').close(); time.sleep(60)"
+        )
+        pool = WorkerPool(1, [sys.executable, "-c", script], grace_period=0.2)
+        await pool.start()
+        await _wait_for(ready.exists)
+
+        started = time.monotonic()
+        await pool.close()
+
+        assert time.monotonic() - started < 10
+        assert pool.pids == []